@@ -0,0 +1 @@
+# Benchmarks and load tests (not shipped in the image)
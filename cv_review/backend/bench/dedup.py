@@ -0,0 +1,110 @@
+"""
+Near-duplicate detection benchmark: fill the fingerprint index with N candidates and time
+FingerprintIndex.find for exact copies, lightly edited copies and unrelated CVs.
+
+The N background candidates get random MinHash signatures (what unrelated CVs look like to
+the index; fingerprinting 100k texts would dominate the run); the duplicates are real
+fingerprints of generated CV texts planted among them.
+
+    python bench/dedup.py --sizes 10000,100000 --target-ms 1
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import CV_TERMS, cv_paragraphs  # noqa: E402
+from src.dedup import NUM_PERM, Fingerprint, FingerprintIndex  # noqa: E402
+
+_WORDS = [t for t, _ in CV_TERMS] + "led built migrated designed owned reduced improved operated team cluster".split()
+
+
+def unique_cv(rng: random.Random) -> str:
+    """A CV text that shares sample paragraphs with others but has its own experience section."""
+    own = [" ".join(rng.choice(_WORDS) for _ in range(12)) + "." for _ in range(30)]
+    return "\n".join(rng.sample(cv_paragraphs(1), 6) + own)
+
+
+def edit(text: str, rng: random.Random, fraction: float) -> str:
+    """The same CV lightly updated: a fraction of its words replaced."""
+    words = text.split(" ")
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = rng.choice(_WORDS)
+    return " ".join(words)
+
+
+def bench_size(n: int, planted: int, repeat: int) -> Dict:
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory(prefix="cv-dedup-") as tmp:
+        index = FingerprintIndex(Path(tmp) / "fingerprints.db")
+        t0 = time.perf_counter()
+        index.add_many(
+            (f"bg-{i}", Fingerprint(f"{rng.getrandbits(128):032x}", tuple(rng.getrandbits(32) for _ in range(NUM_PERM)), 500))
+            for i in range(n)
+        )
+        texts = [unique_cv(rng) for _ in range(planted)]
+        fp_times = []
+        fingerprints = []
+        for text in texts:
+            t = time.perf_counter()
+            fingerprints.append(Fingerprint.of(text))
+            fp_times.append((time.perf_counter() - t) * 1000)
+        index.add_many((f"cv-{i}", fp) for i, fp in enumerate(fingerprints))
+        build_s = time.perf_counter() - t0
+        print(f"n={n}: indexed in {build_s:.1f}s", flush=True)
+
+        cases = {
+            "exact copy": [(f"cv-{i}", Fingerprint.of(t.replace("\n", "\r\n"))) for i, t in enumerate(texts)],
+            "5% edited": [(f"cv-{i}", Fingerprint.of(edit(t, rng, 0.05))) for i, t in enumerate(texts)],
+            "unrelated": [(None, Fingerprint.of(unique_cv(rng))) for _ in range(planted)],
+        }
+        results = {"fingerprint_ms": statistics.median(fp_times)}
+        for name, queries in cases.items():
+            times: List[float] = []
+            hits = 0
+            for expected, fp in queries:
+                for _ in range(repeat):
+                    t = time.perf_counter()
+                    matches = index.find(fp)
+                    times.append((time.perf_counter() - t) * 1000)
+                found = [m.analysis_id for m in matches]
+                hits += (expected in found) if expected else (not found)
+            times.sort()
+            results[name] = {
+                "median_ms": statistics.median(times),
+                "p99_ms": times[int(len(times) * 0.99) - 1],
+                "correct": hits / len(queries),
+            }
+            print(f"  {name:12} median {results[name]['median_ms']:.3f} ms  p99 {results[name]['p99_ms']:.3f} ms  "
+                  f"correct {results[name]['correct']:.0%}", flush=True)
+        print(f"  fingerprint  median {results['fingerprint_ms']:.2f} ms per CV", flush=True)
+        return {"n": n, "build_seconds": build_s, **results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate CV lookup.")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--planted", type=int, default=200, help="Real CV fingerprints planted (and queried)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target-ms", type=float, default=1.0, help="Fail if a median lookup exceeds this")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    runs = [bench_size(int(n), args.planted, args.repeat) for n in args.sizes.split(",")]
+    worst = max(r[c]["median_ms"] for r in runs for c in ("exact copy", "5% edited", "unrelated"))
+    ok = worst <= args.target_ms
+    print(f"\nslowest median lookup {worst:.3f} ms — target {args.target_ms:g} ms: {'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(runs, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+End-to-end load test for the evaluation endpoints.
+
+Drives /api/evaluate, /api/evaluate-batch or /api/evaluate-url with N concurrent
+users, polls /api/jobs/{id} until each job finishes, and reports p50/p95/p99 job
+completion time, throughput, and event-loop lag (latency of /api/health probes).
+
+Self-contained run against the local Fuelix stand-in (no real tokens spent):
+    python bench/loadtest.py --spawn --users 20 --jobs-per-user 3
+Against an already running backend:
+    python bench/loadtest.py --api http://127.0.0.1:8000 --endpoint batch --corpus ./cvs
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CORPUS = [BACKEND_DIR.parent / "sample_cv_alex_chen.txt"]
+CORPUS_SUFFIXES = (".pdf", ".txt", ".docx")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100); 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def load_corpus(paths: List[str]) -> List[Path]:
+    files: List[Path] = []
+    for p in paths or [str(x) for x in DEFAULT_CORPUS]:
+        path = Path(p)
+        if path.is_dir():
+            files.extend(sorted(f for f in path.iterdir() if f.suffix.lower() in CORPUS_SUFFIXES))
+        elif path.is_file():
+            files.append(path)
+    if not files:
+        raise SystemExit("Corpus is empty: pass --corpus with CV files or a directory.")
+    return files
+
+
+def wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Service at {url} did not become healthy within {timeout}s")
+
+
+class LagProbe(threading.Thread):
+    """Polls /api/health at a fixed interval; the probe latency tracks server event-loop lag."""
+
+    def __init__(self, api: str, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.url = f"{api}/api/health"
+        self.interval = interval
+        self.samples: List[float] = []
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        session = requests.Session()
+        while not self._halt.is_set():
+            t0 = time.perf_counter()
+            try:
+                session.get(self.url, timeout=10)
+                self.samples.append(time.perf_counter() - t0)
+            except requests.RequestException:
+                pass
+            self._halt.wait(self.interval)
+
+    def stop(self) -> None:
+        self._halt.set()
+
+
+def _submit(session: requests.Session, api: str, endpoint: str, files: List[Path], url_target: str) -> List[str]:
+    if endpoint == "url":
+        r = session.post(f"{api}/api/evaluate-url", json={"url": url_target}, timeout=60)
+        r.raise_for_status()
+        return [r.json()["job_id"]]
+    if endpoint == "batch":
+        handles = [("files", (f.name, f.read_bytes())) for f in files]
+        r = session.post(f"{api}/api/evaluate-batch", files=handles, timeout=120)
+        r.raise_for_status()
+        return r.json()["job_ids"]
+    f = files[0]
+    r = session.post(f"{api}/api/evaluate", files={"file": (f.name, f.read_bytes())}, timeout=60)
+    r.raise_for_status()
+    return [r.json()["job_id"]]
+
+
+def _wait_job(session: requests.Session, api: str, job_id: str, poll: float, timeout: float) -> str:
+    """Final status of a job: complete, failed, timeout, or poll_error when polling broke."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            r = session.get(f"{api}/api/jobs/{job_id}", timeout=30)
+        except requests.RequestException:
+            return "poll_error"
+        if r.status_code == 200:
+            status = r.json().get("status")
+            if status in ("complete", "failed"):
+                return status
+        time.sleep(poll)
+    return "timeout"
+
+
+def run_user(user: int, args, corpus: List[Path], results: List[Dict]) -> None:
+    session = requests.Session()
+    for j in range(args.jobs_per_user):
+        idx = (user * args.jobs_per_user + j) * args.batch_size
+        files = [corpus[(idx + k) % len(corpus)] for k in range(args.batch_size)]
+        t0 = time.perf_counter()
+        try:
+            job_ids = _submit(session, args.api, args.endpoint, files, args.url_target)
+        except requests.RequestException as exc:
+            results.append({"user": user, "status": "submit_error", "error": str(exc), "seconds": 0.0})
+            continue
+        submit_s = time.perf_counter() - t0
+        for job_id in job_ids:
+            status = _wait_job(session, args.api, job_id, args.poll_interval, args.job_timeout)
+            results.append({
+                "user": user,
+                "job_id": job_id,
+                "status": status,
+                "submit_seconds": submit_s,
+                "seconds": time.perf_counter() - t0,
+            })
+
+
+def _spawn(args, procs: List[subprocess.Popen]) -> None:
+    """Start the Fuelix stand-in and the backend (with a throwaway data dir) as subprocesses,
+    appended to `procs` as they start (the caller stops them, also when a health wait fails)."""
+    mock_port, api_port = args.mock_port, args.api_port
+    procs.append(subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "tools" / "mock_fuelix.py"), "--port", str(mock_port),
+         "--latency", args.mock_latency, "--error-rate", str(args.mock_error_rate),
+         "--rate-limit-rate", str(args.mock_rate_limit_rate)],
+        cwd=BACKEND_DIR,
+    ))
+    wait_until_healthy(f"http://127.0.0.1:{mock_port}/stats")
+    env = {
+        **os.environ,
+        "FUELIX_BASE_URL": f"http://127.0.0.1:{mock_port}/v1",
+        "FUELIX_API_KEY": "mock",
+        "CV_REVIEW_DATA_DIR": tempfile.mkdtemp(prefix="cv-review-loadtest-"),
+        "PYTHONUNBUFFERED": "1",
+    }
+    procs.append(subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port), "--log-level", "warning",
+         "--workers", str(args.workers)],
+        cwd=BACKEND_DIR,
+        env=env,
+    ))
+    args.api = f"http://127.0.0.1:{api_port}"
+    if not args.url_target:
+        args.url_target = f"http://127.0.0.1:{mock_port}/cv/loadtest-candidate"
+    wait_until_healthy(f"{args.api}/api/health")
+
+
+def _stop(procs: List[subprocess.Popen]) -> None:
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        try:
+            p.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Load-test the CV Review evaluation endpoints.")
+    parser.add_argument("--api", default="http://127.0.0.1:8000", help="Backend base URL")
+    parser.add_argument("--endpoint", choices=("single", "batch", "url"), default="single")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent users")
+    parser.add_argument("--jobs-per-user", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=1, help="Files per /api/evaluate-batch request")
+    parser.add_argument("--corpus", nargs="*", default=None, help="CV files or directories")
+    parser.add_argument("--url-target", default="", help="URL submitted to /api/evaluate-url")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--job-timeout", type=float, default=900)
+    parser.add_argument("--out", default=None, help="Write the JSON report here")
+    parser.add_argument("--spawn", action="store_true", help="Start the Fuelix stand-in and backend locally")
+    parser.add_argument("--workers", type=int, default=1, help="Backend workers when --spawn is used")
+    parser.add_argument("--mock-port", type=int, default=9100)
+    parser.add_argument("--api-port", type=int, default=8100)
+    parser.add_argument("--mock-latency", default="lognormal:-1.0,0.4")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--mock-rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if args.endpoint != "batch":
+        args.batch_size = 1
+    if args.endpoint == "url" and not args.url_target and not args.spawn:
+        raise SystemExit("--endpoint url needs --url-target (or --spawn to use the stand-in's /cv page)")
+
+    procs: List[subprocess.Popen] = []
+    probe: Optional[LagProbe] = None
+    results: List[Dict] = []
+    try:
+        if args.spawn:
+            _spawn(args, procs)
+        probe = LagProbe(args.api)
+        probe.start()
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            users = [pool.submit(run_user, u, args, corpus, results) for u in range(args.users)]
+            for user in users:
+                user.result()  # a user that died mid-run fails the run instead of undercounting
+        wall = time.perf_counter() - t0
+    finally:
+        if probe is not None:
+            probe.stop()
+        _stop(procs)
+
+    done = [r["seconds"] for r in results if r["status"] == "complete"]
+    report = {
+        "endpoint": args.endpoint,
+        "users": args.users,
+        "jobs_submitted": len(results),
+        "jobs_complete": len(done),
+        "jobs_failed": sum(1 for r in results if r["status"] != "complete"),
+        "wall_seconds": round(wall, 3),
+        "throughput_jobs_per_second": round(len(done) / wall, 4) if wall else 0.0,
+        "job_completion_seconds": _summary(done),
+        "submit_seconds": _summary([r.get("submit_seconds", 0.0) for r in results if "submit_seconds" in r]),
+        "event_loop_lag_seconds": _summary(probe.samples),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Requisition matching benchmark: N stored candidates with CV embeddings, time /api/match
+ranking (Storage.match_candidates) with the local requisition mapper.
+
+Every candidate gets a real analysis record; the first --embedded of them also get real
+CV-text embeddings, the rest random unit vectors (embedding 100k generated CVs would
+dominate the run and does not change the cost of a query).
+
+    python bench/match.py --sizes 10000,50000 --target-ms 1000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_cv_text, make_records, write_dataset  # noqa: E402
+from src.embeddings import DIM, VectorIndex, embed  # noqa: E402
+from src.matching import map_local  # noqa: E402
+from src.storage import Storage  # noqa: E402
+
+REQUISITIONS = [
+    "Senior ML engineer: PyTorch, TensorFlow, model training pipelines on Vertex AI, strong Python and SQL.",
+    "Kubernetes platform engineer: GKE, Anthos, Helm, service mesh, Terraform.",
+    "Looker developer building LookML models and dashboards for finance.",
+    "Security analyst: SIEM, threat detection, incident response.",
+]
+
+
+def bench_size(n: int, embedded: int, repeat: int) -> Dict:
+    rng = random.Random(5)
+    records = make_records(n)
+    with tempfile.TemporaryDirectory(prefix="cv-match-") as tmp:
+        write_dataset(records, Path(tmp))
+        vectors = VectorIndex(Path(tmp) / "vectors.db")
+        storage = Storage(Path(tmp), vectors=vectors)
+        t0 = time.perf_counter()
+        noise = np.random.default_rng(5).standard_normal((n, DIM)).astype(np.float32)
+        noise /= np.linalg.norm(noise, axis=1, keepdims=True)
+        vectors.add_many(
+            (r["id"], embed(make_cv_text(r, rng)) if i < embedded else noise[i]) for i, r in enumerate(records)
+        )
+        build_s = time.perf_counter() - t0
+        t = time.perf_counter()
+        storage.match_candidates({"Data/AI and ML": 1.0}, embed(REQUISITIONS[0]))
+        cold_ms = (time.perf_counter() - t) * 1000
+        print(f"n={n}: vectors stored in {build_s:.1f}s; first query (loads matrix and vectors) {cold_ms:.0f} ms", flush=True)
+
+        results = {}
+        for req in REQUISITIONS:
+            t = time.perf_counter()
+            weights = map_local(req)
+            map_ms = (time.perf_counter() - t) * 1000
+            vector = embed(req)
+            times = []
+            for _ in range(repeat):
+                t = time.perf_counter()
+                out = storage.match_candidates(weights, vector, text_weight=0.3, limit=20)
+                times.append((time.perf_counter() - t) * 1000)
+            results[req] = {"median_ms": statistics.median(times), "max_ms": max(times), "map_ms": map_ms,
+                            "weights": weights, "top": out["items"][0]["match_score"] if out["items"] else None}
+            print(f"  {req[:60]!r:64} {results[req]['median_ms']:7.1f} ms  (mapping {map_ms:.1f} ms, "
+                  f"{', '.join(weights)})", flush=True)
+        return {"n": n, "build_seconds": build_s, "cold_ms": cold_ms, "queries": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark requisition matching.")
+    parser.add_argument("--sizes", default="10000,50000")
+    parser.add_argument("--embedded", type=int, default=2000, help="Candidates with real CV-text embeddings")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=1000.0, help="Fail if any median query exceeds this")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    runs = [bench_size(int(n), args.embedded, args.repeat) for n in args.sizes.split(",")]
+    worst = max(q["median_ms"] for r in runs for q in r["queries"].values())
+    ok = worst <= args.target_ms
+    print(f"\nslowest median query {worst:.1f} ms — target {args.target_ms:.0f} ms: {'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(runs, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Memory benchmark: bytes per cached analysis (tracemalloc) held as parsed dicts, as the
+record cache held them before, and as compact records (src/compact.py), plus what the
+compact form costs in time: packing a snapshot, rebuilding it after one more save, and
+decoding a full record.
+
+    python bench/memory.py --records 10000 --target-ratio 5
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_records  # noqa: E402
+from src.compact import ROLES, pack  # noqa: E402
+from src.record_index import RecordIndex  # noqa: E402
+from src.storage import _skill_matrix_roles  # noqa: E402
+
+
+def _traced(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """(what build() returned, bytes it still holds)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return kept, held
+
+
+def run(n: int) -> Dict[str, Any]:
+    records = make_records(n)
+    raw = orjson.dumps(records)
+    del records
+    ROLES.extend(_skill_matrix_roles())
+
+    dicts, dict_bytes = _traced(lambda: orjson.loads(raw))
+    del dicts
+    compact, compact_bytes = _traced(lambda: pack(orjson.loads(raw)))
+    index, index_bytes = _traced(lambda: RecordIndex(compact))
+    ratio = dict_bytes / compact_bytes
+    print(f"{n} records: dicts {dict_bytes / n:,.0f} B/record, compact {compact_bytes / n:,.0f} B/record "
+          f"(x{ratio:.1f} smaller); indexes {index_bytes / n:,.0f} B/record")
+
+    t = time.perf_counter()
+    pack(orjson.loads(raw))
+    pack_s = time.perf_counter() - t
+    more = orjson.loads(raw)
+    more.append(make_records(1, seed=7)[0])
+    t = time.perf_counter()
+    pack(more, previous=compact)
+    repack_s = time.perf_counter() - t
+    t = time.perf_counter()
+    orjson.loads(raw)
+    parse_s = time.perf_counter() - t
+    sample = compact[:: max(1, n // 1000)]
+    t = time.perf_counter()
+    for r in sample:
+        r.to_dict()
+    decode_us = (time.perf_counter() - t) / len(sample) * 1e6
+    print(f"  parse analyses.json {parse_s * 1000:.0f} ms; pack {pack_s * 1000:.0f} ms; "
+          f"re-read after one save {repack_s * 1000:.0f} ms (reuses packed records); full record {decode_us:.0f} µs")
+    return {
+        "records": n, "dict_bytes_per_record": dict_bytes / n, "compact_bytes_per_record": compact_bytes / n,
+        "index_bytes_per_record": index_bytes / n, "ratio": ratio, "parse_ms": parse_s * 1000,
+        "pack_ms": pack_s * 1000, "repack_ms": repack_s * 1000, "to_dict_us": decode_us,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memory per cached analysis.")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--target-ratio", type=float, default=5.0, help="Fail if dicts / compact is below this")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    report = run(args.records)
+    ok = report["ratio"] >= args.target_ratio
+    print(f"x{report['ratio']:.1f} — target x{args.target_ratio:.0f}: {'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
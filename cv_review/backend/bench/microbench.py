@@ -0,0 +1,217 @@
+"""
+Microbenchmarks for storage, aggregation, parsing and report generation at scale.
+
+Synthetic analysis records (1k/10k/100k by default) are generated from the real
+schema in data/analyses.json; a PDF/DOCX/TXT fixture corpus is generated under
+bench/.fixtures. Results are written as JSON so runs can be compared across commits.
+
+    python bench/microbench.py run --sizes 1000,10000 --out bench/results/
+    python bench/microbench.py compare bench/results/base.json bench/results/head.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from bench.synthetic import build_fixture_corpus, make_records, write_dataset  # noqa: E402
+from src.cv_parser import extract_text_from_file  # noqa: E402
+from src.evaluator import _parse_json_from_response  # noqa: E402
+from src.reports import build_excel_report, build_pdf_report, get_records_for_report, iter_csv_report  # noqa: E402
+from src.storage import Storage  # noqa: E402
+
+RESPONSES = {
+    "spec_score": '{"score": 4}',
+    "fenced": 'Here is the evaluation:\n```json\n{"score": 3}\n```\nLet me know if you need more.',
+    "area_descriptions": json.dumps({
+        a: f"The candidate shows {a.lower()} experience across several roles. " * 3
+        for a in ["Infrastructure", "Networking", "Platform", "Data", "Other"]
+    }),
+    "braces_in_strings": json.dumps({
+        "candidate_summary": "Uses {templating} and JSON like {\"a\": 1} in configs. " * 10,
+        "recommendation_reason": "Strong {GKE} background.",
+    }),
+    "broken_then_valid": 'Draft: {"score": 4,} — corrected: {"score": 4}',
+    "large": json.dumps({"previous_jobs": [f"Engineer — Company {i} (2010–2012)" for i in range(400)]}),
+}
+
+
+def timeit(fn: Callable[[], Any], repeat: int = 5, min_run_seconds: float = 0.05, max_number: int = 10000) -> Dict:
+    """Time fn: calibrate loops per run so each run lasts ~min_run_seconds, then repeat."""
+    number = 1
+    while number < max_number:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_run_seconds:
+            break
+        number *= 10
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - t0) / number)
+    return {
+        "min_s": min(runs),
+        "median_s": statistics.median(runs),
+        "mean_s": statistics.fmean(runs),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def bench_storage(sizes: List[int], repeat: int) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    for n in sizes:
+        records = make_records(n)
+        area = records[0]["result"]["most_fitted_area"]
+        some_ids = [r["id"] for r in records[:: max(1, n // 50)]]
+        mid_date = records[n // 2]["timestamp"][:10]
+        with tempfile.TemporaryDirectory(prefix="cv-bench-") as tmp:
+            write_dataset(records, Path(tmp))
+            storage = Storage(data_dir=Path(tmp))
+            # Large datasets make each call slow; fewer repeats keep the run bounded.
+            rep = repeat if n <= 10000 else max(1, repeat // 2)
+            cases = {
+                "storage.list_analyses": lambda: storage.list_analyses(limit=100),
+                "storage.list_analyses.deep_page": lambda: storage.list_analyses(limit=50, offset=n - 50),
+                "storage.list_analyses.deep_cursor": lambda: storage.list_analyses(
+                    limit=50, after=f"{records[50]['timestamp']},{records[50]['id']}"),
+                "storage.get_analysis": lambda: storage.get_analysis(records[-1]["id"]),
+                "storage.get_metrics": storage.get_metrics,
+                "storage.get_best_candidates": storage.get_best_candidates,
+                "reports.get_records_for_report": lambda: get_records_for_report(storage, limit=200),
+                "storage.query.filtered": lambda: storage.query(area="Data", min_scores={"Data": 4}, limit=200),
+                "reports.get_records_for_report.filtered": lambda: get_records_for_report(
+                    storage, area_filter=area, date_from=mid_date, limit=200),
+                "reports.get_records_for_report.ids": lambda: get_records_for_report(
+                    storage, analysis_ids=some_ids, limit=200),
+            }
+            for name, fn in cases.items():
+                results[f"{name}[n={n}]"] = timeit(fn, repeat=rep, min_run_seconds=0.02)
+                print(f"  {name}[n={n}]: {results[f'{name}[n={n}]']['median_s'] * 1000:.2f} ms", flush=True)
+    return results
+
+
+def bench_reports(report_sizes: List[int], repeat: int) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    records = make_records(max(report_sizes))
+    for n in report_sizes:
+        subset = records[:n]
+        for name, fn in (
+            ("reports.build_excel_report", build_excel_report),
+            ("reports.build_pdf_report", build_pdf_report),
+            ("reports.iter_csv_report", lambda rs: b"".join(iter_csv_report(rs))),
+        ):
+            key = f"{name}[n={n}]"
+            results[key] = timeit(lambda: fn(subset), repeat=max(1, repeat // 2), min_run_seconds=0.0, max_number=1)
+            print(f"  {key}: {results[key]['median_s'] * 1000:.2f} ms", flush=True)
+    return results
+
+
+def bench_parsing(repeat: int) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    for name, text in RESPONSES.items():
+        key = f"evaluator._parse_json_from_response[{name}]"
+        results[key] = timeit(lambda: _parse_json_from_response(text), repeat=repeat)
+        print(f"  {key}: {results[key]['median_s'] * 1e6:.1f} µs", flush=True)
+    for path in build_fixture_corpus():
+        key = f"cv_parser.extract_text_from_file[{path.name}]"
+        results[key] = timeit(lambda: extract_text_from_file(path), repeat=repeat, min_run_seconds=0.05, max_number=100)
+        print(f"  {key}: {results[key]['median_s'] * 1000:.2f} ms", flush=True)
+    return results
+
+
+def run(args) -> Dict:
+    sizes = [int(x) for x in args.sizes.split(",") if x]
+    report_sizes = [int(x) for x in args.report_sizes.split(",") if x]
+    groups = set(args.only.split(",")) if args.only else {"storage", "reports", "parsing"}
+    benchmarks: Dict[str, Dict] = {}
+    if "parsing" in groups:
+        print("parsing:")
+        benchmarks.update(bench_parsing(args.repeat))
+    if "storage" in groups:
+        print("storage:")
+        benchmarks.update(bench_storage(sizes, args.repeat))
+    if "reports" in groups:
+        print("reports:")
+        benchmarks.update(bench_reports(report_sizes, args.repeat))
+
+    report = {
+        "git_rev": _git_rev(),
+        "created": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "sizes": sizes,
+        "report_sizes": report_sizes,
+        "benchmarks": benchmarks,
+    }
+    out = Path(args.out)
+    if out.is_dir() or not out.suffix:
+        out.mkdir(parents=True, exist_ok=True)
+        out = out / f"microbench-{report['git_rev']}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {out}")
+    return report
+
+
+def compare(args) -> int:
+    """Print per-benchmark ratios (head / base median); exit 1 if any exceeds --threshold."""
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    regressions = 0
+    print(f"{'benchmark':70} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+    for name, b in sorted(base["benchmarks"].items()):
+        h = head["benchmarks"].get(name)
+        if not h:
+            continue
+        ratio = h["median_s"] / b["median_s"] if b["median_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{name:70} {b['median_s'] * 1000:10.3f} {h['median_s'] * 1000:10.3f} {ratio:7.2f}{flag}")
+    print(f"\n{base.get('git_rev')} -> {head.get('git_rev')}: {regressions} regression(s) over x{args.threshold}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CV Review microbenchmarks.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_run = sub.add_parser("run", help="Run benchmarks and save results as JSON")
+    p_run.add_argument("--sizes", default="1000,10000,100000", help="Stored analyses per storage benchmark")
+    p_run.add_argument("--report-sizes", default="10,100,500", help="Records per Excel/PDF report")
+    p_run.add_argument("--repeat", type=int, default=5)
+    p_run.add_argument("--only", default="", help="Comma-separated groups: storage,reports,parsing")
+    p_run.add_argument("--out", default=str(BENCH_DIR / "results"), help="Output file or directory")
+    p_cmp = sub.add_parser("compare", help="Compare two result files")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("head")
+    p_cmp.add_argument("--threshold", type=float, default=1.2, help="Ratio above which a benchmark is a regression")
+    args = parser.parse_args(argv)
+    if args.cmd == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
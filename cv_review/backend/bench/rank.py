@@ -0,0 +1,106 @@
+"""
+Ranking benchmark: build the score matrix over N synthetic candidates and time /api/rank
+queries (ScoreMatrix.rank) and the per-area best candidates, next to the equivalent
+Python loop over the records.
+
+    python bench/rank.py --sizes 10000,100000 --target-ms 10
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_records  # noqa: E402
+from src.score_matrix import AREAS_ORDER, ScoreMatrix  # noqa: E402
+from src.storage import _skill_matrix_roles  # noqa: E402
+
+QUERIES = {
+    "AI and ML 60% + Data Analytics 40%, Security >= Medium, area Data": (
+        {"Data/AI and ML": 0.6, "Data/Data Analytics": 0.4}, {"Infrastructure/Security": 3.0}, "Data"),
+    "Platform area score": ({"Platform": 1.0}, {}, None),
+    "5 specializations, 2 minimums": (
+        {"Infrastructure/Compute": 1, "Infrastructure/DevOps": 1, "Platform/GKE & Anthos": 2,
+         "Platform/Serverless": 1, "Networking/SDN": 0.5},
+        {"Infrastructure/Containers": 4.0, "Platform/Databases": 3.0}, None),
+}
+
+
+def _loop_rank(records: List[Dict[str, Any]], weights, min_scores, area, limit: int = 20) -> List[str]:
+    """What a ranking costs without the matrix: score every record in Python."""
+    def value(result, key):
+        a, _, spec = key.partition("/")
+        if not spec:
+            return (result.get("area_scores") or {}).get(a)
+        for s in result.get("specializations") or []:
+            if s.get("area") == a and s.get("specialization") == spec:
+                return s.get("score")
+        return None
+
+    scored = []
+    for r in records:
+        result = r.get("result") or {}
+        if area and result.get("most_fitted_area") != area:
+            continue
+        if any((value(result, k) or 0) < m for k, m in min_scores.items()):
+            continue
+        scored.append((sum((value(result, k) or 0) * w for k, w in weights.items()), r["id"]))
+    scored.sort(key=lambda t: -t[0])
+    return [i for _, i in scored[:limit]]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return statistics.median(times)
+
+
+def bench_size(n: int, repeat: int) -> Dict:
+    records = make_records(n)
+    t0 = time.perf_counter()
+    matrix = ScoreMatrix(records, roles=_skill_matrix_roles())
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"n={n}: matrix built in {build_ms:.0f} ms ({matrix.scores.nbytes / 1e6:.1f} MB)", flush=True)
+    results: Dict[str, Any] = {}
+    for name, (weights, min_scores, area) in QUERIES.items():
+        ms = _time(lambda: matrix.rank(weights, min_scores, area=area), repeat)
+        loop_ms = _time(lambda: _loop_rank(records, weights, min_scores, area), 1)
+        results[name] = {"median_ms": ms, "loop_ms": loop_ms}
+        print(f"  {name:66} {ms:7.2f} ms   (loop {loop_ms:8.1f} ms)", flush=True)
+    ms = _time(lambda: [matrix.best(a, default=1.0) for a in AREAS_ORDER], repeat)
+    results["best per area"] = {"median_ms": ms}
+    print(f"  {'best per area':66} {ms:7.2f} ms", flush=True)
+    t = time.perf_counter()
+    for r in records[:1000]:
+        matrix.add(r)
+    add_us = (time.perf_counter() - t) * 1000
+    print(f"  incremental update: {add_us:.1f} us per save", flush=True)
+    return {"n": n, "build_ms": build_ms, "update_us": add_us, "queries": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark score-matrix candidate ranking.")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=10.0, help="Fail if any median query exceeds this")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    runs = [bench_size(int(n), args.repeat) for n in args.sizes.split(",")]
+    worst = max(q["median_ms"] for r in runs for q in r["queries"].values())
+    ok = worst <= args.target_ms
+    print(f"\nslowest median query {worst:.2f} ms — target {args.target_ms:g} ms: {'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(runs, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Search benchmark: build the FTS index over N synthetic candidates (with CV text) and time
+/api/search queries (SearchIndex.search) from selective to very common terms.
+
+    python bench/search.py --sizes 10000,100000 --target-ms 50
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_cv_text, make_records  # noqa: E402
+from src.search import SearchIndex  # noqa: E402
+
+QUERIES = [
+    "CKA",
+    "kubernetes CKA",
+    "Spanner",
+    "terraform bigquery",
+    "kube*",
+    '"data engineer"',
+    "the Kubernetes person with a CKA from last month",
+    "engineer",
+]
+
+
+def bench_size(n: int, repeat: int) -> Dict:
+    rng = random.Random(7)
+    records = make_records(n)
+    with tempfile.TemporaryDirectory(prefix="cv-search-") as tmp:
+        index = SearchIndex(Path(tmp) / "search.db")
+        t0 = time.perf_counter()
+        index.add_many((r, make_cv_text(r, rng)) for r in records)
+        build_s = time.perf_counter() - t0
+        size_mb = sum(p.stat().st_size for p in Path(tmp).iterdir()) / 1e6
+        print(f"n={n}: indexed in {build_s:.1f}s ({size_mb:.0f} MB)", flush=True)
+        mid = records[n // 2]["timestamp"][:10]
+        cases = [(q, {}) for q in QUERIES] + [("kubernetes", {"area": "Platform"}), ("kubernetes", {"date_from": mid})]
+        results = {}
+        for q, kwargs in cases:
+            times = []
+            for _ in range(repeat):
+                t = time.perf_counter()
+                out = index.search(q, **kwargs)
+                times.append((time.perf_counter() - t) * 1000)
+            key = q + (f" {kwargs}" if kwargs else "")
+            results[key] = {"median_ms": statistics.median(times), "max_ms": max(times),
+                            "total": out["total"], "mode": out["mode"]}
+            print(f"  {key!r:60} {results[key]['median_ms']:8.2f} ms  ({out['total']} hits, {out['mode']})", flush=True)
+        return {"n": n, "build_seconds": build_s, "size_mb": size_mb, "queries": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark full-text candidate search.")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=50.0, help="Fail if any median query exceeds this")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    runs = [bench_size(int(n), args.repeat) for n in args.sizes.split(",")]
+    worst = max(q["median_ms"] for r in runs for q in r["queries"].values())
+    ok = worst <= args.target_ms
+    print(f"\nslowest median query {worst:.1f} ms — target {args.target_ms:.0f} ms: {'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(runs, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
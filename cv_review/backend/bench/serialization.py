@@ -0,0 +1,90 @@
+"""
+Serialization benchmark: N synthetic analysis records through the stdlib json path the
+storage and API used before (indent=2 files, jsonable_encoder + json responses) and
+through orjson (compact files, OrjsonResponse) and msgspec (typed decode, src/schema.py).
+
+    python bench/serialization.py --records 10000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_records  # noqa: E402
+from src import schema  # noqa: E402
+from src.storage import slim_row  # noqa: E402
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return statistics.median(times)
+
+
+def _stdlib_response(content: Any) -> bytes:
+    # FastAPI's default: jsonable_encoder, then JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _orjson_response(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def run(n: int, repeat: int) -> Dict[str, Any]:
+    records = make_records(n)
+    pretty = json.dumps(records, ensure_ascii=False, indent=2).encode("utf-8")
+    compact = orjson.dumps(records)
+    page = {"items": [slim_row(r) for r in records[:1000]], "total": n}
+    rows: List[Dict[str, Any]] = []
+
+    def case(name: str, before: Callable[[], Any], after: Callable[[], Any], typed: Optional[Callable[[], Any]] = None):
+        row = {"case": name, "stdlib_ms": _time(before, repeat), "orjson_ms": _time(after, repeat)}
+        if typed is not None:
+            row["msgspec_ms"] = _time(typed, repeat)
+        row["speedup"] = row["stdlib_ms"] / row["orjson_ms"] if row["orjson_ms"] else float("inf")
+        rows.append(row)
+        typed_txt = f"  msgspec {row['msgspec_ms']:8.1f} ms" if "msgspec_ms" in row else ""
+        print(f"  {name:36} stdlib {row['stdlib_ms']:8.1f} ms  orjson {row['orjson_ms']:8.1f} ms"
+              f"{typed_txt}  x{row['speedup']:.1f}", flush=True)
+
+    print(f"{n} records: analyses.json {len(pretty) / 1e6:.1f} MB indented, {len(compact) / 1e6:.1f} MB compact")
+    typed_decode = (lambda: schema.decode_records(compact)) if schema.AVAILABLE else None
+    case("read analyses.json", lambda: json.loads(pretty.decode("utf-8")), lambda: orjson.loads(compact), typed_decode)
+    case("write analyses.json", lambda: json.dumps(records, ensure_ascii=False, indent=2).encode("utf-8"),
+         lambda: orjson.dumps(records))
+    case("GET /api/analyses/{id} (x100)", lambda: [_stdlib_response(r) for r in records[:100]],
+         lambda: [_orjson_response(r) for r in records[:100]])
+    case("GET /api/analyses (1000 rows)", lambda: _stdlib_response(page), lambda: _orjson_response(page))
+    if not schema.AVAILABLE:
+        print("  (msgspec not installed: typed decode skipped)")
+    return {"records": n, "pretty_bytes": len(pretty), "compact_bytes": len(compact), "cases": rows}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark record serialization.")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="")
+    args = parser.parse_args(argv)
+    report = run(args.records, args.repeat)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
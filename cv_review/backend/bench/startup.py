@@ -0,0 +1,145 @@
+"""
+Startup benchmark: time-to-first-healthy-response of a fresh backend process.
+
+Each run starts `uvicorn main:app` on a free port with a throwaway data dir and
+polls /api/health until it answers 200; the import-time profile shows where the
+time before that goes.
+
+    python bench/startup.py --runs 5 --target 1.0
+    python bench/startup.py --importtime --top 25
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str, timeout: float = 0.5) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except OSError:
+        return None
+
+
+def measure_once(warmup: str, workers: int, timeout: float = 30.0) -> Dict[str, float]:
+    """Seconds from process spawn to the first 200 from /api/health, and to the first API read."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix="cv-startup-") as data_dir:
+        env = {
+            **os.environ,
+            "CV_REVIEW_DATA_DIR": data_dir,
+            "CV_REVIEW_WARMUP": warmup,
+            "FUELIX_API_KEY": os.getenv("FUELIX_API_KEY", "bench"),
+            # Keep warm-up off the network during the benchmark
+            "FUELIX_BASE_URL": os.getenv("FUELIX_BASE_URL", "http://127.0.0.1:9/v1"),
+        }
+        cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"]
+        if workers > 1:
+            cmd += ["--workers", str(workers)]
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            healthy = None
+            while time.perf_counter() - t0 < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"backend exited early:\n{proc.stderr.read().decode(errors='replace')}")
+                if _get(f"{base}/api/health") == 200:
+                    healthy = time.perf_counter() - t0
+                    break
+                time.sleep(0.005)
+            if healthy is None:
+                raise RuntimeError(f"backend not healthy after {timeout}s")
+            t1 = time.perf_counter()
+            _get(f"{base}/api/analyses?limit=1", timeout=5)
+            return {"first_healthy_s": healthy, "first_api_read_s": time.perf_counter() - t1}
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def import_profile(top: int = 25) -> Dict:
+    """Parse `python -X importtime -c 'import main'` into the slowest modules (cumulative and self)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, "CV_REVIEW_DATA_DIR": tempfile.mkdtemp(prefix="cv-startup-")},
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cum_us, name = line.split("|")
+        self_us = head.split(":")[1]
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cum_us) / 1000})
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == "main"), 0.0)
+    return {
+        "import_main_ms": total,
+        "by_cumulative": sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top],
+        "by_self": sorted(rows, key=lambda r: r["self_ms"], reverse=True)[:top],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure backend cold start.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--warmup", default="background", choices=["background", "blocking", "off"],
+                        help="CV_REVIEW_WARMUP mode for the measured process")
+    parser.add_argument("--target", type=float, default=1.0, help="Fail if median time-to-healthy exceeds this")
+    parser.add_argument("--importtime", action="store_true", help="Also print the import-time profile")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", default="", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    report: Dict = {"warmup": args.warmup, "workers": args.workers, "runs": []}
+    if args.importtime:
+        profile = import_profile(args.top)
+        report["import_profile"] = profile
+        print(f"import main: {profile['import_main_ms']:.0f} ms")
+        print(f"{'module':50} {'cumulative ms':>14} {'self ms':>9}")
+        for r in profile["by_cumulative"]:
+            print(f"{r['module']:50} {r['cumulative_ms']:14.1f} {r['self_ms']:9.1f}")
+        print()
+
+    for i in range(args.runs):
+        run = measure_once(args.warmup, args.workers)
+        report["runs"].append(run)
+        print(f"run {i + 1}: healthy {run['first_healthy_s'] * 1000:.0f} ms, "
+              f"first API read {run['first_api_read_s'] * 1000:.0f} ms", flush=True)
+
+    healthy = [r["first_healthy_s"] for r in report["runs"]]
+    report["median_first_healthy_s"] = statistics.median(healthy)
+    report["max_first_healthy_s"] = max(healthy)
+    ok = report["median_first_healthy_s"] <= args.target
+    print(f"\nmedian time-to-healthy {report['median_first_healthy_s'] * 1000:.0f} ms "
+          f"(max {report['max_first_healthy_s'] * 1000:.0f} ms) — target {args.target * 1000:.0f} ms: "
+          f"{'OK' if ok else 'FAIL'}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Synthetic analysis records and CV fixtures for benchmarks, built from the real data schema."""
+import copy
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from src.evaluator import (  # noqa: E402
+    _area_scores_from_specializations,
+    _best_specializations_for_area,
+    _most_fitted_area_from_specializations,
+    _score_to_level,
+)
+
+SAMPLE_DATA = BACKEND_DIR / "data" / "analyses.json"
+SAMPLE_CV = BACKEND_DIR.parent / "sample_cv_alex_chen.txt"
+MODELS = ["gemini-3-pro", "gemini-3-flash", "gemini-2.0-flash"]
+FIXTURES_DIR = Path(__file__).resolve().parent / ".fixtures"
+
+
+def load_templates(path: Path = SAMPLE_DATA) -> List[Dict[str, Any]]:
+    """Real stored records used as shape templates (ids, text and scores are replaced)."""
+    records = orjson.loads(path.read_bytes())
+    templates = [r for r in records if (r.get("result") or {}).get("specializations")]
+    if not templates:
+        raise SystemExit(f"No usable analysis records in {path}")
+    return templates
+
+
+def make_record(template: Dict[str, Any], rng: random.Random, ts: datetime, i: int) -> Dict[str, Any]:
+    """One synthetic record with the template's schema and fresh ids, scores and timestamp."""
+    record = copy.deepcopy(template)
+    result = record["result"]
+    specs = []
+    for s in result["specializations"]:
+        score = rng.choices([1, 2, 3, 4, 5], weights=[40, 20, 18, 14, 8])[0]
+        specs.append({**s, "score": score, "level": _score_to_level(score)})
+    area = _most_fitted_area_from_specializations(specs)
+    result["specializations"] = specs
+    result["area_scores"] = _area_scores_from_specializations(specs)
+    result["most_fitted_area"] = area
+    result["best_specializations"] = _best_specializations_for_area(area, specs)
+    model = rng.choice(MODELS)
+    result.setdefault("metrics", {})["model_used"] = model
+    record.update({
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "filename": f"candidate-{i:06d}.pdf",
+        "timestamp": ts.isoformat(),
+        "analysis_time_seconds": round(rng.uniform(20, 240), 2),
+        "api_calls": 18,
+        "total_tokens": rng.randint(20000, 60000),
+        "model_used": model,
+    })
+    return record
+
+
+def make_records(n: int, seed: int = 42, templates: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """n synthetic records with timestamps spread over the last two years, oldest first."""
+    rng = random.Random(seed)
+    templates = templates or load_templates()
+    start = datetime(2025, 1, 1)
+    step = timedelta(days=730) / max(n, 1)
+    return [make_record(templates[i % len(templates)], rng, start + step * i, i) for i in range(n)]
+
+
+def write_dataset(records: List[Dict[str, Any]], data_dir: Path) -> Path:
+    """Write records where Storage(data_dir) will find them (compact, as Storage writes them)."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / "analyses.json"
+    path.write_bytes(orjson.dumps(records))
+    return path
+
+
+def cv_paragraphs(pages: int) -> List[str]:
+    """CV text repeated to roughly `pages` pages worth of paragraphs."""
+    base = [p for p in SAMPLE_CV.read_text(encoding="utf-8").split("\n") if p.strip()]
+    per_page = 45
+    return [base[i % len(base)] for i in range(pages * per_page)]
+
+
+# Skill terms sprinkled into synthetic CV text with very different frequencies, so search
+# benchmarks see both selective and common terms
+CV_TERMS = [
+    ("Kubernetes", 0.30), ("Terraform", 0.25), ("BigQuery", 0.20), ("CKA", 0.05), ("Anthos", 0.03),
+    ("Apigee", 0.02), ("Looker", 0.08), ("TensorFlow", 0.10), ("Istio", 0.04), ("Spanner", 0.01),
+]
+
+
+def make_cv_text(record: Dict[str, Any], rng: random.Random, paragraphs: int = 30) -> str:
+    """Plausible extracted CV text for a synthetic record: its own jobs and education, sample CV
+    paragraphs, and a random subset of CV_TERMS."""
+    base = cv_paragraphs(1)
+    result = record.get("result") or {}
+    parts = [str(result.get("candidate_summary") or "")]
+    parts += [str(x) for x in result.get("previous_jobs_list") or []]
+    parts += [str(x) for x in result.get("education_list") or []]
+    parts += rng.sample(base, min(paragraphs, len(base)))
+    terms = [t for t, p in CV_TERMS if rng.random() < p]
+    if terms:
+        parts.append("Skills: " + ", ".join(terms))
+    return "\n".join(parts)
+
+
+def build_fixture_corpus(pages: List[int] = (1, 3, 10)) -> List[Path]:
+    """Generate (once) PDF and DOCX CVs of several lengths under bench/.fixtures."""
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    out: List[Path] = []
+    for n in pages:
+        paragraphs = cv_paragraphs(n)
+        pdf_path = FIXTURES_DIR / f"cv-{n}p.pdf"
+        if not pdf_path.exists():
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib.styles import getSampleStyleSheet
+            from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+            styles = getSampleStyleSheet()
+            story = []
+            for i, p in enumerate(paragraphs):
+                if i and i % 45 == 0:
+                    story.append(PageBreak())
+                story.append(Paragraph(p.replace("&", "&amp;").replace("<", "&lt;"), styles["Normal"]))
+            SimpleDocTemplate(str(pdf_path), pagesize=A4).build(story)
+        out.append(pdf_path)
+
+        docx_path = FIXTURES_DIR / f"cv-{n}p.docx"
+        if not docx_path.exists():
+            import docx
+
+            doc = docx.Document()
+            for p in paragraphs:
+                doc.add_paragraph(p)
+            doc.save(str(docx_path))
+        out.append(docx_path)
+
+        txt_path = FIXTURES_DIR / f"cv-{n}p.txt"
+        if not txt_path.exists():
+            txt_path.write_text("\n".join(paragraphs), encoding="utf-8")
+        out.append(txt_path)
+    return out
@@ -1,8 +1,17 @@
-"""Load settings from config.yaml and environment."""
+"""Load settings from config.yaml and environment.
+
+Parsed YAML is cached and reloaded only when the file changes; callers get their own
+deep copy, so changing a returned dict never leaks into other callers. The skill matrix
+is read from a precompiled JSON artifact (built at image build time with
+tools/compile_skill_matrix.py) when it matches skill_matrix.yaml.
+"""
+import copy
+import hashlib
+import json
 import os
+import threading
 from pathlib import Path
-
-import yaml
+from typing import Any, Callable, Dict, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -13,16 +22,55 @@ except ImportError:
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_PATH = Path(__file__).resolve().parent / "config.yaml"
 SKILL_MATRIX_PATH = Path(__file__).resolve().parent / "skill_matrix.yaml"
+SKILL_MATRIX_COMPILED_PATH = Path(__file__).resolve().parent / "skill_matrix.compiled.json"
+
+_cache: Dict[Path, Tuple[int, Any]] = {}
+_cache_lock = threading.Lock()
 
 
 def _load_yaml(path: Path):
+    import yaml  # only needed when a file changed or no compiled artifact exists
+
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
+def _cached(path: Path, loader: Callable[[Path], Any]) -> Any:
+    """A copy of loader(path); the parsed value is reused until the file's mtime changes."""
+    mtime = path.stat().st_mtime_ns
+    hit = _cache.get(path)
+    if hit and hit[0] == mtime:
+        return copy.deepcopy(hit[1])
+    value = loader(path)
+    with _cache_lock:
+        _cache[path] = (mtime, value)
+    return copy.deepcopy(value)
+
+
+def skill_matrix_digest(path: Path = SKILL_MATRIX_PATH) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def compile_skill_matrix(out: Path = SKILL_MATRIX_COMPILED_PATH) -> Path:
+    """Write the parsed skill matrix as JSON, stamped with the YAML source digest."""
+    payload = {"source_sha256": skill_matrix_digest(), "skill_matrix": _load_yaml(SKILL_MATRIX_PATH)}
+    out.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    return out
+
+
+def _load_skill_matrix(path: Path) -> Dict[str, Any]:
+    try:
+        compiled = json.loads(SKILL_MATRIX_COMPILED_PATH.read_text(encoding="utf-8"))
+        if compiled.get("source_sha256") == skill_matrix_digest(path):
+            return compiled["skill_matrix"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return _load_yaml(path)
+
+
 def get_settings():
     """Return merged settings from YAML and env."""
-    cfg = _load_yaml(CONFIG_PATH)
+    cfg = _cached(CONFIG_PATH, _load_yaml) or {}
     api = cfg.get("api") or {}
     api_key = os.getenv("FUELIX_API_KEY", os.getenv("FUELIX_SECRET_TOKEN", ""))
     model = os.getenv("FUELIX_MODEL", api.get("model", "gemini-3-pro"))
@@ -37,9 +85,22 @@ def get_settings():
         "api_key": api_key,
         "evaluation": cfg.get("evaluation") or {},
         "app": cfg.get("app") or {},
+        "jobs": cfg.get("jobs") or {},
+        "admission": cfg.get("admission") or {},
+        "rescoring": cfg.get("rescoring") or {},
+        "reports": cfg.get("reports") or {},
+        "dedup": cfg.get("dedup") or {},
+        "matching": cfg.get("matching") or {},
+        "state": {
+            **(cfg.get("state") or {}),
+            **{k: v for k, v in {
+                "backend": os.getenv("CV_REVIEW_STATE_BACKEND"),
+                "redis_url": os.getenv("CV_REVIEW_REDIS_URL"),
+            }.items() if v},
+        },
     }
 
 
 def get_skill_matrix():
-    """Return full skill matrix (areas -> specializations -> skills)."""
-    return _load_yaml(SKILL_MATRIX_PATH)
+    """Return full skill matrix (areas -> specializations -> skills), the caller's own copy."""
+    return _cached(SKILL_MATRIX_PATH, _load_skill_matrix)
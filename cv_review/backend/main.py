@@ -1,10 +1,19 @@
 """CV Review v2 — FastAPI Backend"""
 import asyncio
+import hashlib
+import importlib.util
+import io
+import itertools
+import logging
+import math
+import os
 import sys
+import threading
 import time
 import uuid
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple
 
 import tempfile
 
@@ -18,19 +27,90 @@ try:
 except ImportError:
     pass
 
-from fastapi import BackgroundTasks, FastAPI, File, HTTPException, Query, UploadFile
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, Response
-from pydantic import BaseModel
-
-from config.settings import get_settings
-from src.cv_parser import extract_text_from_file
-from src.evaluator import evaluate_cv
-from src.reports import build_excel_report, build_pdf_report, get_records_for_report
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+import orjson
+from pydantic import BaseModel, Field
+
+from config.settings import get_settings, skill_matrix_digest
+from src.admission import Admission, Rejected, Ticket
+from src.bulk_ingest import (
+    SUPPORTED_SUFFIXES,
+    ZIP_CONTENT_TYPES,
+    Member,
+    MultipartStreamReader,
+    ZipStreamReader,
+    multipart_boundary,
+    sniff_type,
+    wait_below,
+)
+from src.dedup import Fingerprint, FingerprintIndex, LocalIndex
+from src.embeddings import VectorIndex, embed
+from src.cv_parser import extract_text_from_bytes, extract_text_from_file, preload_parsers
+from src.evaluator import EvaluationCancelled, current_version, evaluate_cv, get_compiled_roles
+from src.fuelix_client import warm_up as fuelix_warm_up
+from src.jobs import JobStore
+from src.matching import map_requisition
+from src.report_jobs import (
+    REPORT_MEDIA_TYPES,
+    FragmentCache,
+    candidate_pdf,
+    get_render_pool,
+    prune_report_files,
+    shutdown_render_pool,
+    write_pdf_report,
+    write_report_file,
+)
+from src.rescoring import Backfill
+from src.reports import (
+    build_excel_report,
+    get_records_for_report,
+    iter_csv_report,
+    iter_excel_report,
+    iter_parquet_report,
+    iter_records_for_report,
+)
+from src.score_matrix import parse_threshold
+from src.search import SearchIndex
+from src.shared_state import SQLiteBackend, create_backend
+from src.skill_versions import VersionStore, diff
 from src.storage import Storage
-from src.url_fetcher import fetch_text_from_url, url_to_display_name
+from src.structured import answer_rates
+from src.timeline import Timeline
+from src.telemetry import (
+    ADMISSION_REJECTED,
+    CONTENT_TYPE,
+    EVALUATIONS_COALESCED,
+    JOB_REGISTRY_EVICTED,
+    JOB_REGISTRY_SIZE,
+    JOBS_ACTIVE,
+    JOBS_QUEUED,
+    monitor_event_loop_lag,
+    process_memory,
+    render_metrics,
+)
+
+logger = logging.getLogger("cv_review")
+
 
-app = FastAPI(title="CV Review API", version="2.0.0", description="Google Team CV Evaluation API")
+class OrjsonResponse(JSONResponse):
+    """JSON body encoded by orjson (numpy scalars and arrays included).
+
+    The default response class; endpoints that return whole records return one directly,
+    which also skips FastAPI's jsonable_encoder pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(
+    title="CV Review API",
+    version="2.0.0",
+    description="Google Team CV Evaluation API",
+    default_response_class=OrjsonResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -40,33 +120,392 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-storage = Storage(data_dir=PROJECT_ROOT / "data")
+# CV_REVIEW_DATA_DIR lets load tests and local tooling use a throwaway data directory
+DATA_DIR = Path(os.getenv("CV_REVIEW_DATA_DIR") or PROJECT_ROOT / "data")
+
+# Shared by every worker process (and, with Redis, every instance)
+state = create_backend(get_settings().get("state") or {}, DATA_DIR)
+storage = Storage(
+    data_dir=DATA_DIR,
+    lock=None if isinstance(state, SQLiteBackend) else (lambda: state.lock("analyses-write")),
+    search=SearchIndex(DATA_DIR / "search.db"),
+    fingerprints=FingerprintIndex(DATA_DIR / "fingerprints.db"),
+    vectors=VectorIndex(DATA_DIR / "vectors.db"),
+)
+JOB_SETTINGS = get_settings().get("jobs") or {}
+JOB_SWEEP_SECONDS = float(JOB_SETTINGS.get("sweep_seconds", 60))
+jobs = JobStore(
+    state,
+    ttl=float(JOB_SETTINGS.get("ttl_hours", 24)) * 3600,
+    max_jobs=int(JOB_SETTINGS.get("max_jobs", 10000)),
+)
+# Last sweep of the job registry (reported by /api/health)
+_registry: Dict[str, Any] = {"swept_at": None}
+report_jobs = JobStore(state, prefix="report:")
+
+ADMISSION_SETTINGS = get_settings().get("admission") or {}
+admission = Admission(
+    max_in_flight=int(ADMISSION_SETTINGS.get("max_in_flight", 8)),
+    max_queued=int(ADMISSION_SETTINGS.get("max_queued", 100)),
+    rate_per_minute=float(ADMISSION_SETTINGS.get("client_rate_per_minute", 30)),
+    burst=float(ADMISSION_SETTINGS.get("client_burst", 20)),
+)
+CLIENT_HEADER = ADMISSION_SETTINGS.get("client_header", "X-API-Key")
+
+RESCORE_SETTINGS = get_settings().get("rescoring") or {}
+RESCORE_POLL_SECONDS = float(RESCORE_SETTINGS.get("poll_seconds", 30))
+skill_versions = VersionStore(DATA_DIR / "skill_matrix")
+backfill = Backfill(
+    storage,
+    skill_versions,
+    lock=lambda: state.lock("rescore", timeout=1.0, ttl=600.0),
+    calls_per_minute=float(RESCORE_SETTINGS.get("calls_per_minute", 20)),
+)
+
+REPORT_SETTINGS = get_settings().get("reports") or {}
+REPORT_JOB_TTL_SECONDS = float(REPORT_SETTINGS.get("job_ttl_hours", 24)) * 3600
+REPORTS_DIR = DATA_DIR / "reports"
+REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+fragment_cache = FragmentCache(DATA_DIR / "report_cache")
+
+
+def render_pool():
+    return get_render_pool(int(REPORT_SETTINGS.get("render_workers", 2)))
 
-# In-memory job registry (temporary, until completion)
-jobs: Dict[str, Dict[str, Any]] = {}
+
+DEDUP_SETTINGS = get_settings().get("dedup") or {}
+DUPLICATE_THRESHOLD = float(DEDUP_SETTINGS.get("threshold", 0.7))
+OnDuplicate = Literal["link", "changed", "rerun"]
+ON_DUPLICATE_HELP = (
+    "Same candidate already analyzed: link (reuse that analysis), changed (re-run only the "
+    "stages whose input changed) or rerun; default dedup.on_duplicate"
+)
+
+MATCH_SETTINGS = get_settings().get("matching") or {}
 
 # When running in Cloud Run (or Docker), frontend static files are in PROJECT_ROOT / "static"
 STATIC_DIR = PROJECT_ROOT / "static"
 
 
+# Jobs accepted by this worker and not finished yet; re-queued for another worker on shutdown
+_pending: Dict[str, Dict[str, Any]] = {}
+_analysis_tasks: Set[asyncio.Task] = set()
+_report_tasks: Set[asyncio.Task] = set()
+# Set by the shutdown drain: running evaluations stop before their next LLM call, and the
+# jobs it re-queued get no further status writes from here (they belong to whichever
+# worker claims them). A job already saving its analysis is not re-queued.
+_draining = threading.Event()
+_requeued: Set[str] = set()
+_job_updates = threading.Lock()
+REQUEUE_POLL_SECONDS = 5.0
+BATCH_PUBLISH_SECONDS = 1.0
+# Bulk uploads can enqueue hundreds of CVs; only this many run at once per worker
+_bulk_slots = asyncio.Semaphore(int((get_settings().get("app") or {}).get("bulk_concurrency", 4)))
+
+
+# blocking: warm up before accepting requests (run.py --prod) | background: after the port is
+# bound, so the first health check is not delayed (default) | off
+WARM_UP_MODE = os.getenv("CV_REVIEW_WARMUP", "background").lower()
+
+
+def warm_up() -> None:
+    """Load what the first evaluation would otherwise pay for: compiled roles, parsers, HTTP pool."""
+    get_compiled_roles()
+    preload_parsers()
+    settings = get_settings()
+    fuelix_warm_up((settings.get("api") or {}).get("base_url"))
+
+
+async def warm_up_after_bind(delay: float = 1.0) -> None:
+    # The port is bound right after startup returns; waiting keeps the warm-up thread from
+    # competing (GIL) with the first health checks.
+    await asyncio.sleep(delay)
+    await asyncio.to_thread(warm_up)
+
+
+@app.on_event("startup")
+async def start_worker() -> None:
+    if WARM_UP_MODE == "blocking":
+        # Startup finishes before the worker accepts requests, so it is warm when it goes ready
+        await asyncio.to_thread(warm_up)
+    elif WARM_UP_MODE == "background":
+        asyncio.create_task(warm_up_after_bind())
+    asyncio.create_task(monitor_event_loop_lag())
+    asyncio.create_task(run_requeued_jobs())
+    asyncio.create_task(reconcile_search_index())
+    asyncio.create_task(sweep_job_registry())
+    if RESCORE_SETTINGS.get("enabled", True):
+        asyncio.create_task(rescore_stale_analyses())
+
+
+@app.on_event("shutdown")
+async def requeue_unfinished_jobs() -> None:
+    """Graceful drain: whatever did not finish within the shutdown timeout goes back to the queue.
+    Evaluations still running are cancelled first, so their threads neither finish the work
+    the next worker redoes nor overwrite the re-queued job's status."""
+    with _job_updates:
+        _draining.set()
+        for job_id, payload in list(_pending.items()):
+            jobs.requeue(job_id, payload)
+            _requeued.add(job_id)
+    _pending.clear()
+    shutdown_render_pool()
+
+
+async def reconcile_search_index(delay: float = 2.0) -> None:
+    """Index analyses saved before the search, duplicate and vector indexes existed (or while
+    unavailable). Each index is reconciled on its own: one failing does not skip the others."""
+    await asyncio.sleep(delay)
+    for name, reconcile in (
+        ("search", storage.reconcile_search),
+        ("duplicate", storage.reconcile_fingerprints),
+        ("vector", storage.reconcile_vectors),
+    ):
+        try:
+            await asyncio.to_thread(reconcile)
+        except Exception:
+            logger.exception("Reconciling the %s index with analyses.json failed", name)
+
+
+async def rescore_stale_analyses() -> None:
+    """Re-score analyses scored against an older skill matrix, one at a time (see
+    src/rescoring.py), only while no evaluation waits for a slot on this worker."""
+    try:
+        # The matrix at startup: what analyses saved before versioning were scored against
+        await asyncio.to_thread(backfill.record_current)
+    except Exception:
+        pass
+    while True:
+        step = None
+        if not admission.queued:
+            try:
+                step = await asyncio.to_thread(backfill.step)
+            except Exception:
+                step = None  # another worker holds the lock, or the step failed
+        await asyncio.sleep(RESCORE_POLL_SECONDS if step is None or step["outcome"] == "failed" else 0)
+
+
+async def sweep_job_registry() -> None:
+    """Evict expired and excess finished jobs; every worker sweeps (a sweep is idempotent)."""
+    while True:
+        try:
+            stats = await asyncio.to_thread(jobs.sweep)
+        except Exception:
+            stats = None
+        if stats is not None:
+            JOB_REGISTRY_SIZE.set(stats["running"], state="running")
+            JOB_REGISTRY_SIZE.set(stats["finished"], state="finished")
+            JOB_REGISTRY_EVICTED.inc(stats["evicted"], reason="ttl_or_size")
+            _registry.update(stats, swept_at=datetime.utcnow().isoformat())
+        await asyncio.sleep(JOB_SWEEP_SECONDS)
+
+
+async def run_requeued_jobs() -> None:
+    """Pick up jobs re-queued by workers that shut down (this or another instance)."""
+    while True:
+        try:
+            claimed = await asyncio.to_thread(jobs.claim_requeued)
+        except Exception:
+            claimed = []
+        for job_id, payload in claimed:
+            start_analysis_task(
+                job_id, payload["cv_text"], payload["filename"], use_fast_model=bool(payload.get("use_fast_model")),
+                duplicate=payload.get("duplicate"),
+            )
+        await asyncio.sleep(REQUEUE_POLL_SECONDS)
+
+
+def start_analysis_task(
+    job_id: str,
+    cv_text: str,
+    filename: str,
+    *,
+    use_fast_model: bool,
+    timeline: Optional[Timeline] = None,
+    slots: Optional[asyncio.Semaphore] = None,
+    fingerprint: Optional[Fingerprint] = None,
+    duplicate: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Run an analysis outside a request's background tasks (re-queued and bulk jobs)."""
+    timeline = timeline or Timeline()
+    _pending[job_id] = {"cv_text": cv_text, "filename": filename, "use_fast_model": use_fast_model,
+                        "duplicate": duplicate}
+    JOBS_QUEUED.inc()
+    queued_at = timeline.now()
+
+    async def run() -> None:
+        if slots is None:
+            await run_analysis(job_id, cv_text, filename, use_fast_model=use_fast_model, timeline=timeline,
+                               queued_at=queued_at, fingerprint=fingerprint, duplicate=duplicate)
+            return
+        async with slots:
+            await run_analysis(job_id, cv_text, filename, use_fast_model=use_fast_model, timeline=timeline,
+                               queued_at=queued_at, fingerprint=fingerprint, duplicate=duplicate)
+
+    task = asyncio.create_task(run())
+    _analysis_tasks.add(task)
+    task.add_done_callback(_analysis_tasks.discard)
+
+
+def client_key(request: Request) -> str:
+    """Who a request counts against: its API key header, else its IP (first proxy hop)."""
+    key = request.headers.get(CLIENT_HEADER)
+    if key:
+        return "key:" + key
+    forwarded = request.headers.get("x-forwarded-for", "").split(",")[0].strip()
+    return "ip:" + (forwarded or (request.client.host if request.client else "unknown"))
+
+
+def admit(request: Request, n: int = 1) -> Ticket:
+    """Admit `n` evaluations from this request's client, else answer 429/503 with Retry-After."""
+    try:
+        return admission.admit(client_key(request), n)
+    except Rejected as exc:
+        ADMISSION_REJECTED.inc(reason="client_rate" if exc.status == 429 else "queue_full")
+        raise HTTPException(status_code=exc.status, detail=exc.detail,
+                            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))})
+
+
+def enqueue_analysis(
+    background_tasks: BackgroundTasks,
+    job_id: str,
+    cv_text: str,
+    filename: str,
+    *,
+    use_fast_model: bool,
+    timeline: Timeline,
+    fingerprint: Optional[Fingerprint] = None,
+    duplicate: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Queue an admitted evaluation (see admit()) as a background task of the request."""
+    jobs.create(job_id)
+    _pending[job_id] = {"cv_text": cv_text, "filename": filename, "use_fast_model": use_fast_model,
+                        "duplicate": duplicate}
+    JOBS_QUEUED.inc()
+    background_tasks.add_task(
+        run_analysis, job_id, cv_text, filename, use_fast_model=use_fast_model, timeline=timeline,
+        queued_at=timeline.now(), fingerprint=fingerprint, duplicate=duplicate, admitted=True,
+    )
+
+
+def _find_duplicate(fingerprint: Fingerprint, local: Optional[LocalIndex]) -> Optional[Dict[str, Any]]:
+    """Stored analysis (or earlier upload in the same request) of the same candidate."""
+    for match in storage.fingerprints.find(fingerprint, DUPLICATE_THRESHOLD):
+        record = storage.get_analysis(match.analysis_id)
+        if record:
+            return {"analysis_id": match.analysis_id, "filename": record.get("filename"),
+                    "timestamp": record.get("timestamp"), "similarity": match.similarity, "exact": match.exact}
+    match = local.find(fingerprint, DUPLICATE_THRESHOLD) if local is not None else None
+    if match:
+        return {"job_id": match.analysis_id, "similarity": match.similarity, "exact": match.exact}
+    return None
+
+
+async def check_duplicate(
+    cv_text: str,
+    timeline: Timeline,
+    on_duplicate: Optional[str],
+    local: Optional[LocalIndex] = None,
+) -> Tuple[Fingerprint, Optional[Dict[str, Any]]]:
+    """Fingerprint an upload before queueing it; a duplicate found carries the action to take."""
+    with timeline.span("dedup") as span:
+        fingerprint = await asyncio.to_thread(Fingerprint.of, cv_text)
+        duplicate = await asyncio.to_thread(_find_duplicate, fingerprint, local)
+        span["duplicate"] = duplicate is not None
+    if duplicate:
+        action = on_duplicate or DEDUP_SETTINGS.get("on_duplicate", "link")
+        if action == "changed" and (
+            "analysis_id" not in duplicate or not await asyncio.to_thread(storage.search.get_text, duplicate["analysis_id"])
+        ):
+            action = "rerun"  # no stored CV text to compare with
+        duplicate["action"] = action
+    return fingerprint, duplicate
+
+
+def link_duplicate(job_id: str, filename: str, duplicate: Dict[str, Any], **fields: Any) -> None:
+    """Answer a duplicate upload without evaluating it: with the stored analysis, or by
+    following the job of the same CV uploaded earlier in the request."""
+    if "job_id" in duplicate:
+        jobs.create(job_id, filename=filename, same_as=duplicate["job_id"], duplicate=duplicate, **fields)
+        return
+    jobs.create(
+        job_id,
+        status="complete",
+        progress=100,
+        current_step="Same candidate as an earlier analysis",
+        filename=filename,
+        duplicate=duplicate,
+        analysis_id=duplicate["analysis_id"],
+        **fields,
+    )
+
+
+def evaluation_key(fingerprint: Fingerprint, use_fast_model: bool) -> str:
+    """What makes two evaluations identical: normalized CV text, model and skill matrix."""
+    api = get_settings().get("api") or {}
+    model = api.get("fast_model") if use_fast_model else api.get("model")
+    return hashlib.sha256(
+        "\x00".join([fingerprint.digest, model or "", skill_matrix_digest()]).encode("utf-8")
+    ).hexdigest()
+
+
+def coalesce(job_id: str, filename: str, fingerprint: Fingerprint, *, use_fast_model: bool, endpoint: str) -> bool:
+    """Attach a submission to an identical evaluation already running: its job mirrors that
+    job's progress and result (like a repeated upload). False when it must be evaluated;
+    `job_id` is then registered as running for later submissions."""
+    running = jobs.coalesce(evaluation_key(fingerprint, use_fast_model), job_id)
+    if running is None:
+        return False
+    jobs.create(job_id, filename=filename, same_as=running, coalesced=True)
+    EVALUATIONS_COALESCED.inc(endpoint=endpoint)
+    return True
+
+
 async def run_analysis(
     job_id: str,
     cv_text: str,
     filename: str,
     *,
     use_fast_model: bool = False,
+    timeline: Optional[Timeline] = None,
+    queued_at: Optional[float] = None,
+    fingerprint: Optional[Fingerprint] = None,
+    duplicate: Optional[Dict[str, Any]] = None,
+    admitted: bool = False,
 ) -> None:
-    jobs[job_id] = {
-        "status": "processing",
-        "progress": 5,
-        "current_step": "Starting analysis…",
-        "result": None,
-        "error": None,
-    }
+    """Evaluate once one of the worker's evaluation slots is free (`admitted`: counted in the
+    admission queue by the request already); the wait is the timeline's queue_wait."""
+    async with admission.slot(admitted):
+        await _run_analysis(job_id, cv_text, filename, use_fast_model=use_fast_model, timeline=timeline,
+                            queued_at=queued_at, fingerprint=fingerprint, duplicate=duplicate)
+
+
+async def _run_analysis(
+    job_id: str,
+    cv_text: str,
+    filename: str,
+    *,
+    use_fast_model: bool,
+    timeline: Optional[Timeline],
+    queued_at: Optional[float],
+    fingerprint: Optional[Fingerprint],
+    duplicate: Optional[Dict[str, Any]],
+) -> None:
+    JOBS_QUEUED.dec()
+    if _draining.is_set():
+        # Got its slot after the drain (or was claimed during it): back to the queue unstarted
+        payload = _pending.pop(job_id, None)
+        if payload is not None:
+            jobs.requeue(job_id, payload)
+        return
+    timeline = timeline or Timeline()
+    if queued_at is not None:
+        timeline.add("queue_wait", queued_at)
+    JOBS_ACTIVE.inc()
+    update_job(job_id, status="processing", progress=5, current_step="Starting analysis…")
 
     def update_progress(pct: int, step: str) -> None:
-        jobs[job_id]["progress"] = pct
-        jobs[job_id]["current_step"] = step
+        update_job(job_id, progress=pct, current_step=step)
 
     start_time = time.time()
     try:
@@ -78,218 +517,586 @@ async def run_analysis(
         if use_fast_model:
             model_override = (settings.get("api") or {}).get("fast_model", "gemini-2.0-flash")
 
+        previous = None
+        if duplicate and duplicate.get("action") == "changed":
+            record = await asyncio.to_thread(storage.get_analysis, duplicate["analysis_id"])
+            previous_text = await asyncio.to_thread(storage.search.get_text, duplicate["analysis_id"])
+            if record and previous_text:
+                previous = {"cv_text": previous_text, "result": record.get("result") or {}}
+
         result = await asyncio.to_thread(
             evaluate_cv,
             cv_text,
             progress_callback=update_progress,
             model=model_override,
+            timeline=timeline,
+            previous=previous,
+            cancelled=_draining,
         )
+        if _draining.is_set():
+            return
+        # Finished here from now on: a drain does not re-queue a job that is being saved
+        _pending.pop(job_id, None)
 
         elapsed = round(time.time() - start_time, 2)
-        analysis_id = storage.save_analysis(
-            filename=filename,
-            result=result,
-            analysis_time_seconds=elapsed,
-        )
 
-        jobs[job_id]["status"] = "complete"
-        jobs[job_id]["progress"] = 100
-        jobs[job_id]["current_step"] = "Analysis complete!"
-        jobs[job_id]["result"] = {
-            **result,
-            "analysis_id": analysis_id,
-            "analysis_time_seconds": elapsed,
-            "filename": filename,
-        }
+        def persist() -> None:
+            # One thread for the locked read-modify-write of analyses.json and the status, so
+            # the job completes even if shutdown cancels this task meanwhile
+            analysis_id = storage.save_analysis(
+                filename=filename,
+                result=result,
+                analysis_time_seconds=elapsed,
+                timeline=timeline,
+                cv_text=cv_text,
+                fingerprint=fingerprint,
+                duplicate_of=(duplicate or {}).get("analysis_id"),
+            )
+            update_job(
+                job_id,
+                status="complete",
+                progress=100,
+                current_step="Analysis complete!",
+                analysis_id=analysis_id,
+            )
 
+        await asyncio.to_thread(persist)
+
+    except EvaluationCancelled:
+        return
     except Exception as exc:
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["progress"] = 0
-        jobs[job_id]["current_step"] = "Error"
-        jobs[job_id]["error"] = str(exc)
+        update_job(job_id, status="failed", progress=0, current_step="Error", error=str(exc))
+    finally:
+        JOBS_ACTIVE.dec()
+    # Not reached when cancelled by shutdown, so the job stays pending and is re-queued
+    _pending.pop(job_id, None)
+
+
+def update_job(job_id: str, **fields: Any) -> None:
+    """jobs.update for a running analysis; dropped once the shutdown drain re-queued it."""
+    with _job_updates:
+        if job_id not in _requeued:
+            jobs.update(job_id, **fields)
 
 
 @app.post("/api/evaluate")
 async def evaluate(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    on_duplicate: Optional[OnDuplicate] = Query(None, description=ON_DUPLICATE_HELP),
 ):
+    """Queue one CV; `estimated_start_seconds`: when its evaluation should start (null until
+    this worker has finished a few)."""
     name = file.filename or "cv.pdf"
     suffix = Path(name).suffix.lower() or ".pdf"
     if suffix not in (".pdf", ".txt", ".docx", ".doc"):
         raise HTTPException(status_code=400, detail="Unsupported file type. Use PDF, TXT, or DOCX.")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        content = await file.read()
-        if len(content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large (max 10 MB).")
-        tmp.write(content)
-        tmp_path = Path(tmp.name)
+    with admit(request) as ticket:
+        timeline = Timeline()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            content = await file.read()
+            if len(content) > 10 * 1024 * 1024:
+                raise HTTPException(status_code=400, detail="File too large (max 10 MB).")
+            tmp.write(content)
+            tmp_path = Path(tmp.name)
 
-    try:
-        cv_text = extract_text_from_file(tmp_path)
-    finally:
-        tmp_path.unlink(missing_ok=True)
+        try:
+            with timeline.span("extraction", file_type=suffix.lstrip(".")):
+                cv_text = extract_text_from_file(tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
-    if not (cv_text or "").strip():
-        raise HTTPException(status_code=400, detail="Could not extract text from file.")
+        if not (cv_text or "").strip():
+            raise HTTPException(status_code=400, detail="Could not extract text from file.")
 
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "status": "processing",
-        "progress": 0,
-        "current_step": "Queued…",
-        "result": None,
-        "error": None,
-    }
-    background_tasks.add_task(run_analysis, job_id, cv_text, name, use_fast_model=False)
-    return {"job_id": job_id}
+        fingerprint, duplicate = await check_duplicate(cv_text, timeline, on_duplicate)
+        job_id = str(uuid.uuid4())
+        estimated_start = None
+        if duplicate and duplicate["action"] == "link":
+            link_duplicate(job_id, name, duplicate)
+        elif not coalesce(job_id, name, fingerprint, use_fast_model=False, endpoint="evaluate"):
+            estimated_start = ticket.use()
+            enqueue_analysis(background_tasks, job_id, cv_text, name, use_fast_model=False, timeline=timeline,
+                             fingerprint=fingerprint, duplicate=duplicate)
+        return {"job_id": job_id, "duplicate": duplicate, "estimated_start_seconds": estimated_start}
 
 
 @app.post("/api/evaluate-batch")
 async def evaluate_batch(
+    request: Request,
     background_tasks: BackgroundTasks,
     files: list[UploadFile] = File(...),
+    on_duplicate: Optional[OnDuplicate] = Query(None, description=ON_DUPLICATE_HELP),
 ):
-    """Accept multiple CV files and analyze them in parallel using the fast model."""
+    """Accept multiple CV files and analyze them in parallel using the fast model.
+    A file that repeats an earlier one in the same upload, or a CV being evaluated already,
+    follows that job."""
     if not files or len(files) > 20:
         raise HTTPException(
             status_code=400,
             detail="Send between 1 and 20 files.",
         )
 
-    job_ids: list[str] = []
-    for file in files:
-        name = file.filename or "cv.pdf"
-        suffix = Path(name).suffix.lower() or ".pdf"
-        if suffix not in (".pdf", ".txt", ".docx", ".doc"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type for {name}. Use PDF, TXT, or DOCX.",
-            )
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            if len(content) > 10 * 1024 * 1024:
+    with admit(request, len(files)) as ticket:
+        # Every file is read and extracted before any job is registered: a bad file later in
+        # the upload must not leave earlier ones queued (or coalesce targets) without a task.
+        uploads: List[Tuple[str, str, Timeline]] = []
+        for file in files:
+            name = file.filename or "cv.pdf"
+            suffix = Path(name).suffix.lower() or ".pdf"
+            if suffix not in (".pdf", ".txt", ".docx", ".doc"):
                 raise HTTPException(
                     status_code=400,
-                    detail=f"File {name} too large (max 10 MB).",
+                    detail=f"Unsupported file type for {name}. Use PDF, TXT, or DOCX.",
                 )
-            tmp.write(content)
-            tmp_path = Path(tmp.name)
 
+            timeline = Timeline()
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                content = await file.read()
+                if len(content) > 10 * 1024 * 1024:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File {name} too large (max 10 MB).",
+                    )
+                tmp.write(content)
+                tmp_path = Path(tmp.name)
+
+            try:
+                with timeline.span("extraction", file_type=suffix.lstrip(".")):
+                    cv_text = extract_text_from_file(tmp_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+            if not (cv_text or "").strip():
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Could not extract text from {name}.",
+                )
+            uploads.append((name, cv_text, timeline))
+
+        job_ids: list[str] = []
+        estimated_starts: List[Optional[float]] = []
+        duplicates: List[Dict[str, Any]] = []
+        local = LocalIndex()
+        for name, cv_text, timeline in uploads:
+            fingerprint, duplicate = await check_duplicate(cv_text, timeline, on_duplicate, local)
+            job_id = str(uuid.uuid4())
+            job_ids.append(job_id)
+            if duplicate:
+                duplicates.append({"filename": name, "job_id": job_id, "duplicate": duplicate})
+            if duplicate and duplicate["action"] == "link":
+                link_duplicate(job_id, name, duplicate)
+                estimated_starts.append(None)
+            elif coalesce(job_id, name, fingerprint, use_fast_model=True, endpoint="evaluate-batch"):
+                estimated_starts.append(None)
+            else:
+                estimated_starts.append(ticket.use())
+                enqueue_analysis(background_tasks, job_id, cv_text, name, use_fast_model=True, timeline=timeline,
+                                 fingerprint=fingerprint, duplicate=duplicate)
+                local.add(job_id, fingerprint)
+
+        return {"job_ids": job_ids, "duplicates": duplicates, "estimated_start_seconds": estimated_starts}
+
+
+@app.post("/api/evaluate-bulk")
+async def evaluate_bulk(
+    request: Request,
+    fast: bool = Query(True, description="Use the fast model"),
+    on_duplicate: Optional[OnDuplicate] = Query(None, description=ON_DUPLICATE_HELP),
+):
+    """Bulk CV drop: a ZIP body (Content-Type: application/zip) or a multipart upload of any
+    number of files and ZIPs. Members are read as the body streams in, sniffed by content,
+    extracted and enqueued as soon as each one is complete; poll /api/batches/{batch_id}."""
+    content_type = request.headers.get("content-type", "")
+    app_cfg = get_settings().get("app") or {}
+    max_bytes = int(float(app_cfg.get("max_file_size_mb", 10)) * 1024 * 1024)
+    max_files = int(app_cfg.get("bulk_max_files", 1000))
+    boundary = multipart_boundary(content_type)
+    if boundary:
+        reader = MultipartStreamReader(boundary, max_bytes)
+    elif content_type.split(";")[0].strip().lower() in ZIP_CONTENT_TYPES:
+        reader = ZipStreamReader(max_bytes, archive_name=request.headers.get("x-filename") or "upload.zip")
+    else:
+        raise HTTPException(status_code=415, detail="Send a ZIP (application/zip) or multipart/form-data upload.")
+
+    batch_id = str(uuid.uuid4())
+    jobs.create_batch(batch_id)
+    items: List[Dict[str, str]] = []
+    rejected: List[Dict[str, str]] = []
+    extract_slots = asyncio.Semaphore(4)
+    local = LocalIndex()
+    # Members are extracted concurrently; check and register them one at a time so a CV
+    # repeated in the upload is seen by the check for its copy
+    dedup_lock = asyncio.Lock()
+    in_flight: Set[asyncio.Task] = set()
+    finished: List[asyncio.Task] = []
+    files_seen = 0
+
+    async def ingest(member: Member) -> None:
+        name = PurePosixPath(member.name).name or member.name
+        if member.error:
+            rejected.append({"filename": member.name, "reason": member.error})
+            return
+        suffix = sniff_type(member.data, name)
+        if suffix not in SUPPORTED_SUFFIXES:
+            reason = "Nested archives are not supported." if suffix == ".zip" else \
+                "Unsupported file type (PDF, DOCX or plain text only)."
+            rejected.append({"filename": member.name, "reason": reason})
+            return
+        timeline = Timeline()
         try:
-            cv_text = extract_text_from_file(tmp_path)
-        finally:
-            tmp_path.unlink(missing_ok=True)
-
+            async with extract_slots:
+                with timeline.span("extraction", file_type=suffix.lstrip(".")):
+                    cv_text = await asyncio.to_thread(extract_text_from_bytes, member.data, suffix)
+        except Exception as exc:
+            rejected.append({"filename": member.name, "reason": f"Could not extract text: {exc}"})
+            return
         if not (cv_text or "").strip():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Could not extract text from {name}.",
-            )
-
+            rejected.append({"filename": member.name, "reason": "Could not extract text from file."})
+            return
         job_id = str(uuid.uuid4())
-        job_ids.append(job_id)
-        jobs[job_id] = {
-            "status": "processing",
-            "progress": 0,
-            "current_step": "Queued…",
-            "result": None,
-            "error": None,
-        }
-        background_tasks.add_task(
-            run_analysis,
-            job_id,
-            cv_text,
-            name,
-            use_fast_model=True,
-        )
+        async with dedup_lock:
+            fingerprint, duplicate = await check_duplicate(cv_text, timeline, on_duplicate, local)
+            if not (duplicate and duplicate["action"] == "link"):
+                local.add(job_id, fingerprint)
+        if duplicate and duplicate["action"] == "link":
+            link_duplicate(job_id, name, duplicate, batch_id=batch_id)
+        else:
+            jobs.create(job_id, filename=name, batch_id=batch_id)
+            start_analysis_task(job_id, cv_text, name, use_fast_model=fast, timeline=timeline, slots=_bulk_slots,
+                                fingerprint=fingerprint, duplicate=duplicate)
+        items.append({"job_id": job_id, "filename": name, **({"duplicate": duplicate} if duplicate else {})})
+
+    def accept(members: List[Member]) -> None:
+        nonlocal files_seen
+        for member in members:
+            if member.data is not None:
+                if files_seen >= max_files:
+                    rejected.append({"filename": member.name, "reason": f"Batch limit of {max_files} files reached."})
+                    continue
+                files_seen += 1
+            in_flight.add(asyncio.create_task(ingest(member)))
+
+    # The batch's item list is rewritten whole, so it is published at most once a second
+    # while the upload streams (pollers see progress) and once at the end
+    published, published_at = 0, time.monotonic()
+    async for chunk in request.stream():
+        accept(reader.feed(chunk))
+        # Backpressure: stop reading while too many members wait for extraction
+        finished += await wait_below(in_flight, 8)
+        if len(items) > published and time.monotonic() - published_at >= BATCH_PUBLISH_SECONDS:
+            published, published_at = len(items), time.monotonic()
+            jobs.update_batch(batch_id, items=items)
+    accept(reader.close())
+    await asyncio.gather(*finished, *in_flight)
+
+    jobs.update_batch(batch_id, status="processing", items=items, rejected=rejected)
+    return {
+        "batch_id": batch_id,
+        "accepted": len(items),
+        "rejected": rejected,
+        "job_ids": [i["job_id"] for i in items],
+    }
+
 
-    return {"job_ids": job_ids}
+@app.get("/api/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    batch = await asyncio.to_thread(jobs.get_batch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found.")
+    return batch
 
 
 @app.get("/api/jobs/{job_id}")
 async def get_job(job_id: str):
-    job = jobs.get(job_id)
+    job = await asyncio.to_thread(jobs.get, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
-    return {"job_id": job_id, **job}
+    if job.get("analysis_id") and not job.get("result"):
+        job["result"] = await asyncio.to_thread(job_result, job)
+        if job["result"] is None:
+            job["error"] = "The analysis of this job was deleted."
+    return OrjsonResponse({"job_id": job_id, **job})
+
+
+def job_result(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The result of a finished job, read from the stored analysis it references (jobs keep
+    only the id, so each result is held once)."""
+    record = storage.get_analysis(job["analysis_id"])
+    if record is None:
+        return None
+    result = {
+        **(record.get("result") or {}),
+        "analysis_id": record["id"],
+        "analysis_time_seconds": record.get("analysis_time_seconds", 0),
+        "filename": record.get("filename", job.get("filename", "")),
+    }
+    if record.get("timeline"):
+        result["timeline"] = record["timeline"]
+    if job.get("duplicate"):
+        result["duplicate"] = job["duplicate"]
+    return result
 
 
 @app.get("/api/analyses")
-async def list_analyses(limit: int = 50, offset: int = 0):
-    return storage.list_analyses(limit=limit, offset=offset)
+async def list_analyses(
+    limit: int = Query(50, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page (<timestamp>,<id>)"),
+    area: Optional[str] = Query(None, description="Filter by best-fit area"),
+    model: Optional[str] = Query(None, description="Filter by model"),
+    date_from: Optional[str] = Query(None, description="From date (YYYY-MM-DD, inclusive)"),
+    date_to: Optional[str] = Query(None, description="To date (YYYY-MM-DD, inclusive)"),
+):
+    """Newest-first slim listing with keyset pagination: pass next_cursor back as `after`."""
+    try:
+        return OrjsonResponse(await asyncio.to_thread(
+            storage.list_analyses,
+            limit=limit, offset=offset, after=after, area=area, model=model, date_from=date_from, date_to=date_to,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/api/analyses/slow")
+async def list_slow_analyses(
+    stage: str = Query("total", description="Stage key: total, extraction, url_fetch, queue_wait, spec_scoring, "
+                       "preparation, area_descriptions, profile, summary, persistence, llm_max, llm:<prompt>, spec:<specialization>"),
+    min_seconds: float = Query(0.0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """Slow-analysis explorer: analyses filtered and sorted by one stage duration."""
+    return OrjsonResponse(await asyncio.to_thread(
+        storage.list_slow_analyses, stage=stage, min_seconds=min_seconds, limit=limit, descending=order == "desc"
+    ))
+
+
+@app.get("/api/search")
+async def search_candidates(
+    q: str = Query(..., min_length=1, description='Words, "quoted phrases" or prefix* (all must match, else any)'),
+    area: Optional[str] = Query(None, description="Filter by best-fit area"),
+    date_from: Optional[str] = Query(None, description="From date (YYYY-MM-DD, inclusive)"),
+    date_to: Optional[str] = Query(None, description="To date (YYYY-MM-DD, inclusive)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    mode: str = Query("auto", pattern="^(auto|all|any)$"),
+):
+    """Full-text search over CV text, summary, education, previous jobs and specializations.
+
+    Ranked by bm25 among the newest matches (`ranked` of `total`); snippets mark hits with
+    <mark>…</mark> (the rest is raw text: escape it before rendering as HTML).
+    facets.most_fitted_area counts every match, before `area` (estimated for very broad
+    queries: facets_exact=false).
+    """
+    try:
+        return OrjsonResponse(await asyncio.to_thread(
+            storage.search.search, q, area=area, date_from=date_from, date_to=date_to,
+            limit=limit, offset=offset, mode=mode,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/api/rank")
+async def rank_candidates(
+    weight: List[str] = Query(..., description="Score weight, repeatable: KEY:W where KEY is AREA, "
+                              "AREA/SPECIALIZATION or a specialization name (e.g. AI and ML:0.6)"),
+    min_score: Optional[List[str]] = Query(
+        None, description="Minimum score, repeatable: KEY:N or KEY:Basic|Medium|High (e.g. Security:Medium)"),
+    area: Optional[str] = Query(None, description="Filter by best-fit area"),
+    limit: int = Query(20, ge=1, le=500),
+):
+    """Top candidates by a weighted sum of scores, optionally filtered by minimum scores and area.
+
+    Answered from the in-memory score matrix; a missing score counts as 0 in the sum and
+    fails a minimum.
+    """
+    weights = _score_pairs(weight, float, "weight", "KEY:W")
+    min_scores = _score_pairs(min_score, parse_threshold, "min_score", "KEY:N or KEY:Medium")
+    t0 = time.perf_counter()
+    try:
+        out = await asyncio.to_thread(storage.rank_candidates, weights, min_scores, area=area, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    out["took_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return OrjsonResponse(out)
+
+
+def _score_pairs(items: Optional[List[str]], parse: Callable[[str], float], name: str, shape: str) -> Dict[str, float]:
+    """"KEY:VALUE" query items -> {key: parse(value)}; 422 when an item does not parse."""
+    pairs: Dict[str, float] = {}
+    for item in items or []:
+        key, _, value = item.rpartition(":")
+        try:
+            pairs[key.strip()] = parse(value)
+        except ValueError:
+            key = ""
+        if not key.strip():
+            raise HTTPException(status_code=422, detail=f"{name} must look like {shape}, got {item!r}")
+    return pairs
+
+
+class MatchRequest(BaseModel):
+    requisition: str = Field(..., min_length=20, max_length=20000)
+    mapper: Optional[Literal["llm", "local"]] = None
+    text_weight: Optional[float] = Field(None, ge=0, le=1)
+    min_score: Optional[Dict[str, str]] = None
+    area: Optional[str] = None
+    limit: int = Field(20, ge=1, le=200)
+
+
+@app.post("/api/match")
+async def match_candidates(request: MatchRequest):
+    """Stored candidates ranked against a free-text job requisition.
+
+    The requisition is mapped once onto specialization weights (one LLM call, or the local
+    embeddings with mapper=local; cached per text) and candidates are ranked by their
+    stored scores for those specializations blended with the similarity of their CV text
+    (`text_weight`, default matching.text_weight). No candidate is re-evaluated.
+    """
+    mapper = request.mapper or MATCH_SETTINGS.get("mapper", "llm")
+    text_weight = request.text_weight if request.text_weight is not None else float(MATCH_SETTINGS.get("text_weight", 0.3))
+    min_scores = _score_pairs([f"{k}:{v}" for k, v in (request.min_score or {}).items()], parse_threshold,
+                              "min_score", '{"KEY": N or "Medium"}')
+    mapping = await asyncio.to_thread(map_requisition, request.requisition, mapper)
+    t0 = time.perf_counter()
+    try:
+        out = await asyncio.to_thread(
+            lambda: storage.match_candidates(
+                mapping["weights"], embed(request.requisition), text_weight=text_weight,
+                min_scores=min_scores, area=request.area, limit=request.limit,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    out["mapping"] = mapping
+    out["took_ms"] = {"mapping": mapping["mapping_ms"] if not mapping["cached"] else 0.0,
+                      "ranking": round((time.perf_counter() - t0) * 1000, 2)}
+    return OrjsonResponse(out)
 
 
 @app.get("/api/analyses/{analysis_id}")
 async def get_analysis(analysis_id: str):
-    analysis = storage.get_analysis(analysis_id)
+    analysis = await asyncio.to_thread(storage.get_analysis, analysis_id)
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found.")
-    return analysis
+    return OrjsonResponse(analysis)
 
 
 @app.delete("/api/analyses/{analysis_id}")
 async def delete_analysis(analysis_id: str):
-    ok = storage.delete_analysis(analysis_id)
+    ok = await asyncio.to_thread(storage.delete_analysis, analysis_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Analysis not found.")
+    await asyncio.to_thread(fragment_cache.discard, analysis_id)
     return {"deleted": analysis_id}
 
 
 @app.get("/api/metrics")
 async def get_metrics():
-    return storage.get_metrics()
+    # llm_answers: this worker's JSON answers per prompt type that missed their schema
+    return {**await asyncio.to_thread(storage.get_metrics), "llm_answers": answer_rates()}
 
 
 @app.get("/api/best-candidates")
 async def get_best_candidates():
-    return storage.get_best_candidates()
+    return await asyncio.to_thread(storage.get_best_candidates)
 
 
 class URLEvaluateRequest(BaseModel):
     url: str
+    on_duplicate: Optional[OnDuplicate] = None
 
 
 @app.post("/api/evaluate-url")
 async def evaluate_url(
     request: URLEvaluateRequest,
+    http_request: Request,
     background_tasks: BackgroundTasks,
 ):
+    from src.url_fetcher import fetch_text_from_url, url_to_display_name  # HTML/requests stack on first use
+
     url = request.url.strip()
     if not url:
         raise HTTPException(status_code=400, detail="URL is required.")
 
-    # Fetch and extract text from URL (synchronous — fast)
-    try:
-        cv_text, source_label = fetch_text_from_url(url, timeout=30)
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch URL: {e}")
+    with admit(http_request) as ticket:
+        # Fetch and extract text from URL (synchronous — fast)
+        timeline = Timeline()
+        try:
+            with timeline.span("url_fetch") as span:
+                cv_text, source_label = fetch_text_from_url(url, timeout=30)
+                span["source"] = source_label
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to fetch URL: {e}")
 
-    if not cv_text.strip():
-        raise HTTPException(status_code=422, detail="No usable text could be extracted from the URL.")
+        if not cv_text.strip():
+            raise HTTPException(status_code=422, detail="No usable text could be extracted from the URL.")
 
-    display_name = url_to_display_name(url)
-    filename = f"[{source_label}] {display_name}"
+        display_name = url_to_display_name(url)
+        filename = f"[{source_label}] {display_name}"
 
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "status": "processing",
-        "progress": 0,
-        "current_step": "Queued…",
-        "result": None,
-        "error": None,
-    }
-    background_tasks.add_task(run_analysis, job_id, cv_text, filename, use_fast_model=False)
-    return {"job_id": job_id, "source_label": source_label, "chars_extracted": len(cv_text)}
+        fingerprint, duplicate = await check_duplicate(cv_text, timeline, request.on_duplicate)
+        job_id = str(uuid.uuid4())
+        estimated_start = None
+        if duplicate and duplicate["action"] == "link":
+            link_duplicate(job_id, filename, duplicate)
+        elif not coalesce(job_id, filename, fingerprint, use_fast_model=False, endpoint="evaluate-url"):
+            estimated_start = ticket.use()
+            enqueue_analysis(background_tasks, job_id, cv_text, filename, use_fast_model=False, timeline=timeline,
+                             fingerprint=fingerprint, duplicate=duplicate)
+        return {"job_id": job_id, "source_label": source_label, "chars_extracted": len(cv_text), "duplicate": duplicate,
+                "estimated_start_seconds": estimated_start}
+
+
+@app.get("/api/skill-matrix/versions")
+async def skill_matrix_versions():
+    """Skill matrix versions seen (newest last), what changed between each and the current one,
+    how many stored analyses are still scored against each, and the re-scoring backfill."""
+
+    def build() -> Dict[str, Any]:
+        current = skill_versions.record(current_version())
+        counts = storage.skill_matrix_versions()
+        return {
+            "current": current.id,
+            "versions": [
+                {
+                    "version": v.id,
+                    "recorded_at": v.recorded_at,
+                    "analyses": counts.get(v.id, 0),
+                    "changes": None if v.id == current.id else diff(v, current).to_json(),
+                }
+                for v in skill_versions.versions()
+            ],
+            "unstamped": counts.get(None, 0),
+            "backfill": backfill.status(),
+        }
+
+    return await asyncio.to_thread(build)
 
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok", "version": "2.0.0"}
+    """Liveness plus the job registry as of its last sweep, this worker's evaluation slots
+    and queue, and its memory."""
+    return {
+        "status": "ok",
+        "version": "2.0.0",
+        "jobs": {**_registry, "ttl_seconds": jobs.ttl, "max_jobs": jobs.max_jobs},
+        "admission": admission.stats(),
+        "memory": process_memory(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Operational metrics in Prometheus text format (per process)."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
 
 
 # ── Reports (Excel / PDF) ─────────────────────────────────────────────────────
@@ -297,22 +1104,25 @@ async def health():
 @app.get("/api/reports/candidate/{analysis_id}")
 async def report_candidate(
     analysis_id: str,
-    format: str = Query("xlsx", regex="^(xlsx|pdf)$"),
+    format: str = Query("xlsx", pattern="^(xlsx|pdf)$"),
 ):
-    """Download a high-level decision report for one candidate (Excel or PDF)."""
-    record = storage.get_analysis(analysis_id)
+    """Download a high-level decision report for one candidate (Excel or PDF).
+
+    The candidate's PDF section is rendered once per record version (in the render process
+    pool) and served from the fragment cache afterwards, behind a freshly rendered cover.
+    """
+    record = await asyncio.to_thread(storage.get_analysis, analysis_id)
     if not record:
         raise HTTPException(status_code=404, detail="Analysis not found.")
-    records = [record]
     try:
-        if format == "xlsx":
-            content = build_excel_report(records)
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            filename = f"candidate-report-{analysis_id[:8]}.xlsx"
-        else:
-            content = build_pdf_report(records)
-            media_type = "application/pdf"
-            filename = f"candidate-report-{analysis_id[:8]}.pdf"
+        if format == "pdf":
+            content = await asyncio.to_thread(candidate_pdf, record, fragment_cache, render_pool())
+            return Response(
+                content=content,
+                media_type=REPORT_MEDIA_TYPES["pdf"],
+                headers={"Content-Disposition": f'attachment; filename="candidate-report-{analysis_id[:8]}.pdf"'},
+            )
+        content = await asyncio.to_thread(build_excel_report, [record])
     except ImportError as e:
         raise HTTPException(
             status_code=500,
@@ -322,42 +1132,47 @@ async def report_candidate(
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
     return Response(
         content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        media_type=REPORT_MEDIA_TYPES["xlsx"],
+        headers={"Content-Disposition": f'attachment; filename="candidate-report-{analysis_id[:8]}.xlsx"'},
     )
 
 
+# Formats streamed row by row from storage (no record cap); PDF stays capped and in memory
+STREAMED_REPORTS = {
+    "xlsx": iter_excel_report,
+    "csv": iter_csv_report,
+    "parquet": iter_parquet_report,
+}
+# Formats whose libraries are optional or heavy enough to check before accepting the request
+REPORT_LIBRARIES = {"xlsx": "openpyxl", "pdf": "reportlab", "parquet": "pyarrow"}
+
+
 @app.get("/api/reports/candidates")
 async def report_candidates(
-    format: str = Query("xlsx", regex="^(xlsx|pdf)$"),
+    format: str = Query("xlsx", pattern="^(xlsx|pdf|csv|parquet)$"),
     ids: Optional[str] = Query(None, description="Comma-separated analysis IDs to include"),
     area: Optional[str] = Query(None, description="Filter by best-fit area (e.g. Infrastructure)"),
     date_from: Optional[str] = Query(None, description="Filter from date (YYYY-MM-DD, inclusive)"),
     date_to: Optional[str] = Query(None, description="Filter to date (YYYY-MM-DD, inclusive)"),
+    min_score: Optional[List[str]] = Query(
+        None, description="Minimum score, repeatable: AREA:N or AREA/SPECIALIZATION:N (e.g. Data:3.5)"),
+    model: Optional[str] = Query(None, description="Filter by the model that ran the analysis"),
 ):
-    """Download a high-level report for multiple candidates, optionally filtered by IDs, area, or date range."""
-    analysis_ids = [x.strip() for x in ids.split(",")] if ids else None
-    if analysis_ids and not any(analysis_ids):
-        analysis_ids = None
-    records = get_records_for_report(
-        storage,
-        analysis_ids=analysis_ids,
-        area_filter=area,
-        date_from=date_from,
-        date_to=date_to,
-        limit=200,
-    )
+    """Download a high-level report for multiple candidates, filtered by IDs, area, date range, scores or model.
+
+    xlsx, csv and parquet cover every matching analysis (newest first) and are streamed as
+    they are generated in a worker thread; pdf holds the 200 most recent.
+    """
+    filters = _report_filters(ids.split(",") if ids else None, area, date_from, date_to, min_score, model)
+    if format in STREAMED_REPORTS:
+        return await _stream_report(format, filters)
+    records = await asyncio.to_thread(get_records_for_report, storage, limit=200, **filters)
     if not records:
         raise HTTPException(status_code=404, detail="No analyses match the filter.")
     try:
-        if format == "xlsx":
-            content = build_excel_report(records)
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            filename = "candidate-reports.xlsx"
-        else:
-            content = build_pdf_report(records)
-            media_type = "application/pdf"
-            filename = "candidate-reports.pdf"
+        buf = io.BytesIO()
+        await asyncio.to_thread(write_pdf_report, records, fragment_cache, render_pool(), buf)
+        content = buf.getvalue()
     except ImportError as e:
         raise HTTPException(
             status_code=500,
@@ -367,11 +1182,143 @@ async def report_candidates(
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
     return Response(
         content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        media_type=REPORT_MEDIA_TYPES["pdf"],
+        headers={"Content-Disposition": 'attachment; filename="candidate-reports.pdf"'},
+    )
+
+
+def _report_filters(
+    ids: Optional[List[str]],
+    area: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    min_score: Optional[List[str]],
+    model: Optional[str],
+) -> Dict[str, Any]:
+    """Report query parameters as get_records_for_report keyword arguments."""
+    analysis_ids = [x.strip() for x in ids or [] if x and x.strip()] or None
+    min_scores = _score_pairs(min_score, float, "min_score", "AREA:N or AREA/SPECIALIZATION:N")
+    return {
+        "analysis_ids": analysis_ids,
+        "area_filter": area or None,
+        "date_from": date_from or None,
+        "date_to": date_to or None,
+        "min_scores": min_scores or None,
+        "model": model or None,
+    }
+
+
+async def _stream_report(format: str, filters: Dict[str, Any]) -> StreamingResponse:
+    _require_report_library(format)
+    # Index lookup off the event loop (rebuilding the index after a write parses the file)
+    records = await asyncio.to_thread(iter_records_for_report, storage, **filters)
+    first = next(records, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail="No analyses match the filter.")
+    # A sync generator: Starlette iterates it in the threadpool, so rendering never blocks the loop
+    return StreamingResponse(
+        STREAMED_REPORTS[format](itertools.chain([first], records)),
+        media_type=REPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="candidate-reports.{format}"'},
     )
 
 
+def _require_report_library(format: str) -> None:
+    library = REPORT_LIBRARIES.get(format)
+    if library and importlib.util.find_spec(library) is None:
+        raise HTTPException(
+            status_code=501,
+            detail=f"{format} export needs {library}. Install with: pip install {library}",
+        )
+
+
+class ReportJobRequest(BaseModel):
+    format: str = "pdf"
+    ids: Optional[List[str]] = None
+    area: Optional[str] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    min_score: Optional[List[str]] = None  # AREA:N or AREA/SPECIALIZATION:N
+    model: Optional[str] = None
+
+
+@app.post("/api/reports/jobs")
+async def create_report_job(request: ReportJobRequest):
+    """Render a multi-candidate report in the background; poll the job, then download the file.
+
+    No record cap for any format; PDF sections come from the fragment cache where unchanged.
+    """
+    if request.format not in REPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=422, detail=f"format must be one of: {', '.join(REPORT_MEDIA_TYPES)}")
+    _require_report_library(request.format)
+    filters = _report_filters(request.ids, request.area, request.date_from, request.date_to,
+                              request.min_score, request.model)
+    job_id = str(uuid.uuid4())
+    report_jobs.create(job_id, format=request.format, current_step="Queued…")
+    # A job left behind by a worker that stopped mid-render expires instead of lingering
+    state.expire(report_jobs.prefix + job_id, REPORT_JOB_TTL_SECONDS)
+    task = asyncio.create_task(run_report_job(job_id, request, filters))
+    _report_tasks.add(task)
+    task.add_done_callback(_report_tasks.discard)
+    return {"job_id": job_id, "status_url": f"/api/reports/jobs/{job_id}"}
+
+
+async def run_report_job(job_id: str, request: ReportJobRequest, filters: Dict[str, Any]) -> None:
+    path = REPORTS_DIR / f"{job_id}.{request.format}"
+
+    def on_progress(done: int, total: int) -> None:
+        report_jobs.update(job_id, progress=5 + int(90 * done / max(total, 1)),
+                           current_step=f"Rendered {done}/{total} candidates")
+
+    def render() -> int:
+        prune_report_files(REPORTS_DIR, REPORT_JOB_TTL_SECONDS)
+        records = iter_records_for_report(storage, **filters)
+        return write_report_file(request.format, records, path, fragment_cache, render_pool(), on_progress)
+
+    report_jobs.update(job_id, progress=5, current_step="Rendering report…")
+    try:
+        count = await asyncio.to_thread(render)
+        if count == 0:
+            path.unlink(missing_ok=True)
+            report_jobs.update(job_id, status="failed", current_step="Error", error="No analyses match the filter.")
+        else:
+            report_jobs.update(
+                job_id,
+                status="complete",
+                progress=100,
+                current_step="Ready",
+                records=count,
+                size_bytes=path.stat().st_size,
+                download_url=f"/api/reports/jobs/{job_id}/download",
+            )
+    except Exception as exc:
+        report_jobs.update(job_id, status="failed", current_step="Error", error=f"Report generation failed: {exc}")
+    finally:
+        state.expire(report_jobs.prefix + job_id, REPORT_JOB_TTL_SECONDS)
+
+
+@app.get("/api/reports/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found.")
+    return {"job_id": job_id, **job}
+
+
+@app.get("/api/reports/jobs/{job_id}/download")
+async def download_report_job(job_id: str):
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found.")
+    if job.get("status") != "complete":
+        raise HTTPException(status_code=409, detail="Report is not ready yet.")
+    fmt = job["format"]
+    path = REPORTS_DIR / f"{job_id}.{fmt}"
+    if not path.exists():
+        raise HTTPException(status_code=410, detail="Report file has expired.")
+    return FileResponse(path, media_type=REPORT_MEDIA_TYPES[fmt], filename=f"candidate-reports.{fmt}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
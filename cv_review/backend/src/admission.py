@@ -0,0 +1,202 @@
+"""
+Admission control for evaluations (per worker process).
+
+- At most `max_in_flight` evaluations run at once; the rest wait for a slot, and at most
+  `max_queued` may wait: beyond that a request is refused (503, Retry-After from recent
+  throughput) instead of piling onto the Fuelix rate limit.
+- Every client (API key header, else IP address) has a token bucket: `rate_per_minute`
+  evaluations refilled continuously, up to `burst` at once; an empty bucket answers 429
+  with the time until enough tokens are back.
+- Admitted jobs get an estimated start (seconds from now) from their place in the queue
+  and the throughput of the last evaluations.
+
+Re-queued and bulk jobs take slots too (they are not refused: bulk uploads have their own
+backpressure), so the cap holds for everything this worker runs.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# Completions kept for the throughput estimate
+_WINDOW = 50
+# Buckets kept before idle (full) ones are dropped
+_MAX_CLIENTS = 10000
+
+
+class Rejected(Exception):
+    """The request is refused: `status` 429 (client over its rate) or 503 (queue full)."""
+
+    def __init__(self, status: int, retry_after: float, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        """`rate`: tokens per second; `burst`: bucket size (starts full)."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, n: float, now: float) -> float:
+        """Take `n` tokens: 0.0 when taken, else seconds until they would be there (nothing taken)."""
+        self._refill(now)
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        if n > self.burst or self.rate <= 0:
+            return math.inf
+        return (n - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class Ticket:
+    """Admitted evaluations of one request: use() one per job queued; closing the ticket
+    (end of the with block) releases the rest. A request that fails releases them all: its
+    background tasks never run."""
+
+    def __init__(self, admission: "Admission", estimates: List[Optional[float]]):
+        self.admission = admission
+        self.estimates = estimates
+        self.used = 0
+
+    def use(self) -> Optional[float]:
+        """Take one admitted evaluation for a queued job; returns its estimated start (seconds)."""
+        estimate = self.estimates[self.used] if self.used < len(self.estimates) else None
+        self.used += 1
+        return estimate
+
+    def close(self, failed: bool = False) -> None:
+        kept = 0 if failed else min(self.used, len(self.estimates))
+        self.admission.release(len(self.estimates) - kept)
+        self.estimates = self.estimates[:kept]
+
+    def __enter__(self) -> "Ticket":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(failed=exc_type is not None)
+
+
+class Admission:
+    def __init__(self, max_in_flight: int = 8, max_queued: int = 100,
+                 rate_per_minute: float = 30.0, burst: float = 20.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queued = max(0, max_queued)
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.running = 0
+        # Admitted or waiting for a slot
+        self.queued = 0
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._completions: Deque[Tuple[float, float]] = deque(maxlen=_WINDOW)
+
+    # ── admission ───────────────────────────────────────────────────────────────
+
+    def admit(self, client: str, n: int = 1) -> "Ticket":
+        """Admit `n` evaluations for `client`, or raise Rejected.
+
+        Admitted evaluations count as queued until they take a slot (slot(admitted=True));
+        the ticket gives back the ones that were not queued when it is closed.
+        """
+        now = time.monotonic()
+        if self.running + self.queued + n > self.max_in_flight + self.max_queued:
+            overflow = self.running + self.queued + n - self.max_in_flight - self.max_queued
+            wait = self._seconds_for(overflow)
+            raise Rejected(503, wait if wait is not None else 30.0,
+                           f"Evaluation queue is full ({self.queued} waiting); retry later.")
+        bucket = self._bucket(client, now)
+        wait = bucket.take(n, now)
+        if wait:
+            if math.isinf(wait):
+                raise Rejected(429, 60.0, f"At most {int(self.burst)} evaluations per request.")
+            raise Rejected(429, wait, "Too many evaluations from this client; retry later.")
+        first = self.queued
+        self.queued += n
+        return Ticket(self, [self.estimated_start(first + i) for i in range(n)])
+
+    def release(self, n: int) -> None:
+        """Give back admitted evaluations that were not queued (duplicates linked, errors)."""
+        self.queued = max(0, self.queued - n)
+
+    def _bucket(self, client: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_CLIENTS:
+                self._buckets = {k: b for k, b in self._buckets.items() if not b.full(now)}
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+        return bucket
+
+    # ── slots ───────────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def slot(self, admitted: bool = False) -> AsyncIterator[None]:
+        """Hold one of the max_in_flight slots while evaluating; `admitted`: counted as
+        queued by admit() already."""
+        if not admitted:
+            self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued = max(0, self.queued - 1)
+        self.running += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._slots.release()
+            now = time.monotonic()
+            self._completions.append((now, now - started))
+
+    # ── estimates ───────────────────────────────────────────────────────────────
+
+    def throughput(self) -> Optional[float]:
+        """Evaluations finished per second over the recent completions: their number over the
+        time since the earliest of them started (evaluations finishing together are not
+        mistaken for a burst of throughput)."""
+        if not self._completions:
+            return None
+        first_start = min(end - duration for end, duration in self._completions)
+        span = self._completions[-1][0] - first_start
+        return len(self._completions) / span if span > 0 else None
+
+    def _seconds_for(self, n: int) -> Optional[float]:
+        """Seconds until `n` more evaluations have finished at the current throughput."""
+        rate = self.throughput()
+        return None if rate is None else n / rate
+
+    def estimated_start(self, position: int) -> Optional[float]:
+        """Seconds until the evaluation at queue `position` (0: next) gets a slot."""
+        free = self.max_in_flight - self.running
+        if position < free:
+            return 0.0
+        wait = self._seconds_for(position - free + 1)
+        return None if wait is None else round(wait, 1)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        rate = self.throughput()
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "throughput_per_minute": None if rate is None else round(rate * 60, 2),
+            "clients": len(self._buckets),
+        }
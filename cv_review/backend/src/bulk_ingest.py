@@ -0,0 +1,362 @@
+"""
+Streaming ingestion of bulk CV drops: ZIP archives and unlimited multipart uploads.
+
+Both readers are push-based: feed() each chunk of the request body as it arrives
+and get back the members completed so far, so the archive is never held in memory
+(only one member at a time, capped at the per-member size limit).
+"""
+import asyncio
+import io
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+SUPPORTED_SUFFIXES = (".pdf", ".txt", ".docx")
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed", "application/x-zip")
+
+_LOCAL_HEADER = b"PK\x03\x04"
+_CENTRAL_HEADERS = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+_DATA_DESCRIPTOR = b"PK\x07\x08"
+_OUT_CHUNK = 64 * 1024
+
+
+@dataclass
+class Member:
+    """One file from the stream: data is None when it was rejected (see error)."""
+    name: str
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+def too_large_message(max_bytes: int) -> str:
+    return f"File too large (max {max_bytes / (1024 * 1024):g} MB)."
+
+
+def sniff_type(data: bytes, name: str = "") -> Optional[str]:
+    """Suffix for the content ('.pdf', '.docx', '.txt'), judged by magic bytes rather than the filename."""
+    head = data[:1024]
+    if b"%PDF-" in head:
+        return ".pdf"
+    if head.startswith(_LOCAL_HEADER):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                if "word/document.xml" in zf.namelist():
+                    return ".docx"
+        except zipfile.BadZipFile:
+            return None
+        return ".zip"
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        return None  # legacy .doc / OLE: not supported by the parsers
+    if b"\x00" in head:
+        return None
+    try:
+        data[:4096].decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # A multi-byte character cut at the sample boundary is still text
+        if exc.start < len(data[:4096]) - 3:
+            return None
+    return ".txt"
+
+
+def _skip_name(name: str) -> bool:
+    """Directories and OS metadata that archivers add next to the real files."""
+    parts = PurePosixPath(name).parts
+    return (
+        not parts
+        or name.endswith("/")
+        or parts[0] == "__MACOSX"
+        or parts[-1].startswith(".")
+        or parts[-1].lower() in ("thumbs.db", "desktop.ini")
+    )
+
+
+class ZipStreamReader:
+    """Incremental ZIP reader over local file headers (no central directory, no seeking)."""
+
+    def __init__(self, max_member_bytes: int, archive_name: str = "archive.zip"):
+        self.max_member_bytes = max_member_bytes
+        self.archive_name = archive_name
+        self.done = False
+        self.error: Optional[str] = None
+        self._buf = bytearray()
+        self._state = "header"
+        self._member: Dict = {}
+
+    def feed(self, chunk: bytes) -> List[Member]:
+        self._buf += chunk
+        out: List[Member] = []
+        while not self.done:
+            progressed = getattr(self, f"_step_{self._state}")(out)
+            if not progressed:
+                break
+        if self.done:
+            self._buf.clear()
+        return out
+
+    def close(self) -> List[Member]:
+        """End of input: report a truncated archive."""
+        if not self.done and (self._state != "header" or self._buf):
+            self.done = True
+            self.error = "ZIP archive is truncated."
+            return [Member(self._member.get("name") or self.archive_name, error=self.error)]
+        return []
+
+    # ── states ──────────────────────────────────────────────────────────────────
+
+    def _step_header(self, out: List[Member]) -> bool:
+        if len(self._buf) < 30:
+            return False
+        sig = bytes(self._buf[:4])
+        if sig in _CENTRAL_HEADERS:
+            self.done = True
+            return False
+        if sig != _LOCAL_HEADER:
+            self.done = True
+            self.error = "Not a ZIP archive (or corrupt local header)."
+            out.append(Member(self.archive_name, error=self.error))
+            return False
+        (_, _, flags, method, _, _, crc, csize, usize, nlen, elen) = struct.unpack("<4sHHHHHIIIHH", self._buf[:30])
+        if len(self._buf) < 30 + nlen + elen:
+            return False
+        raw_name = bytes(self._buf[30:30 + nlen])
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437", errors="replace")
+        extra = bytes(self._buf[30 + nlen:30 + nlen + elen])
+        del self._buf[:30 + nlen + elen]
+        zip64 = csize == 0xFFFFFFFF or usize == 0xFFFFFFFF
+        if zip64:
+            usize, csize = self._zip64_sizes(extra, usize, csize)
+        streamed = bool(flags & 0x08)
+        self._member = {
+            "name": name,
+            "method": method,
+            "crc": crc,
+            "remaining": None if streamed else csize,
+            "streamed": streamed,
+            "zip64": zip64,
+            "encrypted": bool(flags & 0x01),
+            "skip": _skip_name(name),
+            "out": bytearray(),
+            "crc_calc": 0,
+            "too_large": False,
+            "inflater": zlib.decompressobj(-15) if method == 8 else None,
+        }
+        if method not in (0, 8) or (streamed and method == 0):
+            if streamed:
+                # Without a size or an end-of-stream marker the next header cannot be found
+                self.done = True
+                self.error = f"Unsupported ZIP entry encoding for {name} (stored with data descriptor)."
+                out.append(Member(name, error=self.error))
+                return False
+            self._member["unsupported"] = True
+        self._state = "data"
+        return True
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, usize: int, csize: int) -> Tuple[int, int]:
+        i = 0
+        while i + 4 <= len(extra):
+            tag, size = struct.unpack("<HH", extra[i:i + 4])
+            if tag == 0x0001:
+                fields = extra[i + 4:i + 4 + size]
+                vals = [struct.unpack("<Q", fields[j:j + 8])[0] for j in range(0, len(fields) - 7, 8)]
+                if usize == 0xFFFFFFFF and vals:
+                    usize = vals.pop(0)
+                if csize == 0xFFFFFFFF and vals:
+                    csize = vals.pop(0)
+                break
+            i += 4 + size
+        return usize, csize
+
+    def _emit(self, data: bytes) -> None:
+        m = self._member
+        if m["skip"] or m.get("unsupported") or m["encrypted"] or m["too_large"]:
+            return
+        m["crc_calc"] = zlib.crc32(data, m["crc_calc"])
+        if len(m["out"]) + len(data) > self.max_member_bytes:
+            m["too_large"] = True
+            m["out"] = bytearray()
+            return
+        m["out"] += data
+
+    def _inflate(self, data: bytes) -> None:
+        m = self._member
+        inflater = m["inflater"]
+        chunk = inflater.decompress(data, _OUT_CHUNK)
+        self._emit(chunk)
+        # Bounded output per call: an archive bomb cannot allocate more than _OUT_CHUNK at once
+        while inflater.unconsumed_tail and not inflater.eof:
+            self._emit(inflater.decompress(inflater.unconsumed_tail, _OUT_CHUNK))
+
+    def _step_data(self, out: List[Member]) -> bool:
+        m = self._member
+        if not self._buf and m["remaining"] != 0:
+            return False
+        if m["remaining"] is not None:
+            take = bytes(self._buf[:m["remaining"]])
+            del self._buf[:len(take)]
+            m["remaining"] -= len(take)
+            if not (m.get("unsupported") or m["encrypted"]):
+                if m["inflater"] is not None:
+                    self._inflate(take)
+                else:
+                    self._emit(take)
+            if m["remaining"]:
+                return False
+            self._state = "descriptor" if m["streamed"] else "header"
+            if not m["streamed"]:
+                self._finish(out)
+            return True
+        # Size unknown (data descriptor follows): inflate until the deflate stream ends
+        data = bytes(self._buf)
+        self._buf.clear()
+        self._inflate(data)
+        inflater = m["inflater"]
+        if inflater.eof:
+            self._buf[:0] = inflater.unused_data
+            self._state = "descriptor"
+            return True
+        return False
+
+    def _step_descriptor(self, out: List[Member]) -> bool:
+        m = self._member
+        size_len = 8 if m["zip64"] else 4
+        has_sig = self._buf[:4] == _DATA_DESCRIPTOR
+        need = (4 if has_sig else 0) + 4 + 2 * size_len
+        if len(self._buf) < need:
+            return False
+        crc_at = 4 if has_sig else 0
+        m["crc"] = struct.unpack("<I", self._buf[crc_at:crc_at + 4])[0]
+        del self._buf[:need]
+        self._finish(out)
+        self._state = "header"
+        return True
+
+    def _finish(self, out: List[Member]) -> None:
+        m = self._member
+        self._member = {}
+        name = m["name"]
+        if m["skip"]:
+            return
+        if m["encrypted"]:
+            out.append(Member(name, error="Encrypted archive members are not supported."))
+        elif m.get("unsupported"):
+            out.append(Member(name, error=f"Unsupported ZIP compression method {m['method']}."))
+        elif m["too_large"]:
+            out.append(Member(name, error=too_large_message(self.max_member_bytes)))
+        elif m["crc_calc"] != m["crc"]:
+            out.append(Member(name, error="Corrupt archive member (CRC mismatch)."))
+        else:
+            out.append(Member(name, data=bytes(m["out"])))
+
+
+class MultipartStreamReader:
+    """Incremental multipart/form-data reader; every file part is returned as soon as it ends.
+
+    Parts that are ZIP archives are expanded on the fly through ZipStreamReader.
+    """
+
+    def __init__(self, boundary: bytes, max_member_bytes: int):
+        self.max_member_bytes = max_member_bytes
+        self._ready: List[Member] = []
+        self._headers: Dict[str, str] = {}
+        self._field = bytearray()
+        self._value = bytearray()
+        self._part: Optional[Dict] = None
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": lambda d, s, e: self._field.extend(d[s:e]),
+            "on_header_value": lambda d, s, e: self._value.extend(d[s:e]),
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def feed(self, chunk: bytes) -> List[Member]:
+        self._parser.write(chunk)
+        ready, self._ready = self._ready, []
+        return ready
+
+    def close(self) -> List[Member]:
+        self._parser.finalize()
+        ready, self._ready = self._ready, []
+        return ready
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._part = None
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.decode("latin-1").lower()] = self._value.decode("latin-1")
+        self._field.clear()
+        self._value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get("content-disposition", ""))
+        filename = options.get(b"filename")
+        if filename is None:
+            self._part = None  # plain form field
+            return
+        name = filename.decode("utf-8", errors="replace")
+        content_type = self._headers.get("content-type", "").split(";")[0].strip().lower()
+        is_zip = name.lower().endswith(".zip") or content_type in ZIP_CONTENT_TYPES
+        self._part = {
+            "name": name,
+            "zip": ZipStreamReader(self.max_member_bytes, archive_name=name) if is_zip else None,
+            "data": bytearray(),
+            "too_large": False,
+        }
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        part = self._part
+        if part is None:
+            return
+        if part["zip"] is not None:
+            self._ready.extend(part["zip"].feed(data[start:end]))
+            return
+        if part["too_large"]:
+            return
+        if len(part["data"]) + (end - start) > self.max_member_bytes:
+            part["too_large"] = True
+            part["data"] = bytearray()
+            return
+        part["data"] += data[start:end]
+
+    def _on_part_end(self) -> None:
+        part, self._part = self._part, None
+        if part is None:
+            return
+        if part["zip"] is not None:
+            self._ready.extend(part["zip"].close())
+            return
+        if part["too_large"]:
+            self._ready.append(Member(part["name"], error=too_large_message(self.max_member_bytes)))
+        else:
+            self._ready.append(Member(part["name"], data=bytes(part["data"])))
+
+
+async def wait_below(pending: Set[asyncio.Task], limit: int) -> List[asyncio.Task]:
+    """Backpressure for the body reader: wait until at most `limit` of `pending` are still
+    running. Finished tasks are removed from `pending` (so each wait is on running tasks
+    only) and returned; the caller still owes them an await for their exceptions."""
+    finished: List[asyncio.Task] = []
+    while len(pending) > limit:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending.difference_update(done)
+        finished.extend(done)
+    return finished
+
+
+def multipart_boundary(content_type: str) -> Optional[bytes]:
+    kind, options = parse_options_header(content_type)
+    if kind != b"multipart/form-data":
+        return None
+    return options.get(b"boundary")
@@ -0,0 +1,254 @@
+"""
+Compact in-memory form of a stored analysis record.
+
+As nested dicts a record costs ~14 KB of Python objects: fifteen specialization dicts
+repeating the same four keys, best_specializations repeating some of them, and every
+string and float boxed on its own. CompactRecord keeps:
+
+- the fields queries read (id, filename, timestamp, model, skill matrix version, timings,
+  best-fit area) in slots;
+- specializations as indexes into ROLES (the compiled skill matrix's (area, specialization)
+  pairs, then any other pair on first sight), their scores in a small array and their
+  levels as indexes into LEVELS; best_specializations as positions in that list;
+- area scores as an array in the order of an interned key tuple;
+- stage durations (stored stage_seconds, else derived from the timeline) the same way, for
+  the slow-analysis explorer;
+- everything else (descriptions, summary, education, jobs, timeline, metrics, …) as one
+  zlib-compressed orjson blob, decoded only when the full record is asked for.
+
+to_dict() gives back the record as it was stored (values and types; only key order may
+differ). Anything that does not have the expected shape simply stays in the blob.
+"""
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from src.timeline import stage_durations
+
+# Top-level fields held in slots: strings, then numbers
+_STR_FIELDS = ("id", "filename", "timestamp", "model_used", "skill_matrix_version")
+_NUM_FIELDS = ("analysis_time_seconds", "api_calls", "total_tokens", "human_review_minutes")
+_SPEC_KEYS = frozenset(("area", "specialization", "score", "level"))
+_ZLIB_LEVEL = 1
+_MISSING = object()
+
+
+class Interner:
+    """Values <-> small integer codes, stable for the life of the process."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+        self.extend(values)
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def extend(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.code(value)
+
+
+ROLES = Interner()
+LEVELS = Interner(("Basic", "Medium", "High"))
+_KEY_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_KEY_POSITIONS: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _pack_numbers(values: Sequence[Any]) -> array:
+    """Small whole numbers as bytes, anything else as doubles (both exact)."""
+    if all(isinstance(v, int) and -128 <= v < 128 for v in values):
+        return array("b", values)
+    return array("d", values)
+
+
+class CompactRecord:
+    __slots__ = (
+        "id", "filename", "timestamp", "model_used", "skill_matrix_version",
+        "analysis_time_seconds", "api_calls", "total_tokens", "human_review_minutes",
+        "most_fitted_area", "area_keys", "area_scores",
+        "roles", "spec_scores", "spec_levels", "best", "stage_keys", "stage_values", "_blob",
+    )
+
+    def __init__(self, record: Dict[str, Any]):
+        rest = dict(record)
+        for name in _STR_FIELDS:
+            value = rest.get(name)
+            setattr(self, name, sys.intern(rest.pop(name)) if isinstance(value, str) else None)
+        for name in _NUM_FIELDS:
+            value = rest.get(name)
+            setattr(self, name, rest.pop(name) if _is_number(value) else None)
+
+        self.most_fitted_area = self.area_keys = self.area_scores = None
+        self.roles = self.spec_scores = self.spec_levels = self.best = None
+        self.stage_keys = self.stage_values = None
+        self._pack_stages(rest)
+        result = rest.get("result")
+        if isinstance(result, dict):
+            rest["result"] = result = self._pack_result(dict(result))
+        self._blob = zlib.compress(orjson.dumps(rest), _ZLIB_LEVEL) if rest else b""
+
+    def _pack_stages(self, rest: Dict[str, Any]) -> None:
+        """Stage durations in slots; stage_seconds (if stored) also stays in the blob."""
+        timeline = rest.get("timeline")
+        stages = rest.get("stage_seconds") or stage_durations(
+            timeline if isinstance(timeline, dict) else None, self.analysis_time_seconds or 0.0)
+        if isinstance(stages, dict) and all(isinstance(k, str) and _is_number(v) for k, v in stages.items()):
+            keys = tuple(stages)
+            self.stage_keys = _KEY_TUPLES.setdefault(keys, tuple(sys.intern(k) for k in keys))
+            self.stage_values = array("d", stages.values())
+
+    def _pack_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Move the structured parts of `result` into slots; returns what is left of it."""
+        area = result.get("most_fitted_area")
+        if isinstance(area, str):
+            self.most_fitted_area = sys.intern(result.pop("most_fitted_area"))
+
+        scores = result.get("area_scores")
+        if isinstance(scores, dict) and all(isinstance(k, str) and _is_number(v) for k, v in scores.items()):
+            keys = tuple(scores)
+            self.area_keys = _KEY_TUPLES.setdefault(keys, tuple(sys.intern(k) for k in keys))
+            self.area_scores = _pack_numbers(list(scores.values()))
+            del result["area_scores"]
+
+        specs = result.get("specializations")
+        if isinstance(specs, list) and len(specs) < 256 and all(
+            isinstance(s, dict) and s.keys() == _SPEC_KEYS and isinstance(s["area"], str)
+            and isinstance(s["specialization"], str) and _is_number(s["score"]) and isinstance(s["level"], str)
+            for s in specs
+        ):
+            levels = [LEVELS.code(s["level"]) for s in specs]
+            if max(levels, default=0) < 256:
+                self.roles = array("H", [ROLES.code((s["area"], s["specialization"])) for s in specs])
+                self.spec_scores = _pack_numbers([s["score"] for s in specs])
+                self.spec_levels = bytes(levels)
+                del result["specializations"]
+                best = result.get("best_specializations")
+                if isinstance(best, list):
+                    try:
+                        self.best = bytes(specs.index(b) for b in best)
+                        del result["best_specializations"]
+                    except ValueError:
+                        pass  # not taken from the specializations: stays in the blob
+        return result
+
+    # ── reading ─────────────────────────────────────────────────────────────────
+
+    def _rest(self) -> Dict[str, Any]:
+        return orjson.loads(zlib.decompress(self._blob)) if self._blob else {}
+
+    def _specializations(self) -> List[Dict[str, Any]]:
+        return [
+            {"area": area, "specialization": spec, "score": score, "level": LEVELS.values[level]}
+            for (area, spec), score, level in zip(
+                (ROLES.values[r] for r in self.roles), self.spec_scores.tolist(), self.spec_levels
+            )
+        ]
+
+    def _result(self, rest: Dict[str, Any]) -> Any:
+        result = rest.get("result", _MISSING)
+        if not isinstance(result, dict):
+            return result
+        out: Dict[str, Any] = {}
+        if self.most_fitted_area is not None:
+            out["most_fitted_area"] = self.most_fitted_area
+        if self.area_keys is not None:
+            out["area_scores"] = dict(zip(self.area_keys, self.area_scores.tolist()))
+        if self.roles is not None:
+            specs = out["specializations"] = self._specializations()
+            if self.best is not None:
+                out["best_specializations"] = [dict(specs[i]) for i in self.best]
+        out.update(result)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The full record (a new dict on every call)."""
+        rest = self._rest()
+        out: Dict[str, Any] = {}
+        for name in _STR_FIELDS + _NUM_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = value
+        result = self._result(rest)
+        if result is not _MISSING:
+            out["result"] = result
+        out.update((k, v) for k, v in rest.items() if k != "result")
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Top-level field, as dict.get (fields other than the slotted ones decode the blob)."""
+        if key in _STR_FIELDS or key in _NUM_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        rest = self._rest()
+        if key == "result":
+            result = self._result(rest)
+            return default if result is _MISSING else result
+        return rest.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def scores(self) -> Dict[str, Any]:
+        """most_fitted_area, area_scores and specializations of the result: what rankings and
+        score filters read, built from the slots (the blob is decoded only for a part that is
+        not packed)."""
+        out: Dict[str, Any] = {}
+        if self.most_fitted_area is not None:
+            out["most_fitted_area"] = self.most_fitted_area
+        if self.area_keys is not None:
+            out["area_scores"] = dict(zip(self.area_keys, self.area_scores.tolist()))
+        if self.roles is not None:
+            out["specializations"] = self._specializations()
+        if self.most_fitted_area is None or self.area_keys is None or self.roles is None:
+            result = self.get("result")
+            if isinstance(result, dict):
+                for key in ("most_fitted_area", "area_scores", "specializations"):
+                    if key not in out and key in result:
+                        out[key] = result[key]
+        return out
+
+    def stage_seconds(self, stage: str) -> Optional[float]:
+        """Duration of one stage key (see timeline.stage_durations), from the slots."""
+        if self.stage_keys is None:
+            return None
+        positions = _KEY_POSITIONS.get(self.stage_keys)
+        if positions is None:
+            positions = _KEY_POSITIONS.setdefault(self.stage_keys, {k: i for i, k in enumerate(self.stage_keys)})
+        pos = positions.get(stage)
+        return None if pos is None else self.stage_values[pos]
+
+    def stage_durations(self) -> Dict[str, float]:
+        return {} if self.stage_keys is None else dict(zip(self.stage_keys, self.stage_values.tolist()))
+
+
+def pack(records: Iterable[Dict[str, Any]], previous: Iterable[CompactRecord] = ()) -> List[CompactRecord]:
+    """Compact records; one already packed in `previous` (same id, timestamp and skill matrix
+    version) is reused.
+
+    A stored analysis only changes when it is re-scored against a new skill matrix, which
+    stamps the new version, so an unchanged key is the same record: a rewrite of
+    analyses.json only packs the records it added or re-scored.
+    """
+    reuse = {(r.id, r.timestamp, r.skill_matrix_version): r for r in previous if r.id}
+    return [
+        reuse.get((r.get("id"), r.get("timestamp"), r.get("skill_matrix_version"))) or CompactRecord(r)
+        for r in records
+    ]
@@ -0,0 +1,261 @@
+"""Section-aware CV condensation — normalize, split into sections, pack into a token budget."""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+# Heading keywords per canonical section; text before the first heading is the "header" section.
+SECTION_KEYWORDS: Dict[str, Sequence[str]] = {
+    "summary": ("summary", "professional summary", "profile", "about", "about me", "objective", "overview"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "career", "positions",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "competencies", "core competencies",
+        "technologies", "tech stack", "tools", "expertise",
+    ),
+    "certifications": (
+        "certifications", "certification", "certificates", "licenses", "licenses & certifications",
+        "licenses and certifications", "accreditations",
+    ),
+    "education": ("education", "academic background", "academics", "qualifications", "training", "courses"),
+    "projects": ("projects", "personal projects", "selected projects", "publications", "open source"),
+    "languages": ("languages", "soft skills & languages", "soft skills and languages", "soft skills"),
+}
+
+# Which sections matter most for each prompt type; unlisted sections come last.
+PROMPT_PRIORITIES: Dict[str, Sequence[str]] = {
+    "spec_level": ("skills", "experience", "certifications", "summary", "projects", "education", "header"),
+    "skill_inventory": ("skills", "experience", "certifications", "projects", "summary", "education", "header"),
+    "area_description": ("summary", "experience", "skills", "certifications", "projects", "header"),
+    "profile": ("experience", "education", "certifications", "languages", "summary", "header", "skills"),
+    "summary": ("summary", "experience", "skills", "certifications", "education", "header"),
+}
+
+# Default per-prompt budgets (tokens); roughly the old 8000/6000/10000/6000 character cuts.
+DEFAULT_TOKEN_BUDGETS: Dict[str, int] = {
+    "spec_level": 2000,
+    "skill_inventory": 3000,
+    "area_description": 1500,
+    "profile": 2500,
+    "summary": 1500,
+}
+
+# "Page 2", "Page 2 of 5", "2/5", "2 of 5"; a bare number only at a page edge (years stay)
+_PAGE_NUMBER_RE = re.compile(r"^\s*(?:page\s*\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?|\d{1,3}\s*(?:/|of)\s*\d{1,3})\s*$", re.I)
+_BARE_PAGE_NUMBER_RE = re.compile(r"^\d{1,3}$")
+_DECORATION_RE = re.compile(r"^[\s\-_=~*•·─━═│|#.]+$")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+_tokenizer = None
+_tokenizer_loaded = False
+
+
+def _get_tokenizer():
+    """Return a tiktoken encoder when available locally, else None (regex approximation is used)."""
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        _tokenizer_loaded = True
+        try:
+            import tiktoken
+            _tokenizer = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _tokenizer = None
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with a local tokenizer (tiktoken if installed, otherwise a word/punctuation estimate)."""
+    if not text:
+        return 0
+    enc = _get_tokenizer()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    # Long words split into several BPE pieces; ~4 chars per piece is a good approximation.
+    return sum(max(1, (len(tok) + 3) // 4) for tok in _TOKEN_RE.findall(text))
+
+
+@dataclass
+class CVSection:
+    name: str
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass
+class CondensedCV:
+    """A preprocessed CV: normalized text split into canonical sections."""
+    sections: List[CVSection]
+    original_chars: int
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(s.text for s in self.sections if s.lines)
+
+    def section_names(self) -> List[str]:
+        return [s.name for s in self.sections if s.lines]
+
+    def pack(self, prompt_type: str, budget_tokens: Optional[int] = None) -> str:
+        """Return the CV text packed into the token budget for one prompt type."""
+        budget = budget_tokens or DEFAULT_TOKEN_BUDGETS.get(prompt_type, 2000)
+        return pack_sections(self.sections, budget, PROMPT_PRIORITIES.get(prompt_type, ()))
+
+
+def _normalize_line(line: str) -> str:
+    line = line.replace("\u00a0", " ").replace("\t", " ")
+    line = re.sub(r"[\u200b-\u200d\ufeff]", "", line)
+    return re.sub(r" {2,}", " ", line).strip()
+
+
+def _strip_repeated_page_lines(pages: List[List[str]]) -> List[List[str]]:
+    """Drop header/footer lines that repeat at the top or bottom of most PDF pages."""
+    if len(pages) < 2:
+        return pages
+    edge_counts: Counter = Counter()
+    for lines in pages:
+        content = [ln for ln in lines if ln]
+        edges = set(content[:2] + content[-2:])
+        edge_counts.update(edges)
+    threshold = max(2, (len(pages) + 1) // 2)
+    repeated = {ln for ln, n in edge_counts.items() if n >= threshold and len(ln) <= 120}
+    if not repeated:
+        return pages
+    return [[ln for ln in lines if ln not in repeated] for lines in pages]
+
+
+def normalize_cv_text(text: str) -> str:
+    """Normalize whitespace and strip PDF page furniture (repeated headers/footers, page numbers)."""
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    pages = [[_normalize_line(ln) for ln in page.split("\n")] for page in text.split("\f")]
+    pages = _strip_repeated_page_lines(pages)
+
+    out: List[str] = []
+    for lines in pages:
+        filled = [i for i, ln in enumerate(lines) if ln]
+        edges = {filled[0], filled[-1]} if filled and len(pages) > 1 else set()
+        for i, ln in enumerate(lines):
+            if ln and (_PAGE_NUMBER_RE.match(ln) or _DECORATION_RE.match(ln)
+                       or (i in edges and _BARE_PAGE_NUMBER_RE.match(ln))):
+                continue
+            if not ln:
+                if out and out[-1] != "":
+                    out.append("")
+                continue
+            out.append(ln)
+    return "\n".join(out).strip()
+
+
+def _heading_section(line: str) -> Optional[str]:
+    """Return the canonical section name if the line looks like a section heading."""
+    if len(line) > 48:
+        return None
+    key = re.sub(r"[^\w&/ ]+", " ", line).strip().lower()
+    key = re.sub(r"\s+", " ", key)
+    if not key or len(key.split()) > 5:
+        return None
+    for name, keywords in SECTION_KEYWORDS.items():
+        if key in keywords:
+            return name
+    return None
+
+
+def split_sections(text: str) -> List[CVSection]:
+    """Split normalized CV text into canonical sections; text before the first heading is the header."""
+    sections: Dict[str, CVSection] = {}
+    current = sections.setdefault("header", CVSection("header"))
+    for line in text.split("\n"):
+        name = _heading_section(line) if line else None
+        if name:
+            current = sections.setdefault(name, CVSection(name))
+            continue
+        if not line and (not current.lines or current.lines[-1] == ""):
+            continue
+        current.lines.append(line)
+    for s in sections.values():
+        while s.lines and s.lines[-1] == "":
+            s.lines.pop()
+    return [s for s in sections.values() if s.lines]
+
+
+def preprocess_cv(text: str) -> CondensedCV:
+    """Normalize and sectionize a CV once; pack it per prompt with CondensedCV.pack."""
+    return CondensedCV(sections=split_sections(normalize_cv_text(text)), original_chars=len(text or ""))
+
+
+def _truncate_lines(lines: List[str], budget: int) -> List[str]:
+    """Keep whole lines from the top while they fit; cut the last line at a word boundary."""
+    kept: List[str] = []
+    used = 0
+    for ln in lines:
+        n = count_tokens(ln) + 1
+        if used + n <= budget:
+            kept.append(ln)
+            used += n
+            continue
+        remaining = budget - used
+        if remaining > 8:
+            words = ln.split(" ")
+            partial: List[str] = []
+            for w in words:
+                if count_tokens(" ".join(partial + [w])) > remaining - 1:
+                    break
+                partial.append(w)
+            if partial:
+                kept.append(" ".join(partial) + " …")
+        break
+    return kept
+
+
+def pack_sections(sections: List[CVSection], budget_tokens: int, priorities: Sequence[str] = ()) -> str:
+    """Fit all sections into budget_tokens, sharing the budget fairly so late sections are not dropped.
+
+    Sections that fit their fair share are kept whole; the leftover is redistributed to larger
+    sections in priority order. Output keeps the original section order.
+    """
+    present = [s for s in sections if s.lines]
+    if not present:
+        return ""
+    heading_cost = {s.name: count_tokens(s.name.upper()) + 2 for s in present}
+    sizes = {s.name: sum(count_tokens(ln) + 1 for ln in s.lines) for s in present}
+    total = sum(sizes.values()) + sum(heading_cost.values())
+    if total <= budget_tokens:
+        return _render(present, {s.name: s.lines for s in present})
+
+    rank = {name: i for i, name in enumerate(priorities)}
+    order = sorted(present, key=lambda s: rank.get(s.name, len(rank)))
+    alloc: Dict[str, int] = {}
+    remaining = budget_tokens - sum(heading_cost.values())
+    pending = list(order)
+    # Water-filling: small sections are kept whole, the rest split what is left.
+    while pending and remaining > 0:
+        share = remaining // len(pending)
+        fitting = [s for s in pending if sizes[s.name] <= share]
+        if not fitting:
+            # Higher-priority sections get the rounding remainder.
+            extra = remaining - share * len(pending)
+            for i, s in enumerate(pending):
+                alloc[s.name] = share + (extra if i == 0 else 0)
+            remaining = 0
+            break
+        for s in fitting:
+            alloc[s.name] = sizes[s.name]
+            remaining -= sizes[s.name]
+            pending.remove(s)
+
+    kept = {s.name: _truncate_lines(s.lines, alloc.get(s.name, 0)) for s in present}
+    return _render(present, kept)
+
+
+def _render(sections: List[CVSection], kept: Dict[str, List[str]]) -> str:
+    blocks = []
+    for s in sections:
+        lines = kept.get(s.name) or []
+        if not lines:
+            continue
+        body = "\n".join(lines)
+        blocks.append(body if s.name == "header" else f"{s.name.upper()}\n{body}")
+    return "\n\n".join(blocks)
@@ -1,15 +1,33 @@
 """Extract text from uploaded CV files (PDF, TXT, DOCX)."""
+import importlib
+import io
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Union
+
+from src.telemetry import EXTRACTION_SECONDS
+
 
 def extract_text_from_file(file_path: Union[str, Path]) -> str:
     """
     Extract plain text from a CV file.
     Supports: .pdf, .txt, .docx
+    PDF pages are separated by form feeds (\\f) so repeated headers/footers can be detected later.
     """
     path = Path(file_path)
     suffix = path.suffix.lower()
+    with EXTRACTION_SECONDS.time(file_type=suffix.lstrip(".") or "unknown"):
+        return _extract(path, suffix)
+
+
+def extract_text_from_bytes(data: bytes, suffix: str) -> str:
+    """Same as extract_text_from_file for content already in memory (bulk uploads), without a temp file."""
+    with EXTRACTION_SECONDS.time(file_type=suffix.lstrip(".") or "unknown"):
+        if suffix == ".txt":
+            return data.decode("utf-8", errors="replace")
+        return _extract(io.BytesIO(data), suffix)
+
 
+def _extract(path: Union[Path, BinaryIO], suffix: str) -> str:
     if suffix == ".txt":
         return path.read_text(encoding="utf-8", errors="replace")
 
@@ -22,24 +40,33 @@ def extract_text_from_file(file_path: Union[str, Path]) -> str:
     raise ValueError(f"Unsupported file type: {suffix}. Use .pdf, .txt, or .docx")
 
 
-def _extract_pdf(path: Path) -> str:
+def _extract_pdf(path: Union[Path, BinaryIO]) -> str:
     try:
         import pypdf
         reader = pypdf.PdfReader(path)
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
+        return "\f".join(page.extract_text() or "" for page in reader.pages)
     except ImportError:
         try:
             import PyPDF2
             reader = PyPDF2.PdfReader(path)
-            return "\n".join(page.extract_text() or "" for page in reader.pages)
+            return "\f".join(page.extract_text() or "" for page in reader.pages)
         except ImportError:
             raise ImportError("Install pypdf or PyPDF2 for PDF support: pip install pypdf")
 
 
-def _extract_docx(path: Path) -> str:
+def _extract_docx(path: Union[Path, BinaryIO]) -> str:
     try:
         import docx
         doc = docx.Document(path)
         return "\n".join(p.text for p in doc.paragraphs)
     except ImportError:
         raise ImportError("Install python-docx for DOCX support: pip install python-docx")
+
+
+def preload_parsers() -> None:
+    """Import the PDF/DOCX libraries ahead of the first upload (used by the warm-up hook)."""
+    for module in ("pypdf", "docx"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
@@ -0,0 +1,231 @@
+"""
+Near-duplicate CV detection: MinHash signatures of the extracted text, indexed with LSH bands.
+
+The same candidate arrives as several files (agencies, PDF + DOCX, a slightly updated CV).
+Each text gets a NUM_PERM-value MinHash signature over word shingles; the signature is cut
+into BANDS bands whose hashes go into an indexed SQLite table. A lookup is BANDS point
+queries plus a signature comparison for the few analyses sharing a band, so it stays well
+under a millisecond however many candidates are indexed, and every worker sees the same
+index without loading it.
+"""
+import hashlib
+import re
+import sqlite3
+import struct
+import threading
+import unicodedata
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+# 32 bands x 4 rows: a pair with similarity 0.7 shares a band with probability > 0.999
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.7
+
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"\w+", re.UNICODE)
+# NUM_PERM independent 32-bit hashes per shingle, from one SHAKE-128 output
+_LANES = struct.Struct(f"<{NUM_PERM}I")
+
+
+def normalize(text: str) -> List[str]:
+    """Lower-cased words without accents: formatting, line breaks and punctuation do not count."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD.findall(text.lower())
+
+
+def text_digest(text: str) -> str:
+    """Digest of the normalized text: equal for exact duplicates in any file format."""
+    return hashlib.sha256(" ".join(normalize(text)).encode("utf-8")).hexdigest()
+
+
+def shingles(words: Sequence[str]) -> Set[str]:
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    """NUM_PERM-value MinHash signature of the text's word shingles."""
+    rows = [_LANES.unpack(hashlib.shake_128(s.encode("utf-8")).digest(_LANES.size)) for s in shingles(normalize(text))]
+    if not rows:
+        return (_MAX_HASH,) * NUM_PERM
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the two texts' shingle sets."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(signature: Sequence[int]) -> List[int]:
+    """One signed 64-bit key per band (SQLite INTEGER)."""
+    keys = []
+    for band in range(BANDS):
+        chunk = struct.pack(f"<{ROWS}I", *signature[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+
+@dataclass
+class Fingerprint:
+    digest: str
+    signature: Tuple[int, ...]
+    words: int
+
+    @classmethod
+    def of(cls, text: str) -> "Fingerprint":
+        return cls(digest=text_digest(text), signature=minhash(text), words=len(normalize(text)))
+
+
+@dataclass
+class Match:
+    analysis_id: str
+    similarity: float
+    exact: bool
+
+
+class FingerprintIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                analysis_id TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                words INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS fingerprints_digest ON fingerprints (digest);
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                analysis_id TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, analysis_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS bands_analysis ON bands (analysis_id);
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT count(*) FROM fingerprints").fetchone()[0]
+
+    def add(self, analysis_id: str, fingerprint: Fingerprint) -> None:
+        self.add_many([(analysis_id, fingerprint)])
+
+    def add_many(self, items: Iterable[Tuple[str, Fingerprint]], batch: int = 500) -> int:
+        """Index (analysis_id, fingerprint) pairs, `batch` per transaction."""
+        n = 0
+        pending: List[Tuple[str, Fingerprint]] = []
+        for item in items:
+            pending.append(item)
+            if len(pending) >= batch:
+                n += self._add_batch(pending)
+                pending = []
+        if pending:
+            n += self._add_batch(pending)
+        return n
+
+    def _add_batch(self, items: List[Tuple[str, Fingerprint]]) -> int:
+        with self._tx() as conn:
+            for analysis_id, fp in items:
+                conn.execute("DELETE FROM bands WHERE analysis_id = ?", (analysis_id,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO fingerprints (analysis_id, digest, signature, words) VALUES (?, ?, ?, ?)",
+                    (analysis_id, fp.digest, _LANES.pack(*fp.signature), fp.words),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, bucket, analysis_id) VALUES (?, ?, ?)",
+                    [(band, key, analysis_id) for band, key in enumerate(band_keys(fp.signature))],
+                )
+        return len(items)
+
+    def remove(self, analysis_id: str) -> None:
+        with self._tx() as conn:
+            conn.execute("DELETE FROM fingerprints WHERE analysis_id = ?", (analysis_id,))
+            conn.execute("DELETE FROM bands WHERE analysis_id = ?", (analysis_id,))
+
+    def known_ids(self) -> set:
+        return {row[0] for row in self._conn().execute("SELECT analysis_id FROM fingerprints")}
+
+    def find(self, fingerprint: Fingerprint, threshold: float = DEFAULT_THRESHOLD, limit: int = 5) -> List[Match]:
+        """Indexed analyses whose text is at least `threshold` similar, most similar first."""
+        conn = self._conn()
+        exact = {row[0] for row in conn.execute(
+            "SELECT analysis_id FROM fingerprints WHERE digest = ?", (fingerprint.digest,)
+        )}
+        candidates = set(exact)
+        for band, key in enumerate(band_keys(fingerprint.signature)):
+            candidates.update(row[0] for row in conn.execute(
+                "SELECT analysis_id FROM bands WHERE band = ? AND bucket = ?", (band, key)
+            ))
+        matches = []
+        for analysis_id in candidates:
+            if analysis_id in exact:
+                matches.append(Match(analysis_id, 1.0, True))
+                continue
+            row = conn.execute("SELECT signature FROM fingerprints WHERE analysis_id = ?", (analysis_id,)).fetchone()
+            if row is None:
+                continue
+            score = similarity(fingerprint.signature, _LANES.unpack(row[0]))
+            if score >= threshold:
+                matches.append(Match(analysis_id, round(score, 3), False))
+        matches.sort(key=lambda m: (not m.exact, -m.similarity))
+        return matches[:limit]
+
+
+class LocalIndex:
+    """In-memory LSH over the uploads of one request, which are not in the index until saved."""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[str]] = {}
+        self._items: Dict[str, Fingerprint] = {}
+
+    def add(self, key: str, fingerprint: Fingerprint) -> None:
+        self._items[key] = fingerprint
+        for band, bucket in enumerate(band_keys(fingerprint.signature)):
+            self._buckets.setdefault((band, bucket), []).append(key)
+
+    def find(self, fingerprint: Fingerprint, threshold: float = DEFAULT_THRESHOLD) -> Optional[Match]:
+        """The most similar earlier upload, if any reaches `threshold`."""
+        best: Optional[Match] = None
+        seen: Set[str] = set()
+        for band, bucket in enumerate(band_keys(fingerprint.signature)):
+            for key in self._buckets.get((band, bucket), ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                other = self._items[key]
+                exact = other.digest == fingerprint.digest
+                score = 1.0 if exact else round(similarity(fingerprint.signature, other.signature), 3)
+                if score >= threshold and (best is None or score > best.similarity):
+                    best = Match(key, score, exact)
+        return best
@@ -0,0 +1,206 @@
+"""
+Local text embeddings and a persisted vector index of stored candidates.
+
+Embeddings are hashed bag-of-words vectors: every word and word pair of the normalized
+text goes to one of DIM signed buckets (1 + log tf), and the vector is L2-normalized, so
+a dot product is the cosine similarity. Nothing to download or call: requisitions and CVs
+are embedded in a few milliseconds, and the same text always gets the same vector.
+
+VectorIndex keeps one vector per analysis in SQLite (data/vectors.db, shared by every
+worker) and a float32 NumPy matrix of all of them in memory, topped up from the table's
+sequence column before each query. A query is one matrix-vector product: brute force is
+a few milliseconds for tens of thousands of candidates, so there is no approximate index.
+"""
+import hashlib
+import math
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.dedup import normalize
+from src.search import STOPWORDS, document
+
+DIM = 256
+_MIN_CAPACITY = 1024
+
+
+def _bucket(feature: str) -> Tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % DIM, 1.0 if h >> 63 else -1.0
+
+
+def features(text: str) -> Counter:
+    """Word and word-pair counts of the normalized text, without stopwords."""
+    words = [w for w in normalize(text) if len(w) > 1 and w not in STOPWORDS]
+    counts = Counter(words)
+    counts.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return counts
+
+
+def embed(text: str, idf: Optional[Dict[str, float]] = None, default_idf: float = 1.0) -> np.ndarray:
+    """Unit-length DIM-dimensional vector of the text (all zeros when it has no words).
+
+    `idf`: feature weights (features missing from it get `default_idf`; 0 drops them).
+    """
+    vec = np.zeros(DIM, dtype=np.float32)
+    pairs = []
+    for feature, tf in features(text).items():
+        weight = (1.0 + math.log(tf)) * (idf.get(feature, default_idf) if idf is not None else 1.0)
+        if weight:
+            bucket, sign = _bucket(feature)
+            pairs.append((bucket, sign * weight))
+    if not pairs:
+        return vec
+    buckets, weights = zip(*pairs)
+    np.add.at(vec, np.asarray(buckets), np.asarray(weights, dtype=np.float32))
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def profile_text(record: Dict[str, Any], cv_text: Optional[str] = None) -> str:
+    """What a candidate's vector is built from: the CV text, else the analysis' own text
+    (summary, education, previous jobs, strongest specializations)."""
+    if cv_text:
+        return cv_text
+    doc = document(record)
+    return "\n".join(doc[f] for f in ("summary", "education", "jobs", "specializations"))
+
+
+class VectorIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._guard = threading.Lock()
+        self._vectors = np.zeros((_MIN_CAPACITY, DIM), dtype=np.float32)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._last_seq = 0
+        # Bumped whenever rows of the in-memory matrix change
+        self.version = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vectors (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                analysis_id TEXT NOT NULL UNIQUE,
+                vector BLOB NOT NULL
+            )
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT count(*) FROM vectors").fetchone()[0]
+
+    def add(self, analysis_id: str, vector: np.ndarray) -> None:
+        self.add_many([(analysis_id, vector)])
+
+    def add_many(self, items: Iterable[Tuple[str, np.ndarray]], batch: int = 500) -> int:
+        """Store (analysis_id, vector) pairs, `batch` per transaction (a stored id is replaced)."""
+        n = 0
+        pending: List[Tuple[str, bytes]] = []
+        for analysis_id, vector in items:
+            pending.append((analysis_id, np.asarray(vector, dtype=np.float32).tobytes()))
+            if len(pending) >= batch:
+                n += self._add_batch(pending)
+                pending = []
+        if pending:
+            n += self._add_batch(pending)
+        return n
+
+    def _add_batch(self, items: List[Tuple[str, bytes]]) -> int:
+        with self._tx() as conn:
+            # Delete + insert: a replaced vector gets a new seq, so other workers pick it up
+            conn.executemany("DELETE FROM vectors WHERE analysis_id = ?", [(i,) for i, _ in items])
+            conn.executemany("INSERT INTO vectors (analysis_id, vector) VALUES (?, ?)", items)
+        return len(items)
+
+    def remove(self, analysis_id: str) -> None:
+        with self._tx() as conn:
+            conn.execute("DELETE FROM vectors WHERE analysis_id = ?", (analysis_id,))
+        with self._guard:
+            self._drop(analysis_id)
+
+    def known_ids(self) -> set:
+        return {row[0] for row in self._conn().execute("SELECT analysis_id FROM vectors")}
+
+    # ── in-memory matrix ───────────────────────────────────────────────────────
+
+    def _drop(self, analysis_id: str) -> None:
+        row = self._rows.pop(analysis_id, None)
+        if row is not None:
+            self._vectors[row] = 0.0
+            self._ids[row] = None
+            self.version += 1
+
+    def _append(self, rows: List[Tuple[int, str, bytes]]) -> None:
+        need = len(self._ids) + len(rows)
+        if need > self._vectors.shape[0]:
+            grown = np.zeros((max(need, self._vectors.shape[0] * 2), DIM), dtype=np.float32)
+            grown[:len(self._ids)] = self._vectors[:len(self._ids)]
+            self._vectors = grown
+        for seq, analysis_id, blob in rows:
+            self._drop(analysis_id)
+            row = len(self._ids)
+            self._vectors[row] = np.frombuffer(blob, dtype=np.float32)
+            self._ids.append(analysis_id)
+            self._rows[analysis_id] = row
+            self._last_seq = max(self._last_seq, seq)
+        if rows:
+            self.version += 1
+
+    def _refresh(self) -> None:
+        """Load vectors added since the last query; reload everything when rows were deleted
+        by another worker (the live count no longer matches)."""
+        conn = self._conn()
+        new = conn.execute(
+            "SELECT seq, analysis_id, vector FROM vectors WHERE seq > ? ORDER BY seq", (self._last_seq,)
+        ).fetchall()
+        self._append(new)
+        if conn.execute("SELECT count(*) FROM vectors").fetchone()[0] != len(self._rows):
+            self._vectors = np.zeros((_MIN_CAPACITY, DIM), dtype=np.float32)
+            self._ids, self._rows, self._last_seq = [], {}, 0
+            self._append(conn.execute("SELECT seq, analysis_id, vector FROM vectors ORDER BY seq").fetchall())
+        elif len(self._ids) > 2 * max(len(self._rows), _MIN_CAPACITY):
+            # Mostly replaced or deleted rows: compact
+            keep = [r for r, i in enumerate(self._ids) if i is not None]
+            self._vectors[:len(keep)] = self._vectors[keep]
+            self._ids = [self._ids[r] for r in keep]
+            self._rows = {analysis_id: row for row, analysis_id in enumerate(self._ids)}
+            self.version += 1
+
+    def similarities(self, vector: np.ndarray) -> Tuple[int, List[Optional[str]], np.ndarray]:
+        """(version, ids, cosine similarity of every stored vector to `vector`).
+
+        ids[i] belongs to similarity i (None: removed row); the list is live, read only the
+        first len(similarities) entries.
+        """
+        with self._guard:
+            self._refresh()
+            n = len(self._ids)
+            return self.version, self._ids, self._vectors[:n] @ np.asarray(vector, dtype=np.float32)
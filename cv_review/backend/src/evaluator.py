@@ -1,41 +1,36 @@
 """CV evaluation — areas scores, specialization levels, metrics tracking."""
-import json
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
+import orjson
+
+from src.cv_condenser import DEFAULT_TOKEN_BUDGETS, preprocess_cv
 from src.fuelix_client import chat_completion
-from config.settings import get_settings, get_skill_matrix
+from src.telemetry import EVALUATION_STAGE_SECONDS, LLM_ANSWERS, SKILL_INVENTORY
+from src.timeline import Timeline
+from config.settings import SKILL_MATRIX_PATH, get_settings, get_skill_matrix
+from src.skill_versions import Role, Version
+from src import skill_inventory, structured
 from src.prompts import (
     SYSTEM_ROLE,
     build_role_requirements_text,
     get_area_description_prompt,
     get_education_soft_skills_prompt,
+    get_repair_prompt,
+    get_skill_inventory_prompt,
     get_spec_level_prompt,
     get_summary_prompt,
 )
 
 
+class EvaluationCancelled(Exception):
+    """evaluate_cv stopped because its `cancelled` event was set (worker shutdown)."""
+
+
 def _parse_json_from_response(text: str) -> Optional[dict]:
-    text = text.strip()
-    start = text.find("{")
-    if start == -1:
-        return None
-    depth = 0
-    end = -1
-    for i in range(start, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                end = i + 1
-                break
-    if end == -1:
-        return None
-    try:
-        return json.loads(text[start:end])
-    except json.JSONDecodeError:
-        return None
+    """The JSON object in a model answer, or None (see structured.extract_json)."""
+    return structured.extract_json(text)
 
 
 def _list_roles(skill_matrix: dict) -> List[Tuple[str, str, dict]]:
@@ -48,6 +43,27 @@ def _list_roles(skill_matrix: dict) -> List[Tuple[str, str, dict]]:
     return roles
 
 
+_compiled_roles: Dict[str, Any] = {"mtime": None, "roles": [], "version": None}
+
+
+def get_compiled_roles() -> List[Tuple[str, str, dict, str]]:
+    """(area, specialization, spec data, requirements text) per role; rebuilt when skill_matrix.yaml changes."""
+    mtime = SKILL_MATRIX_PATH.stat().st_mtime_ns
+    if _compiled_roles["mtime"] != mtime:
+        roles = [
+            (area, spec, data, build_role_requirements_text(area, spec, data))
+            for area, spec, data in _list_roles(get_skill_matrix())
+        ]
+        _compiled_roles.update(mtime=mtime, roles=roles, version=Version.of(roles))
+    return _compiled_roles["roles"]
+
+
+def current_version() -> Version:
+    """Version of the skill matrix evaluations currently run against (see skill_versions)."""
+    get_compiled_roles()
+    return _compiled_roles["version"]
+
+
 def _score_to_level(score: int) -> str:
     if score >= 4:
         return "High"
@@ -70,6 +86,17 @@ def _area_counts(specializations: List[Dict[str, Any]]) -> Dict[str, int]:
     return counts
 
 
+def derived_scores(specializations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """area_scores, most_fitted_area and best_specializations: computed from the
+    specialization scores alone (no LLM call)."""
+    most_fitted_area = _most_fitted_area_from_specializations(specializations)
+    return {
+        "area_scores": _area_scores_from_specializations(specializations),
+        "most_fitted_area": most_fitted_area,
+        "best_specializations": _best_specializations_for_area(most_fitted_area, specializations),
+    }
+
+
 def _area_scores_from_specializations(specializations: List[Dict[str, Any]]) -> Dict[str, float]:
     sums: Dict[str, float] = {a: 0.0 for a in AREAS_ORDER}
     counts = _area_counts(specializations)
@@ -123,6 +150,198 @@ def _extract_tokens(response: dict) -> int:
     return usage.get("total_tokens", 0) or usage.get("completion_tokens", 0) or 0
 
 
+def _is_retryable(exc: Exception) -> bool:
+    import requests  # loaded by the Fuelix client anyway; kept off the startup import path
+
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return False
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """Honor Retry-After on 429/503 when present, else exponential backoff (1s, 2s, 4s…, max 10s)."""
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, min(30.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(10.0, 2.0 ** (attempt - 1))
+
+
+def _complete(
+    messages: list,
+    *,
+    options: Dict[str, Any],
+    temperature: float,
+    timeline: Timeline,
+    prompt: str,
+    area: Optional[str] = None,
+    specialization: Optional[str] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+    repair: Optional[bool] = None,
+) -> Tuple[dict, int, float]:
+    """One chat completion with retries, recorded on `timeline`: (response, tokens, seconds)."""
+    start = timeline.now()
+    retries = 0
+    while True:
+        try:
+            out = chat_completion(
+                messages=messages,
+                model=options["model"],
+                api_key=options["api_key"],
+                base_url=options["base_url"],
+                timeout=options["timeout"],
+                temperature=temperature,
+                response_format=response_format,
+            )
+            break
+        except Exception as exc:
+            if retries >= options["max_retries"] or not _is_retryable(exc):
+                timeline.add("llm", start, prompt=prompt, area=area, specialization=specialization,
+                             model=options["model"], retries=retries, repair=repair, error=str(exc)[:200])
+                raise
+            retries += 1
+            time.sleep(_retry_delay(exc, retries))
+    tokens = _extract_tokens(out)
+    span = timeline.add("llm", start, prompt=prompt, area=area, specialization=specialization,
+                        model=options["model"], tokens=tokens, retries=retries, repair=repair)
+    return out, tokens, span["duration"]
+
+
+def _content(out: dict) -> str:
+    choice = (out.get("choices") or [{}])[0]
+    return (choice.get("message") or {}).get("content") or ""
+
+
+class JsonAnswer(NamedTuple):
+    # The answer, valid against its schema; None when it still was not after the repairs
+    value: Optional[Dict[str, Any]]
+    # valid | repaired | invalid
+    outcome: str
+    tokens: int
+    seconds: float
+    calls: int
+
+
+def _complete_json(
+    messages: list,
+    *,
+    options: Dict[str, Any],
+    temperature: float,
+    timeline: Timeline,
+    prompt: str,
+    area: Optional[str] = None,
+    specialization: Optional[str] = None,
+) -> JsonAnswer:
+    """One JSON prompt, its answer validated against structured.SCHEMAS[prompt].
+
+    The schema goes out as response_format when evaluation.structured_output is on. An
+    answer that does not parse or validate gets up to evaluation.repair_retries more calls
+    of this prompt only, each showing the model its answer and what is wrong with it.
+    A failed call raises, as _complete does.
+    """
+    fmt = structured.response_format(prompt) if options["structured_output"] else None
+    schema_text = orjson.dumps(structured.SCHEMAS[prompt]).decode() if prompt in structured.SCHEMAS else "{}"
+    tokens = calls = 0
+    seconds = 0.0
+    value: Optional[Dict[str, Any]] = None
+    attempt_messages = messages
+    for attempt in range(1 + options["repair_retries"]):
+        out, used, took = _complete(attempt_messages, options=options, temperature=temperature, timeline=timeline,
+                                    prompt=prompt, area=area, specialization=specialization,
+                                    response_format=fmt, repair=attempt > 0 or None)
+        tokens += used
+        seconds += took
+        calls += 1
+        content = _content(out)
+        value = _parse_json_from_response(content)
+        errors = ["the answer is not a JSON object"] if value is None else structured.validate(value, prompt)
+        if not errors:
+            outcome = "valid" if attempt == 0 else "repaired"
+            break
+        value = None
+        attempt_messages = messages + [
+            {"role": "assistant", "content": content[:4000]},
+            {"role": "user", "content": get_repair_prompt(errors, schema_text)},
+        ]
+    else:
+        outcome = "invalid"
+    LLM_ANSWERS.inc(prompt=prompt, outcome=outcome)
+    return JsonAnswer(value, outcome, tokens, seconds, calls)
+
+
+def _api_options(
+    api_key: Optional[str], model: Optional[str], base_url: Optional[str], timeout: Optional[int]
+) -> Dict[str, Any]:
+    """Fuelix call options: arguments, else config.yaml / environment."""
+    settings = get_settings()
+    api_cfg = settings.get("api") or {}
+    eval_cfg = settings.get("evaluation") or {}
+    options = {
+        "api_key": api_key or settings.get("api_key"),
+        "model": model or api_cfg.get("model", "gemini-3-pro"),
+        "base_url": base_url or api_cfg.get("base_url"),
+        "timeout": timeout or api_cfg.get("timeout_seconds", 120),
+        "max_retries": int(api_cfg.get("max_retries", 0) or 0),
+        "structured_output": bool(eval_cfg.get("structured_output", True)),
+        "repair_retries": max(0, int(eval_cfg.get("repair_retries", 1) or 0)),
+    }
+    if not options["api_key"]:
+        raise ValueError("FUELIX_API_KEY (or FUELIX_SECRET_TOKEN) must be set in .env")
+    return options
+
+
+def _spec_level_score(parsed: Optional[dict]) -> int:
+    """Score (1-5) from a spec_level answer; 1 when it has none."""
+    raw = (parsed or {}).get("score")
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return max(1, min(5, int(raw)))
+    return 1
+
+
+EVALUATION_MODES = ("per_specialization", "inventory", "shadow")
+
+
+def _evaluation_mode(eval_cfg: Dict[str, Any]) -> str:
+    mode = str(eval_cfg.get("mode") or "per_specialization")
+    return mode if mode in EVALUATION_MODES else "per_specialization"
+
+
+def _inventory_messages(skills: List[str], cv_packed: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_ROLE},
+        {"role": "user", "content": get_skill_inventory_prompt(skills, cv_packed)},
+    ]
+
+
+def extract_skill_inventory(
+    cv_text: str,
+    skills: Optional[List[str]] = None,
+    *,
+    model: Optional[str] = None,
+    timeline: Optional[Timeline] = None,
+) -> Tuple[skill_inventory.Inventory, int, int]:
+    """One skill_inventory prompt: (evidence level per skill, tokens, calls made). `skills`: default every
+    distinct skill of the current matrix. Raises when the call fails or its answer has no
+    usable inventory."""
+    options = _api_options(None, model, None, None)
+    eval_cfg = get_settings().get("evaluation") or {}
+    budget = {**DEFAULT_TOKEN_BUDGETS, **(eval_cfg.get("cv_token_budgets") or {})}["skill_inventory"]
+    if skills is None:
+        skills = skill_inventory.distinct_skills(data for _, _, data, _ in get_compiled_roles())
+    messages = _inventory_messages(skills, preprocess_cv(cv_text or "").pack("skill_inventory", budget))
+    answer = _complete_json(messages, options=options, temperature=eval_cfg.get("temperature", 0.2),
+                            timeline=timeline or Timeline(), prompt="skill_inventory")
+    inventory = skill_inventory.parse_inventory(answer.value, skills)
+    if inventory is None:
+        raise ValueError("skill_inventory answer does not match its schema")
+    return inventory, answer.tokens, answer.calls
+
+
 def evaluate_cv(
     cv_text: str,
     *,
@@ -130,94 +349,183 @@ def evaluate_cv(
     model: Optional[str] = None,
     base_url: Optional[str] = None,
     timeout: int = 120,
-    max_cv_chars: int = 12000,
+    token_budgets: Optional[Dict[str, int]] = None,
     progress_callback: Optional[Callable[[int, str], None]] = None,
+    timeline: Optional[Timeline] = None,
+    previous: Optional[Dict[str, Any]] = None,
+    cancelled: Optional[threading.Event] = None,
 ) -> Dict[str, Any]:
     """
     Evaluate CV against all Google Team specializations.
+    The CV is condensed once (normalized, split into sections) and packed into a
+    per-prompt token budget (evaluation.cv_token_budgets in config.yaml).
+    Each stage and LLM call (with retries, tokens and latency) is recorded on `timeline`.
+    `previous` ({"cv_text", "result"} of an earlier analysis of the same candidate): stages
+    whose input (packed CV text and the results they build on) did not change reuse its output.
+    evaluation.mode picks how specializations are scored: one spec_level call each
+    (per_specialization), or one skill_inventory call scored locally (inventory; falls back
+    to per_specialization when the extraction fails), or both (shadow: the inventory scores
+    are kept in inventory_specializations for comparison).
+    Once `cancelled` is set, the next progress step raises EvaluationCancelled (no further
+    LLM calls).
     Returns scores, descriptions, profile info, and usage metrics.
     """
+    timeline = timeline or Timeline()
+    prep_start = timeline.now()
     settings = get_settings()
-    api_key = api_key or settings.get("api_key")
-    api_cfg = settings.get("api") or {}
-    model = model or api_cfg.get("model", "gemini-3-pro")
-    base_url = base_url or api_cfg.get("base_url")
-    timeout = timeout or api_cfg.get("timeout_seconds", 120)
-    temperature = (settings.get("evaluation") or {}).get("temperature", 0.2)
-
-    if not api_key:
-        raise ValueError("FUELIX_API_KEY (or FUELIX_SECRET_TOKEN) must be set in .env")
-
-    skill_matrix = get_skill_matrix()
-    roles = _list_roles(skill_matrix)
-    cv_trimmed = (cv_text or "")[:max_cv_chars]
+    options = _api_options(api_key, model, base_url, timeout)
+    model = options["model"]
+    eval_cfg = settings.get("evaluation") or {}
+    temperature = eval_cfg.get("temperature", 0.2)
+    budgets = {**DEFAULT_TOKEN_BUDGETS, **(eval_cfg.get("cv_token_budgets") or {}), **(token_budgets or {})}
+    mode = _evaluation_mode(eval_cfg)
+
+    roles = get_compiled_roles()
+    version = current_version()
+    condensed = preprocess_cv(cv_text or "")
+    cv_for_prompt = {name: condensed.pack(name, budget) for name, budget in budgets.items()}
+    prev_result: Dict[str, Any] = (previous or {}).get("result") or {}
+    unchanged = set()
+    if previous and previous.get("cv_text"):
+        prev_condensed = preprocess_cv(previous["cv_text"])
+        unchanged = {name for name, budget in budgets.items() if prev_condensed.pack(name, budget) == cv_for_prompt[name]}
+    reused: List[str] = []
 
     api_call_count = 0
     total_tokens = 0
     api_times: List[float] = []
-
-    def _call(messages: list, temp: Optional[float] = None) -> dict:
+    # prompt -> {"answers", "repaired", "invalid"}: how often its answer missed the schema
+    answers: Dict[str, Dict[str, int]] = {}
+
+    def _call(
+        messages: list,
+        temp: Optional[float] = None,
+        *,
+        prompt: str,
+        area: Optional[str] = None,
+        specialization: Optional[str] = None,
+    ) -> Optional[dict]:
+        """The prompt's answer, valid against its schema (None when it is not after the repairs)."""
         nonlocal api_call_count, total_tokens
-        t0 = time.time()
-        out = chat_completion(
-            messages=messages,
-            model=model,
-            api_key=api_key,
-            base_url=base_url,
-            timeout=timeout,
-            temperature=temp if temp is not None else temperature,
+        answer = _complete_json(
+            messages, options=options, temperature=temp if temp is not None else temperature,
+            timeline=timeline, prompt=prompt, area=area, specialization=specialization,
         )
-        api_times.append(time.time() - t0)
-        api_call_count += 1
-        total_tokens += _extract_tokens(out)
-        return out
+        api_times.append(answer.seconds)
+        api_call_count += answer.calls
+        total_tokens += answer.tokens
+        counts = answers.setdefault(prompt, {"answers": 0, "repaired": 0, "invalid": 0})
+        counts["answers"] += 1
+        if answer.outcome != "valid":
+            counts[answer.outcome] += 1
+        return answer.value
 
     def _progress(pct: int, step: str) -> None:
+        # Every LLM call comes after a progress step, outside the per-call error handling
+        if cancelled is not None and cancelled.is_set():
+            raise EvaluationCancelled(step)
         if progress_callback:
             progress_callback(pct, step)
 
-    # ── 1. Per-specialization level ──────────────────────────────────────────
-    _progress(5, "Preparing analysis…")
-    specializations: List[Dict[str, Any]] = []
-    total_specs = len(roles)
+    def _stage_done(stage: str, started: float) -> None:
+        span = timeline.add(stage, started)
+        EVALUATION_STAGE_SECONDS.observe(span["duration"], stage=stage)
 
-    for i, (area, specialization, spec_data) in enumerate(roles):
-        pct = 5 + int((i / total_specs) * 58)
-        _progress(pct, f"Evaluating {area} — {specialization}…")
+    _stage_done("preparation", prep_start)
 
-        requirements_summary = build_role_requirements_text(area, specialization, spec_data)
-        prompt = get_spec_level_prompt(area, specialization, requirements_summary, cv_trimmed)
-        messages = [
-            {"role": "system", "content": SYSTEM_ROLE},
-            {"role": "user", "content": prompt},
-        ]
-        score = 1
-        try:
-            out = _call(messages, temp=temperature)
-            choice = (out.get("choices") or [{}])[0]
-            content = (choice.get("message") or {}).get("content") or ""
-            parsed = _parse_json_from_response(content)
-            if parsed:
-                raw = parsed.get("score")
-                if isinstance(raw, (int, float)):
-                    score = max(1, min(5, int(raw)))
-        except Exception:
-            pass
-        level = _score_to_level(score)
-        specializations.append({
-            "area": area,
-            "specialization": specialization,
-            "score": score,
-            "level": level,
-        })
+    # ── 1. Per-specialization level ──────────────────────────────────────────
+    specializations: List[Dict[str, Any]] = []
+    inventory: Optional[skill_inventory.Inventory] = None
+    if mode != "per_specialization":
+        # One skill_inventory call (only for skills the previous inventory did not assess)
+        _progress(5, "Extracting skill inventory…")
+        stage_start = timeline.now()
+        skills = skill_inventory.distinct_skills(data for _, _, data, _ in roles)
+        inventory = skill_inventory.from_list(prev_result.get("skill_inventory")) if "skill_inventory" in unchanged else {}
+        missing = [skill for skill in skills if skill not in inventory]
+        if not missing:
+            reused.append("skill_inventory")
+            SKILL_INVENTORY.inc(outcome="reused")
+        else:
+            try:
+                parsed = _call(_inventory_messages(missing, cv_for_prompt["skill_inventory"]), prompt="skill_inventory")
+                extracted = skill_inventory.parse_inventory(parsed, missing)
+            except Exception:
+                extracted = None
+            SKILL_INVENTORY.inc(outcome="extracted" if extracted is not None else "failed")
+            inventory = {**inventory, **extracted} if extracted is not None else None
+        if inventory is not None:
+            inventory = {skill: inventory[skill] for skill in skills}
+        elif mode == "inventory":
+            mode = "per_specialization"
+        _stage_done("skill_inventory", stage_start)
+
+    if mode == "inventory":
+        specializations = skill_inventory.specializations(
+            ((area, spec, data) for area, spec, data, _ in roles), inventory)
+    else:
+        _progress(5, "Preparing analysis…")
+        stage_start = timeline.now()
+        total_specs = len(roles)
+        # Scores of an inventory evaluation are not spec_level answers: never reused as such
+        prev_inventory_scored = (prev_result.get("metrics") or {}).get("evaluation_mode") == "inventory"
+        prev_specs = {
+            (s.get("area"), s.get("specialization")): s
+            for s in prev_result.get("specializations") or []
+            if isinstance(s, dict) and isinstance(s.get("score"), int)
+        } if "spec_level" in unchanged and not prev_inventory_scored else {}
+
+        for i, (area, specialization, spec_data, requirements_summary) in enumerate(roles):
+            pct = 5 + int((i / total_specs) * 58)
+            _progress(pct, f"Evaluating {area} — {specialization}…")
+
+            old = prev_specs.get((area, specialization))
+            if old:
+                specializations.append({
+                    "area": area,
+                    "specialization": specialization,
+                    "score": old["score"],
+                    "level": _score_to_level(old["score"]),
+                })
+                continue
+
+            prompt = get_spec_level_prompt(area, specialization, requirements_summary, cv_for_prompt["spec_level"])
+            messages = [
+                {"role": "system", "content": SYSTEM_ROLE},
+                {"role": "user", "content": prompt},
+            ]
+            score = 1
+            try:
+                parsed = _call(messages, temp=temperature, prompt="spec_level", area=area, specialization=specialization)
+                score = _spec_level_score(parsed)
+            except Exception:
+                pass
+            level = _score_to_level(score)
+            specializations.append({
+                "area": area,
+                "specialization": specialization,
+                "score": score,
+                "level": level,
+            })
+
+        if prev_specs:
+            reused.append("spec_level")
+        _stage_done("spec_scoring", stage_start)
+    spec_key = [(s["area"], s["specialization"], s["score"]) for s in specializations]
+    specs_unchanged = bool(prev_result) and spec_key == [
+        (s.get("area"), s.get("specialization"), s.get("score"))
+        for s in prev_result.get("specializations") or [] if isinstance(s, dict)
+    ]
 
     # ── 2. Area scores + most fitted ─────────────────────────────────────────
-    area_scores = _area_scores_from_specializations(specializations)
-    most_fitted_area = _most_fitted_area_from_specializations(specializations)
-    best_specializations = _best_specializations_for_area(most_fitted_area, specializations)
+    derived = derived_scores(specializations)
+    area_scores = derived["area_scores"]
+    most_fitted_area = derived["most_fitted_area"]
+    best_specializations = derived["best_specializations"]
 
     # ── 3. Area descriptions ─────────────────────────────────────────────────
     _progress(66, "Generating area descriptions…")
+    stage_start = timeline.now()
     area_descriptions: Dict[str, str] = {a: "" for a in AREAS_ORDER}
     by_area: Dict[str, List[Dict[str, Any]]] = {}
     for s in specializations:
@@ -227,56 +535,66 @@ def evaluate_cv(
         f"{area}: " + ", ".join(f"{s['specialization']} (score {s['score']}, {s['level']})" for s in by_area.get(area, []))
         for area in AREAS_ORDER
     )
-    try:
-        messages = [
-            {"role": "system", "content": SYSTEM_ROLE},
-            {"role": "user", "content": get_area_description_prompt(specs_by_area_text, cv_trimmed)},
-        ]
-        out = _call(messages)
-        choice = (out.get("choices") or [{}])[0]
-        content = (choice.get("message") or {}).get("content") or ""
-        parsed = _parse_json_from_response(content)
-        if parsed:
-            for a in AREAS_ORDER:
-                area_descriptions[a] = (parsed.get(a) or "").strip()
-    except Exception:
-        pass
+    if specs_unchanged and "area_description" in unchanged and prev_result.get("area_descriptions"):
+        area_descriptions = {a: str(prev_result["area_descriptions"].get(a) or "") for a in AREAS_ORDER}
+        reused.append("area_description")
+    else:
+        try:
+            messages = [
+                {"role": "system", "content": SYSTEM_ROLE},
+                {"role": "user", "content": get_area_description_prompt(specs_by_area_text, cv_for_prompt["area_description"])},
+            ]
+            parsed = _call(messages, prompt="area_description")
+            if parsed:
+                for a in AREAS_ORDER:
+                    area_descriptions[a] = (parsed.get(a) or "").strip()
+        except Exception:
+            pass
+
+    _stage_done("area_descriptions", stage_start)
 
     # ── 4. Education, soft skills, previous jobs ─────────────────────────────
     _progress(78, "Extracting profile information…")
+    stage_start = timeline.now()
     education_list: List[str] = []
     soft_skills_list: List[str] = []
     previous_jobs_list: List[str] = []
-    try:
-        messages = [
-            {"role": "system", "content": SYSTEM_ROLE},
-            {"role": "user", "content": get_education_soft_skills_prompt(cv_trimmed)},
-        ]
-        out = _call(messages)
-        choice = (out.get("choices") or [{}])[0]
-        content = (choice.get("message") or {}).get("content") or ""
-        parsed = _parse_json_from_response(content)
-        if parsed:
-            ed = parsed.get("education")
-            if isinstance(ed, list):
-                education_list = [str(x).strip() for x in ed if x]
-            elif isinstance(ed, str) and ed.strip():
-                education_list = [ed.strip()]
-            ss = parsed.get("soft_skills")
-            if isinstance(ss, list):
-                soft_skills_list = [str(x).strip() for x in ss if x]
-            elif isinstance(ss, str) and ss.strip():
-                soft_skills_list = [ss.strip()]
-            pj = parsed.get("previous_jobs")
-            if isinstance(pj, list):
-                previous_jobs_list = [str(x).strip() for x in pj if x]
-            elif isinstance(pj, str) and pj.strip():
-                previous_jobs_list = [pj.strip()]
-    except Exception:
-        pass
+    if "profile" in unchanged and any(prev_result.get(k) for k in ("education_list", "soft_skills_list", "previous_jobs_list")):
+        education_list = list(prev_result.get("education_list") or [])
+        soft_skills_list = list(prev_result.get("soft_skills_list") or [])
+        previous_jobs_list = list(prev_result.get("previous_jobs_list") or [])
+        reused.append("profile")
+    else:
+        try:
+            messages = [
+                {"role": "system", "content": SYSTEM_ROLE},
+                {"role": "user", "content": get_education_soft_skills_prompt(cv_for_prompt["profile"])},
+            ]
+            parsed = _call(messages, prompt="profile")
+            if parsed:
+                ed = parsed.get("education")
+                if isinstance(ed, list):
+                    education_list = [str(x).strip() for x in ed if x]
+                elif isinstance(ed, str) and ed.strip():
+                    education_list = [ed.strip()]
+                ss = parsed.get("soft_skills")
+                if isinstance(ss, list):
+                    soft_skills_list = [str(x).strip() for x in ss if x]
+                elif isinstance(ss, str) and ss.strip():
+                    soft_skills_list = [ss.strip()]
+                pj = parsed.get("previous_jobs")
+                if isinstance(pj, list):
+                    previous_jobs_list = [str(x).strip() for x in pj if x]
+                elif isinstance(pj, str) and pj.strip():
+                    previous_jobs_list = [pj.strip()]
+        except Exception:
+            pass
+
+    _stage_done("profile", stage_start)
 
     # ── 5. Candidate summary ─────────────────────────────────────────────────
     _progress(88, "Generating candidate summary…")
+    stage_start = timeline.now()
     results_text = f"Most fitted area: {most_fitted_area}\n"
     results_text += "Best specializations: " + ", ".join(
         f"{s['specialization']} (score {s['score']}, {s['level']})" for s in best_specializations
@@ -286,35 +604,40 @@ def evaluate_cv(
     )
     summary_messages = [
         {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "user", "content": get_summary_prompt(results_text, cv_trimmed)},
+        {"role": "user", "content": get_summary_prompt(results_text, cv_for_prompt["summary"])},
     ]
     candidate_summary = ""
     recommended_role = ""
     recommendation_reason = ""
-    try:
-        out = _call(summary_messages)
-        choice = (out.get("choices") or [{}])[0]
-        content = (choice.get("message") or {}).get("content") or ""
-        summary_parsed = _parse_json_from_response(content)
-        if summary_parsed:
-            candidate_summary = summary_parsed.get("candidate_summary", "")
-            recommended_role = (
-                f"{most_fitted_area} - {best_specializations[0]['specialization']}"
-                if best_specializations else most_fitted_area
-            )
-            recommendation_reason = summary_parsed.get("recommendation_reason", "")
-        else:
-            candidate_summary = content[:500] if content else "Summary not available."
+    if specs_unchanged and "summary" in unchanged and prev_result.get("candidate_summary"):
+        candidate_summary = prev_result["candidate_summary"]
+        recommended_role = prev_result.get("recommended_role") or most_fitted_area
+        recommendation_reason = prev_result.get("recommendation_reason") or ""
+        reused.append("summary")
+    else:
+        try:
+            summary_parsed = _call(summary_messages, prompt="summary")
+            if summary_parsed:
+                candidate_summary = summary_parsed.get("candidate_summary", "")
+                recommended_role = (
+                    f"{most_fitted_area} - {best_specializations[0]['specialization']}"
+                    if best_specializations else most_fitted_area
+                )
+                recommendation_reason = summary_parsed.get("recommendation_reason", "")
+            else:
+                candidate_summary = "Summary not available."
+                recommended_role = (
+                    f"{most_fitted_area} - {best_specializations[0]['specialization']}"
+                    if best_specializations else most_fitted_area
+                )
+        except Exception as e:
+            candidate_summary = f"Summary generation failed: {e}"
             recommended_role = (
                 f"{most_fitted_area} - {best_specializations[0]['specialization']}"
                 if best_specializations else most_fitted_area
             )
-    except Exception as e:
-        candidate_summary = f"Summary generation failed: {e}"
-        recommended_role = (
-            f"{most_fitted_area} - {best_specializations[0]['specialization']}"
-            if best_specializations else most_fitted_area
-        )
+
+    _stage_done("summary", stage_start)
 
     most_fitted_reason = (area_descriptions.get(most_fitted_area) or recommendation_reason or "").strip()
     if not most_fitted_reason and best_specializations:
@@ -342,10 +665,116 @@ def evaluate_cv(
         "candidate_summary": candidate_summary,
         "recommended_role": recommended_role,
         "recommendation_reason": recommendation_reason,
+        **({"skill_inventory": skill_inventory.to_list(inventory)} if inventory is not None else {}),
+        **({"inventory_specializations": skill_inventory.specializations(
+            ((area, spec, data) for area, spec, data, _ in roles), inventory)}
+           if mode == "shadow" and inventory is not None else {}),
         "metrics": {
             "api_calls": api_call_count,
             "total_tokens": total_tokens,
-            "avg_api_call_seconds": round(sum(api_times) / len(api_times), 2) if api_times else 0,
+            "avg_api_call_seconds": round(sum(api_times) / api_call_count, 2) if api_call_count else 0,
             "model_used": model,
+            "cv_sections": condensed.section_names(),
+            "skill_matrix_version": version.id,
+            "evaluation_mode": mode,
+            "structured_output": answers,
+            **({"reused_stages": reused} if previous else {}),
         },
     }
+
+
+def rescore_specializations(
+    cv_text: str,
+    result: Dict[str, Any],
+    roles: Iterable[Role],
+    *,
+    model: Optional[str] = None,
+    timeline: Optional[Timeline] = None,
+) -> Dict[str, Any]:
+    """`result` scored again for `roles` only, against the current skill matrix.
+
+    Specializations follow the current matrix: the given roles (and any the result has no
+    score for) get a new spec_level call, the others keep their score, and roles no longer in
+    the matrix are dropped. area_scores, most_fitted_area, best_specializations and
+    recommended_role are recomputed locally; descriptions and the summary are kept as they
+    are. A result scored from a skill inventory is re-scored from it locally: only skills it
+    has not assessed yet are extracted (one skill_inventory call). A failed call raises
+    (nothing is half re-scored). Returns a new result.
+    """
+    timeline = timeline or Timeline()
+    options = _api_options(None, model, None, None)
+    eval_cfg = get_settings().get("evaluation") or {}
+    temperature = eval_cfg.get("temperature", 0.2)
+    budget = {**DEFAULT_TOKEN_BUDGETS, **(eval_cfg.get("cv_token_budgets") or {})}["spec_level"]
+    cv_packed = preprocess_cv(cv_text or "").pack("spec_level", budget)
+    roles_to_score = set(roles)
+    version = current_version()
+    old = {
+        (s.get("area"), s.get("specialization")): s
+        for s in result.get("specializations") or []
+        if isinstance(s, dict) and isinstance(s.get("score"), (int, float))
+    }
+
+    specializations: List[Dict[str, Any]] = []
+    scored: List[str] = []
+    calls = tokens = 0
+    inventory: Optional[skill_inventory.Inventory] = None
+    if result.get("skill_inventory") is not None:
+        inventory = skill_inventory.from_list(result["skill_inventory"])
+        skills = skill_inventory.distinct_skills(data for _, _, data, _ in get_compiled_roles())
+        missing = [skill for skill in skills if skill not in inventory]
+        if missing:
+            extracted, used, made = extract_skill_inventory(cv_text, missing, model=options["model"], timeline=timeline)
+            inventory.update(extracted)
+            calls += made
+            tokens += used
+        inventory = {skill: inventory[skill] for skill in skills}
+    by_inventory = inventory is not None and (result.get("metrics") or {}).get("evaluation_mode") == "inventory"
+
+    for area, specialization, data, requirements_summary in get_compiled_roles():
+        prev = old.get((area, specialization))
+        if prev is not None and (area, specialization) not in roles_to_score:
+            score = prev["score"]
+        elif by_inventory:
+            score, _ = skill_inventory.score(data or {}, inventory)
+            scored.append(f"{area}/{specialization}")
+        else:
+            messages = [
+                {"role": "system", "content": SYSTEM_ROLE},
+                {"role": "user", "content": get_spec_level_prompt(area, specialization, requirements_summary, cv_packed)},
+            ]
+            answer = _complete_json(messages, options=options, temperature=temperature, timeline=timeline,
+                                    prompt="spec_level", area=area, specialization=specialization)
+            if answer.value is None:
+                raise ValueError(f"spec_level answer for {area}/{specialization} does not match its schema")
+            score = _spec_level_score(answer.value)
+            calls += answer.calls
+            tokens += answer.tokens
+            scored.append(f"{area}/{specialization}")
+        specializations.append({"area": area, "specialization": specialization, "score": score,
+                                "level": _score_to_level(score)})
+
+    derived = derived_scores(specializations)
+    best = derived["best_specializations"]
+    metrics = dict(result.get("metrics") or {})
+    metrics.update(
+        api_calls=int(metrics.get("api_calls") or 0) + calls,
+        total_tokens=int(metrics.get("total_tokens") or 0) + tokens,
+        skill_matrix_version=version.id,
+        rescored=list(metrics.get("rescored") or []) + [
+            {"skill_matrix_version": version.id, "specializations": scored, "model": options["model"], "calls": calls}
+        ],
+    )
+    return {
+        **result,
+        **derived,
+        "specializations": specializations,
+        **({"skill_inventory": skill_inventory.to_list(inventory)} if inventory is not None else {}),
+        **({"inventory_specializations": skill_inventory.specializations(
+            ((area, spec, data) for area, spec, data, _ in get_compiled_roles()), inventory)}
+           if inventory is not None and "inventory_specializations" in result else {}),
+        "recommended_role": (
+            f"{derived['most_fitted_area']} - {best[0]['specialization']}" if best else derived["most_fitted_area"]
+        ),
+        "metrics": metrics,
+    }
@@ -1,11 +1,52 @@
 """Fuelix API client - OpenAI-compatible chat completions."""
 import os
-from typing import Iterator, List, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
 
-import requests
+from src.telemetry import LLM_REQUEST_SECONDS, LLM_REQUESTS
+
+if TYPE_CHECKING:
+    import requests
 
 DEFAULT_BASE_URL = "https://api.fuelix.ai/v1"
 
+# requests is imported on first use (or by the warm-up hook) to keep it out of cold start
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+# Models that refused a response_format (400/422): asked without it from then on
+_no_response_format: Set[str] = set()
+# What an error body names when it is the response_format that was refused
+_RESPONSE_FORMAT_ERRORS = ("response_format", "json_schema")
+
+
+def get_session() -> "requests.Session":
+    """Process-wide session so evaluations reuse keep-alive TLS connections to Fuelix."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def warm_up(base_url: Optional[str] = None, timeout: float = 5.0) -> bool:
+    """Open a pooled connection to the API host ahead of the first evaluation."""
+    base_url = (base_url or os.getenv("FUELIX_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+    session = get_session()
+    try:
+        session.head(base_url, timeout=timeout)
+        return True
+    except OSError:  # requests.RequestException is an IOError
+        return False
+
 
 def _message_to_role_content(msg: dict) -> tuple:
     role = (msg.get("role") or "user").strip().lower()
@@ -15,6 +56,12 @@ def _message_to_role_content(msg: dict) -> tuple:
     return role, str(content)
 
 
+def _refuses_response_format(resp: "requests.Response") -> bool:
+    """Whether an error answer is about the response_format (not, say, the context length)."""
+    body = (resp.text or "").lower()
+    return any(term in body for term in _RESPONSE_FORMAT_ERRORS)
+
+
 def chat_completion(
     messages: List[dict],
     *,
@@ -23,11 +70,15 @@ def chat_completion(
     base_url: Optional[str] = None,
     timeout: int = 120,
     temperature: Optional[float] = None,
+    response_format: Optional[Dict[str, Any]] = None,
 ) -> dict:
     """
     Call Fuelix chat completions API.
     messages: list of {"role": "user"|"assistant"|"system", "content": "..."}
     temperature: lower (e.g. 0.1–0.2) for more consistent, accurate evaluation.
+    response_format: structured output (e.g. {"type": "json_schema", ...}). A model that
+    rejects it (a 400/422 whose body names response_format or json_schema) is asked again
+    without it, and never sent one again by this process; any other error raises.
     """
     api_key = api_key or os.getenv("FUELIX_API_KEY") or os.getenv("FUELIX_SECRET_TOKEN")
     base_url = (base_url or os.getenv("FUELIX_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
@@ -41,17 +92,25 @@ def chat_completion(
     }
     if temperature is not None:
         payload["temperature"] = max(0.0, min(2.0, float(temperature)))
-    resp = requests.post(
-        url,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        json=payload,
-        timeout=timeout,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    if response_format and model not in _no_response_format:
+        payload["response_format"] = response_format
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+    t0 = time.perf_counter()
+    outcome = "error"
+    try:
+        resp = get_session().post(url, headers=headers, json=payload, timeout=timeout)
+        outcome = str(resp.status_code)
+        if resp.status_code in (400, 422) and "response_format" in payload and _refuses_response_format(resp):
+            _no_response_format.add(model)
+            LLM_REQUESTS.inc(model=model, outcome=outcome)
+            payload.pop("response_format")
+            resp = get_session().post(url, headers=headers, json=payload, timeout=timeout)
+            outcome = str(resp.status_code)
+        resp.raise_for_status()
+        return resp.json()
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - t0, model=model)
+        LLM_REQUESTS.inc(model=model, outcome=outcome)
 
 
 def chat_completion_stream(
@@ -74,7 +133,7 @@ def chat_completion_stream(
         "messages": [{"role": m.get("role", "user"), "content": m.get("content", "")} for m in messages],
         "stream": True,
     }
-    with requests.post(
+    with get_session().post(
         url,
         headers={
             "Content-Type": "application/json",
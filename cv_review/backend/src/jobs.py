@@ -0,0 +1,235 @@
+"""Job registry kept in shared state so any worker can answer /api/jobs/{id}.
+
+Bounded: a finished job expires `ttl` seconds after it finished, and sweep() (run
+periodically by every worker) drops expired entries, the oldest finished jobs beyond
+`max_jobs` and batches none of whose jobs are left. Jobs still running are never evicted.
+
+Evaluations in flight are registered by key (normalized CV text, model, skill matrix), so
+an identical submission while one runs is attached to it instead of evaluated again.
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.shared_state import StateBackend
+
+FINISHED = ("complete", "failed")
+# An in-flight entry outlives its evaluation by at most this long (it is ignored once the job finished)
+INFLIGHT_TTL = 3600.0
+
+
+class JobStore:
+    def __init__(
+        self,
+        backend: StateBackend,
+        prefix: str = "job:",
+        requeue_prefix: str = "requeue:",
+        batch_prefix: str = "batch:",
+        inflight_prefix: str = "inflight:",
+        ttl: Optional[float] = None,
+        max_jobs: Optional[int] = None,
+    ):
+        """`ttl`: seconds a finished job is kept; `max_jobs`: jobs kept at most (None: unbounded)."""
+        self.backend = backend
+        self.prefix = prefix
+        self.requeue_prefix = requeue_prefix
+        self.batch_prefix = batch_prefix
+        self.inflight_prefix = inflight_prefix
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+
+    def create(self, job_id: str, **fields: Any) -> None:
+        job = {
+            "status": "processing",
+            "progress": 0,
+            "current_step": "Queued…",
+            "result": None,
+            "error": None,
+            **fields,
+        }
+        self._stamp(job)
+        self.backend.hset(self.prefix + job_id, job)
+        self._expire_if_finished(job_id, job)
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Set only the given fields; concurrent updates to other fields are kept."""
+        self._stamp(fields)
+        self.backend.hset(self.prefix + job_id, fields)
+        self._expire_if_finished(job_id, fields)
+
+    @staticmethod
+    def _stamp(fields: Dict[str, Any]) -> None:
+        if fields.get("status") in FINISHED and "finished_at" not in fields:
+            fields["finished_at"] = time.time()
+
+    def _expire_if_finished(self, job_id: str, fields: Dict[str, Any]) -> None:
+        if self.ttl is not None and fields.get("status") in FINISHED:
+            self.backend.expire(self.prefix + job_id, self.ttl)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job fields; a job linked to another (`same_as`, a repeated upload) reports that job's progress.
+
+        A finished job holds `analysis_id`, not a copy of the result: the caller reads the
+        stored analysis (older jobs may still carry `result`).
+        """
+        job = self.backend.hgetall(self.prefix + job_id) or None
+        if job and job.get("same_as"):
+            target = self.backend.hgetall(self.prefix + job["same_as"]) or {}
+            job = {**job, **{k: target[k] for k in ("status", "progress", "current_step", "result", "analysis_id", "error") if k in target}}
+        return job
+
+    def requeue(self, job_id: str, payload: Dict[str, Any]) -> None:
+        """Hand an unfinished job (cv text, filename, options) back for another worker to run."""
+        self.backend.hset(self.requeue_prefix + job_id, payload)
+        self.update(job_id, status="processing", progress=0, current_step="Re-queued after restart…")
+
+    def claim_requeued(self, limit: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+        """Take up to `limit` re-queued jobs; each is claimed by exactly one worker."""
+        claimed: List[Tuple[str, Dict[str, Any]]] = []
+        if not self.backend.keys(self.requeue_prefix):
+            return claimed
+        with self.backend.lock("requeue", timeout=5.0):
+            for key in self.backend.keys(self.requeue_prefix)[:limit]:
+                payload = self.backend.hgetall(key)
+                self.backend.delete(key)
+                if payload:
+                    claimed.append((key[len(self.requeue_prefix):], payload))
+        return claimed
+
+    def coalesce(self, key: str, job_id: str) -> Optional[str]:
+        """Register `job_id` as the evaluation of `key`, unless an unfinished job already is:
+        then that job's id is returned and nothing is registered.
+
+        A registered job that does not exist yet counts as running for a minute (it is
+        created right after registering); one that finished or is gone is replaced.
+        """
+        entry_key = self.inflight_prefix + key
+        with self.backend.lock("inflight", timeout=5.0):
+            entry = self.backend.hgetall(entry_key)
+            running = entry.get("job_id")
+            if running and running != job_id:
+                status = self.backend.hget(self.prefix + running, "status")
+                if status is None:
+                    status = "processing" if time.time() - entry.get("registered_at", 0) < 60 else "failed"
+                if status not in FINISHED:
+                    return running
+            self.backend.hset(entry_key, {"job_id": job_id, "registered_at": time.time()})
+            self.backend.expire(entry_key, INFLIGHT_TTL)
+        return None
+
+    # ── Batches (bulk uploads) ────────────────────────────────────────────────
+
+    def create_batch(self, batch_id: str, **fields: Any) -> None:
+        self.backend.hset(self.batch_prefix + batch_id, {
+            "status": "receiving",
+            "created": datetime.utcnow().isoformat(),
+            "items": [],
+            "rejected": [],
+            **fields,
+        })
+
+    def update_batch(self, batch_id: str, **fields: Any) -> None:
+        self.backend.hset(self.batch_prefix + batch_id, fields)
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Batch with per-job status and aggregated progress (failed jobs count as finished)."""
+        batch = self.backend.hgetall(self.batch_prefix + batch_id)
+        if not batch:
+            return None
+        counts = {"queued": 0, "processing": 0, "complete": 0, "failed": 0}
+        items = []
+        total_progress = 0
+        for item in batch.get("items") or []:
+            job = self.get(item["job_id"]) or {}
+            status = job.get("status", "failed")
+            if status == "processing" and not job.get("progress"):
+                status = "queued"
+            counts[status] = counts.get(status, 0) + 1
+            progress = 100 if status in ("complete", "failed") else int(job.get("progress") or 0)
+            total_progress += progress
+            items.append({
+                **item,
+                "status": status,
+                "progress": progress,
+                "current_step": job.get("current_step", ""),
+                "analysis_id": job.get("analysis_id") or (job.get("result") or {}).get("analysis_id"),
+                "error": job.get("error"),
+            })
+        n = len(items)
+        status = batch.get("status", "processing")
+        if status != "receiving":
+            status = "complete" if counts["complete"] + counts["failed"] == n else "processing"
+        return {
+            **batch,
+            "batch_id": batch_id,
+            "status": status,
+            "total": n,
+            "counts": counts,
+            "progress": round(total_progress / n) if n else (100 if status == "complete" else 0),
+            "items": items,
+        }
+
+    # ── Eviction ──────────────────────────────────────────────────────────────
+
+    def sweep(self) -> Dict[str, int]:
+        """Drop expired entries, then the oldest finished jobs beyond max_jobs, then batches
+        whose jobs are all gone. Returns what is left and what was removed."""
+        expired = self.backend.purge_expired()
+        now = time.time()
+        running = 0
+        finished: List[Tuple[float, str]] = []
+        keys = self.backend.keys(self.prefix)
+        for key in keys:
+            status, finished_at = self._status(key)
+            if status not in FINISHED:
+                running += 1
+                continue
+            if finished_at is None:
+                # Finished before jobs were stamped (or a link to a job that is gone): start its TTL now
+                finished_at = now
+                self.backend.hset(key, {"finished_at": now})
+                if self.ttl is not None:
+                    self.backend.expire(key, self.ttl)
+            finished.append((finished_at, key))
+
+        evicted = 0
+        if self.ttl is not None:
+            # Redis expires keys by itself; the SQLite backend only hides them until purged
+            for finished_at, key in finished:
+                if finished_at + self.ttl <= now:
+                    self.backend.delete(key)
+                    evicted += 1
+            finished = [(t, k) for t, k in finished if t + self.ttl > now]
+        if self.max_jobs is not None and running + len(finished) > self.max_jobs:
+            finished.sort()
+            excess = running + len(finished) - self.max_jobs
+            for _, key in finished[:excess]:
+                self.backend.delete(key)
+            evicted += min(excess, len(finished))
+            finished = finished[excess:]
+
+        batches = 0
+        for key in self.backend.keys(self.batch_prefix):
+            items = self.backend.hget(key, "items") or []
+            if items:
+                gone = not any(self.backend.hget(self.prefix + item["job_id"], "status") for item in items)
+            else:
+                # Nothing was accepted: kept for the client to read the rejections, then dropped
+                created = self.backend.hget(key, "created")
+                age = (datetime.utcnow() - datetime.fromisoformat(created)).total_seconds() if created else 0.0
+                gone = self.ttl is not None and age > self.ttl
+            if gone:
+                self.backend.delete(key)
+                batches += 1
+        return {"jobs": running + len(finished), "running": running, "finished": len(finished),
+                "expired": expired, "evicted": evicted, "batches_removed": batches}
+
+    def _status(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        """(status, finished_at) of a job; a link (`same_as`) has the status of its target,
+        and counts as failed once the target is gone."""
+        status = self.backend.hget(key, "status")
+        target = self.backend.hget(key, "same_as")
+        if target:
+            status = self.backend.hget(self.prefix + target, "status") or "failed"
+            return status, self.backend.hget(self.prefix + target, "finished_at") if status in FINISHED else None
+        return status, self.backend.hget(key, "finished_at")
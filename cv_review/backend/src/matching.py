@@ -0,0 +1,164 @@
+"""
+Requisition matching: map a free-text job description onto skill-matrix specialization
+weights once, then rank stored candidates with no per-candidate LLM call.
+
+The mapping comes from one LLM call (mapper "llm") or from the local embeddings: the
+requisition's similarity to each role's skills plus explicit mentions of a specialization
+(mapper "local", also the fallback when the LLM call fails). Mappings are cached per
+requisition text, mapper, model and skill matrix version.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from config.settings import SKILL_MATRIX_PATH, get_settings, skill_matrix_digest
+from src.dedup import normalize
+from src.embeddings import embed, features
+from src.evaluator import SYSTEM_ROLE, _api_options, _complete_json, get_compiled_roles
+from src.prompts import PROFILE_SIGNALS, get_requisition_prompt
+from src.timeline import Timeline
+
+MAPPERS = ("llm", "local")
+# Local mapper: roles within this fraction of the best role's similarity, at most MAX_ROLES
+LOCAL_KEEP = 0.6
+MAX_ROLES = 5
+# Similarity added when the requisition names the specialization ("Looker", "AI and ML")
+MENTION_BOOST = 0.5
+_SKILL_SECTIONS = ("core_skills", "web_networking", "additional")
+_CACHE_SIZE = 256
+
+_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_cache_guard = threading.Lock()
+_role_vectors: Dict[str, Any] = {"mtime": None, "keys": [], "vectors": None, "idf": {}}
+
+
+def role_key(area: str, specialization: str) -> str:
+    return f"{area}/{specialization}"
+
+
+def _role_skills(spec_data: dict) -> List[str]:
+    skills: List[str] = []
+    for section in _SKILL_SECTIONS:
+        block = (spec_data or {}).get(section) or {}
+        skills.extend(block.keys() if isinstance(block, dict) else (str(x) for x in block))
+    return skills
+
+
+def roles_text() -> str:
+    """One line per role for the mapping prompt: "Area/Specialization: skill, skill, …"."""
+    return "\n".join(
+        f"- {role_key(area, spec)}: {', '.join(_role_skills(data))}" for area, spec, data, _ in get_compiled_roles()
+    )
+
+
+def _roles_embedded() -> Tuple[List[str], np.ndarray, Dict[str, float]]:
+    """Role keys, the embedding of each role's name, skills and profile signals, and the idf of
+    their words across roles (rebuilt when the skill matrix changes).
+
+    Most roles list the same generic skills (command line, DNS, HTTP): idf leaves the words
+    that tell roles apart.
+    """
+    mtime = SKILL_MATRIX_PATH.stat().st_mtime_ns
+    if _role_vectors["mtime"] != mtime:
+        roles = get_compiled_roles()
+        keys = [role_key(area, spec) for area, spec, _, _ in roles]
+        texts = [
+            f"{area} {spec} {spec}\n" + "\n".join(_role_skills(data)) + "\n" + PROFILE_SIGNALS.get((area, spec), "")
+            for area, spec, data, _ in roles
+        ]
+        df: Dict[str, int] = {}
+        for text in texts:
+            for feature in features(text):
+                df[feature] = df.get(feature, 0) + 1
+        idf = {feature: math.log(len(texts) / n) for feature, n in df.items()}
+        vectors = np.stack([embed(text, idf) for text in texts])
+        _role_vectors.update(mtime=mtime, keys=keys, vectors=vectors, idf=idf)
+    return _role_vectors["keys"], _role_vectors["vectors"], _role_vectors["idf"]
+
+
+def map_local(requisition: str) -> Dict[str, float]:
+    """Specialization weights from embedding similarity and explicit mentions; they sum to 1."""
+    keys, vectors, idf = _roles_embedded()
+    # Only words some role mentions count (the rest would only add hash collisions)
+    sims = vectors @ embed(requisition, idf, default_idf=0.0)
+    text = f" {' '.join(normalize(requisition))} "
+    for i, key in enumerate(keys):
+        name = " ".join(normalize(key.partition("/")[2]))
+        if name and f" {name} " in text:
+            sims[i] += MENTION_BOOST
+    best = float(sims.max()) if len(sims) else 0.0
+    if best <= 0:
+        return {}
+    picked = [i for i in np.argsort(-sims)[:MAX_ROLES] if sims[i] >= LOCAL_KEEP * best]
+    total = float(sum(sims[i] for i in picked))
+    return {keys[i]: round(float(sims[i]) / total, 3) for i in picked}
+
+
+def map_llm(requisition: str, model: str) -> Tuple[Dict[str, float], str, int]:
+    """(weights summing to 1, one-line summary, tokens) from one LLM call (and a repair call
+    when its answer does not match the schema); ValueError on an unusable answer."""
+    answer = _complete_json(
+        [
+            {"role": "system", "content": SYSTEM_ROLE},
+            {"role": "user", "content": get_requisition_prompt(requisition, roles_text())},
+        ],
+        options=_api_options(None, model, None, None),
+        temperature=(get_settings().get("evaluation") or {}).get("temperature", 0.2),
+        timeline=Timeline(),
+        prompt="requisition",
+    )
+    parsed = answer.value or {}
+    known = {role_key(area, spec) for area, spec, _, _ in get_compiled_roles()}
+    raw = parsed.get("requisition_weights")
+    weights = {
+        k: max(0.0, min(1.0, float(v)))
+        for k, v in (raw.items() if isinstance(raw, dict) else ())
+        if k in known and isinstance(v, (int, float)) and v > 0
+    }
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("no known specialization in the model's answer")
+    return {k: round(v / total, 3) for k, v in weights.items()}, str(parsed.get("summary") or ""), answer.tokens
+
+
+def map_requisition(requisition: str, mapper: str = "llm") -> Dict[str, Any]:
+    """{"weights", "mapper", "summary", "tokens", "cached", "mapping_ms"[, "fallback"]} for a requisition.
+
+    mapper "llm" falls back to "local" (with `fallback` set to the reason) when the call fails
+    or names no known specialization.
+    """
+    if mapper not in MAPPERS:
+        raise ValueError(f"mapper must be one of {MAPPERS}")
+    model = (get_settings().get("api") or {}).get("model", "gemini-3-pro")
+    key = hashlib.sha256(
+        "\x00".join([mapper, model if mapper == "llm" else "", skill_matrix_digest(), " ".join(normalize(requisition))]).encode("utf-8")
+    ).hexdigest()
+    with _cache_guard:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return {**hit, "cached": True}
+
+    t0 = time.perf_counter()
+    mapping: Dict[str, Any] = {"mapper": mapper, "summary": "", "tokens": 0}
+    if mapper == "llm":
+        try:
+            mapping["weights"], mapping["summary"], mapping["tokens"] = map_llm(requisition, model)
+            mapping["model"] = model
+        except Exception as exc:
+            mapping.update(mapper="local", fallback=str(exc)[:200])
+    if mapping["mapper"] == "local":
+        mapping["weights"] = map_local(requisition)
+    mapping["mapping_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    if "fallback" not in mapping:
+        # A failed call is retried next time rather than cached
+        with _cache_guard:
+            _cache[key] = mapping
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return {**mapping, "cached": False}
@@ -89,7 +89,7 @@ def get_evaluation_prompt(requirements: str, cv_text: str) -> str:
 def get_summary_prompt(per_role_results: str, cv_excerpt: str) -> str:
     return SUMMARY_AND_RECOMMENDATION_PROMPT.format(
         per_role_results=per_role_results,
-        cv_excerpt=cv_excerpt[:6000],
+        cv_excerpt=cv_excerpt,
     )
 
 
@@ -179,6 +179,8 @@ Respond with a JSON object only. Keys must be exactly: Infrastructure, Networkin
 """
 
 
+# The get_*_prompt builders below take CV text already packed to a token budget by
+# src.cv_condenser, so they no longer cut it by characters.
 def get_spec_level_prompt(area: str, specialization: str, requirements_summary: str, cv_text: str) -> str:
     signals = _get_profile_signals(area, specialization)
     profile_signals_block = f"\nProfile accuracy — {specialization}:\n{signals}\n" if signals else ""
@@ -187,14 +189,14 @@ def get_spec_level_prompt(area: str, specialization: str, requirements_summary:
         specialization=specialization,
         requirements_summary=requirements_summary[:2000],
         profile_signals_block=profile_signals_block,
-        cv_text=cv_text[:8000],
+        cv_text=cv_text,
     )
 
 
 def get_area_description_prompt(specs_by_area: str, cv_text: str) -> str:
     return AREA_DESCRIPTION_PROMPT.format(
         specs_by_area=specs_by_area,
-        cv_text=cv_text[:6000],
+        cv_text=cv_text,
     )
 
 
@@ -217,4 +219,69 @@ Respond with a JSON object only:
 
 
 def get_education_soft_skills_prompt(cv_text: str) -> str:
-    return EDUCATION_SOFT_SKILLS_JOBS_PROMPT.format(cv_text=cv_text[:10000])
+    return EDUCATION_SOFT_SKILLS_JOBS_PROMPT.format(cv_text=cv_text)
+
+
+# --- Requisition → specialization weights (candidate matching) ---
+REQUISITION_PROMPT = """A hiring manager wrote the job requisition below. Map it onto the Google Team specializations it needs, so stored candidates can be ranked by their existing specialization scores.
+
+Specializations (Area/Specialization: key skills):
+{roles}
+
+---
+JOB REQUISITION:
+---
+{requisition}
+---
+
+Give a weight from 0 to 1 to every specialization the role really needs (1 = central to the role, 0.3 = nice to have); leave out the rest. Use the keys exactly as listed.
+
+Respond with a JSON object only:
+{{"requisition_weights": {{"<Area>/<Specialization>": <weight 0-1>, ...}}, "summary": "<one sentence: what the role needs>"}}
+"""
+
+
+def get_requisition_prompt(requisition: str, roles: str) -> str:
+    return REQUISITION_PROMPT.format(requisition=requisition, roles=roles)
+
+
+# --- Skill inventory: evidence level per skill of the matrix (evaluation.mode: inventory) ---
+SKILL_INVENTORY_PROMPT = """List the evidence the candidate CV below gives for each skill. Judge only what the CV actually shows (roles, projects, certifications, tools used); do not infer skills from job titles alone.
+
+Levels:
+- Advanced: deep, hands-on, repeated or leading experience with this skill.
+- Intermediate: clear practical use in at least one role or project.
+- Basic: mentioned, studied or used marginally.
+- None: no evidence in the CV.
+
+SKILLS TO ASSESS:
+{skills}
+
+---
+CANDIDATE CV (excerpt):
+---
+{cv_text}
+---
+
+Use the skill names exactly as listed, one entry per skill. "evidence": a short quote or paraphrase from the CV (empty for None).
+
+Respond with a JSON object only:
+{{"skills": {{"<skill>": {{"level": "None|Basic|Intermediate|Advanced", "evidence": "<short quote>"}}, ...}}}}
+"""
+
+
+def get_skill_inventory_prompt(skills: list, cv_text: str) -> str:
+    return SKILL_INVENTORY_PROMPT.format(skills="\n".join(f"- {s}" for s in skills), cv_text=cv_text)
+
+
+# --- Repair: an answer that did not match its JSON schema, asked once more ---
+REPAIR_PROMPT = """Your previous answer did not match the required JSON format:
+{errors}
+
+Answer again with the corrected JSON object only (no prose, no code fences), matching this JSON schema:
+{schema}
+"""
+
+
+def get_repair_prompt(errors: list, schema: str) -> str:
+    return REPAIR_PROMPT.format(errors="\n".join(f"- {e}" for e in errors), schema=schema)
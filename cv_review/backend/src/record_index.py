@@ -0,0 +1,285 @@
+"""
+Secondary indexes over the stored analyses, so filtered queries do not scan the history.
+
+Built once per version of analyses.json (Storage rebuilds it when the file changes) over
+compact records (src/compact.py): id -> position, area -> positions, model -> positions, plus positions sorted by timestamp
+and by any area / specialization score (those columns on first use). A query intersects the candidate sets of its
+filters smallest-first and only sorts what is left.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.compact import CompactRecord
+
+SORT_KEYS = ("timestamp", "analysis_time_seconds", "total_tokens", "filename")
+
+
+class _SortedColumn:
+    """Positions ordered by a value, with the values alongside for range lookups."""
+
+    __slots__ = ("values", "positions", "_rank")
+
+    def __init__(self, pairs: Iterable[Tuple[Any, int]]):
+        ordered = sorted(pairs)
+        self.values = [v for v, _ in ordered]
+        self.positions = [p for _, p in ordered]
+        self._rank: Optional[Dict[int, int]] = None
+
+    def rank(self) -> Dict[int, int]:
+        """position -> place in this order (built on first use)."""
+        if self._rank is None:
+            self._rank = {pos: i for i, pos in enumerate(self.positions)}
+        return self._rank
+
+    def range(self, low: Any = None, high: Any = None) -> List[int]:
+        """Positions with low <= value <= high (either bound optional)."""
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        return self.positions[start:end]
+
+
+class RecordIndex:
+    def __init__(self, records: Sequence[CompactRecord]):
+        self.records = records
+        self.by_id: Dict[str, int] = {}
+        self.by_area: Dict[str, List[int]] = {}
+        self.by_model: Dict[str, List[int]] = {}
+        for pos, record in enumerate(records):
+            if record.id:
+                self.by_id[record.id] = pos
+            self.by_area.setdefault(record.most_fitted_area or "", []).append(pos)
+            self.by_model.setdefault(record.model_used or "", []).append(pos)
+        # Score and sort columns are built on first use: only the keys actually queried cost anything
+        self._scores: Dict[str, _SortedColumn] = {}
+        self._orders: Dict[str, _SortedColumn] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def score_column(self, key: str) -> _SortedColumn:
+        """Positions of the records that have score `key`, ordered by that score."""
+        column = self._scores.get(key)
+        if column is None:
+            area, _, spec = key.partition("/")
+            pairs = []
+            for pos, record in enumerate(self.records):
+                value = _score(record.scores(), area, spec)
+                if value is not None:
+                    pairs.append((value, pos))
+            column = self._scores[key] = _SortedColumn(pairs)
+        return column
+
+    def order(self, sort: str) -> _SortedColumn:
+        """Positions sorted ascending by a SORT_KEYS field or a score key ("score:Data")."""
+        column = self._orders.get(sort)
+        if column is None:
+            if sort.startswith("score:"):
+                key = sort[len("score:"):]
+                # Records without that score sort lowest
+                scored = self.score_column(key)
+                have = set(scored.positions)
+                pairs = [(float("-inf"), p) for p in range(len(self.records)) if p not in have]
+                pairs += zip(scored.values, scored.positions)
+                column = _SortedColumn(pairs)
+            elif sort in SORT_KEYS:
+                column = _SortedColumn((_sort_value(r.get(sort), sort), p) for p, r in enumerate(self.records))
+            else:
+                raise ValueError(f"Unknown sort key: {sort}")
+            self._orders[sort] = column
+        return column
+
+    def query(
+        self,
+        ids: Optional[Iterable[str]] = None,
+        area: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_scores: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+        sort: str = "timestamp",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Tuple[int, List[int]]:
+        """(number of matches, positions of the requested page).
+
+        date_from / date_to: ISO dates YYYY-MM-DD, inclusive, compared with the timestamp's
+        date part. min_scores: score key -> minimum ("Data": 3.5, "Data/AI and ML": 4).
+        """
+        candidates: List[List[int]] = []
+        if ids is not None:
+            candidates.append([self.by_id[i] for i in ids if i in self.by_id])
+        if area:
+            candidates.append(self.by_area.get(area, []))
+        if model:
+            candidates.append(self.by_model.get(model, []))
+        if date_from or date_to:
+            # "YYYY-MM-DD~" sorts after every timestamp on that date ("~" > "T" and digits)
+            hits = self.order("timestamp").range(date_from or None, (date_to + "~") if date_to else None)
+            if not date_from:
+                hits = [p for p in hits if self.records[p].get("timestamp")]
+            candidates.append(hits)
+        for key, minimum in (min_scores or {}).items():
+            candidates.append(self.score_column(key).range(float(minimum)))
+
+        order = self.order(sort)
+        n = len(order.positions)
+        end = n if limit is None else min(n, offset + limit)
+        if not candidates:
+            if descending:
+                return n, order.positions[max(0, n - end):max(0, n - offset)][::-1]
+            return n, order.positions[offset:end]
+
+        # Smallest candidate set first; every other filter only narrows it
+        candidates.sort(key=len)
+        matches: Set[int] = set(candidates[0])
+        for hits in candidates[1:]:
+            if not matches:
+                break
+            matches.intersection_update(hits)
+        total = len(matches)
+        if total * 8 < len(self.records):
+            rank = order.rank()
+            page = sorted(matches, key=rank.__getitem__, reverse=descending)
+            return total, page[offset:end]
+        # Large result: walk the sort order and stop once the page is filled
+        walk = reversed(order.positions) if descending else iter(order.positions)
+        page = []
+        skipped = 0
+        for pos in walk:
+            if pos not in matches:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append(pos)
+            if limit is not None and len(page) >= limit:
+                break
+        return total, page
+
+
+def _score(result: Dict[str, Any], area: str, spec: str) -> Optional[float]:
+    if not spec:
+        value = (result.get("area_scores") or {}).get(area)
+        return float(value) if isinstance(value, (int, float)) else None
+    for item in result.get("specializations") or []:
+        if isinstance(item, dict) and item.get("area") == area and item.get("specialization") == spec:
+            value = item.get("score")
+            return float(value) if isinstance(value, (int, float)) else None
+    return None
+
+
+def _sort_value(value: Any, sort: str) -> Any:
+    if sort in ("timestamp", "filename"):
+        return str(value or "")
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def listing_key(row: Dict[str, Any]) -> Tuple[str, str]:
+    return (str(row.get("timestamp") or ""), str(row.get("id") or ""))
+
+
+def parse_cursor(cursor: str) -> Tuple[str, str]:
+    """`after` cursor "<timestamp>,<id>" (as returned in next_cursor) -> listing key."""
+    timestamp, sep, analysis_id = cursor.rpartition(",")
+    if not sep:
+        raise ValueError("cursor must be <timestamp>,<id>")
+    return (timestamp, analysis_id)
+
+
+class ListingIndex:
+    """Slim listing rows ordered by (timestamp, id), for newest-first keyset pagination.
+
+    A page starts by bisecting to the cursor and walks back only as far as it needs, so
+    page N costs the same as page 1. Area / model filters walk their own position lists.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.rows = sorted(rows, key=listing_key)
+        self.keys = [listing_key(r) for r in self.rows]
+        self.by_area: Dict[str, List[int]] = {}
+        self.by_model: Dict[str, List[int]] = {}
+        for pos, row in enumerate(self.rows):
+            self.by_area.setdefault(row.get("most_fitted_area") or "", []).append(pos)
+            self.by_model.setdefault(row.get("model_used") or "", []).append(pos)
+        self._totals: Dict[Tuple, int] = {}
+        self._by_id: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Row of one analysis (id map built on first use)."""
+        if self._by_id is None:
+            self._by_id = {row.get("id"): row for row in self.rows}
+        return self._by_id.get(analysis_id)
+
+    def page(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[str, str]] = None,
+        offset: int = 0,
+        area: Optional[str] = None,
+        model: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, Any]], Optional[str]]:
+        """(matches in total, rows of the page newest first, cursor for the next page or None)."""
+        # Positions [low, high) hold the date range; the cursor lowers high further
+        low = bisect_left(self.keys, (date_from, "")) if date_from else 0
+        high = bisect_right(self.keys, (date_to + "~", "")) if date_to else len(self.keys)
+        if after is not None:
+            high = min(high, bisect_left(self.keys, after))
+        total = self._total(area, model, date_from, date_to)
+
+        # Walk the smallest applicable position list downwards from `high`
+        lists = []
+        if area:
+            lists.append(self.by_area.get(area, []))
+        if model:
+            lists.append(self.by_model.get(model, []))
+        if lists:
+            positions = min(lists, key=len)
+            end = bisect_left(positions, high)
+            start = bisect_left(positions, low)
+            walk = (positions[i] for i in range(end - 1, start - 1, -1))
+        else:
+            if not (date_from or date_to):
+                # Every position matches: skip the offset arithmetically
+                high, offset = max(low, high - offset), 0
+            walk = iter(range(high - 1, low - 1, -1))
+
+        out: List[Dict[str, Any]] = []
+        skipped = 0
+        has_more = False
+        for pos in walk:
+            row = self.rows[pos]
+            if (area and (row.get("most_fitted_area") or "") != area) or (model and (row.get("model_used") or "") != model):
+                continue
+            if (date_from or date_to) and not row.get("timestamp"):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(out) == limit:
+                has_more = True
+                break
+            out.append(row)
+        next_cursor = ",".join(listing_key(out[-1])) if has_more and out else None
+        return total, out, next_cursor
+
+    def _total(self, area: Optional[str], model: Optional[str], date_from: Optional[str], date_to: Optional[str]) -> int:
+        key = (area, model, date_from, date_to)
+        if key not in self._totals:
+            if not any(key):
+                self._totals[key] = len(self.rows)
+            else:
+                low = bisect_left(self.keys, (date_from, "")) if date_from else 0
+                high = bisect_right(self.keys, (date_to + "~", "")) if date_to else len(self.keys)
+                self._totals[key] = sum(
+                    1 for row in self.rows[low:high]
+                    if (not area or (row.get("most_fitted_area") or "") == area)
+                    and (not model or (row.get("model_used") or "") == model)
+                    and (not (date_from or date_to) or row.get("timestamp"))
+                )
+        return self._totals[key]
@@ -0,0 +1,223 @@
+"""
+Report rendering off the request path: a per-record PDF fragment cache, a process pool
+for reportlab, and the background report jobs behind /api/reports/jobs.
+
+A candidate's PDF section is rendered once per record version and kept on disk in the
+data directory, so repeat downloads and multi-candidate PDFs (cover page + cached
+fragments merged with pypdf) skip reportlab for every unchanged record. The cover page
+carries the generation time and is rendered for every download.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.reports import (
+    iter_csv_report,
+    iter_excel_report,
+    iter_parquet_report,
+    merge_pdfs,
+    render_pdf_fragment,
+    render_pdf_title,
+)
+from src.telemetry import REPORT_RENDER_SECONDS
+
+# Bump when the PDF layout changes so fragments rendered by older code are not reused
+RENDER_VERSION = 1
+
+REPORT_MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_STREAM_WRITERS = {"xlsx": iter_excel_report, "csv": iter_csv_report, "parquet": iter_parquet_report}
+
+
+def record_version(record: Dict[str, Any]) -> str:
+    """Content digest of a stored record: changes whenever anything in it changes."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class FragmentCache:
+    """Rendered PDF fragments on disk, keyed by analysis id + record version.
+
+    Files are written atomically, so every worker (and instance sharing the data volume)
+    can read and fill the same cache without locking.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, record: Dict[str, Any], kind: str = "section") -> Path:
+        analysis_id = str(record.get("id") or "unknown")
+        return self.cache_dir / f"{analysis_id}-{record_version(record)}-r{RENDER_VERSION}-{kind}.pdf"
+
+    def get(self, record: Dict[str, Any], kind: str = "section") -> Optional[Path]:
+        path = self.path(record, kind)
+        return path if path.exists() else None
+
+    def put(self, record: Dict[str, Any], data: bytes, kind: str = "section") -> Path:
+        path = self.path(record, kind)
+        _atomic_write(path, data)
+        return path
+
+    def discard(self, analysis_id: str) -> int:
+        """Drop every cached fragment of an analysis (all versions)."""
+        n = 0
+        for path in self.cache_dir.glob(f"{analysis_id}-*.pdf"):
+            try:
+                path.unlink()
+                n += 1
+            except OSError:
+                pass
+        return n
+
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_render_pool(max_workers: int = 2) -> ProcessPoolExecutor:
+    """Process pool for reportlab (CPU-bound, holds the GIL); created on first use."""
+    global _render_pool
+    if _render_pool is None:
+        # spawn: forking a process that runs an event loop and threads is not safe
+        _render_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def _timed(render: Callable[..., bytes], *args: Any) -> Tuple[bytes, float]:
+    """render(*args) and its duration; runs in the pool, whose processes have their own
+    metrics registry, so the caller records the duration (_result)."""
+    t0 = time.perf_counter()
+    return render(*args), time.perf_counter() - t0
+
+
+def _result(future: Any, format: str) -> bytes:
+    """A render submitted as pool.submit(_timed, ...): its output, with its render time
+    observed in this process (served by /metrics)."""
+    data, seconds = future.result()
+    REPORT_RENDER_SECONDS.observe(seconds, format=format)
+    return data
+
+
+def candidate_pdf(record: Dict[str, Any], cache: FragmentCache, pool: Executor) -> bytes:
+    """Single-candidate PDF: a fresh cover page and the candidate's cached section."""
+    buf = io.BytesIO()
+    write_pdf_report([record], cache, pool, buf)
+    return buf.getvalue()
+
+
+def ensure_fragments(
+    records: List[Dict[str, Any]],
+    cache: FragmentCache,
+    pool: Executor,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Path]:
+    """Paths of every record's section, rendering only the ones missing from the cache."""
+    paths: List[Optional[Path]] = [cache.get(r) for r in records]
+    missing = [i for i, p in enumerate(paths) if p is None]
+    done = len(records) - len(missing)
+    if on_progress:
+        on_progress(done, len(records))
+    futures = {i: pool.submit(_timed, render_pdf_fragment, records[i]) for i in missing}
+    for i, future in futures.items():
+        paths[i] = cache.put(records[i], _result(future, "pdf_fragment"))
+        done += 1
+        if on_progress and (done % 10 == 0 or done == len(records)):
+            on_progress(done, len(records))
+    return paths  # type: ignore[return-value]
+
+
+def write_pdf_report(
+    records: List[Dict[str, Any]],
+    cache: FragmentCache,
+    pool: Executor,
+    fileobj: Any,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    """Multi-candidate PDF: a fresh cover page followed by the cached per-candidate sections."""
+    title = pool.submit(_timed, render_pdf_title)
+    paths = ensure_fragments(records, cache, pool, on_progress)
+    merge_pdfs([io.BytesIO(_result(title, "pdf_title")), *paths], fileobj)
+
+
+def write_report_file(
+    format: str,
+    records: Iterable[Dict[str, Any]],
+    path: Path,
+    cache: FragmentCache,
+    pool: Executor,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Render a report of any format to `path` (atomically); returns the number of records."""
+    count = 0
+
+    def counted(rows: Iterable[Dict[str, Any]]):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if format == "pdf":
+                records = list(records)
+                count = len(records)
+                write_pdf_report(records, cache, pool, f, on_progress)
+            else:
+                for chunk in _STREAM_WRITERS[format](counted(records)):
+                    f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def prune_report_files(reports_dir: Path, max_age_seconds: float) -> int:
+    """Delete finished report files older than max_age_seconds (their jobs have expired too)."""
+    cutoff = time.time() - max_age_seconds
+    n = 0
+    for path in reports_dir.glob("*.*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                n += 1
+        except OSError:
+            pass
+    return n
@@ -1,8 +1,12 @@
-"""High-level candidate reports for decision makers (Excel & PDF)."""
+"""High-level candidate reports for decision makers (Excel & PDF) and bulk exports (CSV / Parquet)."""
+import csv
 import io
 import re
+import tempfile
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.telemetry import REPORT_RENDER_SECONDS
 
 AREAS_ORDER = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
 
@@ -38,96 +42,265 @@ def _record_to_row(record: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def build_excel_report(records: List[Dict[str, Any]]) -> bytes:
+EXCEL_HEADERS = [
+    "Candidate",
+    "Date",
+    "Best-fit area",
+    "Recommended role",
+    "Summary",
+    "Recommendation reason",
+    "Infra",
+    "Network",
+    "Platform",
+    "Data",
+    "Other",
+    "Top specializations",
+    "Education",
+    "AI time (s)",
+]
+EXCEL_WIDTHS = [28, 12, 14, 24, 45, 35, 8, 8, 8, 8, 8, 32, 28, 10]
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def build_excel_report(records: Iterable[Dict[str, Any]]) -> bytes:
     """Build an Excel workbook with one summary sheet (high-level for decision makers)."""
+    buf = io.BytesIO()
+    write_excel_report(records, buf)
+    return buf.getvalue()
+
+
+def iter_excel_report(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Stream the Excel workbook in chunks; rows are pulled from `records` one at a time.
+
+    The xlsx is a zip, so it is assembled in a temporary file (not in memory) and read
+    back once complete.
+    """
+    with tempfile.TemporaryFile() as f:
+        write_excel_report(records, f)
+        f.seek(0)
+        while True:
+            chunk = f.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def write_excel_report(records: Iterable[Dict[str, Any]], fileobj: BinaryIO) -> None:
+    with REPORT_RENDER_SECONDS.time(format="xlsx"):
+        _write_excel_report(records, fileobj)
+
+
+def _write_excel_report(records: Iterable[Dict[str, Any]], fileobj: BinaryIO) -> None:
     from openpyxl import Workbook
-    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Candidate Summary"
-
-    # Header
-    headers = [
-        "Candidate",
-        "Date",
-        "Best-fit area",
-        "Recommended role",
-        "Summary",
-        "Recommendation reason",
-        "Infra",
-        "Network",
-        "Platform",
-        "Data",
-        "Other",
-        "Top specializations",
-        "Education",
-        "AI time (s)",
-    ]
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    # Write-only: rows go straight to the sheet's XML stream, nothing is kept per cell
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Candidate Summary")
+    # Column widths must be set before the first row is written
+    for col, width in enumerate(EXCEL_WIDTHS, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
     header_fill = PatternFill(start_color="4285F4", end_color="4285F4", fill_type="solid")
     header_font = Font(bold=True, color="FFFFFF")
-    for col, h in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=h)
+    header_alignment = Alignment(horizontal="center", wrap_text=True)
+    header = []
+    for h in EXCEL_HEADERS:
+        cell = WriteOnlyCell(ws, value=h)
         cell.fill = header_fill
         cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", wrap_text=True)
+        cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
 
-    for row_idx, record in enumerate(records, 2):
+    body_alignment = Alignment(wrap_text=True, vertical="top")
+    for record in records:
         row_data = _record_to_row(record)
         area_scores = row_data["area_scores"]
-        ws.cell(row=row_idx, column=1, value=row_data["filename"])
-        ws.cell(row=row_idx, column=2, value=row_data["timestamp"][:10] if row_data["timestamp"] else "—")
-        ws.cell(row=row_idx, column=3, value=row_data["most_fitted_area"])
-        ws.cell(row=row_idx, column=4, value=row_data["recommended_role"])
-        ws.cell(row=row_idx, column=5, value=row_data["candidate_summary"])
-        ws.cell(row=row_idx, column=6, value=row_data["recommendation_reason"])
-        for i, area in enumerate(AREAS_ORDER):
-            ws.cell(row=row_idx, column=7 + i, value=area_scores.get(area, "—"))
-        ws.cell(row=row_idx, column=12, value=row_data["top_specializations"])
-        ws.cell(row=row_idx, column=13, value=row_data["education"])
-        ws.cell(row=row_idx, column=14, value=row_data["analysis_time_seconds"])
-        for c in range(1, 15):
-            ws.cell(row=row_idx, column=c).alignment = Alignment(wrap_text=True, vertical="top")
-
-    # Column widths
-    ws.column_dimensions["A"].width = 28
-    ws.column_dimensions["B"].width = 12
-    ws.column_dimensions["C"].width = 14
-    ws.column_dimensions["D"].width = 24
-    ws.column_dimensions["E"].width = 45
-    ws.column_dimensions["F"].width = 35
-    for col in "GHIJ":
-        ws.column_dimensions[col].width = 8
-    ws.column_dimensions["K"].width = 8
-    ws.column_dimensions["L"].width = 32
-    ws.column_dimensions["M"].width = 28
-    ws.column_dimensions["N"].width = 10
+        values = [
+            row_data["filename"],
+            row_data["timestamp"][:10] if row_data["timestamp"] else "—",
+            row_data["most_fitted_area"],
+            row_data["recommended_role"],
+            row_data["candidate_summary"],
+            row_data["recommendation_reason"],
+            *(area_scores.get(area, "—") for area in AREAS_ORDER),
+            row_data["top_specializations"],
+            row_data["education"],
+            row_data["analysis_time_seconds"],
+        ]
+        row = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = body_alignment
+            row.append(cell)
+        ws.append(row)
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
+    wb.save(fileobj)
+
+
+# ── Bulk export (CSV / Parquet) ───────────────────────────────────────────────
+
+def _spec_columns() -> List[Tuple[str, str]]:
+    """(area, specialization) pairs in skill-matrix order: one score column each."""
+    from config.settings import get_skill_matrix
+
+    return [
+        (area, spec)
+        for area, area_data in (get_skill_matrix().get("areas") or {}).items()
+        for spec in (area_data.get("specializations") or {})
+    ]
+
+
+def _export_columns(spec_columns: List[Tuple[str, str]]) -> List[str]:
+    return [
+        "id", "filename", "timestamp", "most_fitted_area", "recommended_role",
+        *(f"score_{area}" for area in AREAS_ORDER),
+        "top_specializations", "education", "analysis_time_seconds", "api_calls",
+        "total_tokens", "model_used", "candidate_summary", "recommendation_reason",
+        *(f"{area} / {spec}" for area, spec in spec_columns),
+    ]
+
+
+def _export_row(record: Dict[str, Any], spec_columns: List[Tuple[str, str]]) -> List[Any]:
+    """One flat export row; missing scores are None (empty in CSV, null in Parquet)."""
+    result = record.get("result") or {}
+    area_scores = result.get("area_scores") or {}
+    spec_scores = {
+        (s.get("area"), s.get("specialization")): s.get("score")
+        for s in result.get("specializations") or []
+        if isinstance(s, dict)
+    }
+    return [
+        record.get("id"),
+        record.get("filename"),
+        record.get("timestamp"),
+        result.get("most_fitted_area"),
+        result.get("recommended_role"),
+        *(area_scores.get(area) for area in AREAS_ORDER),
+        ", ".join(str(s.get("specialization") or "") for s in (result.get("best_specializations") or [])[:5]),
+        "; ".join(str(x).strip() for x in result.get("education_list") or [] if x),
+        record.get("analysis_time_seconds"),
+        record.get("api_calls"),
+        record.get("total_tokens"),
+        record.get("model_used"),
+        result.get("candidate_summary"),
+        result.get("recommendation_reason"),
+        *(spec_scores.get(key) for key in spec_columns),
+    ]
+
+
+class _LineBuffer:
+    """csv.writer target that hands back what was written since the last take()."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def write(self, s: str) -> None:
+        self._parts.append(s)
+
+    def take(self) -> str:
+        out = "".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def iter_csv_report(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Stream a flat CSV export (one row per analysis, one column per specialization score)."""
+    with REPORT_RENDER_SECONDS.time(format="csv"):
+        spec_columns = _spec_columns()
+        buf = _LineBuffer()
+        writer = csv.writer(buf)
+        # BOM so Excel opens the UTF-8 file with the right encoding
+        writer.writerow(_export_columns(spec_columns))
+        pending = "\ufeff" + buf.take()
+        for record in records:
+            writer.writerow(_export_row(record, spec_columns))
+            pending += buf.take()
+            if len(pending) >= STREAM_CHUNK_BYTES:
+                yield pending.encode("utf-8")
+                pending = ""
+        if pending:
+            yield pending.encode("utf-8")
+
+
+def iter_parquet_report(records: Iterable[Dict[str, Any]], row_group_size: int = 5000) -> Iterator[bytes]:
+    """Stream a Parquet export with the CSV columns, written one row group at a time.
+
+    Requires pyarrow (optional dependency): raises ImportError when it is missing.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with REPORT_RENDER_SECONDS.time(format="parquet"):
+        spec_columns = _spec_columns()
+        columns = _export_columns(spec_columns)
+        schema = pa.schema(
+            [pa.field(c, pa.string()) for c in columns[:5]]  # id .. recommended_role
+            + [pa.field(f"score_{a}", pa.float64()) for a in AREAS_ORDER]
+            + [
+                pa.field("top_specializations", pa.string()),
+                pa.field("education", pa.string()),
+                pa.field("analysis_time_seconds", pa.float64()),
+                pa.field("api_calls", pa.int64()),
+                pa.field("total_tokens", pa.int64()),
+                pa.field("model_used", pa.string()),
+                pa.field("candidate_summary", pa.string()),
+                pa.field("recommendation_reason", pa.string()),
+            ]
+            + [pa.field(f"{area} / {spec}", pa.float64()) for area, spec in spec_columns]
+        )
+
+        def _to_batch(rows: List[List[Any]]) -> "pa.RecordBatch":
+            arrays = []
+            for i, field in enumerate(schema):
+                values = [_coerce(row[i], field.type) for row in rows]
+                arrays.append(pa.array(values, type=field.type))
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+        def _coerce(value: Any, type_: "pa.DataType") -> Any:
+            if value is None:
+                return None
+            try:
+                if pa.types.is_floating(type_):
+                    return float(value)
+                if pa.types.is_integer(type_):
+                    return int(value)
+            except (TypeError, ValueError):
+                return None
+            return str(value)
+
+        with tempfile.TemporaryFile() as f:
+            with pq.ParquetWriter(f, schema) as writer:
+                rows: List[List[Any]] = []
+                for record in records:
+                    rows.append(_export_row(record, spec_columns))
+                    if len(rows) >= row_group_size:
+                        writer.write_batch(_to_batch(rows))
+                        rows = []
+                if rows:
+                    writer.write_batch(_to_batch(rows))
+            f.seek(0)
+            while True:
+                chunk = f.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
 
 
 def build_pdf_report(records: List[Dict[str, Any]]) -> bytes:
     """Build a PDF with one section per candidate (high-level for decision makers)."""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib.units import inch
-    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    with REPORT_RENDER_SECONDS.time(format="pdf"):
+        return _build_pdf_report(records)
+
+
+def _pdf_styles() -> Dict[str, Any]:
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf,
-        pagesize=A4,
-        rightMargin=inch,
-        leftMargin=inch,
-        topMargin=inch,
-        bottomMargin=inch,
-    )
     styles = getSampleStyleSheet()
     # Style for table cell paragraphs: wrap text, smaller font
-    from reportlab.lib.styles import ParagraphStyle
     cell_style = ParagraphStyle(
         name="CellWrap",
         parent=styles["Normal"],
@@ -135,113 +308,193 @@ def build_pdf_report(records: List[Dict[str, Any]]) -> bytes:
         leading=11,
         wordWrap="CJK",  # enables word wrap
     )
-    story = []
+    return {"sheet": styles, "cell": cell_style}
+
+
+def _pdf_document(buf: BinaryIO):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    return SimpleDocTemplate(
+        buf,
+        pagesize=A4,
+        rightMargin=inch,
+        leftMargin=inch,
+        topMargin=inch,
+        bottomMargin=inch,
+    )
+
+
+def _title_story(styles: Dict[str, Any]) -> List[Any]:
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
 
     title = Paragraph(
         "<b>CV Review — Candidate Report (Google Team)</b><br/><font size=9 color=gray>High-level summary for decision making</font>",
-        styles["Title"],
+        styles["sheet"]["Title"],
     )
-    story.append(title)
-    story.append(Paragraph(f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", styles["Normal"]))
-    story.append(Spacer(1, 0.3 * inch))
+    return [
+        title,
+        Paragraph(f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", styles["sheet"]["Normal"]),
+        Spacer(1, 0.3 * inch),
+    ]
 
-    for record in records:
-        row_data = _record_to_row(record)
-        result = record.get("result") or {}
-        filename = _escape_paragraph_text(str(record.get("filename") or "—"), 200)
-        # Full summary and reason for PDF (with wrapping via Paragraph)
-        summary_full = (result.get("candidate_summary") or "—")
-        reason_full = (result.get("recommendation_reason") or "—")
-        summary_para = Paragraph(_escape_paragraph_text(summary_full, 2000), cell_style)
-        reason_para = Paragraph(_escape_paragraph_text(reason_full, 1000), cell_style)
-
-        story.append(Paragraph(f"<b>Candidate: {filename}</b>", styles["Heading2"]))
-        story.append(Spacer(1, 0.1 * inch))
-
-        # Key decision table: use Paragraph in cells so text wraps and shows in full
-        data = [
-            ["Best-fit area", row_data["most_fitted_area"]],
-            ["Recommended role", row_data["recommended_role"]],
-            ["Summary", summary_para],
-            ["Recommendation reason", reason_para],
-        ]
-        t = Table(data, colWidths=[1.8 * inch, 4.2 * inch])
-        t.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#E8F0FE")),
-                    ("TEXTCOLOR", (0, 0), (0, -1), colors.HexColor("#1967D2")),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (0, -1), 9),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                ]
-            )
+
+def _candidate_story(record: Dict[str, Any], styles: Dict[str, Any]) -> List[Any]:
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+    sheet, cell_style = styles["sheet"], styles["cell"]
+    story = []
+    row_data = _record_to_row(record)
+    result = record.get("result") or {}
+    filename = _escape_paragraph_text(str(record.get("filename") or "—"), 200)
+    # Full summary and reason for PDF (with wrapping via Paragraph)
+    summary_full = (result.get("candidate_summary") or "—")
+    reason_full = (result.get("recommendation_reason") or "—")
+    summary_para = Paragraph(_escape_paragraph_text(summary_full, 2000), cell_style)
+    reason_para = Paragraph(_escape_paragraph_text(reason_full, 1000), cell_style)
+
+    story.append(Paragraph(f"<b>Candidate: {filename}</b>", sheet["Heading2"]))
+    story.append(Spacer(1, 0.1 * inch))
+
+    # Key decision table: use Paragraph in cells so text wraps and shows in full
+    data = [
+        ["Best-fit area", row_data["most_fitted_area"]],
+        ["Recommended role", row_data["recommended_role"]],
+        ["Summary", summary_para],
+        ["Recommendation reason", reason_para],
+    ]
+    t = Table(data, colWidths=[1.8 * inch, 4.2 * inch])
+    t.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#E8F0FE")),
+                ("TEXTCOLOR", (0, 0), (0, -1), colors.HexColor("#1967D2")),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (0, -1), 9),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("LEFTPADDING", (0, 0), (-1, -1), 6),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ]
         )
-        story.append(t)
-        story.append(Spacer(1, 0.15 * inch))
-
-        # Area scores
-        area_vals = [str(row_data["area_scores"].get(a, "—")) for a in AREAS_ORDER]
-        score_headers = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
-        score_table = Table([score_headers, area_vals], colWidths=[1.1 * inch] * 5)
-        score_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F1F3F4")),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-            )
+    )
+    story.append(t)
+    story.append(Spacer(1, 0.15 * inch))
+
+    # Area scores
+    area_vals = [str(row_data["area_scores"].get(a, "—")) for a in AREAS_ORDER]
+    score_headers = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
+    score_table = Table([score_headers, area_vals], colWidths=[1.1 * inch] * 5)
+    score_table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F1F3F4")),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ]
         )
-        story.append(Paragraph("<b>Area scores (1–5)</b>", styles["Normal"]))
-        story.append(score_table)
-        story.append(Spacer(1, 0.1 * inch))
-        top_spec = _escape_paragraph_text(row_data.get("top_specializations") or "—", 300)
-        education = _escape_paragraph_text(row_data.get("education") or "—", 400)
-        story.append(Paragraph(f"<b>Top specializations:</b> {top_spec}", styles["Normal"]))
-        story.append(Paragraph(f"<b>Education:</b> {education}", styles["Normal"]))
-        story.append(Spacer(1, 0.35 * inch))
-
-    doc.build(story)
+    )
+    story.append(Paragraph("<b>Area scores (1–5)</b>", sheet["Normal"]))
+    story.append(score_table)
+    story.append(Spacer(1, 0.1 * inch))
+    top_spec = _escape_paragraph_text(row_data.get("top_specializations") or "—", 300)
+    education = _escape_paragraph_text(row_data.get("education") or "—", 400)
+    story.append(Paragraph(f"<b>Top specializations:</b> {top_spec}", sheet["Normal"]))
+    story.append(Paragraph(f"<b>Education:</b> {education}", sheet["Normal"]))
+    story.append(Spacer(1, 0.35 * inch))
+    return story
+
+
+def _build_pdf_report(records: List[Dict[str, Any]]) -> bytes:
+    styles = _pdf_styles()
+    story = _title_story(styles)
+    for record in records:
+        story.extend(_candidate_story(record, styles))
+    buf = io.BytesIO()
+    _pdf_document(buf).build(story)
     return buf.getvalue()
 
 
+# ── PDF fragments (rendered once per record version, assembled with pypdf) ─────
+
+def render_pdf_title() -> bytes:
+    """Cover page of a candidate PDF (carries the generation time, so never cached)."""
+    buf = io.BytesIO()
+    _pdf_document(buf).build(_title_story(_pdf_styles()))
+    return buf.getvalue()
+
+
+def render_pdf_fragment(record: Dict[str, Any]) -> bytes:
+    """One candidate's section as a standalone PDF.
+
+    Top-level and free of shared state so it can run in a process pool (which is also why
+    it records no metrics: the caller does, in its own process).
+    """
+    styles = _pdf_styles()
+    buf = io.BytesIO()
+    _pdf_document(buf).build(_candidate_story(record, styles))
+    return buf.getvalue()
+
+
+def merge_pdfs(parts: Iterable[Any], fileobj: BinaryIO) -> None:
+    """Concatenate PDFs (paths or file objects) page by page into fileobj."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(part)
+    writer.write(fileobj)
+    writer.close()
+
+
 def get_records_for_report(
     storage,
     analysis_ids: Optional[List[str]] = None,
     area_filter: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    limit: int = 200,
+    limit: Optional[int] = 200,
+    min_scores: Optional[Dict[str, float]] = None,
+    model: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    """Fetch analysis records from storage, optionally filtered by ids, area, or date range.
+    """Newest analysis records matching every filter (ids, area, date range, score minimums, model).
     date_from / date_to: ISO date strings YYYY-MM-DD (inclusive)."""
-    analyses = storage._read()
-    # Newest first
-    analyses = sorted(analyses, key=lambda x: x.get("timestamp", ""), reverse=True)[: limit * 2]
-
-    if analysis_ids:
-        id_set = set(analysis_ids)
-        analyses = [a for a in analyses if a.get("id") in id_set]
-    if area_filter:
-        analyses = [a for a in analyses if (a.get("result") or {}).get("most_fitted_area") == area_filter]
-
-    if date_from or date_to:
-        def _date_ok(ts: str) -> bool:
-            if not ts:
-                return False
-            # timestamp is ISO like 2025-02-23T20:00:00.000Z; compare date part
-            record_date = (ts.split("T")[0] if "T" in ts else ts[:10])[:10]
-            if date_from and record_date < date_from:
-                return False
-            if date_to and record_date > date_to:
-                return False
-            return True
-
-        analyses = [a for a in analyses if _date_ok(a.get("timestamp") or "")]
-
-    return analyses[:limit]
+    return storage.query(
+        ids=analysis_ids,
+        area=area_filter,
+        date_from=date_from,
+        date_to=date_to,
+        min_scores=min_scores,
+        model=model,
+        sort="timestamp",
+        descending=True,
+        limit=limit,
+    )["items"]
+
+
+def iter_records_for_report(
+    storage,
+    analysis_ids: Optional[List[str]] = None,
+    area_filter: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    min_scores: Optional[Dict[str, float]] = None,
+    model: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Same filters as get_records_for_report, uncapped, for the streamed exports (newest first).
+
+    Records are decoded one at a time as the export writes them (Storage.iter_analyses).
+    """
+    return storage.iter_analyses(
+        ids=analysis_ids,
+        area=area_filter,
+        date_from=date_from,
+        date_to=date_to,
+        min_scores=min_scores,
+        model=model,
+    )
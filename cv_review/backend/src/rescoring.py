@@ -0,0 +1,118 @@
+"""
+Background re-scoring of stored analyses after skill_matrix.yaml changes.
+
+Each stored analysis is stamped with the skill matrix version it was scored against. When
+the matrix changes, the backfill takes the stale analyses one at a time (oldest first), diffs
+their version against the current one and re-scores only the specializations that were
+added or whose requirements changed, from the CV text kept in the search index. Area
+scores, the best-fit area and best specializations are then recomputed locally
+(evaluator.rescore_specializations); nothing else is asked of the LLM. Analyses scored
+from a skill inventory (evaluation.mode: inventory) are re-scored from it locally, with at
+most one call for skills the inventory has not assessed yet.
+
+Throttled: at most `calls_per_minute` spec_level calls, paced while the shared lock is held
+so the rate holds across workers, and the caller skips steps while live evaluations queue.
+Analyses saved before versioning count as scored against the first version recorded. Stale
+analyses with nothing to re-score (no role changed since their version) are only stamped
+with the current version, all in one write.
+"""
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Set, Tuple
+
+from src.evaluator import current_version, rescore_specializations
+from src.skill_versions import Role, Version, VersionStore, diff
+from src.storage import Storage
+from src.telemetry import RESCORE_STALE, RESCORED
+
+# A failed analysis is retried after this long (the others go first meanwhile)
+RETRY_SECONDS = 600.0
+
+
+class Backfill:
+    def __init__(
+        self,
+        storage: Storage,
+        versions: VersionStore,
+        lock: Callable[[], ContextManager[Any]],
+        calls_per_minute: float = 30.0,
+    ):
+        """`lock`: held while one analysis is re-scored (shared state lock: one worker at a time)."""
+        self.storage = storage
+        self.versions = versions
+        self.lock = lock
+        self.calls_per_minute = calls_per_minute
+        # Analyses with no stored CV text (saved before the search index kept it): not re-scorable
+        self._no_text: Set[str] = set()
+        self._retry_at: Dict[str, float] = {}
+        self.last: Optional[Dict[str, Any]] = None
+
+    def record_current(self) -> str:
+        """Keep the current matrix in the version store; returns its id."""
+        return self.versions.record(current_version()).id
+
+    def step(self) -> Optional[Dict[str, Any]]:
+        """Re-score the oldest stale analysis; None when there is none (the lock may raise LockTimeout)."""
+        with self.lock():
+            current = self.versions.load(self.record_current())
+            now = time.monotonic()
+            stale = [(i, v) for i, v in self.storage.stale_analyses(current.id)
+                     if i not in self._no_text and self._retry_at.get(i, 0.0) <= now]
+            RESCORE_STALE.set(len(stale))
+            if not stale:
+                return None
+            # Roles to re-score, per version stale analyses are stamped with
+            plans: Dict[Optional[str], Tuple[Optional[Version], List[Role]]] = {}
+            for _, stamped in stale:
+                if stamped not in plans:
+                    old = self.versions.load(stamped) if stamped else (self.versions.versions() or [current])[0]
+                    plans[stamped] = (old, diff(old, current).rescore if old is not None else list(current.roles))
+            # Analyses the change leaves as they are (unversioned ones scored against the current
+            # matrix, say) only need the stamp: all of them in one write, no call
+            unchanged = {i: v for i, v in stale if not plans[v][1]}
+            if unchanged:
+                count = self.storage.stamp_skill_matrix_version(unchanged, current.id)
+                RESCORED.inc(count, outcome="stamped")
+                self.last = {"analyses": count, "outcome": "stamped", "to": current.id, "calls": 0, "seconds": 0.0}
+                return self.last
+            analysis_id, stamped = stale[0]
+            old, roles = plans[stamped]
+            record = self.storage.get_analysis(analysis_id)
+            if record is None:
+                return None
+            cv_text = self.storage.search.get_text(analysis_id) if self.storage.search else None
+            if roles and not cv_text:
+                self._no_text.add(analysis_id)
+                RESCORED.inc(outcome="no_cv_text")
+                return {"analysis_id": analysis_id, "outcome": "no_cv_text", "calls": 0}
+            started = time.monotonic()
+            try:
+                result = rescore_specializations(cv_text or "", record.get("result") or {}, roles,
+                                                 model=record.get("model_used") or None)
+            except Exception as exc:
+                self._retry_at[analysis_id] = time.monotonic() + RETRY_SECONDS
+                RESCORED.inc(outcome="failed")
+                return {"analysis_id": analysis_id, "outcome": "failed", "calls": len(roles), "error": str(exc)[:200]}
+            self._retry_at.pop(analysis_id, None)
+            saved = self.storage.save_rescored(analysis_id, result, expected_version=stamped)
+            latest = result["metrics"]["rescored"][-1]
+            calls = latest.get("calls", len(latest["specializations"]))
+            outcome = "rescored" if saved else "skipped"
+            RESCORED.inc(outcome=outcome)
+            self.last = {
+                "analysis_id": analysis_id, "outcome": outcome, "from": stamped or old.id, "to": current.id,
+                "calls": calls, "seconds": round(time.monotonic() - started, 2),
+            }
+            # Pace under the lock: the next analysis (on any worker) waits its turn
+            if calls and self.calls_per_minute > 0:
+                time.sleep(max(0.0, calls * 60.0 / self.calls_per_minute - (time.monotonic() - started)))
+            return self.last
+
+    def status(self) -> Dict[str, Any]:
+        current = current_version().id
+        counts = self.storage.skill_matrix_versions()
+        return {
+            "current": current,
+            "stale": sum(n for v, n in counts.items() if v != current),
+            "without_cv_text": len(self._no_text),
+            "last": self.last,
+        }
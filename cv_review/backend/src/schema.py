@@ -0,0 +1,116 @@
+"""
+Typed schema of a stored analysis record (msgspec structs).
+
+msgspec is optional. With it, Storage validates every record before it is saved and
+tools/export_analyses.py decodes whole files straight into these structs: one pass that
+checks types and allocates no intermediate dicts. Without it, validation is skipped and
+everything else works the same (records are read with orjson as plain dicts, which is
+what the rest of the code uses).
+
+Unknown fields are ignored, so older and newer records both decode; fields added later
+have defaults.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+AVAILABLE = msgspec is not None
+Number = Union[int, float]
+
+if AVAILABLE:
+
+    class Specialization(msgspec.Struct, omit_defaults=True):
+        area: str
+        specialization: str
+        score: Number
+        level: str = ""
+
+    class SkillEvidence(msgspec.Struct, omit_defaults=True):
+        skill: str
+        level: str = "None"
+        evidence: str = ""
+
+    class ResultMetrics(msgspec.Struct, omit_defaults=True):
+        api_calls: int = 0
+        total_tokens: int = 0
+        avg_api_call_seconds: Number = 0
+        model_used: str = ""
+        cv_sections: List[str] = []
+        reused_stages: Optional[List[str]] = None
+        skill_matrix_version: str = ""
+        rescored: Optional[List[Dict[str, Any]]] = None
+        evaluation_mode: str = ""
+        # prompt -> {"answers", "repaired", "invalid"}
+        structured_output: Optional[Dict[str, Dict[str, int]]] = None
+
+    class AnalysisResult(msgspec.Struct, omit_defaults=True):
+        most_fitted_area: str = ""
+        most_fitted_reason: str = ""
+        area_scores: Dict[str, Number] = {}
+        area_descriptions: Dict[str, str] = {}
+        specializations: List[Specialization] = []
+        best_specializations: List[Specialization] = []
+        education_list: List[str] = []
+        soft_skills_list: List[str] = []
+        previous_jobs_list: List[str] = []
+        candidate_summary: str = ""
+        recommended_role: str = ""
+        recommendation_reason: str = ""
+        skill_inventory: Optional[List[SkillEvidence]] = None
+        inventory_specializations: Optional[List[Specialization]] = None
+        metrics: ResultMetrics = msgspec.field(default_factory=ResultMetrics)
+
+    class TimelineSpan(msgspec.Struct):
+        stage: str
+        start: Number
+        end: Number
+        duration: Number
+
+    class Timeline(msgspec.Struct, omit_defaults=True):
+        started_at: str = ""
+        total_seconds: Number = 0
+        spans: List[TimelineSpan] = []
+
+    class AnalysisRecord(msgspec.Struct, omit_defaults=True):
+        id: str
+        filename: str = ""
+        timestamp: str = ""
+        analysis_time_seconds: Number = 0
+        api_calls: int = 0
+        total_tokens: int = 0
+        model_used: str = ""
+        human_review_minutes: Number = 0
+        result: AnalysisResult = msgspec.field(default_factory=AnalysisResult)
+        timeline: Optional[Timeline] = None
+        stage_seconds: Dict[str, Number] = {}
+        duplicate_of: Optional[str] = None
+        skill_matrix_version: Optional[str] = None
+        rescored_at: Optional[str] = None
+
+    _records_decoder = msgspec.json.Decoder(List[AnalysisRecord])
+
+
+def validate_record(record: Dict[str, Any]) -> None:
+    """Raise ValueError when `record` does not fit AnalysisRecord (no-op without msgspec)."""
+    if not AVAILABLE:
+        return
+    try:
+        msgspec.convert(record, AnalysisRecord)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Invalid analysis record: {e}") from e
+
+
+def decode_records(data: bytes) -> List["AnalysisRecord"]:
+    """Typed decode of a whole analyses.json; ValueError (with the JSON path) on a bad record.
+
+    Requires msgspec: raises ImportError when it is missing.
+    """
+    if not AVAILABLE:
+        raise ImportError("msgspec is not installed")
+    try:
+        return _records_decoder.decode(data)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise ValueError(str(e)) from e
@@ -0,0 +1,262 @@
+"""
+Columnar score matrix for ranking questions over every stored candidate.
+
+One row per analysis, one float32 column per area score ("Data") and per specialization
+score ("Data/AI and ML"); NaN where a record has no such score. Weighted sums, threshold
+filters and top-k (argpartition) run as NumPy array operations, so a ranking over 100k
+candidates takes milliseconds instead of a Python loop over the records.
+
+Rows are appended in analyses.json order and deletions only clear a row (compacted once
+half the rows are gone), so row order stays the file order and ties break the same way
+as a scan of the file.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+AREAS_ORDER = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
+# Minimum spec score for each level (evaluator._score_to_level)
+LEVEL_MIN_SCORE = {"Basic": 1.0, "Medium": 3.0, "High": 4.0}
+
+_MIN_CAPACITY = 1024
+
+
+def parse_threshold(value: str) -> float:
+    """A minimum score: a number or a level name (Basic, Medium, High)."""
+    level = LEVEL_MIN_SCORE.get(value.strip().capitalize())
+    return level if level is not None else float(value)
+
+
+class ScoreMatrix:
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), roles: Sequence[Tuple[str, str]] = ()):
+        """`roles`: (area, specialization) pairs that always get a column (the skill matrix);
+        specializations found only in records get one on first sight."""
+        self.columns: List[str] = list(AREAS_ORDER) + [f"{area}/{spec}" for area, spec in roles]
+        self.column_index: Dict[str, int] = {key: i for i, key in enumerate(self.columns)}
+        self._spec_columns: Dict[Tuple[Any, Any], int] = {}
+        # Column-major: a query reads a few whole columns
+        self.scores = np.full((_MIN_CAPACITY, len(self.columns)), np.nan, dtype=np.float32, order="F")
+        self.area_codes = np.full(_MIN_CAPACITY, -1, dtype=np.int8)
+        self.alive = np.zeros(_MIN_CAPACITY, dtype=bool)
+        self.ids: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.size = 0
+        self._dead = 0
+        # Bumped by every change to rows or columns (callers cache row-aligned data by it)
+        self.version = 0
+        self.add_many(records)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def copy(self) -> "ScoreMatrix":
+        """An independent copy: changes to it are not seen by readers of this one."""
+        other = ScoreMatrix.__new__(ScoreMatrix)
+        other.columns = list(self.columns)
+        other.column_index = dict(self.column_index)
+        other._spec_columns = dict(self._spec_columns)
+        other.scores = self.scores.copy(order="F")
+        other.area_codes = self.area_codes.copy()
+        other.alive = self.alive.copy()
+        other.ids = list(self.ids)
+        other.rows = dict(self.rows)
+        other.size = self.size
+        other._dead = self._dead
+        other.version = self.version
+        return other
+
+    # ── maintenance ─────────────────────────────────────────────────────────────
+
+    def _column(self, key: str) -> int:
+        col = self.column_index.get(key)
+        if col is None:
+            col = self.column_index[key] = len(self.columns)
+            self.columns.append(key)
+            scores = np.full((self.scores.shape[0], len(self.columns)), np.nan, dtype=np.float32, order="F")
+            scores[:, :-1] = self.scores
+            self.scores = scores
+            self.version += 1
+        return col
+
+    def _reserve(self, n: int) -> None:
+        capacity = self.scores.shape[0]
+        if self.size + n <= capacity:
+            return
+        new = max(capacity * 2, self.size + n)
+        scores = np.full((new, self.scores.shape[1]), np.nan, dtype=np.float32, order="F")
+        scores[:self.size] = self.scores[:self.size]
+        area_codes = np.full(new, -1, dtype=np.int8)
+        area_codes[:self.size] = self.area_codes[:self.size]
+        alive = np.zeros(new, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        self.scores, self.area_codes, self.alive = scores, area_codes, alive
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[Dict[str, Any]], batch: int = 4096) -> int:
+        """Append records (a record already present is replaced in place), `batch` rows per array write."""
+        n = 0
+        pending: List[Tuple[int, List[Tuple[int, float]], int]] = []
+        for record in records:
+            analysis_id = record.get("id")
+            if not analysis_id:
+                continue
+            row = self.rows.get(analysis_id)
+            if row is None:
+                self._reserve(1)
+                row = self.size
+                self.size += 1
+                self.ids.append(analysis_id)
+                self.rows[analysis_id] = row
+            pending.append((row, *self._values(record.get("result") or {})))
+            if len(pending) >= batch:
+                self._write_rows(pending)
+                pending = []
+            n += 1
+        if pending:
+            self._write_rows(pending)
+        self.version += 1
+        return n
+
+    def _values(self, result: Dict[str, Any]) -> Tuple[List[Tuple[int, float]], int]:
+        """(column, score) pairs and the area code of one result."""
+        values: List[Tuple[int, float]] = []
+        for area, value in (result.get("area_scores") or {}).items():
+            if isinstance(value, (int, float)):
+                values.append((self._column(area), value))
+        spec_columns = self._spec_columns
+        for item in result.get("specializations") or []:
+            if not isinstance(item, dict):
+                continue
+            value = item.get("score")
+            if isinstance(value, (int, float)):
+                pair = (item.get("area"), item.get("specialization"))
+                col = spec_columns.get(pair)
+                if col is None:
+                    col = spec_columns[pair] = self._column(f"{pair[0]}/{pair[1]}")
+                values.append((col, value))
+        area = result.get("most_fitted_area") or ""
+        return values, AREAS_ORDER.index(area) if area in AREAS_ORDER else -1
+
+    def _write_rows(self, pending: List[Tuple[int, List[Tuple[int, float]], int]]) -> None:
+        rows = np.fromiter((row for row, _, _ in pending), dtype=np.int64, count=len(pending))
+        block = np.full((len(pending), len(self.columns)), np.nan, dtype=np.float32)
+        for i, (_, values, _) in enumerate(pending):
+            for col, value in values:
+                block[i, col] = value
+        self.scores[rows] = block
+        self.area_codes[rows] = [code for _, _, code in pending]
+        self.alive[rows] = True
+
+    def remove(self, analysis_id: str) -> bool:
+        row = self.rows.pop(analysis_id, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self.scores[row] = np.nan
+        self.ids[row] = None
+        self._dead += 1
+        self.version += 1
+        if self._dead * 2 > self.size:
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.alive[:self.size])
+        self.scores[:len(keep)] = self.scores[keep]
+        self.area_codes[:len(keep)] = self.area_codes[keep]
+        self.alive[:len(keep)] = True
+        self.alive[len(keep):] = False
+        self.ids = [self.ids[i] for i in keep]
+        self.rows = {analysis_id: row for row, analysis_id in enumerate(self.ids)}
+        self.size = len(keep)
+        self._dead = 0
+
+    # ── queries ─────────────────────────────────────────────────────────────────
+
+    def resolve(self, key: str) -> str:
+        """Canonical column key for "Data", "Data/AI and ML" or a unique specialization name ("AI and ML")."""
+        if key in self.column_index:
+            return key
+        matches = [c for c in self.columns if c.partition("/")[2] == key]
+        if len(matches) == 1:
+            return matches[0]
+        raise ValueError(f"Unknown score {key!r}" if not matches else f"Ambiguous score {key!r}: use one of {matches}")
+
+    def rank(
+        self,
+        weights: Dict[str, float],
+        min_scores: Optional[Dict[str, float]] = None,
+        area: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[int, List[Tuple[str, float]]]:
+        """(number of candidates passing the filters, top `limit` (id, weighted score), best first).
+
+        weights: score key -> weight; a missing score counts as 0. min_scores: score key ->
+        minimum; a missing score fails the filter. area: most_fitted_area.
+        """
+        mask = self.mask(min_scores, area)
+        total = int(mask.sum())
+        if not total or limit <= 0:
+            return total, []
+        # Rounded so sums that are equal on paper (0.6*5 + 0.4*2 and 0.6*3 + 0.4*5) tie
+        ranked = np.round(self.weighted(weights), 4)
+        return total, [(self.ids[i], round(float(ranked[i]), 3)) for i in top_k(ranked, mask, limit)]
+
+    def mask(self, min_scores: Optional[Dict[str, float]] = None, area: Optional[str] = None) -> np.ndarray:
+        """Rows (of the first `size`) that are live, in `area` and meet every minimum score."""
+        n = self.size
+        mask = self.alive[:n].copy()
+        if area:
+            code = AREAS_ORDER.index(area) if area in AREAS_ORDER else -2
+            mask &= self.area_codes[:n] == code
+        for key, minimum in (min_scores or {}).items():
+            # NaN >= x is False: candidates without the score are filtered out
+            with np.errstate(invalid="ignore"):
+                mask &= self.scores[:n, self.column_index[self.resolve(key)]] >= minimum
+        return mask
+
+    def weighted(self, weights: Dict[str, float]) -> np.ndarray:
+        """Weighted sum of the given scores per row (of the first `size`); a missing score counts as 0."""
+        cols = [self.column_index[self.resolve(key)] for key in weights]
+        if not cols:
+            return np.zeros(self.size, dtype=np.float32)
+        w = np.asarray(list(weights.values()), dtype=np.float32)
+        return np.nan_to_num(self.scores[:self.size, cols], nan=0.0) @ w
+
+    def best(self, column: str, default: float) -> Optional[Tuple[str, float]]:
+        """(id, score) of the highest `column` score; records without it count as `default`.
+        The first record in file order wins a tie."""
+        n = self.size
+        if not len(self.rows):
+            return None
+        values = np.nan_to_num(self.scores[:n, self.column_index[self.resolve(column)]], nan=default)
+        values = np.where(self.alive[:n], values, -np.inf)
+        row = int(np.argmax(values))
+        return self.ids[row], round(float(values[row]), 3)
+
+    def values(self, analysis_id: str, keys: Iterable[str]) -> Dict[str, Optional[float]]:
+        row = self.rows[analysis_id]
+        out: Dict[str, Optional[float]] = {}
+        for key in keys:
+            value = self.scores[row, self.column_index[self.resolve(key)]]
+            out[key] = None if np.isnan(value) else round(float(value), 3)
+        return out
+
+
+def top_k(ranked: np.ndarray, mask: np.ndarray, limit: int) -> np.ndarray:
+    """Positions of the `limit` highest `ranked` values among `mask`, best first; equal
+    values keep position order."""
+    ranked = np.where(mask, ranked, -np.inf)
+    total = int(mask.sum())
+    if total > limit:
+        # The limit-th best value; scores are mostly whole numbers, so many rows can tie
+        # on it: take the ones above it, then the earliest rows equal to it
+        cutoff = ranked[np.argpartition(-ranked, limit - 1)[limit - 1]]
+        above = np.flatnonzero(ranked > cutoff)
+        top = np.concatenate([above, np.flatnonzero(ranked == cutoff)[:limit - len(above)]])
+    else:
+        top = np.flatnonzero(mask)
+    # Sort only the selected rows
+    return top[np.lexsort((top, -ranked[top]))]
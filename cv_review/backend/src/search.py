@@ -0,0 +1,370 @@
+"""
+Full-text candidate search: an SQLite FTS5 index next to analyses.json.
+
+One document per analysis: filename, summary, education, previous jobs, strongest
+specializations and the extracted CV text (kept only here, not in analyses.json).
+Storage updates it on every save/delete; reconcile() repairs it after upgrades or
+when search.db was removed.
+
+Document rowids are (timestamp in microseconds << AREA_BITS) | area code: "newest matches"
+and date filters are rowid ranges, and the best-fit area is read off the rowid, so neither
+facets nor filters join the metadata table.
+"""
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Columns of the FTS table, in order; weights are the bm25() column weights
+FIELDS = ("filename", "summary", "education", "jobs", "specializations", "cv_text")
+WEIGHTS = (2.0, 3.0, 1.5, 1.5, 2.0, 1.0)
+HIGHLIGHT = ("<mark>", "</mark>")
+# Specializations at or above this score count as the candidate's skills
+SPEC_MIN_SCORE = 3
+# Low bits of every document rowid: the best-fit area code (0 = none)
+AREA_BITS = 8
+_AREA_MASK = (1 << AREA_BITS) - 1
+# bm25 ranks at most this many of the newest matches (plus the requested page); the total
+# is always exact. Beyond FACET_EXACT_LIMIT matches, area facets are estimated from the
+# newest RANK_WINDOW of them and flagged facets_exact=false.
+RANK_WINDOW = 2000
+FACET_EXACT_LIMIT = 20000
+# Sequences below this belong to records without a timestamp
+_UNDATED = 1 << 20
+_EPOCH = datetime(1970, 1, 1)
+_DAY = timedelta(days=1) // timedelta(microseconds=1)
+# Dropped from queries unless quoted (or the query has nothing else)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were with".split()
+)
+
+_TOKEN = re.compile(r'"[^"]+"|[^\s"]+')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def document(record: Dict[str, Any], cv_text: Optional[str] = None) -> Dict[str, str]:
+    """The searchable text of one analysis record, by field."""
+    result = record.get("result") or {}
+    specs = [
+        f"{s.get('specialization', '')} {s.get('area', '')} {s.get('level', '')}"
+        for s in (result.get("specializations") or [])
+        if isinstance(s, dict) and isinstance(s.get("score"), (int, float)) and s["score"] >= SPEC_MIN_SCORE
+    ]
+    specs += [str(s.get("specialization") or "") for s in result.get("best_specializations") or [] if isinstance(s, dict)]
+    return {
+        "filename": str(record.get("filename") or ""),
+        "summary": " ".join(str(result.get(k) or "") for k in ("candidate_summary", "recommended_role")),
+        "education": "\n".join(str(x) for x in result.get("education_list") or [] if x),
+        "jobs": "\n".join(str(x) for x in result.get("previous_jobs_list") or [] if x),
+        "specializations": "\n".join(specs),
+        "cv_text": cv_text or "",
+    }
+
+
+def to_match_query(q: str, mode: str = "all") -> str:
+    """User query -> FTS5 MATCH expression. Words and "quoted phrases" are literal (no FTS
+    syntax injection); a trailing * keeps prefix matching; mode "all" ANDs terms, "any" ORs them."""
+    terms = []
+    for token in _TOKEN.findall(q):
+        prefix = token.endswith("*") and not token.startswith('"')
+        words = _WORD.findall(token)
+        if not words:
+            continue
+        phrase = '"' + " ".join(words) + '"'
+        stop = len(words) == 1 and not token.startswith('"') and not prefix and words[0].lower() in STOPWORDS
+        terms.append((phrase + ("*" if prefix else ""), stop))
+    kept = [t for t, stop in terms if not stop] or [t for t, _ in terms]
+    return (" OR " if mode == "any" else " AND ").join(kept)
+
+
+def timestamp_seq(timestamp: Optional[str]) -> int:
+    """Microseconds since 1970 of an ISO timestamp or date (wall clock, offset ignored)."""
+    dt = datetime.fromisoformat(str(timestamp))
+    return max(0, (dt.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1))
+
+
+class SearchIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._areas: Dict[str, int] = {}
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+                {", ".join(FIELDS)}, tokenize = 'porter unicode61 remove_diacritics 2',
+                prefix = '3 4'
+            );
+            CREATE TABLE IF NOT EXISTS doc_meta (
+                doc_id INTEGER PRIMARY KEY,
+                analysis_id TEXT NOT NULL UNIQUE,
+                timestamp TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS areas (
+                code INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _area_names(self) -> Dict[int, str]:
+        return {code: name for code, name in self._conn().execute("SELECT code, name FROM areas")}
+
+    def _area_code(self, conn: sqlite3.Connection, area: str, create: bool = False) -> Optional[int]:
+        """Code of an area name (0 is reserved for "no area"); new codes only when `create`."""
+        if not area:
+            return 0
+        code = self._areas.get(area)
+        if code is None:
+            row = conn.execute("SELECT code FROM areas WHERE name = ?", (area,)).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                code = conn.execute("SELECT coalesce(max(code), 0) + 1 FROM areas").fetchone()[0]
+                if code > _AREA_MASK:
+                    raise sqlite3.IntegrityError(f"more than {_AREA_MASK} areas")
+                conn.execute("INSERT INTO areas (code, name) VALUES (?, ?)", (code, area))
+            else:
+                code = row[0]
+            self._areas[area] = code
+        return code
+
+    # ── updates ───────────────────────────────────────────────────────────────
+
+    def add(self, record: Dict[str, Any], cv_text: Optional[str] = None) -> None:
+        """Index (or re-index) one analysis; an existing CV text is kept when none is given."""
+        with self._tx() as conn:
+            self._add(conn, record, cv_text)
+
+    def _add(self, conn: sqlite3.Connection, record: Dict[str, Any], cv_text: Optional[str]) -> None:
+        analysis_id = record["id"]
+        code = self._area_code(conn, str((record.get("result") or {}).get("most_fitted_area") or ""), create=True)
+        old = conn.execute("SELECT doc_id FROM doc_meta WHERE analysis_id = ?", (analysis_id,)).fetchone()
+        if old:
+            seq = old[0] >> AREA_BITS
+            if cv_text is None:
+                row = conn.execute("SELECT cv_text FROM docs WHERE rowid = ?", (old[0],)).fetchone()
+                cv_text = row[0] if row else None
+            conn.execute("DELETE FROM docs WHERE rowid = ?", (old[0],))
+            conn.execute("DELETE FROM doc_meta WHERE doc_id = ?", (old[0],))
+        else:
+            try:
+                seq = max(_UNDATED, timestamp_seq(record.get("timestamp")))
+            except ValueError:
+                seq = 1
+            # Same microsecond (or no timestamp): take the next free sequence
+            while conn.execute(
+                "SELECT 1 FROM doc_meta WHERE doc_id BETWEEN ? AND ?", (seq << AREA_BITS, (seq << AREA_BITS) | _AREA_MASK)
+            ).fetchone():
+                seq += 1
+        doc_id = (seq << AREA_BITS) | code
+        doc = document(record, cv_text)
+        conn.execute(
+            f"INSERT INTO docs (rowid, {', '.join(FIELDS)}) VALUES (?, {', '.join('?' for _ in FIELDS)})",
+            [doc_id, *(doc[f] for f in FIELDS)],
+        )
+        conn.execute(
+            "INSERT INTO doc_meta (doc_id, analysis_id, timestamp) VALUES (?, ?, ?)",
+            (doc_id, analysis_id, str(record.get("timestamp") or "")),
+        )
+
+    def add_many(self, items: Iterable[Tuple[Dict[str, Any], Optional[str]]], batch: int = 500) -> int:
+        """Index (record, cv_text) pairs, `batch` per transaction."""
+        n = 0
+        pending: List[Tuple[Dict[str, Any], Optional[str]]] = []
+        for item in items:
+            pending.append(item)
+            if len(pending) >= batch:
+                n += self._add_batch(pending)
+                pending = []
+        if pending:
+            n += self._add_batch(pending)
+        return n
+
+    def _add_batch(self, items: List[Tuple[Dict[str, Any], Optional[str]]]) -> int:
+        with self._tx() as conn:
+            for record, cv_text in items:
+                self._add(conn, record, cv_text)
+        return len(items)
+
+    def remove(self, analysis_id: str) -> None:
+        with self._tx() as conn:
+            old = conn.execute("SELECT doc_id FROM doc_meta WHERE analysis_id = ?", (analysis_id,)).fetchone()
+            if old:
+                conn.execute("DELETE FROM docs WHERE rowid = ?", (old[0],))
+                conn.execute("DELETE FROM doc_meta WHERE doc_id = ?", (old[0],))
+
+    def reconcile(self, records: Iterable[Dict[str, Any]], batch: int = 500) -> Dict[str, int]:
+        """Index records missing from search.db and drop documents of deleted analyses.
+
+        Records indexed this way have no CV text (it was not kept before the index existed).
+        """
+        records = [r for r in records if r.get("id")]
+        known = {row[0] for row in self._conn().execute("SELECT analysis_id FROM doc_meta")}
+        wanted = {r["id"] for r in records}
+        missing = [r for r in records if r["id"] not in known]
+        self.add_many(((r, None) for r in missing), batch)
+        stale = known - wanted
+        for analysis_id in stale:
+            self.remove(analysis_id)
+        return {"added": len(missing), "removed": len(stale)}
+
+    def get_text(self, analysis_id: str) -> Optional[str]:
+        """The extracted CV text stored for an analysis (None when it was not kept)."""
+        row = self._conn().execute(
+            "SELECT d.cv_text FROM doc_meta m JOIN docs d ON d.rowid = m.doc_id WHERE m.analysis_id = ?",
+            (analysis_id,),
+        ).fetchone()
+        return row[0] if row and row[0] else None
+
+    # ── queries ───────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        q: str,
+        area: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        mode: str = "auto",
+    ) -> Dict[str, Any]:
+        """Ranked matches (bm25, weighted by field) with highlighted snippets and area facets.
+
+        mode: "all" terms must match, "any" ranks by how well any terms match, "auto"
+        tries "all" and falls back to "any" when nothing matches every term.
+        """
+        t0 = time.perf_counter()
+        used = "all" if mode == "auto" else mode
+        result = self._search(q, used, area, date_from, date_to, limit, offset)
+        if mode == "auto" and result["total"] == 0 and len(_TOKEN.findall(q)) > 1:
+            used = "any"
+            result = self._search(q, used, area, date_from, date_to, limit, offset)
+        result.update(query=q, mode=used, took_ms=round((time.perf_counter() - t0) * 1000, 2))
+        return result
+
+    def _search(
+        self,
+        q: str,
+        mode: str,
+        area: Optional[str],
+        date_from: Optional[str],
+        date_to: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> Dict[str, Any]:
+        empty = {"total": 0, "items": [], "facets": {"most_fitted_area": {}}, "facets_exact": True, "ranked": 0}
+        match = to_match_query(q, mode)
+        if not match:
+            return empty
+        conn = self._conn()
+        base = "FROM docs WHERE docs MATCH ?"
+        params: List[Any] = [match]
+        if date_from or date_to:
+            # Dates are rowid ranges; records without a timestamp fall outside all of them
+            low = max(_UNDATED, timestamp_seq(date_from)) if date_from else _UNDATED
+            base += " AND docs.rowid >= ?"
+            params.append(low << AREA_BITS)
+            if date_to:
+                base += " AND docs.rowid < ?"
+                params.append((timestamp_seq(date_to[:10]) + _DAY) << AREA_BITS)
+
+        def newest_boundary(sql: str, args: List[Any], n: int) -> int:
+            """Smallest rowid among the newest n matches."""
+            row = conn.execute(f"SELECT docs.rowid {sql} ORDER BY docs.rowid DESC LIMIT 1 OFFSET ?", [*args, n - 1]).fetchone()
+            return row[0] if row else 0
+
+        matched = conn.execute(f"SELECT count(*) {base}", params).fetchone()[0]
+        if not matched:
+            return empty
+        names = self._area_names()
+        facet_sql, facet_params, facets_exact = base, params, matched <= FACET_EXACT_LIMIT
+        if not facets_exact:
+            facet_sql = f"{base} AND docs.rowid >= ?"
+            facet_params = [*params, newest_boundary(base, params, RANK_WINDOW)]
+        counts = conn.execute(f"SELECT docs.rowid & {_AREA_MASK}, count(*) {facet_sql} GROUP BY 1", facet_params).fetchall()
+        sample = sum(n for _, n in counts)
+        facets = {
+            names.get(code, ""): n if facets_exact else round(n * matched / sample)
+            for code, n in sorted(counts, key=lambda c: -c[1])
+        }
+
+        total = matched
+        if area:
+            code = self._area_code(conn, area)
+            if code is None:
+                return {**empty, "facets": {"most_fitted_area": facets}, "facets_exact": facets_exact}
+            base, params = f"{base} AND (docs.rowid & {_AREA_MASK}) = ?", [*params, code]
+            total = facets.get(area, 0) if facets_exact else conn.execute(f"SELECT count(*) {base}", params).fetchone()[0]
+        window = max(RANK_WINDOW, offset + limit)
+        rank_sql, rank_params = base, params
+        if total > window:
+            rank_sql, rank_params = f"{base} AND docs.rowid >= ?", [*params, newest_boundary(base, params, window)]
+        weights = ", ".join(str(w) for w in WEIGHTS)
+        ranked = conn.execute(
+            f"SELECT docs.rowid, bm25(docs, {weights}) AS score {rank_sql} ORDER BY score LIMIT ? OFFSET ?",
+            [*rank_params, limit, offset],
+        ).fetchall()
+
+        items = []
+        if ranked:
+            # Snippets only for the page; fetched after ranking so they are not built for every match
+            open_, close = HIGHLIGHT
+            ids = [rowid for rowid, _ in ranked]
+            details = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"""
+                    SELECT docs.rowid, m.analysis_id, m.timestamp, docs.filename,
+                           snippet(docs, 1, ?, ?, '…', 24), snippet(docs, -1, ?, ?, '…', 16)
+                    FROM docs JOIN doc_meta m ON m.doc_id = docs.rowid
+                    WHERE docs MATCH ? AND docs.rowid IN ({', '.join('?' for _ in ids)})
+                    """,
+                    [open_, close, open_, close, match, *ids],
+                )
+            }
+            for rowid, score in ranked:
+                analysis_id, timestamp, filename, summary_snippet, best_snippet = details[rowid]
+                items.append({
+                    "id": analysis_id,
+                    "filename": filename,
+                    "timestamp": timestamp,
+                    "most_fitted_area": names.get(rowid & _AREA_MASK, ""),
+                    # bm25() is lower-is-better; flip it so higher means more relevant
+                    "score": round(-score, 4),
+                    "summary_snippet": summary_snippet,
+                    "snippet": best_snippet,
+                })
+        return {
+            "total": total,
+            "items": items,
+            "facets": {"most_fitted_area": facets},
+            "facets_exact": facets_exact,
+            # How many of the newest matches were ranked (all of them when equal to total)
+            "ranked": min(total, window),
+        }
@@ -0,0 +1,396 @@
+"""
+Shared state for multi-worker / multi-node deployments.
+
+Backends store small JSON hashes (job status, counters) and provide locks:
+- SQLiteBackend: one SQLite file (WAL) shared by every worker on the host; locks are file locks.
+- RedisBackend: any Redis-protocol server (Redis, Memorystore, or tools/mini_redis.py locally);
+  locks use SET NX PX so they also hold across Cloud Run instances.
+Select with `state.backend` in config.yaml or CV_REVIEW_STATE_BACKEND / CV_REVIEW_REDIS_URL.
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import orjson
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+class FileLock:
+    """Exclusive lock on a file, shared by threads and processes on the same host."""
+
+    def __init__(self, path: Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fh = None
+
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    import msvcrt
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    fh.close()
+                    raise LockTimeout(f"Timed out waiting for lock {self.path}")
+                time.sleep(0.01)
+        self._fh = fh
+        return self
+
+    def __exit__(self, *exc) -> None:
+        fh, self._fh = self._fh, None
+        if fh is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            fh.close()
+
+
+class StateBackend:
+    """Hash-of-JSON-values store with counters, expiry and named locks."""
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def hget(self, key: str, field: str) -> Any:
+        """One field of a hash (None when the hash or the field is missing)."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def expire(self, key: str, seconds: float) -> None:
+        raise NotImplementedError
+
+    def keys(self, prefix: str) -> List[str]:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Delete expired keys that are still stored; returns how many."""
+        return 0
+
+    def lock(self, name: str, timeout: float = 30.0, ttl: float = 60.0):
+        raise NotImplementedError
+
+
+# ── SQLite ──────────────────────────────────────────────────────────────────────
+
+class SQLiteBackend(StateBackend):
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS hashes (
+                key TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL,
+                PRIMARY KEY (key, field)
+            );
+            CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS expiry (key TEXT PRIMARY KEY, expires_at REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS expiry_at ON expiry (expires_at);
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _expired(self, conn: sqlite3.Connection, key: str) -> bool:
+        row = conn.execute("SELECT expires_at FROM expiry WHERE key = ?", (key,)).fetchone()
+        return bool(row and row[0] <= time.time())
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> None:
+        with self._tx() as conn:
+            if self._expired(conn, key):
+                self._delete(conn, key)
+            conn.executemany(
+                "INSERT INTO hashes (key, field, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (key, field) DO UPDATE SET value = excluded.value",
+                [(key, f, orjson.dumps(v).decode()) for f, v in mapping.items()],
+            )
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        conn = self._conn()
+        if self._expired(conn, key):
+            return {}
+        rows = conn.execute("SELECT field, value FROM hashes WHERE key = ?", (key,)).fetchall()
+        return {f: orjson.loads(v) for f, v in rows}
+
+    def hget(self, key: str, field: str) -> Any:
+        conn = self._conn()
+        if self._expired(conn, key):
+            return None
+        row = conn.execute("SELECT value FROM hashes WHERE key = ? AND field = ?", (key, field)).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def _delete(self, conn: sqlite3.Connection, key: str) -> None:
+        conn.execute("DELETE FROM hashes WHERE key = ?", (key,))
+        conn.execute("DELETE FROM counters WHERE key = ?", (key,))
+        conn.execute("DELETE FROM expiry WHERE key = ?", (key,))
+
+    def delete(self, key: str) -> None:
+        with self._tx() as conn:
+            self._delete(conn, key)
+
+    def expire(self, key: str, seconds: float) -> None:
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO expiry (key, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET expires_at = excluded.expires_at",
+                (key, time.time() + seconds),
+            )
+
+    def keys(self, prefix: str) -> List[str]:
+        conn = self._conn()
+        now = time.time()
+        rows = conn.execute(
+            "SELECT DISTINCT h.key FROM hashes h LEFT JOIN expiry e ON e.key = h.key "
+            "WHERE h.key >= ? AND h.key < ? AND (e.expires_at IS NULL OR e.expires_at > ?) "
+            "UNION SELECT c.key FROM counters c WHERE c.key >= ? AND c.key < ?",
+            (prefix, prefix + "￿", now, prefix, prefix + "￿"),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO counters (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                (key, amount),
+            )
+            return conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        with self._tx() as conn:
+            keys = [r[0] for r in conn.execute("SELECT key FROM expiry WHERE expires_at <= ?", (time.time(),))]
+            for key in keys:
+                self._delete(conn, key)
+        return len(keys)
+
+    def lock(self, name: str, timeout: float = 30.0, ttl: float = 60.0) -> FileLock:
+        return FileLock(self.path.parent / f".{name}.lock", timeout=timeout)
+
+
+# ── Redis protocol ──────────────────────────────────────────────────────────────
+
+class RedisError(RuntimeError):
+    pass
+
+
+class _RespConnection:
+    """Minimal RESP2 client: enough for hashes, counters, expiry and SET NX locks."""
+
+    def __init__(self, host: str, port: int, password: Optional[str], db: int, timeout: float = 10.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if password:
+            self.command("AUTH", password)
+        if db:
+            self.command("SELECT", str(db))
+
+    def command(self, *args: Any) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for a in args:
+            data = a if isinstance(a, bytes) else str(a).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self) -> Any:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self.reader.read(n + 2)[:-2]
+            return data.decode("utf-8")
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read() for _ in range(n)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+# Delete the lock key only while it still holds our token (GET + DEL in one step: the lock
+# cannot expire and be taken by another worker between the check and the delete)
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock:
+    def __init__(self, backend: "RedisBackend", name: str, timeout: float, ttl: float):
+        self.backend = backend
+        self.key = f"lock:{name}"
+        self.timeout = timeout
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid.uuid4().hex
+
+    def __enter__(self) -> "RedisLock":
+        deadline = time.monotonic() + self.timeout
+        while self.backend._cmd("SET", self.key, self.token, "NX", "PX", self.ttl_ms, replay=False) != "OK":
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Timed out waiting for {self.key}")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # Only release our own lock; a lock that outlived its TTL may belong to someone else now.
+        self.backend._cmd("EVAL", _RELEASE_SCRIPT, 1, self.key, self.token)
+
+
+class RedisBackend(StateBackend):
+    def __init__(self, url: str, namespace: str = "cvreview"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.namespace = namespace
+        self._local = threading.local()
+
+    def _conn(self) -> _RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self.host, self.port, self.password, self.db)
+            self._local.conn = conn
+        return conn
+
+    def _cmd(self, *args: Any, replay: bool = True) -> Any:
+        """Run one command. On a broken connection it is sent again once over a new one
+        (server restart, idle timeout), unless replay=False: the first attempt may have been
+        applied before the reply was lost, so commands that are not idempotent (INCRBY,
+        SET NX) raise instead of running twice."""
+        try:
+            return self._conn().command(*args)
+        except (ConnectionError, OSError):
+            conn = getattr(self._local, "conn", None)
+            if conn:
+                conn.close()
+            self._local.conn = None
+            if not replay:
+                raise
+            return self._conn().command(*args)
+
+    def _k(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> None:
+        if not mapping:
+            return
+        args: List[Any] = []
+        for f, v in mapping.items():
+            args += [f, orjson.dumps(v).decode()]
+        self._cmd("HSET", self._k(key), *args)
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        flat = self._cmd("HGETALL", self._k(key)) or []
+        return {flat[i]: orjson.loads(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    def hget(self, key: str, field: str) -> Any:
+        value = self._cmd("HGET", self._k(key), field)
+        return None if value is None else orjson.loads(value)
+
+    def delete(self, key: str) -> None:
+        self._cmd("DEL", self._k(key))
+
+    def expire(self, key: str, seconds: float) -> None:
+        self._cmd("PEXPIRE", self._k(key), int(seconds * 1000))
+
+    def keys(self, prefix: str) -> List[str]:
+        out: List[str] = []
+        cursor = "0"
+        pattern = self._k(prefix) + "*"
+        while True:
+            cursor, batch = self._cmd("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            out.extend(k[len(self.namespace) + 1:] for k in batch)
+            if str(cursor) == "0":
+                return out
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return int(self._cmd("INCRBY", self._k(key), amount, replay=False))
+
+    def lock(self, name: str, timeout: float = 30.0, ttl: float = 60.0) -> RedisLock:
+        return RedisLock(self, self._k(name), timeout, ttl)
+
+
+def create_backend(state_cfg: Dict[str, Any], data_dir: Path) -> StateBackend:
+    """Build the configured backend (default: SQLite file next to the analyses)."""
+    kind = (state_cfg.get("backend") or "sqlite").lower()
+    if kind == "redis":
+        url = state_cfg.get("redis_url") or "redis://127.0.0.1:6379/0"
+        return RedisBackend(url, namespace=state_cfg.get("namespace") or "cvreview")
+    if kind == "sqlite":
+        path = Path(state_cfg.get("sqlite_path") or data_dir / "state.db")
+        if not path.is_absolute():
+            path = data_dir / path
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown state backend: {kind}")
@@ -0,0 +1,178 @@
+"""
+Extract-once skill inventory and deterministic specialization scores (evaluation.mode: inventory).
+
+The fifteen specializations in skill_matrix.yaml share most of their skills ("Command line",
+Networking, DNS, "APIs / System Design", …). Instead of one spec_level call per
+specialization, one call lists every distinct skill of the matrix and asks for the evidence
+level the CV shows for each (None / Basic / Intermediate / Advanced) with a short quote.
+Each specialization is then scored locally from that inventory:
+
+- every required skill has a weight by requirement (Mandatory 3, Needed 2, Nice-to-have and
+  additional knowledge 1) and a required level;
+- it earns evidence / required level of its weight (capped at 1), so fit is the weighted
+  share of requirements the CV covers, and the score is 1 + 4 x fit rounded (1-5);
+- a Mandatory skill with no evidence at all caps the score at 3 (Medium).
+
+The same inventory always gives the same scores, and a changed requirement is re-scored
+without an LLM call as long as its skills are in the inventory.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LEVELS = ("None", "Basic", "Intermediate", "Advanced")
+_LEVEL_RANK = {name.lower(): rank for rank, name in enumerate(LEVELS)}
+_LEVEL_RANK.update({"medium": 2, "high": 3, "expert": 3, "low": 1, "none": 0, "": 0})
+REQUIREMENT_WEIGHTS = {"Mandatory": 3.0, "Needed": 2.0, "Nice-to-have": 1.0}
+# Weight of a skill listed without a requirement (the `additional` block)
+DEFAULT_WEIGHT = 1.0
+# Required level when the matrix gives none
+DEFAULT_LEVEL = "Intermediate"
+# Highest score when a Mandatory skill has no evidence
+MANDATORY_GAP_CAP = 3
+CATEGORIES = ("core_skills", "web_networking", "additional", "soft_skills")
+
+Requirement = Tuple[str, Optional[str], str]  # (skill, requirement or None, required level)
+Inventory = Dict[str, Dict[str, str]]  # skill -> {"level", "evidence"}
+
+
+def _level(value: int) -> str:
+    """Basic / Medium / High of a 1-5 score (as evaluator._score_to_level)."""
+    return "High" if value >= 4 else "Medium" if value == 3 else "Basic"
+
+
+def _parse_requirement(value: Any) -> Tuple[Optional[str], str]:
+    """(requirement, level) from the forms used in skill_matrix.yaml: {requirement, level},
+    "Mandatory - Advanced", "Advanced", "Nice-to-have"."""
+    if isinstance(value, dict):
+        requirement = str(value.get("requirement") or "").strip() or None
+        level = str(value.get("level") or "").strip() or DEFAULT_LEVEL
+        return requirement, level
+    requirement, level = None, DEFAULT_LEVEL
+    for part in str(value or "").split(" - "):
+        part = part.strip()
+        if part in REQUIREMENT_WEIGHTS:
+            requirement = part
+        elif part.lower() in _LEVEL_RANK and part.lower() != "none":
+            level = part
+    return requirement, level
+
+
+def requirements(spec_data: Dict[str, Any]) -> List[Requirement]:
+    """Every skill a specialization lists, with its requirement and required level."""
+    out: List[Requirement] = []
+    for category in CATEGORIES:
+        block = spec_data.get(category)
+        if isinstance(block, dict):
+            for skill, value in block.items():
+                out.append((str(skill), *_parse_requirement(value)))
+        elif isinstance(block, list):
+            out.extend((str(item), None, DEFAULT_LEVEL) for item in block)
+    return out
+
+
+def distinct_skills(specs: Iterable[Dict[str, Any]]) -> List[str]:
+    """Skills of all the given specializations, each once, in first-seen order."""
+    seen: Dict[str, None] = {}
+    for spec_data in specs:
+        for skill, _, _ in requirements(spec_data or {}):
+            seen.setdefault(skill, None)
+    return list(seen)
+
+
+def parse_inventory(parsed: Any, skills: Sequence[str]) -> Optional[Inventory]:
+    """The model's answer as {skill: {"level", "evidence"}} for the skills asked about
+    (matched case-insensitively; unknown names are dropped, missing skills get None).
+    None when the answer has no usable skills object."""
+    block = parsed.get("skills") if isinstance(parsed, dict) else None
+    if not isinstance(block, dict):
+        return None
+    by_name = {str(k).strip().lower(): v for k, v in block.items()}
+    inventory: Inventory = {}
+    for skill in skills:
+        entry = by_name.get(skill.lower())
+        if isinstance(entry, str):
+            entry = {"level": entry}
+        if not isinstance(entry, dict):
+            entry = {}
+        rank = _LEVEL_RANK.get(str(entry.get("level") or "").strip().lower(), 0)
+        inventory[skill] = {"level": LEVELS[rank], "evidence": str(entry.get("evidence") or "").strip()[:300]}
+    return inventory
+
+
+def score(spec_data: Dict[str, Any], inventory: Inventory) -> Tuple[int, float]:
+    """(score 1-5, fit 0-1) of one specialization from the inventory."""
+    total = earned = 0.0
+    mandatory_gap = False
+    for skill, requirement, level in requirements(spec_data):
+        weight = REQUIREMENT_WEIGHTS.get(requirement or "", DEFAULT_WEIGHT)
+        required = max(1, _LEVEL_RANK.get(level.lower(), 2))
+        evidence = _LEVEL_RANK.get((inventory.get(skill) or {}).get("level", "None").lower(), 0)
+        total += weight
+        earned += weight * min(evidence, required) / required
+        if requirement == "Mandatory" and evidence == 0:
+            mandatory_gap = True
+    fit = earned / total if total else 0.0
+    value = 1 + int(4 * fit + 0.5)
+    return (min(value, MANDATORY_GAP_CAP) if mandatory_gap else value), round(fit, 3)
+
+
+def to_list(inventory: Inventory) -> List[Dict[str, str]]:
+    """Stored form (result["skill_inventory"]): one row per skill assessed, strongest first."""
+    rows = [{"skill": s, "level": e.get("level", "None"), "evidence": e.get("evidence", "")} for s, e in inventory.items()]
+    return sorted(rows, key=lambda r: -_LEVEL_RANK.get(r["level"].lower(), 0))
+
+
+def from_list(rows: Any) -> Inventory:
+    """Inventory back from its stored form (only the skills that were assessed)."""
+    return {
+        str(r["skill"]): {"level": str(r.get("level") or "None"), "evidence": str(r.get("evidence") or "")}
+        for r in rows or [] if isinstance(r, dict) and r.get("skill")
+    }
+
+
+def specializations(roles: Iterable[Tuple[str, str, Dict[str, Any]]], inventory: Inventory) -> List[Dict[str, Any]]:
+    """Specialization scores ({area, specialization, score, level}) of `roles` ((area,
+    specialization, spec data)) from the inventory."""
+    out = []
+    for area, specialization, spec_data in roles:
+        value, _ = score(spec_data or {}, inventory)
+        out.append({"area": area, "specialization": specialization, "score": value, "level": _level(value)})
+    return out
+
+
+# ── Agreement with per-specialization scoring ──────────────────────────────────
+
+def agreement(pairs: Iterable[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """Per-specialization agreement of (reference, inventory) specialization lists of the same
+    candidates: exact score, within one point, same level (Basic/Medium/High), mean absolute
+    difference and bias (inventory minus reference)."""
+    per: Dict[str, Dict[str, float]] = {}
+    for reference, candidate in pairs:
+        scored = {(s.get("area"), s.get("specialization")): s.get("score") for s in candidate}
+        for s in reference:
+            key = (s.get("area"), s.get("specialization"))
+            a, b = s.get("score"), scored.get(key)
+            if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+                continue
+            row = per.setdefault(f"{key[0]}/{key[1]}", {"n": 0, "exact": 0, "within_1": 0, "level": 0, "abs": 0.0, "diff": 0.0})
+            row["n"] += 1
+            row["exact"] += a == b
+            row["within_1"] += abs(a - b) <= 1
+            row["level"] += _level(int(a)) == _level(int(b))
+            row["abs"] += abs(a - b)
+            row["diff"] += b - a
+
+    def summary(rows: Iterable[Dict[str, float]]) -> Dict[str, Any]:
+        rows = list(rows)
+        n = sum(r["n"] for r in rows)
+        if not n:
+            return {"n": 0}
+        return {
+            "n": int(n),
+            "exact": round(sum(r["exact"] for r in rows) / n, 3),
+            "within_1": round(sum(r["within_1"] for r in rows) / n, 3),
+            "same_level": round(sum(r["level"] for r in rows) / n, 3),
+            "mean_abs_diff": round(sum(r["abs"] for r in rows) / n, 3),
+            "bias": round(sum(r["diff"] for r in rows) / n, 3),
+        }
+
+    return {"overall": summary(per.values()), "specializations": {k: summary([r]) for k, r in per.items()}}
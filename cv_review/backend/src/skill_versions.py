@@ -0,0 +1,163 @@
+"""
+Versioned skill matrix and the structural diff between two versions.
+
+A version is identified by the digest of what the evaluation prompts actually see: the
+requirements text of every (area, specialization). Comments, key order and formatting in
+skill_matrix.yaml do not make a new version; a changed skill, level or requirement does.
+
+Every version the app has run with is kept in data/skill_matrix/<version>.json (the
+parsed specialization data plus one digest per role), so a record stamped with an older
+version can be diffed against the current matrix: only the roles that were added or whose
+requirements changed need re-scoring.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+Role = Tuple[str, str]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def role_key(role: Role) -> str:
+    return f"{role[0]}/{role[1]}"
+
+
+@dataclass(frozen=True)
+class Version:
+    id: str
+    # (area, specialization) -> digest of its requirements text, in matrix order
+    roles: Dict[Role, str]
+    # (area, specialization) -> its data in skill_matrix.yaml
+    specs: Dict[Role, Dict[str, Any]] = field(default_factory=dict, compare=False)
+    recorded_at: str = ""
+
+    @classmethod
+    def of(cls, compiled_roles: Iterable[Tuple[str, str, dict, str]]) -> "Version":
+        """Version of evaluator.get_compiled_roles() output ((area, spec, data, requirements text))."""
+        roles: Dict[Role, str] = {}
+        specs: Dict[Role, Dict[str, Any]] = {}
+        for area, spec, data, text in compiled_roles:
+            roles[(area, spec)] = _digest(text)
+            specs[(area, spec)] = data or {}
+        version = _digest("\n".join(f"{role_key(r)}\x00{d}" for r, d in roles.items()))[:16]
+        return cls(id=version, roles=roles, specs=specs)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": self.id,
+            "recorded_at": self.recorded_at,
+            "roles": [
+                {"area": a, "specialization": s, "digest": d, "spec": self.specs.get((a, s), {})}
+                for (a, s), d in self.roles.items()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Version":
+        roles = {(r["area"], r["specialization"]): r["digest"] for r in data.get("roles") or []}
+        specs = {(r["area"], r["specialization"]): r.get("spec") or {} for r in data.get("roles") or []}
+        return cls(id=data["version"], roles=roles, specs=specs, recorded_at=data.get("recorded_at", ""))
+
+
+@dataclass
+class MatrixDiff:
+    old: str
+    new: str
+    added: List[Role] = field(default_factory=list)
+    removed: List[Role] = field(default_factory=list)
+    # role -> skills that changed ("core_skills/Databases"), or [] when only the text did
+    changed: Dict[Role, List[str]] = field(default_factory=dict)
+
+    @property
+    def rescore(self) -> List[Role]:
+        """Roles a record scored against `old` must be scored again for."""
+        return self.added + list(self.changed)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "from": self.old,
+            "to": self.new,
+            "added": [role_key(r) for r in self.added],
+            "removed": [role_key(r) for r in self.removed],
+            "changed": {role_key(r): skills for r, skills in self.changed.items()},
+        }
+
+
+def _skill_changes(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Paths ("category/skill", or "category" for list blocks) whose value differs."""
+    changes: List[str] = []
+    for category in list(old) + [c for c in new if c not in old]:
+        a, b = old.get(category), new.get(category)
+        if a == b:
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            changes.extend(f"{category}/{skill}" for skill in list(a) + [s for s in b if s not in a]
+                           if a.get(skill) != b.get(skill))
+        else:
+            changes.append(category)
+    return changes
+
+
+def diff(old: Version, new: Version) -> MatrixDiff:
+    out = MatrixDiff(old=old.id, new=new.id)
+    for role, digest in new.roles.items():
+        if role not in old.roles:
+            out.added.append(role)
+        elif old.roles[role] != digest:
+            out.changed[role] = _skill_changes(old.specs.get(role) or {}, new.specs.get(role) or {})
+    out.removed = [role for role in old.roles if role not in new.roles]
+    return out
+
+
+class VersionStore:
+    """data/skill_matrix/<version>.json, one file per version ever recorded (never rewritten)."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._cache: Dict[str, Version] = {}
+
+    def _path(self, version_id: str) -> Path:
+        return self.directory / f"{version_id}.json"
+
+    def record(self, version: Version) -> Version:
+        """Keep `version` (first time only); returns it as stored."""
+        stored = self.load(version.id)
+        if stored is not None:
+            return stored
+        version = Version(version.id, version.roles, version.specs, datetime.utcnow().isoformat())
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{version.id}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(version.to_json()))
+            os.replace(tmp, self._path(version.id))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._cache[version.id] = version
+        return version
+
+    def load(self, version_id: str) -> Optional[Version]:
+        if version_id not in self._cache:
+            try:
+                self._cache[version_id] = Version.from_json(orjson.loads(self._path(version_id).read_bytes()))
+            except (OSError, ValueError, KeyError):
+                return None
+        return self._cache[version_id]
+
+    def versions(self) -> List[Version]:
+        """Every recorded version, oldest first."""
+        found = (self.load(p.stem) for p in self.directory.glob("*.json"))
+        return sorted((v for v in found if v is not None), key=lambda v: v.recorded_at)
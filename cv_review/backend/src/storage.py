@@ -1,32 +1,257 @@
 """Persistent JSON storage for CV analyses and metrics."""
 import json
+import os
+import sqlite3
+import tempfile
+import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import get_skill_matrix
+import numpy as np
+import orjson
+
+from src import schema
+from src.compact import ROLES, pack
+from src.dedup import Fingerprint, FingerprintIndex
+from src.embeddings import VectorIndex, embed, profile_text
+from src.record_index import ListingIndex, RecordIndex, parse_cursor
+from src.score_matrix import ScoreMatrix, top_k
+from src.search import SearchIndex
+from src.shared_state import FileLock
+from src.telemetry import EVALUATION_STAGE_SECONDS, STORAGE_SECONDS
+from src.timeline import Timeline, stage_durations
 
 AREAS_ORDER = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
 # Estimated human review time per CV (minutes) — thorough technical review
 HUMAN_REVIEW_MINUTES = 45
 
 
+def slim_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing projection of a record (no full result blob), stored once at save time."""
+    res = record.get("result") or {}
+    return {
+        "id": record["id"],
+        "filename": record.get("filename", ""),
+        "timestamp": record.get("timestamp", ""),
+        "analysis_time_seconds": record.get("analysis_time_seconds", 0),
+        "api_calls": record.get("api_calls", 0),
+        "total_tokens": record.get("total_tokens", 0),
+        "model_used": record.get("model_used", ""),
+        "most_fitted_area": res.get("most_fitted_area", ""),
+        "area_scores": res.get("area_scores", {}),
+        "candidate_summary": res.get("candidate_summary", ""),
+        "human_review_minutes": record.get("human_review_minutes", HUMAN_REVIEW_MINUTES),
+    }
+
+
+class _Unchanged(Exception):
+    """Raised inside a Storage._update block: the file is left as it is (nothing is written)."""
+
+
 class Storage:
-    def __init__(self, data_dir: Path = None):
+    """analyses.json shared by every worker: writes are locked read-modify-write + atomic replace.
+
+    `lock` returns the context manager guarding writes; the default file lock covers workers on
+    one host, a shared-state lock (e.g. Redis) covers instances sharing the data volume.
+    `search`, `fingerprints` (near-duplicate index) and `vectors` (CV text embeddings), when
+    given, are kept in step with every save and delete.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path = None,
+        lock: Optional[Callable[[], Any]] = None,
+        search: Optional[SearchIndex] = None,
+        fingerprints: Optional[FingerprintIndex] = None,
+        vectors: Optional[VectorIndex] = None,
+    ):
         self._path = (data_dir or Path(__file__).resolve().parent.parent / "data") / "analyses.json"
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        if not self._path.exists():
-            self._write([])
+        # Listing rows, rewritten with every write of analyses.json
+        self._slim_path = self._path.with_name("analyses.slim.json")
+        self._lock = lock or (lambda: FileLock(self._path.with_name(".analyses.lock")))
+        self._index: Optional[RecordIndex] = None
+        self._index_signature: Optional[tuple] = None
+        self._index_guard = threading.Lock()
+        self._listing: Optional[ListingIndex] = None
+        self._listing_signature: Optional[tuple] = None
+        self._matrix: Optional[ScoreMatrix] = None
+        self._matrix_signature: Optional[tuple] = None
+        self._matrix_guard = threading.Lock()
+        self._written = threading.local()
+        self.search = search
+        self.fingerprints = fingerprints
+        self.vectors = vectors
+        self._alignment: Optional[Tuple[tuple, np.ndarray]] = None
+        with self._lock():
+            if not self._path.exists():
+                self._write([])
 
     # ── internal helpers ───────────────────────────────────────────────────────
 
-    def _read(self) -> List[Dict[str, Any]]:
+    def _read(self, strict: bool = False) -> List[Dict[str, Any]]:
+        """Stored records; a file orjson rejects (older files may hold NaN) is parsed by json.
+
+        A missing or unreadable file reads as no records, unless `strict` (the write path):
+        then it raises, so a write never replaces the records it could not read.
+        """
+        with STORAGE_SECONDS.time(op="read"):
+            try:
+                data = self._path.read_bytes()
+            except FileNotFoundError:
+                return []
+            except OSError:
+                if strict:
+                    raise
+                return []
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+            try:
+                return json.loads(data)
+            except ValueError as exc:
+                if strict:
+                    raise ValueError(f"{self._path} is not valid JSON; refusing to overwrite it") from exc
+                return []
+
+    def _write(self, data: List[Dict[str, Any]]) -> None:
+        with STORAGE_SECONDS.time(op="write"):
+            self._replace(self._path, data)
+
+    @staticmethod
+    def _replace(path: Path, data: Any) -> None:
+        # Compact UTF-8 (tools/export_analyses.py pretty-prints). Readers never see a
+        # half-written file: write a sibling temp file, then rename over.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _signature(self) -> Optional[tuple]:
         try:
-            return json.loads(self._path.read_text(encoding="utf-8"))
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _write_slim(self, analyses: List[Dict[str, Any]], previous: Dict[str, Dict[str, Any]]) -> None:
+        """Rewrite the listing file; rows of unchanged records are reused, not re-projected.
+
+        `source` ties it to the analyses.json it was derived from, so a stale file (crash
+        between the two writes, or an edit by hand) is detected and rebuilt.
+        """
+        rows = [previous.get(a.get("id")) or slim_row(a) for a in analyses if a.get("id")]
+        self._replace(self._slim_path, {"source": list(self._signature() or ()), "rows": rows})
+
+    def _read_slim(self) -> Optional[Dict[str, Any]]:
+        try:
+            return orjson.loads(self._slim_path.read_bytes())
         except Exception:
-            return []
+            return None
 
-    def _write(self, data: List[Dict[str, Any]]) -> None:
-        self._path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    def _snapshot(self) -> RecordIndex:
+        """Compact records plus indexes for the current analyses.json, rebuilt only when the
+        file changes (records of the previous snapshot are reused, not packed again).
+
+        Shared across requests: treat the records as read-only.
+        """
+        signature = self._signature()
+        with self._index_guard:
+            if self._index is None or signature != self._index_signature:
+                with STORAGE_SECONDS.time(op="index"):
+                    ROLES.extend(_skill_matrix_roles())
+                    previous = self._index.records if self._index is not None else ()
+                    self._index = RecordIndex(pack(self._read(), previous))
+                self._index_signature = signature
+            return self._index
+
+    def _listing_index(self) -> ListingIndex:
+        """Listing rows from analyses.slim.json (never the full records), rebuilt when it changes."""
+        signature = self._signature()
+        with self._index_guard:
+            if self._listing is not None and signature == self._listing_signature:
+                return self._listing
+        slim = self._read_slim()
+        if slim is None or tuple(slim.get("source") or ()) != signature:
+            # Missing (first run after upgrade) or stale: derive it once from analyses.json
+            with self._lock():
+                self._write_slim(self._read(), {})
+                signature = self._signature()
+            slim = self._read_slim() or {"rows": []}
+        listing = ListingIndex(slim.get("rows") or [])
+        with self._index_guard:
+            self._listing, self._listing_signature = listing, signature
+        return listing
+
+    def _score_matrix(self) -> ScoreMatrix:
+        """Score matrix for the current analyses.json: kept up to date by this process's own
+        saves and deletes, rebuilt when another worker has written the file. The matrix
+        returned never changes afterwards (writes replace it), so callers read it unguarded."""
+        signature = self._signature()
+        with self._matrix_guard:
+            if self._matrix is not None and signature == self._matrix_signature:
+                return self._matrix
+        index = self._snapshot()
+        with STORAGE_SECONDS.time(op="matrix"):
+            # Built from the packed scores: no record is decoded
+            rows = ({"id": r.id, "result": r.scores()} for r in index.records)
+            matrix = ScoreMatrix(rows, roles=_skill_matrix_roles())
+        with self._matrix_guard:
+            # Tagged with the signature seen before the snapshot: if the file moved on meanwhile,
+            # the next call rebuilds rather than serving a matrix that is behind
+            self._matrix, self._matrix_signature = matrix, signature
+        return matrix
+
+    def _apply_to_matrix(self, before: Optional[tuple], after: Optional[tuple], change: Callable[[ScoreMatrix], Any]) -> None:
+        """Apply one write to the matrix if it was current just before it (else it is rebuilt on next use).
+
+        Copy-on-write: the change goes to a copy that then replaces the matrix, so a ranking
+        running in another thread keeps reading the matrix it started with, unchanged.
+        """
+        with self._matrix_guard:
+            if self._matrix is None or self._matrix_signature != before:
+                return
+            matrix = self._matrix.copy()
+            change(matrix)
+            self._matrix, self._matrix_signature = matrix, after
+
+    @contextmanager
+    def _update(self, changed: Iterable[str] = ()) -> Iterator[List[Dict[str, Any]]]:
+        """Hold the write lock, yield the current records and write them back on success.
+
+        `changed`: ids of records modified in place (their listing rows are projected again).
+        self._written holds the file signatures (before, after) of the write, taken under the lock.
+        Raise _Unchanged in the block to skip the write.
+        """
+        with self._lock():
+            before = self._signature()
+            analyses = self._read(strict=True)
+            slim = self._read_slim() or {}
+            previous = {} if tuple(slim.get("source") or ()) != before else {
+                row["id"]: row for row in slim.get("rows") or []
+            }
+            for analysis_id in changed:
+                previous.pop(analysis_id, None)
+            try:
+                yield analyses
+            except _Unchanged:
+                self._written.value = (before, before)
+                return
+            self._write(analyses)
+            self._written.value = (before, self._signature())
+            self._write_slim(analyses, previous)
 
     # ── CRUD ───────────────────────────────────────────────────────────────────
 
@@ -35,8 +260,12 @@ class Storage:
         filename: str,
         result: Dict[str, Any],
         analysis_time_seconds: float,
+        timeline: Optional[Timeline] = None,
+        cv_text: Optional[str] = None,
+        fingerprint: Optional[Fingerprint] = None,
+        duplicate_of: Optional[str] = None,
     ) -> str:
-        analyses = self._read()
+        persist_start = timeline.now() if timeline else 0.0
         analysis_id = str(uuid.uuid4())
         metrics = result.get("metrics") or {}
         record = {
@@ -50,48 +279,290 @@ class Storage:
             "human_review_minutes": HUMAN_REVIEW_MINUTES,
             "result": result,
         }
-        analyses.append(record)
-        self._write(analyses)
+        if duplicate_of:
+            record["duplicate_of"] = duplicate_of
+        if metrics.get("skill_matrix_version"):
+            record["skill_matrix_version"] = metrics["skill_matrix_version"]
+        with self._update() as analyses:
+            if timeline:
+                # Stored "persistence" span: building the record, the write lock and the read
+                # of analyses.json. The write itself comes after the record is serialized, so
+                # it is its own stage (persistence_write: live timeline and stage histogram).
+                timeline.add("persistence", persist_start)
+                record["timeline"] = timeline.to_dict()
+                record["stage_seconds"] = stage_durations(record["timeline"], analysis_time_seconds)
+            schema.validate_record(record)
+            write_start = timeline.now() if timeline else 0.0
+            analyses.append(record)
+        if timeline:
+            span = timeline.add("persistence_write", write_start)
+            EVALUATION_STAGE_SECONDS.observe(span["duration"], stage="persistence_write")
+        self._apply_to_matrix(*self._written.value, lambda m: m.add(record))
+        if self.search is not None:
+            try:
+                self.search.add(record, cv_text)
+            except sqlite3.Error:
+                pass  # the record is saved; reconcile() at the next start indexes it
+        if self.fingerprints is not None and (fingerprint is not None or cv_text):
+            try:
+                self.fingerprints.add(analysis_id, fingerprint or Fingerprint.of(cv_text))
+            except sqlite3.Error:
+                pass
+        if self.vectors is not None:
+            try:
+                self.vectors.add(analysis_id, embed(profile_text(record, cv_text)))
+            except sqlite3.Error:
+                pass
         return analysis_id
 
+    def save_rescored(self, analysis_id: str, result: Dict[str, Any], expected_version: Optional[str]) -> bool:
+        """Replace the result of a re-scored analysis (see evaluator.rescore_specializations)
+        and stamp the skill matrix version it now matches.
+
+        Nothing is written (False) when the analysis is gone or no longer has
+        `expected_version`: another worker re-scored it meanwhile.
+        """
+        index = self._snapshot()
+        pos = index.by_id.get(analysis_id)
+        if pos is None or index.records[pos].skill_matrix_version != expected_version:
+            return False
+        metrics = result.get("metrics") or {}
+        record: Optional[Dict[str, Any]] = None
+        with self._update(changed=(analysis_id,)) as analyses:
+            found = next((a for a in analyses if a.get("id") == analysis_id), None)
+            if found is None or found.get("skill_matrix_version") != expected_version:
+                raise _Unchanged  # changed since the snapshot was taken
+            record = found
+            record.update(
+                result=result,
+                skill_matrix_version=metrics.get("skill_matrix_version"),
+                rescored_at=datetime.utcnow().isoformat(),
+                api_calls=metrics.get("api_calls", record.get("api_calls", 0)),
+                total_tokens=metrics.get("total_tokens", record.get("total_tokens", 0)),
+            )
+            schema.validate_record(record)
+        if record is None:
+            return False
+
+        def replace(matrix: ScoreMatrix) -> None:
+            matrix.remove(analysis_id)
+            matrix.add(record)
+
+        self._apply_to_matrix(*self._written.value, replace)
+        if self.search is not None:
+            try:
+                self.search.add(record)  # most_fitted_area facet; the CV text is kept
+            except sqlite3.Error:
+                pass
+        return True
+
+    def stamp_skill_matrix_version(self, expected: Dict[str, Optional[str]], version: str) -> int:
+        """Stamp `version` on analyses whose scores it leaves as they are (nothing to re-score),
+        in one write. `expected`: id -> version each must still have; returns how many were stamped.
+        """
+        stamped = 0
+        with self._update() as analyses:
+            for record in analyses:
+                analysis_id = record.get("id")
+                if analysis_id in expected and record.get("skill_matrix_version") == expected[analysis_id]:
+                    record["skill_matrix_version"] = version
+                    stamped += 1
+            if not stamped:
+                raise _Unchanged
+        # Scores and listing rows are unchanged: keep the matrix current for the new file
+        self._apply_to_matrix(*self._written.value, lambda matrix: None)
+        return stamped
+
+    def skill_matrix_versions(self) -> Dict[Optional[str], int]:
+        """Stored analyses per skill matrix version they were scored against (None: not stamped)."""
+        counts: Dict[Optional[str], int] = {}
+        for r in self._snapshot().records:
+            counts[r.skill_matrix_version] = counts.get(r.skill_matrix_version, 0) + 1
+        return counts
+
+    def stale_analyses(self, version: str, limit: Optional[int] = None) -> List[Tuple[str, Optional[str]]]:
+        """(id, version) of analyses not scored against `version`, oldest first."""
+        stale = [(r.id, r.skill_matrix_version) for r in self._snapshot().records
+                 if r.id and r.skill_matrix_version != version]
+        return stale[:limit] if limit is not None else stale
+
     def get_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        for a in self._read():
-            if a.get("id") == analysis_id:
-                return a
-        return None
+        index = self._snapshot()
+        pos = index.by_id.get(analysis_id)
+        return None if pos is None else index.records[pos].to_dict()
 
     def delete_analysis(self, analysis_id: str) -> bool:
-        analyses = self._read()
-        new = [a for a in analyses if a.get("id") != analysis_id]
-        if len(new) == len(analyses):
+        if analysis_id not in self._snapshot().by_id:
+            return False
+        deleted = False
+        with self._update() as analyses:
+            before = len(analyses)
+            analyses[:] = [a for a in analyses if a.get("id") != analysis_id]
+            if len(analyses) == before:
+                raise _Unchanged  # deleted since the snapshot was taken
+            deleted = True
+        if not deleted:
             return False
-        self._write(new)
+        self._apply_to_matrix(*self._written.value, lambda m: m.remove(analysis_id))
+        for index in (self.search, self.fingerprints, self.vectors):
+            if index is None:
+                continue
+            try:
+                index.remove(analysis_id)
+            except sqlite3.Error:
+                pass
         return True
 
-    def list_analyses(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        analyses = self._read()
-        total = len(analyses)
-        # Sort newest first
-        sorted_analyses = sorted(analyses, key=lambda x: x.get("timestamp", ""), reverse=True)
-        page = sorted_analyses[offset: offset + limit]
-        # Return slim version (no full result blob)
-        slim = []
-        for a in page:
-            res = a.get("result") or {}
-            slim.append({
-                "id": a["id"],
-                "filename": a.get("filename", ""),
-                "timestamp": a.get("timestamp", ""),
-                "analysis_time_seconds": a.get("analysis_time_seconds", 0),
-                "api_calls": a.get("api_calls", 0),
-                "total_tokens": a.get("total_tokens", 0),
-                "model_used": a.get("model_used", ""),
-                "most_fitted_area": res.get("most_fitted_area", ""),
-                "area_scores": res.get("area_scores", {}),
-                "candidate_summary": res.get("candidate_summary", ""),
-                "human_review_minutes": a.get("human_review_minutes", HUMAN_REVIEW_MINUTES),
-            })
-        return {"total": total, "items": slim}
+    def list_analyses(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[str] = None,
+        area: Optional[str] = None,
+        model: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Newest-first page of slim rows, optionally filtered by best-fit area, model and date.
+
+        `after` is the next_cursor of the previous page ("<timestamp>,<id>"): keyset
+        pagination, so deep pages cost the same as the first. `offset` still works (on top
+        of the cursor) for older clients.
+        """
+        listing = self._listing_index()
+        with STORAGE_SECONDS.time(op="list"):
+            total, items, next_cursor = listing.page(
+                limit=limit,
+                after=parse_cursor(after) if after else None,
+                offset=offset,
+                area=area,
+                model=model,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        return {"total": total, "items": items, "next_cursor": next_cursor}
+
+    def reconcile_search(self) -> Dict[str, int]:
+        """Bring the search index in line with analyses.json (after an upgrade or a lost search.db)."""
+        if self.search is None:
+            return {"added": 0, "removed": 0}
+        return self.search.reconcile(self._snapshot().records)
+
+    def reconcile_fingerprints(self) -> Dict[str, int]:
+        """Fingerprint stored analyses missing from the duplicate index, from the CV text kept in
+        the search index (analyses saved before either existed have no text and are skipped)."""
+        if self.fingerprints is None or self.search is None:
+            return {"added": 0, "removed": 0}
+        ids = [r.id for r in self._snapshot().records if r.id]
+        known = self.fingerprints.known_ids()
+        texts = ((i, self.search.get_text(i)) for i in ids if i not in known)
+        added = self.fingerprints.add_many((i, Fingerprint.of(text)) for i, text in texts if text)
+        stale = known - set(ids)
+        for analysis_id in stale:
+            self.fingerprints.remove(analysis_id)
+        return {"added": added, "removed": len(stale)}
+
+    def reconcile_vectors(self) -> Dict[str, int]:
+        """Embed stored analyses missing from the vector index: their CV text from the search
+        index when it has one, else the analysis' summary, education and jobs."""
+        if self.vectors is None:
+            return {"added": 0, "removed": 0}
+        records = [r for r in self._snapshot().records if r.id]
+        known = self.vectors.known_ids()
+        missing = (r for r in records if r.id not in known)
+        added = self.vectors.add_many(
+            (r.id, embed(profile_text(r.to_dict(), self.search.get_text(r.id) if self.search else None))) for r in missing
+        )
+        stale = known - {r.id for r in records}
+        for analysis_id in stale:
+            self.vectors.remove(analysis_id)
+        return {"added": added, "removed": len(stale)}
+
+    def query(
+        self,
+        ids: Optional[List[str]] = None,
+        area: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_scores: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+        sort: str = "timestamp",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Full records matching every given filter, answered from the indexes (see RecordIndex.query).
+
+        sort: timestamp, analysis_time_seconds, total_tokens, filename or "score:<key>"
+        (e.g. "score:Data", "score:Data/AI and ML").
+        """
+        index = self._snapshot()
+        with STORAGE_SECONDS.time(op="query"):
+            total, positions = index.query(
+                ids=ids, area=area, date_from=date_from, date_to=date_to, min_scores=min_scores,
+                model=model, sort=sort, descending=descending, limit=limit, offset=offset,
+            )
+        return {"total": total, "items": [index.records[p].to_dict() for p in positions]}
+
+    def iter_analyses(
+        self,
+        ids: Optional[List[str]] = None,
+        area: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_scores: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+        sort: str = "timestamp",
+        descending: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every record matching the filters (as query, uncapped), decoded one at a time as the
+        caller consumes them: an export holds one full record, not a list of all of them.
+
+        The matching positions are resolved now, against the current snapshot; later writes
+        do not change what the iterator yields.
+        """
+        index = self._snapshot()
+        with STORAGE_SECONDS.time(op="query"):
+            _, positions = index.query(
+                ids=ids, area=area, date_from=date_from, date_to=date_to, min_scores=min_scores,
+                model=model, sort=sort, descending=descending,
+            )
+        records = index.records
+        return (records[p].to_dict() for p in positions)
+
+    def list_slow_analyses(
+        self,
+        stage: str = "total",
+        min_seconds: float = 0.0,
+        limit: int = 50,
+        descending: bool = True,
+    ) -> Dict[str, Any]:
+        """Analyses with a recorded duration for `stage` >= min_seconds, sorted by that duration.
+
+        `stage` is any key of stage_durations(): a top-level stage (e.g. "spec_scoring"),
+        "llm_max", "llm:<prompt>", "spec:<specialization>" or "total". Served from the
+        durations packed in the snapshot records: nothing is decoded.
+        """
+        matches = []
+        for r in self._snapshot().records:
+            value = r.stage_seconds(stage)
+            if r.id and value is not None and value >= min_seconds:
+                matches.append((value, r))
+        matches.sort(key=lambda m: m[0], reverse=descending)
+        items = [
+            {
+                "id": r.id,
+                "filename": r.filename or "",
+                "timestamp": r.timestamp or "",
+                "analysis_time_seconds": r.analysis_time_seconds or 0,
+                "model_used": r.model_used or "",
+                "stage": stage,
+                "stage_seconds": value,
+                "durations": r.stage_durations(),
+            }
+            for value, r in matches[:limit]
+        ]
+        return {"total": len(matches), "stage": stage, "items": items}
 
     # ── Metrics ────────────────────────────────────────────────────────────────
 
@@ -159,26 +630,121 @@ class Storage:
     # ── Best candidates ────────────────────────────────────────────────────────
 
     def get_best_candidates(self) -> Dict[str, Any]:
-        analyses = self._read()
+        """Top candidate per area (highest area score, earliest on a tie), from the score matrix."""
+        matrix = self._score_matrix()
+        index = self._snapshot()
         best: Dict[str, Optional[Dict[str, Any]]] = {a: None for a in AREAS_ORDER}
-
-        for a in analyses:
-            res = a.get("result") or {}
-            area_scores = res.get("area_scores") or {}
+        with STORAGE_SECONDS.time(op="rank"):
             for area in AREAS_ORDER:
-                score = area_scores.get(area, 1.0)
-                current_best = best[area]
-                if current_best is None or score > (current_best.get("area_scores", {}).get(area, 0)):
-                    best[area] = {
-                        "id": a["id"],
-                        "filename": a.get("filename", ""),
-                        "timestamp": a.get("timestamp", ""),
-                        "most_fitted_area": res.get("most_fitted_area", ""),
-                        "area_scores": area_scores,
-                        "candidate_summary": res.get("candidate_summary", ""),
-                        "best_specializations": res.get("best_specializations", []),
-                        "education_list": res.get("education_list", []),
-                        "score_in_area": score,
-                    }
-
+                top = matrix.best(area, default=1.0)
+                pos = index.by_id.get(top[0]) if top else None
+                if pos is None:
+                    continue
+                a = index.records[pos].to_dict()
+                res = a.get("result") or {}
+                best[area] = {
+                    "id": a["id"],
+                    "filename": a.get("filename", ""),
+                    "timestamp": a.get("timestamp", ""),
+                    "most_fitted_area": res.get("most_fitted_area", ""),
+                    "area_scores": res.get("area_scores") or {},
+                    "candidate_summary": res.get("candidate_summary", ""),
+                    "best_specializations": res.get("best_specializations", []),
+                    "education_list": res.get("education_list", []),
+                    "score_in_area": top[1],
+                }
         return {"best_by_area": best}
+
+    def rank_candidates(
+        self,
+        weights: Dict[str, float],
+        min_scores: Optional[Dict[str, float]] = None,
+        area: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Top candidates by a weighted sum of area / specialization scores (see ScoreMatrix.rank).
+
+        Keys are "Data", "Data/AI and ML" or an unambiguous specialization name; unknown keys
+        raise ValueError. Items are listing rows plus `score` and the scores used.
+        """
+        matrix = self._score_matrix()
+        with STORAGE_SECONDS.time(op="rank"):
+            weights = {matrix.resolve(k): w for k, w in weights.items()}
+            min_scores = {matrix.resolve(k): v for k, v in (min_scores or {}).items()}
+            total, top = matrix.rank(weights, min_scores, area=area, limit=limit)
+        listing = self._listing_index()
+        keys = list(dict.fromkeys([*weights, *min_scores]))
+        items = []
+        for analysis_id, score in top:
+            row = listing.get(analysis_id)
+            if row is not None:
+                items.append({**row, "score": score, "scores": matrix.values(analysis_id, keys)})
+        return {"total": total, "items": items, "weights": weights, "min_scores": min_scores}
+
+    def match_candidates(
+        self,
+        weights: Dict[str, float],
+        vector: Optional[np.ndarray] = None,
+        text_weight: float = 0.3,
+        min_scores: Optional[Dict[str, float]] = None,
+        area: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Candidates ranked by fit to a requisition: (1 - text_weight) * spec_fit + text_weight * text_score.
+
+        spec_fit is the weighted specialization score over 5 (weights are normalized), text_score
+        the cosine similarity of the candidate's embedding to `vector`, relative to the best one
+        in the pool. Without a vector index (or `vector`) only spec_fit counts.
+        """
+        matrix = self._score_matrix()
+        with STORAGE_SECONDS.time(op="match"):
+            weights = {matrix.resolve(k): w for k, w in weights.items()}
+            min_scores = {matrix.resolve(k): v for k, v in (min_scores or {}).items()}
+            norm = sum(weights.values()) or 1.0
+            spec_fit = matrix.weighted({k: w / norm for k, w in weights.items()}) / 5.0
+            mask = matrix.mask(min_scores, area)
+            text = np.zeros(matrix.size, dtype=np.float32)
+            if self.vectors is not None and vector is not None and text_weight > 0:
+                version, ids, sims = self.vectors.similarities(vector)
+                rows = self._vector_rows(matrix, version, ids, len(sims))
+                found = rows >= 0
+                text[rows[found]] = np.clip(sims[found], 0.0, None)
+                best = float(text[mask].max()) if mask.any() else 0.0
+                if best > 0:
+                    text /= best
+            else:
+                text_weight = 0.0
+            combined = np.round((1.0 - text_weight) * spec_fit + text_weight * text, 4)
+            total = int(mask.sum())
+            top = top_k(combined, mask, limit)
+        listing = self._listing_index()
+        items = []
+        for row in top:
+            analysis_id = matrix.ids[row]
+            slim = listing.get(analysis_id)
+            if slim is None:
+                continue
+            items.append({
+                **slim,
+                "match_score": round(float(combined[row]), 3),
+                "spec_fit": round(float(spec_fit[row]), 3),
+                "text_score": round(float(text[row]), 3),
+                "scores": matrix.values(analysis_id, weights),
+            })
+        return {"total": total, "items": items, "weights": weights, "min_scores": min_scores, "text_weight": text_weight}
+
+    def _vector_rows(self, matrix: ScoreMatrix, version: int, ids: List[Optional[str]], n: int) -> np.ndarray:
+        """Score-matrix row of each of the first n vector-index rows (-1: none), cached until either changes."""
+        key = (id(matrix), matrix.version, version, n)
+        cached = self._alignment
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        rows = np.fromiter((matrix.rows.get(i, -1) if i else -1 for i in ids[:n]), dtype=np.int64, count=n)
+        self._alignment = (key, rows)
+        return rows
+
+
+def _skill_matrix_roles() -> List[Tuple[str, str]]:
+    """(area, specialization) of every role in the skill matrix: score matrix columns."""
+    areas = get_skill_matrix().get("areas") or {}
+    return [(area, spec) for area, data in areas.items() for spec in ((data or {}).get("specializations") or {})]
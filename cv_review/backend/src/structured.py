@@ -0,0 +1,212 @@
+"""
+Structured LLM answers: a JSON schema per prompt type, a tolerant JSON scanner and validation.
+
+Every prompt that expects JSON has a schema here. The schema is sent as `response_format`
+(json_schema) to models that accept it (fuelix_client drops it for models that refuse it),
+and every answer is validated against it, whichever way it was produced. An answer that
+does not validate gets a repair retry of that prompt only (evaluator._complete_json,
+evaluation.repair_retries): the model sees its own answer and the validation errors.
+
+The validator covers the JSON Schema subset used below: type, properties, required,
+additionalProperties, items, enum, minimum, maximum.
+"""
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from src.skill_inventory import LEVELS
+from src.telemetry import LLM_ANSWERS
+
+_STRING = {"type": "string"}
+_STRINGS = {"type": "array", "items": _STRING}
+AREAS = ("Infrastructure", "Networking", "Platform", "Data", "Other")
+
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "spec_level": {
+        "type": "object",
+        "properties": {"score": {"type": "integer", "minimum": 1, "maximum": 5}},
+        "required": ["score"],
+    },
+    "area_description": {
+        "type": "object",
+        "properties": {area: _STRING for area in AREAS},
+        "required": list(AREAS),
+    },
+    "profile": {
+        "type": "object",
+        "properties": {"education": _STRINGS, "soft_skills": _STRINGS, "previous_jobs": _STRINGS},
+        "required": ["education", "soft_skills", "previous_jobs"],
+    },
+    "summary": {
+        "type": "object",
+        "properties": {"candidate_summary": _STRING, "recommended_role": _STRING, "recommendation_reason": _STRING},
+        "required": ["candidate_summary", "recommendation_reason"],
+    },
+    "skill_inventory": {
+        "type": "object",
+        "properties": {
+            "skills": {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {"level": {"type": "string", "enum": list(LEVELS)}, "evidence": _STRING},
+                    "required": ["level"],
+                },
+            },
+        },
+        "required": ["skills"],
+    },
+    "requisition": {
+        "type": "object",
+        "properties": {
+            "requisition_weights": {
+                "type": "object",
+                "additionalProperties": {"type": "number", "minimum": 0, "maximum": 1},
+            },
+            "summary": _STRING,
+        },
+        "required": ["requisition_weights"],
+    },
+}
+
+# Validation errors reported (and shown to the model in a repair) per answer
+MAX_ERRORS = 5
+
+
+def response_format(prompt: str) -> Optional[Dict[str, Any]]:
+    """`response_format` for a prompt type (None when it has no schema)."""
+    schema = SCHEMAS.get(prompt)
+    if schema is None:
+        return None
+    return {"type": "json_schema", "json_schema": {"name": prompt, "schema": schema}}
+
+
+# ── Scanning ─────────────────────────────────────────────────────────────────
+
+def _object_end(text: str, start: int) -> int:
+    """Index just past the object opening at text[start] ("{"), or -1. Braces inside
+    strings (and escaped quotes) do not count."""
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """The JSON object in a model answer: the whole answer (structured output), else the
+    first complete object that parses, skipping prose, code fences and broken candidates."""
+    text = (text or "").strip()
+    if text.startswith("{"):
+        try:
+            value = orjson.loads(text)
+            if isinstance(value, dict):
+                return value
+        except orjson.JSONDecodeError:
+            pass
+    start = text.find("{")
+    while start != -1:
+        end = _object_end(text, start)
+        if end == -1:
+            return None
+        try:
+            value = orjson.loads(text[start:end])
+            if isinstance(value, dict):
+                return value
+        except orjson.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+
+# ── Validation ───────────────────────────────────────────────────────────────
+
+def _type_ok(value: Any, expected: str) -> bool:
+    if expected == "object":
+        return isinstance(value, dict)
+    if expected == "array":
+        return isinstance(value, list)
+    if expected == "string":
+        return isinstance(value, str)
+    if expected == "boolean":
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if expected == "integer":
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if expected == "number":
+        return isinstance(value, (int, float))
+    return True
+
+
+def _validate(value: Any, schema: Dict[str, Any], path: str, errors: List[str]) -> None:
+    if len(errors) >= MAX_ERRORS:
+        return
+    expected = schema.get("type")
+    if expected and not _type_ok(value, expected):
+        errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+        return
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} is below {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} is above {schema['maximum']}")
+    if isinstance(value, dict):
+        properties = schema.get("properties") or {}
+        for key in schema.get("required") or ():
+            if key not in value:
+                errors.append(f"{path}: missing {key!r}")
+        extra = schema.get("additionalProperties", True)
+        for key, item in value.items():
+            if key in properties:
+                _validate(item, properties[key], f"{path}.{key}", errors)
+            elif isinstance(extra, dict):
+                _validate(item, extra, f"{path}.{key}", errors)
+            elif extra is False:
+                errors.append(f"{path}: unexpected {key!r}")
+    elif isinstance(value, list) and isinstance(schema.get("items"), dict):
+        for i, item in enumerate(value):
+            _validate(item, schema["items"], f"{path}[{i}]", errors)
+
+
+def validate(value: Any, prompt: str) -> List[str]:
+    """Why `value` does not match the schema of `prompt` (empty: it does, or there is none)."""
+    schema = SCHEMAS.get(prompt)
+    if schema is None:
+        return []
+    errors: List[str] = []
+    _validate(value, schema, "$", errors)
+    return errors[:MAX_ERRORS]
+
+
+def answer_rates() -> Dict[str, Dict[str, Any]]:
+    """Per prompt type, the JSON answers this worker got and the share that missed the
+    schema: repaired (valid after a repair call) and invalid (still not)."""
+    rates: Dict[str, Dict[str, Any]] = {}
+    for prompt in SCHEMAS:
+        counts = {o: int(LLM_ANSWERS.value(prompt=prompt, outcome=o)) for o in ("valid", "repaired", "invalid")}
+        total = sum(counts.values())
+        if total:
+            rates[prompt] = {
+                "answers": total,
+                "repair_rate": round(counts["repaired"] / total, 4),
+                "invalid_rate": round(counts["invalid"] / total, 4),
+            }
+    return rates
@@ -0,0 +1,274 @@
+"""Operational metrics in Prometheus text format — histograms, gauges, counters and timing hooks."""
+import asyncio
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labels_text(self, key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{self._labels_text(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        return self._header() + [f"{self.name}{self._labels_text(k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the with-block (also when it raises)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            cumulative = 0.0
+            for i, upper in enumerate(self.buckets):
+                cumulative += series[i]
+                lines.append(f"{self.name}_bucket{self._labels_text(key, ('le', _fmt(upper)))} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{self._labels_text(key)} {_fmt(series[-2])}")
+            lines.append(f"{self.name}_count{self._labels_text(key)} {_fmt(series[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# ── Metrics used across the app ──────────────────────────────────────────────
+
+EXTRACTION_SECONDS = histogram(
+    "cv_review_extraction_seconds", "CV text extraction time by file type.", ["file_type"])
+URL_FETCH_SECONDS = histogram(
+    "cv_review_url_fetch_seconds", "URL fetch and extraction time by source label.", ["source"])
+EVALUATION_STAGE_SECONDS = histogram(
+    "cv_review_evaluation_stage_seconds", "evaluate_cv time per stage.", ["stage"])
+LLM_REQUEST_SECONDS = histogram(
+    "cv_review_llm_request_seconds", "Fuelix chat completion latency by model.", ["model"])
+LLM_REQUESTS = counter(
+    "cv_review_llm_requests_total", "Fuelix chat completion calls by model and outcome.", ["model", "outcome"])
+STORAGE_SECONDS = histogram(
+    "cv_review_storage_seconds", "analyses.json read/write time.", ["op"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+REPORT_RENDER_SECONDS = histogram(
+    "cv_review_report_render_seconds", "Excel/PDF report rendering time.", ["format"])
+JOBS_ACTIVE = gauge("cv_review_jobs_active", "Evaluations currently running.")
+JOBS_QUEUED = gauge("cv_review_jobs_queued", "Evaluations accepted but not started yet.")
+JOB_REGISTRY_SIZE = gauge(
+    "cv_review_job_registry_size", "Jobs in the shared job registry at the last sweep.", ["state"])
+JOB_REGISTRY_EVICTED = counter(
+    "cv_review_job_registry_evicted_total", "Jobs removed from the registry by this worker's sweeps.", ["reason"])
+EVALUATIONS_COALESCED = counter(
+    "cv_review_evaluations_coalesced_total",
+    "Submissions attached to an identical evaluation already running, by endpoint.", ["endpoint"])
+RESCORED = counter(
+    "cv_review_rescored_total", "Stored analyses taken by the skill matrix re-scoring backfill, by outcome.", ["outcome"])
+RESCORE_STALE = gauge(
+    "cv_review_rescore_stale", "Stored analyses not scored against the current skill matrix (last backfill step).")
+LLM_ANSWERS = counter(
+    "cv_review_llm_answers_total",
+    "JSON answers by prompt type and outcome: valid, repaired (valid after a repair call) or invalid.",
+    ["prompt", "outcome"])
+SKILL_INVENTORY = counter(
+    "cv_review_skill_inventory_total",
+    "Skill inventory extractions (evaluation.mode inventory/shadow), by outcome.", ["outcome"])
+ADMISSION_REJECTED = counter(
+    "cv_review_admission_rejected_total", "Evaluation requests refused by admission control.", ["reason"])
+PROCESS_RESIDENT_BYTES = gauge("cv_review_process_resident_bytes", "Resident memory of this worker process.")
+EVENT_LOOP_LAG_SECONDS = gauge("cv_review_event_loop_lag_seconds", "Most recent event-loop lag sample.")
+EVENT_LOOP_LAG = histogram(
+    "cv_review_event_loop_lag_sample_seconds", "Event-loop lag samples.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Background task: sleep `interval` and record how late the loop woke up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - t0 - interval)
+        EVENT_LOOP_LAG_SECONDS.set(lag)
+        EVENT_LOOP_LAG.observe(lag)
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident and peak resident memory of this process in bytes (None where unavailable)."""
+    rss = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # ru_maxrss: KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        pass
+    if rss is not None:
+        PROCESS_RESIDENT_BYTES.set(rss)
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
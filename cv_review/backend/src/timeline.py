@@ -0,0 +1,101 @@
+"""Per-analysis latency timeline — extraction, each LLM call, stages and persistence."""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Top-level stages in the order they happen; "llm" spans sit inside the evaluation stages.
+STAGES = [
+    "extraction",
+    "url_fetch",
+    "queue_wait",
+    "preparation",
+    "spec_scoring",
+    "area_descriptions",
+    "profile",
+    "summary",
+    "persistence",
+    "persistence_write",
+]
+
+
+class Timeline:
+    """Collects spans as offsets (seconds) from the moment the CV was received."""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.time()
+        # perf_counter is monotonic; anchor it to the wall-clock start once
+        self._origin = time.perf_counter() - (time.time() - self.started_at)
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def add(self, stage: str, start: float, end: Optional[float] = None, **attrs: Any) -> Dict[str, Any]:
+        end = self.now() if end is None else end
+        span = {
+            "stage": stage,
+            "start": round(start, 3),
+            "end": round(end, 3),
+            "duration": round(max(0.0, end - start), 3),
+            **{k: v for k, v in attrs.items() if v is not None},
+        }
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, stage: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Record the with-block as a span; the yielded dict can carry extra attributes."""
+        start = self.now()
+        extra: Dict[str, Any] = dict(attrs)
+        try:
+            yield extra
+        finally:
+            self.add(stage, start, **extra)
+
+    def spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            # Parents (stages) before the LLM calls they contain
+            return sorted(self._spans, key=lambda s: (s["start"], -s["end"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        spans = self.spans()
+        return {
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat(),
+            "total_seconds": round(max((s["end"] for s in spans), default=0.0), 3),
+            "spans": spans,
+        }
+
+
+def stage_durations(timeline: Optional[Dict[str, Any]], total_seconds: float = 0.0) -> Dict[str, float]:
+    """Flatten a stored timeline into filterable durations.
+
+    Keys: each top-level stage, "llm_total", "llm_max", "llm:<prompt type>",
+    "spec:<specialization>", "llm_retries" and "total".
+    """
+    out: Dict[str, float] = {"total": round(float(total_seconds or 0.0), 3)}
+    if not timeline:
+        return out
+    llm_max = 0.0
+    for s in timeline.get("spans") or []:
+        d = float(s.get("duration") or 0.0)
+        stage = s.get("stage") or ""
+        if stage == "llm":
+            llm_max = max(llm_max, d)
+            out["llm_total"] = out.get("llm_total", 0.0) + d
+            out["llm_retries"] = out.get("llm_retries", 0) + int(s.get("retries") or 0)
+            prompt = s.get("prompt")
+            if prompt:
+                out[f"llm:{prompt}"] = out.get(f"llm:{prompt}", 0.0) + d
+            if s.get("specialization"):
+                out[f"spec:{s['specialization']}"] = out.get(f"spec:{s['specialization']}", 0.0) + d
+        else:
+            out[stage] = out.get(stage, 0.0) + d
+    if llm_max:
+        out["llm_max"] = llm_max
+    if not total_seconds and timeline.get("total_seconds"):
+        out["total"] = float(timeline["total_seconds"])
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in out.items()}
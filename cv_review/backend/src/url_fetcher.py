@@ -4,12 +4,15 @@ Supports: LinkedIn public profiles, portfolio sites, GitHub, PDF links, any publ
 """
 import re
 import tempfile
+import time
 from pathlib import Path
 from typing import Tuple
 from urllib.parse import urlparse
 
 import requests
 
+from src.telemetry import URL_FETCH_SECONDS
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -171,6 +174,18 @@ def fetch_text_from_url(url: str, timeout: int = 30) -> Tuple[str, str]:
     Raises:
         ValueError: if the URL is unreachable or returns no usable content.
     """
+    t0 = time.perf_counter()
+    source = "error"
+    try:
+        text, source = _fetch_text_from_url(url, timeout)
+        return text, source
+    finally:
+        # Generic pages are labelled per hostname; collapse them to keep label cardinality bounded
+        label = "Web Page" if source.startswith("Web Page") else source
+        URL_FETCH_SECONDS.observe(time.perf_counter() - t0, source=label)
+
+
+def _fetch_text_from_url(url: str, timeout: int) -> Tuple[str, str]:
     url = url.strip()
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
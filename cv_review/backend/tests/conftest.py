@@ -0,0 +1,31 @@
+"""Run from cv_review/backend: python -m pytest -q tests"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def make_record():
+    """Factory of stored analysis records: id a<i>, saved on day i of 2026 (in file order)."""
+
+    def make(i, area="Data", score=4):
+        return {
+            "id": f"a{i}",
+            "filename": f"cv{i}.pdf",
+            "timestamp": (datetime(2026, 1, 1, 10) + timedelta(days=i)).isoformat(),
+            "model_used": "m",
+            "result": {
+                "most_fitted_area": area,
+                "area_scores": {"Data": score, "Platform": 2},
+                "specializations": [{"area": "Data", "specialization": "AI and ML", "score": score, "level": "High"}],
+                "candidate_summary": f"Candidate {i}",
+            },
+        }
+
+    return make
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.admission import Admission, Rejected, TokenBucket
+
+
+def test_token_bucket_refills_continuously():
+    bucket = TokenBucket(rate=1.0, burst=2, now=0.0)
+    assert bucket.take(2, now=0.0) == 0.0
+    assert bucket.take(1, now=0.5) == pytest.approx(0.5)
+    assert bucket.take(1, now=1.0) == 0.0
+    assert bucket.take(3, now=100.0) == float("inf")
+
+
+def test_queue_full_and_client_rate():
+    admission = Admission(max_in_flight=1, max_queued=2, rate_per_minute=60, burst=2)
+    with admission.admit("a", 2) as ticket:
+        ticket.use()
+        ticket.use()
+    with pytest.raises(Rejected) as full:
+        admission.admit("b", 2)
+    assert full.value.status == 503
+    admission.release(2)
+    with pytest.raises(Rejected) as limited:
+        admission.admit("a", 1)
+    assert limited.value.status == 429 and 0 < limited.value.retry_after <= 1
+    with pytest.raises(Rejected) as too_many:
+        admission.admit("c", 3)
+    assert too_many.value.status == 429
+
+
+def test_ticket_gives_back_what_was_not_queued():
+    admission = Admission(max_in_flight=1, max_queued=10, rate_per_minute=600, burst=10)
+    with admission.admit("a", 3) as ticket:
+        assert ticket.use() == 0.0
+    assert admission.queued == 1
+    with pytest.raises(RuntimeError):
+        with admission.admit("a", 2) as ticket:
+            ticket.use()
+            raise RuntimeError("request failed")
+    assert admission.queued == 1
+
+
+def test_slots_cap_running_evaluations():
+    admission = Admission(max_in_flight=2, max_queued=10)
+    peak = 0
+
+    async def evaluate():
+        nonlocal peak
+        async with admission.slot():
+            peak = max(peak, admission.running)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(evaluate() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2 and admission.running == 0 and admission.queued == 0
+    assert admission.throughput() > 0
+    assert admission.estimated_start(1) == 0.0 < admission.estimated_start(100) < admission.estimated_start(1000)
@@ -0,0 +1,44 @@
+import asyncio
+import io
+import os
+import tempfile
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException, UploadFile
+from starlette.requests import Request
+
+os.environ.setdefault("CV_REVIEW_DATA_DIR", tempfile.mkdtemp(prefix="cv-review-test-"))
+import main  # noqa: E402
+
+CV = "Jane Doe\nSite Reliability Engineer\nKubernetes, Terraform, Python\n" * 20
+
+
+def upload(name, text):
+    return UploadFile(io.BytesIO(text.encode()), filename=name)
+
+
+def request():
+    return Request({"type": "http", "method": "POST", "path": "/api/evaluate-batch",
+                    "headers": [(b"x-forwarded-for", b"10.0.0.7")], "client": ("10.0.0.7", 1)})
+
+
+def batch(*files):
+    tasks = BackgroundTasks()
+    result = asyncio.run(main.evaluate_batch(request(), tasks, files=list(files), on_duplicate=None))
+    return result, tasks
+
+
+def test_failing_file_registers_nothing_from_the_upload():
+    queued = main.JOBS_QUEUED.value()
+    pending = dict(main._pending)
+    with pytest.raises(HTTPException) as exc:
+        batch(upload("jane.txt", CV), upload("notes.exe", "x"))
+    assert exc.value.status_code == 400
+    assert main._pending == pending and main.JOBS_QUEUED.value() == queued
+
+    # The same CV is evaluated afresh, not coalesced onto a job that never ran
+    result, tasks = batch(upload("jane.txt", CV))
+    assert len(tasks.tasks) == 1 and result["estimated_start_seconds"] != [None]
+    job = main.jobs.get(result["job_ids"][0])
+    assert not job.get("coalesced")
+    main._pending.pop(result["job_ids"][0], None)
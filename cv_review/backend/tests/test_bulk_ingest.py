@@ -0,0 +1,116 @@
+import asyncio
+import io
+import zipfile
+
+from src import bulk_ingest
+from src.bulk_ingest import MultipartStreamReader, ZipStreamReader, multipart_boundary, wait_below
+
+CV = b"Jane Doe\nSite Reliability Engineer\nKubernetes, Terraform, Python\n" * 20
+
+
+class Unseekable(io.RawIOBase):
+    """A pipe-like sink: zipfile then streams members with data descriptors."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def feed_bytewise(reader, data):
+    members = []
+    for i in range(len(data)):
+        members += reader.feed(data[i:i + 1])
+    return members + reader.close()
+
+
+def test_zip64_members():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("cvs/jane.txt", "w", force_zip64=True) as f:
+            f.write(CV)
+        with zf.open("notes.txt", "w", force_zip64=True) as f:
+            f.write(b"second")
+    members = feed_bytewise(ZipStreamReader(1 << 20), buf.getvalue())
+    assert [(m.name, m.data, m.error) for m in members] == [("cvs/jane.txt", CV, None), ("notes.txt", b"second", None)]
+
+
+def test_data_descriptor_members():
+    sink = Unseekable()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("a.txt", CV)
+        zf.writestr("b.txt", b"second")
+    assert bytes(sink.data).find(b"PK\x07\x08") > 0
+    members = feed_bytewise(ZipStreamReader(1 << 20), bytes(sink.data))
+    assert [(m.name, m.data) for m in members] == [("a.txt", CV), ("b.txt", b"second")]
+
+
+def test_truncated_zip_and_oversized_member():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("big.txt", CV)
+        zf.writestr("small.txt", b"ok")
+    data = buf.getvalue()
+    members = ZipStreamReader(100).feed(data)
+    assert [(m.name, m.data) for m in members] == [("big.txt", None), ("small.txt", b"ok")]
+    assert members[0].error.startswith("File too large")
+
+    reader = ZipStreamReader(1 << 20, archive_name="drop.zip")
+    assert reader.feed(data[:40]) == []
+    assert reader.close()[0].error == "ZIP archive is truncated."
+
+
+def test_multipart_files_and_nested_zip():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("inner.txt", b"inner cv")
+    boundary = "b0und4ry"
+    body = b"".join([
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"jane.txt\"\r\n"
+        "Content-Type: text/plain\r\n\r\n".encode(), CV, b"\r\n",
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"more.zip\"\r\n"
+        "Content-Type: application/zip\r\n\r\n".encode(), archive.getvalue(), b"\r\n",
+        f"--{boundary}--\r\n".encode(),
+    ])
+    reader = MultipartStreamReader(multipart_boundary(f"multipart/form-data; boundary={boundary}"), 1 << 20)
+    members = []
+    for i in range(0, len(body), 7):
+        members += reader.feed(body[i:i + 7])
+    members += reader.close()
+    assert [(m.name.split("/")[-1], m.data) for m in members] == [("jane.txt", CV), ("inner.txt", b"inner cv")]
+
+
+def test_wait_below_waits_on_running_tasks_only(monkeypatch):
+    waits = []
+    real_wait = asyncio.wait
+
+    async def counting_wait(tasks, **kwargs):
+        waits.append(len(tasks))
+        return await real_wait(tasks, **kwargs)
+
+    monkeypatch.setattr(bulk_ingest.asyncio, "wait", counting_wait)
+
+    async def run():
+        gates = [asyncio.Event() for _ in range(12)]
+        pending = {asyncio.create_task(gate.wait()) for gate in gates}
+        waiter = asyncio.create_task(wait_below(pending, 8))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        for gate in gates[:4]:
+            gate.set()
+            await asyncio.sleep(0.01)
+        finished = await waiter
+        assert len(finished) == 4 and len(pending) == 8
+        assert all(not t.done() for t in pending)
+        for gate in gates[4:]:
+            gate.set()
+        await asyncio.gather(*pending)
+
+    asyncio.run(run())
+    # One wait per completion, never one per loop turn over finished tasks
+    assert waits == [12, 11, 10, 9]
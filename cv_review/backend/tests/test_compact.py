@@ -0,0 +1,72 @@
+from src.compact import CompactRecord, pack
+
+SPECS = [
+    {"area": "Data", "specialization": "AI and ML", "score": 4, "level": "High"},
+    {"area": "Platform", "specialization": "Kubernetes", "score": 3, "level": "Medium"},
+    {"area": "Networking", "specialization": "Load Balancing", "score": 1, "level": "Basic"},
+]
+
+
+def record(**overrides):
+    return {
+        "id": "a1",
+        "filename": "jane.pdf",
+        "timestamp": "2026-01-02T03:04:05",
+        "model_used": "gemini-3-pro",
+        "skill_matrix_version": "v2",
+        "analysis_time_seconds": 12.5,
+        "api_calls": 19,
+        "total_tokens": 48000,
+        "result": {
+            "most_fitted_area": "Data",
+            "area_scores": {"Infrastructure": 2, "Networking": 1.5, "Platform": 3, "Data": 4, "Other": 1},
+            "specializations": SPECS,
+            "best_specializations": [SPECS[0]],
+            "candidate_summary": "Strong ML engineer.",
+        },
+        "timeline": {"spans": [{"stage": "llm", "duration": 1.25}]},
+        **overrides,
+    }
+
+
+def test_round_trip_is_exact():
+    original = record()
+    compact = CompactRecord(original)
+    assert compact.to_dict() == original
+    assert compact["result"] == original["result"]
+    assert compact.get("timeline") == original["timeline"]
+    assert compact.get("missing", "default") == "default"
+
+
+def test_odd_shapes_stay_in_the_blob():
+    result = {
+        "most_fitted_area": None,
+        "area_scores": {"Data": "n/a"},
+        "specializations": [{**SPECS[0], "note": "extra key"}],
+        "best_specializations": [{"area": "Other", "specialization": "Elsewhere", "score": 2, "level": "Basic"}],
+    }
+    original = record(result=result, api_calls=True, filename=None)
+    compact = CompactRecord(original)
+    assert compact.to_dict() == original
+    assert compact.area_scores is None and compact.roles is None
+
+
+def test_best_specializations_not_in_the_list_are_kept():
+    original = record()
+    original["result"]["best_specializations"] = [{"area": "Other", "specialization": "X", "score": 5, "level": "High"}]
+    assert CompactRecord(original).to_dict() == original
+
+
+def test_scores_reads_the_slots():
+    compact = CompactRecord(record())
+    scores = compact.scores()
+    assert scores["most_fitted_area"] == "Data"
+    assert scores["specializations"] == SPECS
+    assert scores["area_scores"]["Networking"] == 1.5
+
+
+def test_pack_reuses_unchanged_records():
+    first = pack([record(), record(id="a2")])
+    again = pack([record(), record(id="a2", skill_matrix_version="v3")], first)
+    assert again[0] is first[0]
+    assert again[1] is not first[1] and again[1].skill_matrix_version == "v3"
@@ -0,0 +1,18 @@
+from src.cv_condenser import normalize_cv_text
+
+
+def test_year_lines_are_kept():
+    text = "Acme Corp\n2019\nSenior Engineer\n2021"
+    assert normalize_cv_text(text) == "Acme Corp\n2019\nSenior Engineer\n2021"
+
+
+def test_dated_experience_survives_page_breaks():
+    text = "Experience\nAcme Corp\n2019 - 2021\n2019\n1\fGlobex\n2021\nLead Engineer\n2"
+    assert normalize_cv_text(text).split("\n") == [
+        "Experience", "Acme Corp", "2019 - 2021", "2019", "Globex", "2021", "Lead Engineer",
+    ]
+
+
+def test_page_furniture_is_stripped():
+    text = "Jane Doe\nPage 1 of 2\nPython\n1/2\fGo\n2 of 2\n06/2019"
+    assert normalize_cv_text(text) == "Jane Doe\nPython\nGo\n06/2019"
@@ -0,0 +1,44 @@
+from src.dedup import Fingerprint, FingerprintIndex, LocalIndex, minhash, similarity, text_digest
+
+CV = (
+    "Jane Doe. Site reliability engineer at Acme Corp since 2019. Runs Kubernetes clusters on GCP, "
+    "writes Terraform modules and Python tooling, on call for the payments platform. Previously "
+    "network engineer at Globex: BGP, load balancers, DNS migrations. Education: BSc Computer Science."
+)
+UPDATED = CV.replace("since 2019", "since 2019, promoted to lead in 2023")
+OTHER = (
+    "John Smith. Data analyst with SQL, Looker and BigQuery experience. Built marketing dashboards "
+    "and churn models in Python. Education: MSc Statistics. Languages: English, Spanish."
+)
+
+
+def test_exact_duplicates_ignore_formatting():
+    assert text_digest(CV) == text_digest(CV.upper().replace(". ", ".\n\n"))
+
+
+def test_minhash_estimates_similarity():
+    assert similarity(minhash(CV), minhash(CV)) == 1.0
+    assert similarity(minhash(CV), minhash(UPDATED)) >= 0.7
+    assert similarity(minhash(CV), minhash(OTHER)) < 0.2
+
+
+def test_local_index_finds_near_duplicates():
+    local = LocalIndex()
+    local.add("job-1", Fingerprint.of(CV))
+    local.add("job-2", Fingerprint.of(OTHER))
+    match = local.find(Fingerprint.of(UPDATED))
+    assert match.analysis_id == "job-1" and not match.exact
+    assert local.find(Fingerprint.of(CV)).exact
+    assert local.find(Fingerprint.of("Completely unrelated text about gardening and roses.")) is None
+
+
+def test_fingerprint_index(tmp_path):
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    index.add("a1", Fingerprint.of(CV))
+    index.add_many([("a2", Fingerprint.of(OTHER))])
+    matches = index.find(Fingerprint.of(UPDATED))
+    assert [m.analysis_id for m in matches] == ["a1"]
+    assert index.find(Fingerprint.of(CV))[0].exact
+    index.remove("a1")
+    assert index.find(Fingerprint.of(CV)) == []
+    assert index.known_ids() == {"a2"}
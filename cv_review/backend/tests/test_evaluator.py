@@ -0,0 +1,23 @@
+import threading
+
+import pytest
+
+from src import evaluator
+from src.evaluator import EvaluationCancelled, evaluate_cv
+
+
+def test_cancelled_evaluation_makes_no_further_calls(monkeypatch):
+    cancelled = threading.Event()
+    calls = []
+
+    def chat_completion(**kwargs):
+        calls.append(kwargs)
+        cancelled.set()  # the drain starts while the first call is in flight
+        return {"choices": [{"message": {"content": '{"score": 4}'}}], "usage": {"total_tokens": 10}}
+
+    monkeypatch.setattr(evaluator, "chat_completion", chat_completion)
+    settings = {**evaluator.get_settings(), "evaluation": {"mode": "per_specialization"}}
+    monkeypatch.setattr(evaluator, "get_settings", lambda: settings)
+    with pytest.raises(EvaluationCancelled):
+        evaluate_cv("Jane Doe\nPython, Kubernetes, Terraform", api_key="test", cancelled=cancelled)
+    assert len(calls) == 1
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from src.jobs import JobStore
+from src.shared_state import SQLiteBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def jobs(tmp_path, clock):
+    return JobStore(SQLiteBackend(tmp_path / "state.db"), ttl=60.0, max_jobs=3)
+
+
+def test_coalesce_attaches_to_the_running_job(jobs):
+    assert jobs.coalesce("cv-key", "job-1") is None
+    jobs.create("job-1", filename="a.pdf")
+    assert jobs.coalesce("cv-key", "job-2") == "job-1"
+    jobs.create("job-2", same_as="job-1", coalesced=True)
+    jobs.update("job-1", status="complete", progress=100, analysis_id="an-1")
+    assert jobs.get("job-2")["analysis_id"] == "an-1"
+    # Finished: the next identical submission is evaluated again
+    assert jobs.coalesce("cv-key", "job-3") is None
+
+
+def test_registered_job_that_never_appears_stops_counting(jobs, clock):
+    assert jobs.coalesce("cv-key", "job-1") is None
+    assert jobs.coalesce("cv-key", "job-2") == "job-1"
+    clock[0] += 61
+    assert jobs.coalesce("cv-key", "job-2") is None
+
+
+def test_sweep_evicts_expired_then_oldest_finished(jobs, clock):
+    for i in range(5):
+        jobs.create(f"job-{i}")
+        clock[0] += 1
+    for i in range(4):
+        jobs.update(f"job-{i}", status="complete")
+        clock[0] += 1
+    stats = jobs.sweep()
+    # 5 jobs, at most 3: the two oldest finished go; the running one is never evicted
+    assert (stats["running"], stats["finished"], stats["evicted"]) == (1, 2, 2)
+    assert jobs.get("job-0") is None and jobs.get("job-1") is None and jobs.get("job-4")
+    clock[0] += 61
+    stats = jobs.sweep()
+    assert (stats["jobs"], stats["expired"]) == (1, 2)
+
+
+def test_sweep_drops_batches_whose_jobs_are_gone(jobs, clock):
+    jobs.create("job-1", batch_id="b1")
+    jobs.create_batch("b1", items=[{"job_id": "job-1", "filename": "a.pdf"}])
+    jobs.update("job-1", status="failed")
+    assert jobs.sweep()["batches_removed"] == 0
+    assert jobs.get_batch("b1")["counts"]["failed"] == 1
+    clock[0] += 61
+    assert jobs.sweep()["batches_removed"] == 1
+    assert jobs.get_batch("b1") is None
@@ -0,0 +1,51 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("pypdf")
+
+from pypdf import PdfReader  # noqa: E402
+
+from src import reports  # noqa: E402
+from src.report_jobs import FragmentCache, candidate_pdf  # noqa: E402
+from src.telemetry import REPORT_RENDER_SECONDS  # noqa: E402
+
+RECORD = {
+    "id": "a1",
+    "filename": "jane.pdf",
+    "timestamp": "2026-01-02T03:04:05",
+    "result": {
+        "most_fitted_area": "Data",
+        "area_scores": {"Data": 4},
+        "specializations": [{"area": "Data", "specialization": "AI and ML", "score": 4, "level": "High"}],
+        "candidate_summary": "Strong ML engineer.",
+    },
+}
+
+
+def text(pdf: bytes) -> str:
+    return "\n".join(page.extract_text() for page in PdfReader(io.BytesIO(pdf)).pages)
+
+
+def test_candidate_pdf_caches_the_section_and_renders_the_cover_each_time(tmp_path, monkeypatch):
+    cache = FragmentCache(tmp_path)
+    fragments = REPORT_RENDER_SECONDS.count(format="pdf_fragment")
+    titles = REPORT_RENDER_SECONDS.count(format="pdf_title")
+    with ThreadPoolExecutor(1) as pool:
+        first = candidate_pdf(RECORD, cache, pool)
+
+        class Later(reports.datetime):
+            @classmethod
+            def utcnow(cls):
+                return reports.datetime(2031, 5, 6, 7, 8)
+
+        monkeypatch.setattr(reports, "datetime", Later)
+        second = candidate_pdf(RECORD, cache, pool)
+    assert "Generated: 2031-05-06 07:08 UTC" in text(second)
+    assert "2031-05-06" not in text(first)
+    assert [p.name.rsplit("-", 1)[1] for p in tmp_path.glob("*.pdf")] == ["section.pdf"]
+    # Rendered in the pool, observed here: one section, two covers
+    assert REPORT_RENDER_SECONDS.count(format="pdf_fragment") == fragments + 1
+    assert REPORT_RENDER_SECONDS.count(format="pdf_title") == titles + 2
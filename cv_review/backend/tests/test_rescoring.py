@@ -0,0 +1,40 @@
+from contextlib import nullcontext
+
+import orjson
+import pytest
+
+from src import rescoring
+from src.rescoring import Backfill
+from src.skill_versions import VersionStore
+from src.storage import Storage
+
+
+@pytest.fixture
+def storage(tmp_path, make_record):
+    (tmp_path / "analyses.json").write_bytes(orjson.dumps([make_record(i) for i in range(50)]))
+    storage = Storage(tmp_path)
+    storage.writes = 0
+    write = storage._write
+
+    def counting_write(analyses):
+        storage.writes += 1
+        write(analyses)
+
+    storage._write = counting_write
+    return storage
+
+
+def test_unversioned_analyses_are_stamped_in_one_write(storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(rescoring, "rescore_specializations", lambda *a, **kw: pytest.fail("nothing to re-score"))
+    backfill = Backfill(storage, VersionStore(tmp_path / "skill_matrix"), nullcontext, calls_per_minute=0)
+    step = backfill.step()
+    assert step["outcome"] == "stamped" and step["analyses"] == 50 and step["calls"] == 0
+    assert storage.writes == 1
+    assert storage.skill_matrix_versions() == {step["to"]: 50}
+    assert backfill.step() is None and storage.writes == 1
+
+
+def test_rescore_of_a_changed_version_writes_nothing(storage, make_record):
+    assert storage.save_rescored("a1", make_record(1)["result"], expected_version="v0") is False
+    assert storage.save_rescored("missing", make_record(1)["result"], expected_version=None) is False
+    assert storage.writes == 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.score_matrix import ScoreMatrix, parse_threshold, top_k
+
+ROLES = [("Data", "AI and ML"), ("Platform", "Kubernetes")]
+
+
+def record(analysis_id, area, ml, k8s, data=3.0):
+    return {"id": analysis_id, "result": {
+        "most_fitted_area": area,
+        "area_scores": {"Data": data, "Platform": k8s},
+        "specializations": [
+            {"area": "Data", "specialization": "AI and ML", "score": ml, "level": "x"},
+            {"area": "Platform", "specialization": "Kubernetes", "score": k8s, "level": "x"},
+        ],
+    }}
+
+
+@pytest.fixture
+def matrix():
+    return ScoreMatrix([
+        record("a", "Data", 5, 2),
+        record("b", "Platform", 3, 5),
+        record("c", "Data", 4, 4),
+        record("d", "Data", 5, 2),
+    ], roles=ROLES)
+
+
+def test_rank_weights_filters_and_ties(matrix):
+    total, top = matrix.rank({"AI and ML": 1.0}, limit=3)
+    assert total == 4
+    # a and d tie: file order
+    assert top == [("a", 5.0), ("d", 5.0), ("c", 4.0)]
+    total, top = matrix.rank({"Data/AI and ML": 0.6, "Kubernetes": 0.4}, {"Kubernetes": parse_threshold("High")})
+    assert total == 2 and top == [("c", 4.0), ("b", 3.8)]
+    total, top = matrix.rank({"Platform": 1.0}, area="Data", limit=1)
+    assert total == 3 and top == [("c", 4.0)]
+
+
+def test_missing_scores(matrix):
+    matrix.add({"id": "e", "result": {"most_fitted_area": "Other"}})
+    # A missing score fails a minimum and counts as 0 in a weighted sum
+    assert matrix.rank({"Kubernetes": 1.0}, {"AI and ML": 1})[0] == 4
+    assert matrix.rank({"Kubernetes": 1.0}, limit=5)[1][-1] == ("e", 0.0)
+    assert matrix.values("e", ["Kubernetes"]) == {"Kubernetes": None}
+
+
+def test_replace_remove_and_compact(matrix):
+    matrix.add(record("a", "Data", 1, 1))
+    assert matrix.values("a", ["AI and ML"]) == {"AI and ML": 1.0}
+    assert matrix.remove("a") and matrix.remove("b") and matrix.remove("c")
+    assert not matrix.remove("a")
+    assert len(matrix) == 1 and matrix.size == 1  # compacted once half the rows were gone
+    assert matrix.rank({"AI and ML": 1.0}) == (1, [("d", 5.0)])
+    assert matrix.best("AI and ML", 0.0) == ("d", 5.0)
+
+
+def test_unknown_and_ambiguous_keys(matrix):
+    matrix.add({"id": "x", "result": {"specializations": [
+        {"area": "Other", "specialization": "Kubernetes", "score": 2, "level": "Basic"}]}})
+    with pytest.raises(ValueError, match="Ambiguous"):
+        matrix.resolve("Kubernetes")
+    with pytest.raises(ValueError, match="Unknown"):
+        matrix.resolve("Cobol")
+
+
+def test_top_k_keeps_position_order_on_ties():
+    ranked = np.array([3, 5, 5, 1, 5, 4], dtype=np.float32)
+    mask = np.array([True, True, True, True, False, True])
+    assert top_k(ranked, mask, 3).tolist() == [1, 2, 5]
+
+
+def test_copy_is_independent(matrix):
+    other = matrix.copy()
+    other.add(record("e", "Data", 5, 5))
+    other.remove("a")
+    assert "e" not in matrix.rows and "a" in matrix.rows
+    assert matrix.rank({"AI and ML": 1.0}, limit=1) == (4, [("a", 5.0)])
+    assert other.rank({"AI and ML": 1.0}, limit=1) == (4, [("d", 5.0)])
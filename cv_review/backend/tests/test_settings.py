@@ -0,0 +1,15 @@
+from config.settings import get_settings, get_skill_matrix
+
+
+def test_settings_are_not_shared_between_callers():
+    settings = get_settings()
+    settings["evaluation"]["mode"] = "changed"
+    settings["app"].clear()
+    assert get_settings()["evaluation"].get("mode") != "changed"
+
+
+def test_skill_matrix_is_not_shared_between_callers():
+    matrix = get_skill_matrix()
+    area = next(iter(matrix["areas"]))
+    matrix["areas"][area]["specializations"].clear()
+    assert get_skill_matrix()["areas"][area]["specializations"]
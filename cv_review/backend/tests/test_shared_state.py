@@ -0,0 +1,53 @@
+import pytest
+
+from src import shared_state
+from src.shared_state import RedisBackend
+
+
+class FlakyConnection:
+    """Records commands; the first one sent fails as if the reply was lost."""
+
+    def __init__(self, sent, fail):
+        self.sent = sent
+        self.fail = fail
+
+    def command(self, *args):
+        self.sent.append(args)
+        if self.fail:
+            self.fail = False
+            raise ConnectionError("Redis connection closed")
+        return "OK" if args[0] == "SET" else 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    sent = []
+    connections = iter([FlakyConnection(sent, fail=True)] + [FlakyConnection(sent, fail=False)] * 3)
+    monkeypatch.setattr(shared_state, "_RespConnection", lambda *a, **kw: next(connections))
+    backend = RedisBackend("redis://127.0.0.1:6379/0")
+    backend.sent = sent
+    return backend
+
+
+def test_idempotent_commands_are_replayed_after_a_reconnect(backend):
+    backend.expire("job:1", 5)
+    assert [a[0] for a in backend.sent] == ["PEXPIRE", "PEXPIRE"]
+
+
+def test_incr_is_not_replayed(backend):
+    with pytest.raises(ConnectionError):
+        backend.incr("counter", 3)
+    assert [a[0] for a in backend.sent] == ["INCRBY"]
+    assert backend.incr("counter", 3) == 1
+
+
+def test_lock_release_is_one_compare_and_delete(backend):
+    backend._local.conn = FlakyConnection(backend.sent, fail=False)
+    with backend.lock("analyses", timeout=1) as lock:
+        pass
+    set_cmd, release = backend.sent[-2:]
+    assert set_cmd[:3] == ("SET", "lock:cvreview:analyses", lock.token)
+    assert release[0] == "EVAL" and release[2:] == (1, "lock:cvreview:analyses", lock.token)
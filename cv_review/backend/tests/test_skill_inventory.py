@@ -0,0 +1,56 @@
+from src import skill_inventory
+from src.skill_inventory import agreement, parse_inventory, requirements, score, specializations
+
+SPEC = {
+    "core_skills": {
+        "Kubernetes": {"requirement": "Mandatory", "level": "Advanced"},
+        "Terraform": "Needed - Intermediate",
+    },
+    "additional": ["Go"],
+}
+
+
+def inventory(**levels):
+    return {skill: {"level": level, "evidence": ""} for skill, level in levels.items()}
+
+
+def test_requirements_from_every_matrix_form():
+    assert requirements(SPEC) == [
+        ("Kubernetes", "Mandatory", "Advanced"),
+        ("Terraform", "Needed", "Intermediate"),
+        ("Go", None, skill_inventory.DEFAULT_LEVEL),
+    ]
+
+
+def test_score_is_weighted_coverage():
+    assert score(SPEC, inventory(Kubernetes="Advanced", Terraform="Intermediate", Go="Advanced")) == (5, 1.0)
+    # Kubernetes at a third of the required level: earns 1 of its weight 3 → fit 4/6
+    assert score(SPEC, inventory(Kubernetes="Basic", Terraform="Intermediate", Go="Intermediate")) == (4, 0.667)
+    assert score(SPEC, {}) == (1, 0.0)
+
+
+def test_mandatory_gap_caps_the_score():
+    value, fit = score({"core_skills": {"K8s": "Mandatory - Basic", **{f"s{i}": "Needed - Basic" for i in range(9)}}},
+                       inventory(**{f"s{i}": "Advanced" for i in range(9)}))
+    assert fit > 0.8 and value == skill_inventory.MANDATORY_GAP_CAP
+
+
+def test_parse_inventory_matches_names_and_fills_gaps():
+    parsed = {"skills": {"kubernetes": {"level": "High", "evidence": "ran GKE"}, "Cobol": "Advanced", "Go": "Basic"}}
+    out = parse_inventory(parsed, ["Kubernetes", "Terraform", "Go"])
+    assert out == {
+        "Kubernetes": {"level": "Advanced", "evidence": "ran GKE"},
+        "Terraform": {"level": "None", "evidence": ""},
+        "Go": {"level": "Basic", "evidence": ""},
+    }
+    assert parse_inventory({"skills": []}, ["Go"]) is None
+    assert skill_inventory.from_list(skill_inventory.to_list(out)) == out
+
+
+def test_specializations_and_agreement():
+    scored = specializations([("Platform", "SRE", SPEC)], inventory(Kubernetes="Advanced", Terraform="Basic"))
+    assert scored == [{"area": "Platform", "specialization": "SRE", "score": 4, "level": "High"}]
+    reference = [{"area": "Platform", "specialization": "SRE", "score": 3}]
+    report = agreement([(reference, scored)])
+    assert report["overall"] == {"n": 1, "exact": 0.0, "within_1": 1.0, "same_level": 0.0,
+                                 "mean_abs_diff": 1.0, "bias": 1.0}
@@ -0,0 +1,85 @@
+import orjson
+import pytest
+
+from src import compact
+from src.storage import Storage
+
+
+@pytest.fixture
+def storage(tmp_path, make_record):
+    records = [make_record(0), make_record(1, area="Platform", score=2), make_record(2), make_record(3, score=5)]
+    (tmp_path / "analyses.json").write_bytes(orjson.dumps(records))
+    return Storage(tmp_path)
+
+
+def test_iter_analyses_decodes_one_record_at_a_time(storage, monkeypatch):
+    decoded = []
+    to_dict = compact.CompactRecord.to_dict
+    monkeypatch.setattr(compact.CompactRecord, "to_dict", lambda self: decoded.append(self.id) or to_dict(self))
+    records = storage.iter_analyses(area="Data")
+    assert decoded == []
+    first = next(records)
+    assert first["id"] == "a3" and first["result"]["candidate_summary"] == "Candidate 3"
+    assert decoded == ["a3"]
+    assert [r["id"] for r in records] == ["a2", "a0"]
+
+
+def test_iter_analyses_filters_like_query(storage):
+    filters = {"min_scores": {"Data/AI and ML": 4}, "date_from": "2026-01-02"}
+    assert [r["id"] for r in storage.iter_analyses(**filters)] == [r["id"] for r in storage.query(**filters)["items"]]
+    assert [r["id"] for r in storage.iter_analyses(ids=["a1", "zz"])] == ["a1"]
+
+
+def test_saves_replace_the_score_matrix_instead_of_changing_it(storage, make_record):
+    held = storage._score_matrix()
+    before = held.rank({"Data": 1.0}, limit=10)
+    result = make_record(9, score=5)["result"]
+    new_id = storage.save_analysis(filename="new.pdf", result=result, analysis_time_seconds=1.0)
+    assert held.rank({"Data": 1.0}, limit=10) == before
+    current = storage._score_matrix()
+    assert current is not held and new_id in current.rows and new_id not in held.rows
+    storage.delete_analysis("a3")
+    assert "a3" in current.rows and "a3" not in storage._score_matrix().rows
+
+
+def test_files_with_nan_are_still_read(tmp_path):
+    (tmp_path / "analyses.json").write_text('[{"id": "a1", "analysis_time_seconds": NaN, "result": {}}]')
+    storage = Storage(tmp_path)
+    assert [r["id"] for r in storage._read()] == ["a1"]
+
+
+def test_unreadable_file_is_never_overwritten(tmp_path, make_record):
+    path = tmp_path / "analyses.json"
+    path.write_text('[{"id": "a1", "result": {}}, {"id": "a2", "res')
+    storage = Storage(tmp_path)
+    assert storage._read() == []
+    with pytest.raises(ValueError, match="refusing to overwrite"):
+        storage.save_analysis(filename="new.pdf", result=make_record(9)["result"], analysis_time_seconds=1.0)
+    assert path.read_text().endswith('"res')
+
+
+def test_deleting_an_unknown_id_leaves_the_file_alone(storage):
+    signature = storage._signature()
+    matrix = storage._score_matrix()
+    assert storage.delete_analysis("zz") is False
+    assert storage._signature() == signature and storage._score_matrix() is matrix
+    assert storage.delete_analysis("a1") is True and storage.delete_analysis("a1") is False
+
+
+def test_slow_analyses_come_from_the_snapshot(tmp_path, monkeypatch, make_record):
+    timeline = {"spans": [{"stage": "extraction", "duration": 0.5},
+                          {"stage": "llm", "duration": 2.0, "prompt": "profile", "retries": 1}]}
+    records = [
+        {**make_record(0), "analysis_time_seconds": 9.0, "stage_seconds": {"total": 9.0, "extraction": 4.0}},
+        {**make_record(1), "analysis_time_seconds": 3.0, "timeline": timeline},
+        make_record(2),
+    ]
+    (tmp_path / "analyses.json").write_bytes(orjson.dumps(records))
+    storage = Storage(tmp_path)
+    storage._snapshot()
+    monkeypatch.setattr(storage, "_read", lambda strict=False: pytest.fail("analyses.json parsed again"))
+    slow = storage.list_slow_analyses(stage="extraction", min_seconds=0.1)
+    assert [(r["id"], r["stage_seconds"]) for r in slow["items"]] == [("a0", 4.0), ("a1", 0.5)]
+    assert slow["items"][1]["durations"] == {"total": 3.0, "extraction": 0.5, "llm_total": 2.0, "llm_retries": 1,
+                                             "llm:profile": 2.0, "llm_max": 2.0}
+    assert [r["id"] for r in storage.list_slow_analyses(stage="total", limit=2, descending=False)["items"]] == ["a2", "a1"]
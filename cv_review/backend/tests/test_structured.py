@@ -0,0 +1,96 @@
+import pytest
+import requests
+
+from src import evaluator, fuelix_client, structured
+from src.structured import extract_json, validate
+from src.timeline import Timeline
+
+OPTIONS = {"model": "m", "api_key": "k", "base_url": "http://mock", "timeout": 5, "max_retries": 0,
+           "structured_output": True, "repair_retries": 1}
+
+
+def test_extract_json_from_prose_and_fences():
+    assert extract_json('{"score": 4}') == {"score": 4}
+    assert extract_json('Sure!\n```json\n{"score": 4, "note": "a } in a string"}\n```') == \
+        {"score": 4, "note": "a } in a string"}
+    assert extract_json('{broken} then {"score": 2}') == {"score": 2}
+    assert extract_json('{"score": 4') is None
+    assert extract_json("no json here") is None
+
+
+def test_validate_reports_paths():
+    assert validate({"score": 3}, "spec_level") == []
+    assert validate({"score": 7}, "spec_level") == ["$.score: 7 is above 5"]
+    assert validate({"score": True}, "spec_level") == ["$.score: expected integer, got bool"]
+    assert validate({"skills": {"Go": {"level": "Guru"}}}, "skill_inventory") == \
+        ["$.skills.Go.level: 'Guru' is not one of ['None', 'Basic', 'Intermediate', 'Advanced']"]
+    errors = validate({"education": "BSc"}, "profile")
+    assert "$.education: expected array, got str" in errors and "$: missing 'soft_skills'" in errors
+    assert validate({"anything": 1}, "no_schema") == []
+
+
+def test_response_format():
+    assert structured.response_format("summary")["json_schema"]["name"] == "summary"
+    assert structured.response_format("no_schema") is None
+
+
+def answers(*contents):
+    sent = []
+    replies = iter(contents)
+
+    def chat_completion(**kwargs):
+        sent.append(kwargs)
+        return {"choices": [{"message": {"content": next(replies)}}], "usage": {"total_tokens": 7}}
+
+    return sent, chat_completion
+
+
+def test_invalid_answer_gets_one_repair(monkeypatch):
+    sent, fake = answers('{"score": 9}', '{"score": 4}')
+    monkeypatch.setattr(evaluator, "chat_completion", fake)
+    answer = evaluator._complete_json([{"role": "user", "content": "rate"}], options=OPTIONS, temperature=0.2,
+                                      timeline=Timeline(), prompt="spec_level")
+    assert (answer.value, answer.outcome, answer.calls, answer.tokens) == ({"score": 4}, "repaired", 2, 14)
+    repair = sent[1]["messages"]
+    assert repair[1] == {"role": "assistant", "content": '{"score": 9}'}
+    assert "$.score: 9 is above 5" in repair[2]["content"]
+    assert sent[0]["response_format"]["json_schema"]["name"] == "spec_level"
+
+
+def test_answer_still_invalid_after_repairs(monkeypatch):
+    _, fake = answers("not json", '{"score": "high"}')
+    monkeypatch.setattr(evaluator, "chat_completion", fake)
+    answer = evaluator._complete_json([], options=OPTIONS, temperature=0.2, timeline=Timeline(), prompt="spec_level")
+    assert (answer.value, answer.outcome, answer.calls) == (None, "invalid", 2)
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Client Error")
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.text}}]}
+
+
+def test_only_a_refused_response_format_is_dropped(monkeypatch):
+    sent = []
+    replies = iter([
+        FakeResponse(400, '{"error": "maximum context length is 8192 tokens"}'),
+        FakeResponse(400, '{"error": "response_format json_schema is not supported"}'),
+        FakeResponse(200, '{"score": 4}'),
+    ])
+    session = type("Session", (), {"post": lambda self, url, **kw: sent.append(dict(kw["json"])) or next(replies)})()
+    monkeypatch.setattr(fuelix_client, "get_session", lambda: session)
+    monkeypatch.setattr(fuelix_client, "_no_response_format", set())
+    fmt = structured.response_format("spec_level")
+    with pytest.raises(requests.HTTPError):
+        fuelix_client.chat_completion([], model="m", api_key="k", response_format=fmt)
+    assert len(sent) == 1 and not fuelix_client._no_response_format
+    assert fuelix_client.chat_completion([], model="m", api_key="k", response_format=fmt)
+    assert ["response_format" in p for p in sent] == [True, True, False]
+    assert fuelix_client._no_response_format == {"m"}
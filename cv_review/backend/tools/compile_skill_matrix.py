@@ -0,0 +1,24 @@
+"""
+Precompile config/skill_matrix.yaml to config/skill_matrix.compiled.json.
+
+Run at image build time so workers load the matrix with json instead of
+parsing YAML on their first evaluation:
+    python tools/compile_skill_matrix.py
+"""
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from config.settings import compile_skill_matrix, skill_matrix_digest  # noqa: E402
+
+
+def main() -> None:
+    out = compile_skill_matrix()
+    print(f"Wrote {out} (source sha256 {skill_matrix_digest()[:12]})")
+
+
+if __name__ == "__main__":
+    main()
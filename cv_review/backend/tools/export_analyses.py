@@ -0,0 +1,60 @@
+"""
+Export stored analyses as pretty-printed JSON.
+
+data/analyses.json is written compact (orjson, no indentation): this is the readable copy
+for diffs, reviews and hand edits.
+    python tools/export_analyses.py                      # every record to stdout
+    python tools/export_analyses.py --out export.json
+    python tools/export_analyses.py --id <analysis_id>   # one record (repeatable)
+    python tools/export_analyses.py --validate           # check every record against src/schema.py first
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import orjson
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from src import schema  # noqa: E402
+
+DEFAULT_SOURCE = BACKEND_DIR / "data" / "analyses.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pretty-print stored analyses.")
+    parser.add_argument("--source", default=str(DEFAULT_SOURCE), help="analyses.json to read")
+    parser.add_argument("--out", default="", help="Output file (default: stdout)")
+    parser.add_argument("--id", action="append", default=[], help="Only this analysis id (repeatable)")
+    parser.add_argument("--validate", action="store_true", help="Fail on records that do not fit the schema (needs msgspec)")
+    args = parser.parse_args(argv)
+
+    data = Path(args.source).read_bytes()
+    if args.validate:
+        try:
+            schema.decode_records(data)
+        except (ImportError, ValueError) as e:
+            print(f"{args.source}: {e}", file=sys.stderr)
+            return 1
+    records = orjson.loads(data)
+    if args.id:
+        wanted = set(args.id)
+        records = [r for r in records if r.get("id") in wanted]
+        missing = wanted - {r.get("id") for r in records}
+        if missing:
+            print(f"Not found: {', '.join(sorted(missing))}", file=sys.stderr)
+            return 1
+    out = orjson.dumps(records, option=orjson.OPT_INDENT_2) + b"\n"
+    if args.out:
+        Path(args.out).write_bytes(out)
+        print(f"Wrote {len(records)} records to {args.out}", file=sys.stderr)
+    else:
+        sys.stdout.buffer.write(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
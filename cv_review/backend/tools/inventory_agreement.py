@@ -0,0 +1,89 @@
+"""
+Agreement of inventory scoring (evaluation.mode: inventory) with per-specialization scoring.
+
+Compares, per specialization, the spec_level scores of stored analyses with the scores
+computed from their skill inventory: exact match, within one point, same level
+(Basic/Medium/High), mean absolute difference and bias, plus how often the best-fit area
+is the same. Analyses evaluated in shadow mode carry both; --extract N also runs one
+skill_inventory call for up to N other analyses (CV text from the search index) and scores
+them locally, without saving anything:
+    python tools/inventory_agreement.py
+    python tools/inventory_agreement.py --extract 50 --data-dir /srv/cv-review/data --out agreement.json
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import orjson
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from src import skill_inventory  # noqa: E402
+from src.evaluator import derived_scores, extract_skill_inventory, get_compiled_roles  # noqa: E402
+from src.search import SearchIndex  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare inventory scores with per-specialization scores.")
+    parser.add_argument("--data-dir", default=str(BACKEND_DIR / "data"))
+    parser.add_argument("--extract", type=int, default=0, metavar="N",
+                        help="Extract an inventory for up to N analyses that have none (N LLM calls)")
+    parser.add_argument("--model", default=None, help="Model for --extract (default: api.model)")
+    parser.add_argument("--out", default="", help="Also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    try:
+        records = orjson.loads((data_dir / "analyses.json").read_bytes())
+    except (OSError, ValueError) as exc:
+        print(f"Cannot read {data_dir / 'analyses.json'}: {exc}", file=sys.stderr)
+        return 1
+
+    roles = [(area, spec, data) for area, spec, data, _ in get_compiled_roles()]
+    pairs = []
+    extracted = failed = 0
+    search = SearchIndex(data_dir / "search.db") if args.extract > 0 else None
+    for record in records:
+        result = record.get("result") or {}
+        if (result.get("metrics") or {}).get("evaluation_mode") == "inventory" or record.get("duplicate_of"):
+            continue
+        reference = result.get("specializations") or []
+        if result.get("inventory_specializations"):
+            pairs.append((reference, result["inventory_specializations"]))
+        elif search is not None and extracted + failed < args.extract:
+            cv_text = search.get_text(record.get("id", ""))
+            if not cv_text:
+                continue
+            try:
+                inventory, _, _ = extract_skill_inventory(cv_text, model=args.model)
+            except Exception as exc:
+                failed += 1
+                print(f"{record.get('id')}: extraction failed: {exc}", file=sys.stderr)
+                continue
+            extracted += 1
+            pairs.append((reference, skill_inventory.specializations(roles, inventory)))
+
+    report = skill_inventory.agreement(pairs)
+    same_area = sum(derived_scores(a)["most_fitted_area"] == derived_scores(b)["most_fitted_area"] for a, b in pairs)
+    report["most_fitted_area"] = {"n": len(pairs), "same": round(same_area / len(pairs), 3) if pairs else None}
+    report["extracted"] = extracted
+    report["extraction_failed"] = failed
+
+    overall = report["overall"]
+    print(f"{len(pairs)} analyses compared ({extracted} extracted now)")
+    if overall.get("n"):
+        print(f"{'specialization':40} {'n':>5} {'exact':>6} {'±1':>6} {'level':>6} {'MAE':>6} {'bias':>6}")
+        for name, row in sorted(report["specializations"].items()) + [("overall", overall)]:
+            print(f"{name[:40]:40} {row['n']:5d} {row['exact']:6.2f} {row['within_1']:6.2f} "
+                  f"{row['same_level']:6.2f} {row['mean_abs_diff']:6.2f} {row['bias']:+6.2f}")
+        print(f"most fitted area agrees: {report['most_fitted_area']['same']:.2f}")
+    if args.out:
+        Path(args.out).write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Local Redis stand-in — the RESP2 subset used by src/shared_state.RedisBackend.
+
+Supports PING, AUTH, SELECT, GET, SET (EX/PX/NX/XX), DEL, EXISTS, INCR/INCRBY,
+HSET, HGET, HGETALL, HDEL, EXPIRE/PEXPIRE, TTL, KEYS, SCAN and FLUSHALL, so
+multi-worker / multi-instance setups can be exercised without a Redis server.
+
+Run with:
+    python tools/mini_redis.py --port 6390
+Then start the backend against it:
+    CV_REVIEW_STATE_BACKEND=redis CV_REVIEW_REDIS_URL=redis://127.0.0.1:6390/0 uvicorn main:app --workers 4
+"""
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RespError(Exception):
+    pass
+
+
+class Store:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}  # str or dict (hash)
+        self.expires: Dict[str, float] = {}
+
+    def _alive(self, key: str) -> bool:
+        exp = self.expires.get(key)
+        if exp is not None and exp <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _hash(self, key: str, create: bool = False) -> Optional[Dict[str, str]]:
+        if not self._alive(key):
+            if not create:
+                return None
+            self.data[key] = {}
+        value = self.data[key]
+        if not isinstance(value, dict):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def execute(self, args: List[str]) -> Any:
+        if not args:
+            raise RespError("ERR empty command")
+        name = args[0].upper()
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            raise RespError(f"ERR unknown command '{args[0]}'")
+        return handler(*args[1:])
+
+    def cmd_ping(self, *args: str) -> Any:
+        return args[0] if args else ("+", "PONG")
+
+    def cmd_auth(self, *args: str) -> Any:
+        return ("+", "OK")
+
+    def cmd_select(self, db: str) -> Any:
+        return ("+", "OK")
+
+    def cmd_flushall(self, *args: str) -> Any:
+        self.data.clear()
+        self.expires.clear()
+        return ("+", "OK")
+
+    def cmd_get(self, key: str) -> Any:
+        if not self._alive(key):
+            return None
+        if isinstance(self.data[key], dict):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return self.data[key]
+
+    def cmd_set(self, key: str, value: str, *opts: str) -> Any:
+        ttl: Optional[float] = None
+        nx = xx = False
+        i = 0
+        while i < len(opts):
+            opt = opts[i].upper()
+            if opt in ("EX", "PX"):
+                ttl = float(opts[i + 1]) / (1 if opt == "EX" else 1000)
+                i += 2
+                continue
+            nx, xx = nx or opt == "NX", xx or opt == "XX"
+            i += 1
+        exists = self._alive(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ttl is not None:
+            self.expires[key] = time.time() + ttl
+        return ("+", "OK")
+
+    def cmd_del(self, *keys: str) -> int:
+        n = 0
+        for key in keys:
+            if self._alive(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                n += 1
+        return n
+
+    def cmd_exists(self, *keys: str) -> int:
+        return sum(self._alive(k) for k in keys)
+
+    def cmd_incrby(self, key: str, amount: str) -> int:
+        current = int(self.cmd_get(key) or 0) + int(amount)
+        self.data[key] = str(current)
+        return current
+
+    def cmd_incr(self, key: str) -> int:
+        return self.cmd_incrby(key, "1")
+
+    def cmd_hset(self, key: str, *pairs: str) -> int:
+        if not pairs or len(pairs) % 2:
+            raise RespError("ERR wrong number of arguments for 'hset' command")
+        h = self._hash(key, create=True)
+        added = 0
+        for i in range(0, len(pairs), 2):
+            added += pairs[i] not in h
+            h[pairs[i]] = pairs[i + 1]
+        return added
+
+    def cmd_hget(self, key: str, field: str) -> Any:
+        h = self._hash(key)
+        return h.get(field) if h else None
+
+    def cmd_hgetall(self, key: str) -> List[str]:
+        h = self._hash(key) or {}
+        return [x for kv in h.items() for x in kv]
+
+    def cmd_hdel(self, key: str, *fields: str) -> int:
+        h = self._hash(key) or {}
+        return sum(h.pop(f, None) is not None for f in fields)
+
+    def cmd_pexpire(self, key: str, ms: str) -> int:
+        if not self._alive(key):
+            return 0
+        self.expires[key] = time.time() + int(ms) / 1000
+        return 1
+
+    def cmd_expire(self, key: str, seconds: str) -> int:
+        return self.cmd_pexpire(key, str(int(seconds) * 1000))
+
+    def cmd_ttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        exp = self.expires.get(key)
+        return -1 if exp is None else max(0, int(exp - time.time()))
+
+    def cmd_keys(self, pattern: str) -> List[str]:
+        return [k for k in list(self.data) if self._alive(k) and fnmatch.fnmatchcase(k, pattern)]
+
+    def cmd_scan(self, cursor: str, *opts: str) -> List[Any]:
+        pattern = "*"
+        for i in range(0, len(opts) - 1, 2):
+            if opts[i].upper() == "MATCH":
+                pattern = opts[i + 1]
+        # Single pass: the whole keyspace in one page, cursor 0 ends the iteration
+        return ["0", self.cmd_keys(pattern)]
+
+
+def encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, tuple) and value[0] == "+":
+        return f"+{value[1]}\r\n".encode()
+    if isinstance(value, bool):
+        return f":{int(value)}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(encode(v) for v in value)
+    data = str(value).encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[str]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.decode("utf-8").split()  # inline command (e.g. from telnet / redis-cli PING)
+    args: List[str] = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        n = int(header[1:-2])
+        args.append((await reader.readexactly(n + 2))[:-2].decode("utf-8"))
+    return args
+
+
+def make_handler(store: Store):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                try:
+                    reply = encode(store.execute(args))
+                except (RespError, ValueError, TypeError, IndexError) as exc:
+                    msg = str(exc) if isinstance(exc, RespError) else f"ERR {exc}"
+                    reply = f"-{msg}\r\n".encode()
+                writer.write(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int) -> Tuple[asyncio.AbstractServer, Store]:
+    store = Store()
+    server = await asyncio.start_server(make_handler(store), host, port)
+    return server, store
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in for shared state.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server, _ = await serve(args.host, args.port)
+        print(f"mini_redis listening on {args.host}:{args.port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Local Fuelix stand-in — OpenAI-compatible /chat/completions with canned JSON.
+
+Answers every prompt template in src/prompts.py with well-formed JSON, with
+configurable latency, error and 429 rates, so load tests never spend real tokens.
+
+Run with:
+    python tools/mock_fuelix.py --port 9100 --latency lognormal:-0.7,0.5 --rate-limit-rate 0.02
+Then point the backend at it:
+    FUELIX_BASE_URL=http://127.0.0.1:9100/v1 FUELIX_API_KEY=mock uvicorn main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+from src.cv_condenser import count_tokens
+
+AREAS = ["Infrastructure", "Networking", "Platform", "Data", "Other"]
+
+
+@dataclass
+class MockConfig:
+    latency: str = "fixed:0.2"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    seed: Optional[int] = None
+    stream_chunk_chars: int = 24
+    invalid_rate: float = 0.0
+    reject_response_format: bool = False
+
+
+config = MockConfig()
+_rng = random.Random()
+_stats: Dict[str, int] = {
+    "requests": 0, "errors": 0, "rate_limited": 0, "streamed": 0,
+    "response_format": 0, "invalid": 0, "repairs": 0,
+}
+# Marker of evaluator repair prompts (prompts.REPAIR_PROMPT)
+_REPAIR_MARKER = "did not match the required JSON format"
+
+
+def sample_latency(spec: str, rng: random.Random = _rng) -> float:
+    """Sample a delay in seconds from a spec: fixed:S, uniform:A,B, normal:MU,SD, lognormal:MU,SIGMA, exp:MEAN."""
+    kind, _, params = spec.partition(":")
+    args = [float(x) for x in params.split(",") if x.strip()] if params else []
+    kind = kind.strip().lower()
+    if kind == "fixed":
+        value = args[0] if args else 0.0
+    elif kind == "uniform":
+        value = rng.uniform(args[0], args[1])
+    elif kind == "normal":
+        value = rng.gauss(args[0], args[1])
+    elif kind == "lognormal":
+        value = rng.lognormvariate(args[0], args[1])
+    elif kind in ("exp", "exponential"):
+        value = rng.expovariate(1.0 / args[0]) if args and args[0] > 0 else 0.0
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return max(0.0, value)
+
+
+def _stable_int(text: str, lo: int, hi: int) -> int:
+    """Deterministic pseudo-random int per prompt, so the same CV gets the same scores."""
+    digest = hashlib.sha1(text.encode("utf-8", "replace")).digest()
+    return lo + int.from_bytes(digest[:4], "big") % (hi - lo + 1)
+
+
+def _inventory_content(prompt: str) -> str:
+    """skill_inventory answer: a skill whose name shares a word with the CV gets Basic to
+    Advanced (stable per CV and skill), the others None."""
+    listed, _, cv = prompt.partition("SKILLS TO ASSESS:")[2].partition("CANDIDATE CV")
+    skills = [line[2:].strip() for line in listed.splitlines() if line.startswith("- ")]
+    cv_words = set(re.findall(r"[a-z]{3,}", cv.lower()))
+    levels = ("None", "Basic", "Intermediate", "Advanced")
+    out = {}
+    for skill in skills:
+        found = cv_words & set(re.findall(r"[a-z]{3,}", skill.lower()))
+        level = levels[_stable_int(cv + skill, 1, 3)] if found else "None"
+        out[skill] = {"level": level, "evidence": f"mentions {sorted(found)[0]}" if found else ""}
+    return json.dumps({"skills": out})
+
+
+def canned_content(prompt: str) -> str:
+    """Return JSON text shaped like the answer the real model gives for this prompt template."""
+    if "SKILLS TO ASSESS:" in prompt:
+        return _inventory_content(prompt)
+    if '{"score": <integer 1-5>}' in prompt:
+        return json.dumps({"score": _stable_int(prompt, 1, 5)})
+    if "Keys must be exactly: Infrastructure" in prompt:
+        return json.dumps({a: f"Mock description of the candidate's fit for {a}." for a in AREAS})
+    if '"education":' in prompt and '"previous_jobs"' in prompt:
+        return json.dumps({
+            "education": ["BSc Computer Science, Mock University"],
+            "soft_skills": ["Client-facing communication", "English proficiency"],
+            "previous_jobs": ["Cloud Engineer — Mock Corp (2020–2024)", "SysAdmin — Example Ltd (2017–2020)"],
+        })
+    if '"requisition_weights"' in prompt:
+        return json.dumps({
+            "requisition_weights": {"Data/AI and ML": 1.0, "Data/Data Analytics": 0.6, "Platform/GKE & Anthos": 0.3},
+            "summary": "Mock requisition: ML engineering with data pipelines.",
+        })
+    if '"candidate_summary"' in prompt:
+        return json.dumps({
+            "candidate_summary": "Mock summary: experienced engineer with cloud and infrastructure background.",
+            "recommended_role": "Platform - GKE & Anthos",
+            "recommendation_reason": "Highest specialization scores are in Platform.",
+        })
+    if "fit score from 0 to 100" in prompt:
+        return json.dumps({
+            "score": _stable_int(prompt, 0, 100),
+            "summary": "Mock fit summary.",
+            "strengths": ["Mock strength"],
+            "gaps": ["Mock gap"],
+        })
+    if "MUST sum to exactly 100" in prompt:
+        return json.dumps({"Infrastructure": 25, "Networking": 15, "Platform": 30, "Data": 20, "Other": 10})
+    return json.dumps({"ok": True})
+
+
+def _completion_body(model: str, content: str, prompt_tokens: int) -> Dict[str, Any]:
+    completion_tokens = count_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+async def _stream_chunks(model: str, content: str):
+    cid = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    step = max(1, config.stream_chunk_chars)
+    for i in range(0, len(content), step):
+        chunk = {
+            "id": cid,
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(0)
+    yield "data: [DONE]\n\n"
+
+
+app = FastAPI(title="Mock Fuelix", version="1.0.0")
+
+
+@app.post("/v1/chat/completions")
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    _stats["requests"] += 1
+    body = await request.json()
+    messages: List[dict] = body.get("messages") or []
+    model = body.get("model") or "mock-model"
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+
+    await asyncio.sleep(sample_latency(config.latency))
+
+    if body.get("response_format"):
+        if config.reject_response_format:
+            return JSONResponse(status_code=400, content={"error": {"message": "response_format is not supported (mock)"}})
+        _stats["response_format"] += 1
+    repair = _REPAIR_MARKER in prompt
+    _stats["repairs"] += repair
+
+    roll = _rng.random()
+    if roll < config.rate_limit_rate:
+        _stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit exceeded (mock)", "type": "rate_limit_error"}},
+            headers={"Retry-After": str(config.retry_after_seconds)},
+        )
+    if roll < config.rate_limit_rate + config.error_rate:
+        _stats["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": {"message": "Internal error (mock)"}})
+
+    content = canned_content(prompt)
+    if not repair and _rng.random() < config.invalid_rate:
+        # Prose around a truncated object: what a model that ignores the format sends
+        _stats["invalid"] += 1
+        content = f"Here is the evaluation:\n```json\n{content[:max(1, len(content) // 2)]}\n```"
+    if body.get("stream"):
+        _stats["streamed"] += 1
+        return StreamingResponse(_stream_chunks(model, content), media_type="text/event-stream")
+    return _completion_body(model, content, count_tokens(prompt))
+
+
+@app.get("/cv/{name}", response_class=HTMLResponse)
+async def cv_page(name: str):
+    """Serve a CV from the load-test corpus as an HTML page, for /api/evaluate-url runs."""
+    path = BACKEND_DIR.parent / "sample_cv_alex_chen.txt"
+    text = path.read_text(encoding="utf-8") if path.exists() else "Mock candidate CV " * 50
+    paragraphs = "".join(f"<p>{line}</p>" for line in text.splitlines() if line.strip())
+    return f"<html><body><main id='resume'><h1>{name}</h1>{paragraphs}</main></body></html>"
+
+
+@app.get("/stats")
+async def stats():
+    return {**_stats, "config": config.__dict__}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible Fuelix stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default=config.latency,
+                        help="fixed:S | uniform:A,B | normal:MU,SD | lognormal:MU,SIGMA | exp:MEAN (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls answered with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="Fraction of answers sent as malformed JSON (repair prompts always get valid JSON)")
+    parser.add_argument("--reject-response-format", action="store_true",
+                        help="Answer HTTP 400 to requests that carry a response_format")
+    args = parser.parse_args(argv)
+
+    sample_latency(args.latency)  # validate early
+    config.latency = args.latency
+    config.error_rate = args.error_rate
+    config.rate_limit_rate = args.rate_limit_rate
+    config.retry_after_seconds = args.retry_after
+    config.seed = args.seed
+    config.invalid_rate = args.invalid_rate
+    config.reject_response_format = args.reject_response_format
+    if args.seed is not None:
+        _rng.seed(args.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
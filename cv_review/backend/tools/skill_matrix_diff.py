@@ -0,0 +1,65 @@
+"""
+Preview what an edit of config/skill_matrix.yaml will re-score before deploying it.
+
+Diffs the working skill matrix against a recorded version (default: the one most stored
+analyses are scored against) and counts the spec_level calls the backfill will make:
+    python tools/skill_matrix_diff.py
+    python tools/skill_matrix_diff.py --from <version> --data-dir /srv/cv-review/data
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import orjson
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from src.evaluator import current_version  # noqa: E402
+from src.skill_versions import VersionStore, diff, role_key  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff the working skill matrix against a recorded version.")
+    parser.add_argument("--data-dir", default=str(BACKEND_DIR / "data"))
+    parser.add_argument("--from", dest="old", default="", help="Recorded version (default: the most used)")
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    store = VersionStore(data_dir / "skill_matrix")
+    try:
+        records = orjson.loads((data_dir / "analyses.json").read_bytes())
+    except (OSError, ValueError):
+        records = []
+    counts: dict = {}
+    for r in records:
+        counts[r.get("skill_matrix_version")] = counts.get(r.get("skill_matrix_version"), 0) + 1
+
+    recorded = store.versions()
+    if not recorded:
+        print(f"No recorded versions in {store.directory}", file=sys.stderr)
+        return 1
+    old_id = args.old or max(recorded, key=lambda v: counts.get(v.id, 0)).id
+    old = store.load(old_id)
+    if old is None:
+        print(f"Unknown version {old_id}; recorded: {', '.join(v.id for v in recorded)}", file=sys.stderr)
+        return 1
+
+    new = current_version()
+    changes = diff(old, new)
+    print(f"{old.id} -> {new.id}{' (no change)' if old.id == new.id else ''}")
+    for role in changes.added:
+        print(f"  + {role_key(role)}")
+    for role in changes.removed:
+        print(f"  - {role_key(role)}")
+    for role, skills in changes.changed.items():
+        print(f"  ~ {role_key(role)}: {', '.join(skills) or 'requirements text'}")
+    n = counts.get(old.id, 0) + (counts.get(None, 0) if old.id == recorded[0].id else 0)
+    print(f"{n} stored analyses on {old.id}: {n * len(changes.rescore)} spec_level calls to re-score them")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ import Link from "next/link";
 import { getAnalysis, downloadCandidateReport } from "@/lib/api";
 import type { AnalysisResult } from "@/lib/types";
 import AnalysisResults from "@/components/AnalysisResults";
+import LatencyWaterfall from "@/components/LatencyWaterfall";
 
 function AnalysisContent() {
   const searchParams = useSearchParams();
@@ -29,6 +30,7 @@ function AnalysisContent() {
           timestamp: (r as unknown as { timestamp?: string }).timestamp,
           analysis_time_seconds: r.analysis_time_seconds,
           api_calls: r.api_calls,
+          timeline: r.timeline,
         });
       })
       .catch(() => setError("Analysis not found."))
@@ -118,6 +120,11 @@ function AnalysisContent() {
         </div>
       </div>
       <AnalysisResults result={data} />
+      {data.timeline && data.timeline.spans.length > 0 && (
+        <div className="mt-6">
+          <LatencyWaterfall timeline={data.timeline} />
+        </div>
+      )}
     </div>
   );
 }
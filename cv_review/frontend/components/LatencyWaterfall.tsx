@@ -0,0 +1,83 @@
+"use client";
+
+import type { AnalysisTimeline, TimelineSpan } from "@/lib/types";
+
+interface Props {
+  timeline: AnalysisTimeline;
+}
+
+const STAGE_COLORS: Record<string, string> = {
+  extraction: "#9AA0A6",
+  url_fetch: "#9AA0A6",
+  queue_wait: "#DADCE0",
+  spec_scoring: "#4285F4",
+  area_descriptions: "#34A853",
+  profile: "#FBBC04",
+  summary: "#EA4335",
+  persistence: "#5F6368",
+  persistence_write: "#80868B",
+  llm: "#8AB4F8",
+};
+
+/**
+ * Label for one waterfall row.
+ * @param span - Timeline span from the stored analysis.
+ * @returns Human-readable row label.
+ */
+function spanLabel(span: TimelineSpan): string {
+  if (span.stage !== "llm") return span.stage.replace(/_/g, " ");
+  if (span.specialization) return `LLM · ${span.specialization}`;
+  return `LLM · ${(span.prompt ?? "call").replace(/_/g, " ")}`;
+}
+
+/**
+ * Waterfall of an analysis: one bar per stage and LLM call, positioned on a shared time axis.
+ * @param props.timeline - Stored per-analysis latency breakdown.
+ */
+export default function LatencyWaterfall({ timeline }: Props) {
+  const total = Math.max(timeline.total_seconds, ...timeline.spans.map((s) => s.end), 0.001);
+  const slowestLlm = Math.max(0, ...timeline.spans.filter((s) => s.stage === "llm").map((s) => s.duration));
+
+  return (
+    <div className="card p-6">
+      <div className="flex items-baseline justify-between mb-4">
+        <h3 className="font-bold text-[#202124]">⏱️ Latency Breakdown</h3>
+        <p className="text-xs text-[#9AA0A6]">
+          {total.toFixed(1)}s total · slowest LLM call {slowestLlm.toFixed(1)}s
+        </p>
+      </div>
+      <div className="space-y-1">
+        {timeline.spans.map((span, i) => {
+          const left = (span.start / total) * 100;
+          const width = Math.max((span.duration / total) * 100, 0.4);
+          const color = span.error ? "#EA4335" : STAGE_COLORS[span.stage] ?? "#9AA0A6";
+          const details = [
+            `${span.duration.toFixed(2)}s`,
+            span.model,
+            span.tokens ? `${span.tokens} tokens` : undefined,
+            span.retries ? `${span.retries} retries` : undefined,
+            span.error,
+          ].filter(Boolean).join(" · ");
+          return (
+            <div key={i} className="flex items-center gap-3 text-xs">
+              <div
+                className={`w-48 shrink-0 truncate ${span.stage === "llm" ? "pl-4 text-[#5F6368]" : "font-semibold text-[#202124]"}`}
+                title={spanLabel(span)}
+              >
+                {spanLabel(span)}
+              </div>
+              <div className="relative flex-1 h-4 bg-[#F8F9FA] rounded">
+                <div
+                  className="absolute top-0 h-4 rounded"
+                  style={{ left: `${left}%`, width: `${width}%`, backgroundColor: color }}
+                  title={details}
+                />
+              </div>
+              <div className="w-14 shrink-0 text-right text-[#5F6368]">{span.duration.toFixed(2)}s</div>
+            </div>
+          );
+        })}
+      </div>
+    </div>
+  );
+}
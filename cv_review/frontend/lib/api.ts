@@ -1,5 +1,21 @@
 import axios from "axios";
-import type { AnalysesList, AnalysisRecord, BestCandidates, JobStatus, Metrics } from "./types";
+import type {
+  AnalysesList,
+  AnalysisRecord,
+  BatchStatus,
+  BestCandidates,
+  BulkUploadResult,
+  DuplicateMatch,
+  JobStatus,
+  MatchResults,
+  Metrics,
+  OnDuplicate,
+  ReportFormat,
+  RankResults,
+  ReportJob,
+  SearchResults,
+  SlowAnalysesList,
+} from "./types";
 
 // Same origin when empty (single Cloud Run URL); fallback for local dev / SSR
 const raw = process.env.NEXT_PUBLIC_API_URL;
@@ -12,10 +28,15 @@ export const API_BASE =
 
 const api = axios.create({ baseURL: API_BASE || undefined });
 
-export async function uploadCV(file: File): Promise<{ job_id: string }> {
+/** `duplicate` is set when the CV matches an earlier analysis; with "link" the job is already complete. */
+export async function uploadCV(
+  file: File,
+  onDuplicate?: OnDuplicate
+): Promise<{ job_id: string; duplicate: DuplicateMatch | null }> {
   const form = new FormData();
   form.append("file", file);
-  const res = await api.post<{ job_id: string }>("/api/evaluate", form, {
+  const res = await api.post<{ job_id: string; duplicate: DuplicateMatch | null }>("/api/evaluate", form, {
+    params: { on_duplicate: onDuplicate },
     headers: { "Content-Type": "multipart/form-data" },
   });
   return res.data;
@@ -35,6 +56,22 @@ export async function uploadCVBatch(files: File[]): Promise<{ job_ids: string[]
   return res.data;
 }
 
+/** Bulk drop: a ZIP archive or any number of files; the server streams and enqueues each CV as it arrives. */
+export async function uploadBulk(files: File[], fast = true): Promise<BulkUploadResult> {
+  const form = new FormData();
+  files.forEach((f) => form.append("files", f));
+  const res = await api.post<BulkUploadResult>("/api/evaluate-bulk", form, {
+    params: { fast },
+    headers: { "Content-Type": "multipart/form-data" },
+  });
+  return res.data;
+}
+
+export async function getBatchStatus(batchId: string): Promise<BatchStatus> {
+  const res = await api.get<BatchStatus>(`/api/batches/${batchId}`);
+  return res.data;
+}
+
 export async function evaluateFromUrl(
   url: string
 ): Promise<{ job_id: string; source_label: string; chars_extracted: number }> {
@@ -47,8 +84,93 @@ export async function getJobStatus(jobId: string): Promise<JobStatus> {
   return res.data;
 }
 
-export async function listAnalyses(limit = 50, offset = 0): Promise<AnalysesList> {
-  const res = await api.get<AnalysesList>("/api/analyses", { params: { limit, offset } });
+export async function listAnalyses(
+  limit = 50,
+  offset = 0,
+  filters: { after?: string; area?: string; model?: string; dateFrom?: string; dateTo?: string } = {}
+): Promise<AnalysesList> {
+  const res = await api.get<AnalysesList>("/api/analyses", {
+    params: {
+      limit,
+      offset,
+      after: filters.after,
+      area: filters.area,
+      model: filters.model,
+      date_from: filters.dateFrom,
+      date_to: filters.dateTo,
+    },
+  });
+  return res.data;
+}
+
+/** Full-text search: words, "quoted phrases" or prefix*; all must match, else any. */
+export async function searchCandidates(
+  q: string,
+  filters: { area?: string; dateFrom?: string; dateTo?: string; limit?: number; offset?: number } = {}
+): Promise<SearchResults> {
+  const res = await api.get<SearchResults>("/api/search", {
+    params: {
+      q,
+      area: filters.area,
+      date_from: filters.dateFrom,
+      date_to: filters.dateTo,
+      limit: filters.limit,
+      offset: filters.offset,
+    },
+  });
+  return res.data;
+}
+
+/**
+ * Top candidates by a weighted sum of scores. Keys are "Data", "Data/AI and ML" or a
+ * specialization name; minimums are numbers or levels ("Medium").
+ */
+export async function rankCandidates(
+  weights: Record<string, number>,
+  filters: { minScores?: Record<string, number | "Basic" | "Medium" | "High">; area?: string; limit?: number } = {}
+): Promise<RankResults> {
+  const params = new URLSearchParams();
+  Object.entries(weights).forEach(([key, w]) => params.append("weight", `${key}:${w}`));
+  Object.entries(filters.minScores ?? {}).forEach(([key, min]) => params.append("min_score", `${key}:${min}`));
+  if (filters.area) params.append("area", filters.area);
+  if (filters.limit) params.append("limit", String(filters.limit));
+  const res = await api.get<RankResults>("/api/rank", { params });
+  return res.data;
+}
+
+/** Stored candidates ranked against a free-text job requisition (no re-evaluation). */
+export async function matchRequisition(
+  requisition: string,
+  options: {
+    mapper?: "llm" | "local";
+    textWeight?: number;
+    minScores?: Record<string, number | "Basic" | "Medium" | "High">;
+    area?: string;
+    limit?: number;
+  } = {}
+): Promise<MatchResults> {
+  const res = await api.post<MatchResults>("/api/match", {
+    requisition,
+    mapper: options.mapper,
+    text_weight: options.textWeight,
+    min_score: options.minScores
+      ? Object.fromEntries(Object.entries(options.minScores).map(([k, v]) => [k, String(v)]))
+      : undefined,
+    area: options.area,
+    limit: options.limit,
+  });
+  return res.data;
+}
+
+/** List analyses filtered and sorted by one stage duration (e.g. "spec_scoring", "llm_max", "total"). */
+export async function listSlowAnalyses(
+  stage = "total",
+  minSeconds = 0,
+  limit = 50
+): Promise<SlowAnalysesList> {
+  const res = await api.get<SlowAnalysesList>("/api/analyses/slow", {
+    params: { stage, min_seconds: minSeconds, limit },
+  });
   return res.data;
 }
 
@@ -105,11 +227,14 @@ export async function downloadCandidateReport(
 
 /** Trigger download of high-level report for multiple candidates (optional filter by area, ids, or date range). */
 export async function downloadCandidatesReport(params: {
-  format: "xlsx" | "pdf";
+  format: ReportFormat;
   ids?: string[];
   area?: string;
   dateFrom?: string;
   dateTo?: string;
+  /** "AREA:N" or "AREA/SPECIALIZATION:N" */
+  minScores?: string[];
+  model?: string;
 }): Promise<void> {
   const search = new URLSearchParams();
   search.set("format", params.format);
@@ -117,6 +242,8 @@ export async function downloadCandidatesReport(params: {
   if (params.area) search.set("area", params.area);
   if (params.dateFrom) search.set("date_from", params.dateFrom);
   if (params.dateTo) search.set("date_to", params.dateTo);
+  params.minScores?.forEach((m) => search.append("min_score", m));
+  if (params.model) search.set("model", params.model);
   const url = `${API_BASE}/api/reports/candidates?${search.toString()}`;
   const res = await fetch(url);
   if (!res.ok) {
@@ -126,10 +253,37 @@ export async function downloadCandidatesReport(params: {
   const blob = await res.blob();
   const disp = res.headers.get("Content-Disposition");
   const match = disp && disp.match(/filename="?([^";]+)"?/);
-  const filename = match ? match[1] : `candidate-reports.${params.format === "xlsx" ? "xlsx" : "pdf"}`;
+  const filename = match ? match[1] : `candidate-reports.${params.format}`;
   const a = document.createElement("a");
   a.href = URL.createObjectURL(blob);
   a.download = filename;
   a.click();
   URL.revokeObjectURL(a.href);
 }
+
+/** Start a background report (any size); poll getReportJob, then fetch `${API_BASE}${download_url}`. */
+export async function createReportJob(params: {
+  format: ReportFormat;
+  ids?: string[];
+  area?: string;
+  dateFrom?: string;
+  dateTo?: string;
+  minScores?: string[];
+  model?: string;
+}): Promise<{ job_id: string; status_url: string }> {
+  const res = await api.post<{ job_id: string; status_url: string }>("/api/reports/jobs", {
+    format: params.format,
+    ids: params.ids,
+    area: params.area,
+    date_from: params.dateFrom,
+    date_to: params.dateTo,
+    min_score: params.minScores,
+    model: params.model,
+  });
+  return res.data;
+}
+
+export async function getReportJob(jobId: string): Promise<ReportJob> {
+  const res = await api.get<ReportJob>(`/api/reports/jobs/${jobId}`);
+  return res.data;
+}
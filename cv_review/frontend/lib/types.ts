@@ -23,6 +23,45 @@ export interface AnalysisMetrics {
   model_used: string;
 }
 
+export interface TimelineSpan {
+  stage: string;
+  start: number;
+  end: number;
+  duration: number;
+  prompt?: string;
+  area?: Area;
+  specialization?: string;
+  model?: string;
+  tokens?: number;
+  retries?: number;
+  error?: string;
+  file_type?: string;
+  source?: string;
+}
+
+export interface AnalysisTimeline {
+  started_at: string;
+  total_seconds: number;
+  spans: TimelineSpan[];
+}
+
+export interface SlowAnalysis {
+  id: string;
+  filename: string;
+  timestamp: string;
+  analysis_time_seconds: number;
+  model_used: string;
+  stage: string;
+  stage_seconds: number;
+  durations: Record<string, number>;
+}
+
+export interface SlowAnalysesList {
+  total: number;
+  stage: string;
+  items: SlowAnalysis[];
+}
+
 export interface AnalysisResult {
   area_scores: AreaScores;
   area_descriptions: Record<Area, string>;
@@ -41,6 +80,21 @@ export interface AnalysisResult {
   analysis_id?: string;
   analysis_time_seconds?: number;
   filename?: string;
+  timeline?: AnalysisTimeline;
+}
+
+/** What to do when an upload is the same candidate as an earlier analysis */
+export type OnDuplicate = "link" | "changed" | "rerun";
+
+export interface DuplicateMatch {
+  /** Earlier analysis (or, within one upload, the job of the earlier file: job_id) */
+  analysis_id?: string;
+  job_id?: string;
+  filename?: string;
+  timestamp?: string;
+  similarity: number;
+  exact: boolean;
+  action: OnDuplicate;
 }
 
 export interface JobStatus {
@@ -50,6 +104,49 @@ export interface JobStatus {
   current_step: string;
   result?: AnalysisResult;
   error?: string;
+  duplicate?: DuplicateMatch;
+}
+
+export interface BulkUploadResult {
+  batch_id: string;
+  accepted: number;
+  rejected: { filename: string; reason: string }[];
+  job_ids: string[];
+}
+
+export interface BatchItem {
+  job_id: string;
+  filename: string;
+  status: "queued" | "processing" | "complete" | "failed";
+  progress: number;
+  current_step: string;
+  analysis_id?: string | null;
+  error?: string | null;
+}
+
+export interface BatchStatus {
+  batch_id: string;
+  status: "receiving" | "processing" | "complete";
+  created: string;
+  total: number;
+  progress: number;
+  counts: Record<BatchItem["status"], number>;
+  items: BatchItem[];
+  rejected: { filename: string; reason: string }[];
+}
+
+export type ReportFormat = "xlsx" | "pdf" | "csv" | "parquet";
+
+export interface ReportJob {
+  job_id: string;
+  format: ReportFormat;
+  status: "processing" | "complete" | "failed";
+  progress: number;
+  current_step: string;
+  records?: number;
+  size_bytes?: number;
+  download_url?: string;
+  error: string | null;
 }
 
 export interface AnalysisRecord {
@@ -64,11 +161,88 @@ export interface AnalysisRecord {
   area_scores: AreaScores;
   candidate_summary: string;
   human_review_minutes: number;
+  timeline?: AnalysisTimeline;
 }
 
 export interface AnalysesList {
   total: number;
   items: AnalysisRecord[];
+  /** Pass as `after` to get the next page; null on the last page */
+  next_cursor: string | null;
+}
+
+export interface SearchHit {
+  id: string;
+  filename: string;
+  timestamp: string;
+  most_fitted_area: Area | "";
+  score: number;
+  /** Raw text with hits wrapped in <mark>…</mark>: escape everything else before rendering */
+  summary_snippet: string;
+  snippet: string;
+}
+
+export interface SearchResults {
+  total: number;
+  items: SearchHit[];
+  facets: { most_fitted_area: Record<string, number> };
+  /** false: facet counts are estimated from the newest matches */
+  facets_exact: boolean;
+  /** Number of newest matches ranked by relevance */
+  ranked: number;
+  query: string;
+  mode: "all" | "any";
+  took_ms: number;
+}
+
+export interface RankedCandidate extends AnalysisRecord {
+  /** Weighted sum of the requested scores */
+  score: number;
+  /** Each weighted / filtered score of this candidate (null when it has none) */
+  scores: Record<string, number | null>;
+}
+
+export interface RankResults {
+  /** Candidates passing the filters */
+  total: number;
+  items: RankedCandidate[];
+  /** Weights and minimums as resolved to "Area" / "Area/Specialization" keys */
+  weights: Record<string, number>;
+  min_scores: Record<string, number>;
+  took_ms: number;
+}
+
+export interface RequisitionMapping {
+  /** "local" when requested, or when the LLM call failed (see `fallback`) */
+  mapper: "llm" | "local";
+  /** "Area/Specialization" -> weight; weights sum to 1 */
+  weights: Record<string, number>;
+  summary: string;
+  tokens: number;
+  cached: boolean;
+  mapping_ms: number;
+  model?: string;
+  fallback?: string;
+}
+
+export interface MatchedCandidate extends AnalysisRecord {
+  /** (1 - text_weight) * spec_fit + text_weight * text_score, 0-1 */
+  match_score: number;
+  /** Weighted specialization score over 5 */
+  spec_fit: number;
+  /** CV text similarity to the requisition, relative to the best candidate */
+  text_score: number;
+  scores: Record<string, number | null>;
+}
+
+export interface MatchResults {
+  total: number;
+  items: MatchedCandidate[];
+  mapping: RequisitionMapping;
+  weights: Record<string, number>;
+  min_scores: Record<string, number>;
+  text_weight: number;
+  took_ms: { mapping: number; ranking: number };
 }
 
 export interface Metrics {
@@ -2,7 +2,12 @@
 CV Review v2 - Single launcher script
 Run with: python run.py
 Starts FastAPI backend (port 8000) + Next.js frontend (port 3000)
+
+Production mode: python run.py --prod [--workers N] [--port 8000] [--skip-build]
+Builds the frontend once into backend/static and serves everything from N
+backend workers (default: CPU count) on one port, without the file watcher.
 """
+import argparse
 import os
 import shutil
 import signal
@@ -104,18 +109,34 @@ def ensure_npm_modules():
 # pre-flight
 # ---------------------------------------------------------------------------
 
-def pre_flight():
+def build_frontend():
+    """Static export (same-origin API) copied to backend/static, where main.py serves it."""
+    print("[BUILD] Building frontend (next build)...")
+    run(["npm", "run", "build"], cwd=FRONTEND_DIR, shell=(sys.platform == "win32"),
+        env={**os.environ, "NEXT_PUBLIC_API_URL": ""})
+    out_dir = FRONTEND_DIR / "out"
+    static_dir = BACKEND_DIR / "static"
+    if not out_dir.is_dir():
+        print(f"[ERROR] Build output not found at {out_dir}")
+        sys.exit(1)
+    shutil.rmtree(static_dir, ignore_errors=True)
+    shutil.copytree(out_dir, static_dir)
+    print(f"[BUILD] Frontend copied to {static_dir}")
+
+
+def pre_flight(need_node=True):
     print("\n==========================================")
     print("       CV Review v2 - Launcher")
     print("==========================================\n")
 
-    if not check_node():
+    if need_node and not check_node():
         print("[ERROR] Node.js is not installed or not on PATH.")
         print("  Download it from https://nodejs.org")
         sys.exit(1)
 
     ensure_venv()
-    ensure_npm_modules()
+    if need_node:
+        ensure_npm_modules()
 
     env_file = BACKEND_DIR / ".env"
     if env_file.exists():
@@ -126,11 +147,78 @@ def pre_flight():
         print("[WARN] backend/.env not found - copy .env.example and set your API key")
 
 
+# ---------------------------------------------------------------------------
+# production
+# ---------------------------------------------------------------------------
+
+def main_prod(args):
+    """Prebuilt frontend + N warm backend workers; SIGTERM drains running evaluations."""
+    skip_build = args.skip_build and (BACKEND_DIR / "static" / "index.html").exists()
+    pre_flight(need_node=not skip_build)
+    if not skip_build:
+        build_frontend()
+    run([str(VENV_PYTHON), str(BACKEND_DIR / "tools" / "compile_skill_matrix.py")])
+
+    CYAN  = "\033[36m"
+    RESET = "\033[0m"
+    workers = args.workers or os.cpu_count() or 1
+    cmd = [
+        str(VENV_PYTHON), "-m", "uvicorn", "main:app",
+        "--host", args.host, "--port", str(args.port),
+        "--workers", str(workers),
+        "--timeout-graceful-shutdown", str(args.drain_timeout),
+        "--no-access-log",
+    ]
+    print(f"\n{CYAN}[BOOT]{RESET} Starting {workers} backend worker(s) on http://{args.host}:{args.port} ...")
+    backend = subprocess.Popen(
+        cmd,
+        cwd=BACKEND_DIR,
+        env={"CV_REVIEW_WARMUP": "blocking", **os.environ, "PYTHONUNBUFFERED": "1"},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    threading.Thread(target=stream, args=(backend, "API", CYAN), daemon=True).start()
+
+    def drain(sig=None, frame=None):
+        # uvicorn stops accepting connections, lets running evaluations finish for up to
+        # --drain-timeout seconds, then re-queues the rest in shared state for the next start.
+        print(f"\n[STOP] Draining (up to {args.drain_timeout}s)...")
+        if sys.platform == "win32":
+            backend.terminate()
+        else:
+            backend.send_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGINT,  drain)
+    signal.signal(signal.SIGTERM, drain)
+
+    code = backend.wait()
+    print(f"[STOP] Backend exited ({code}).")
+    sys.exit(code)
+
+
 # ---------------------------------------------------------------------------
 # main
 # ---------------------------------------------------------------------------
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CV Review launcher.")
+    parser.add_argument("--prod", action="store_true",
+                        help="Serve the built frontend from N backend workers (no reload, no dev server)")
+    parser.add_argument("--workers", type=int, default=0, help="Backend workers in --prod (default: CPU count)")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address in --prod")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")), help="Port in --prod")
+    parser.add_argument("--drain-timeout", type=int, default=120,
+                        help="Seconds running evaluations get to finish on SIGTERM before being re-queued")
+    parser.add_argument("--skip-build", action="store_true", help="Reuse backend/static from a previous build")
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args()
+    if args.prod:
+        main_prod(args)
+        return
+
     pre_flight()
 
     CYAN  = "\033[36m"